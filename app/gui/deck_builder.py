@@ -6,19 +6,54 @@ Dieses Modul implementiert den Deck-Builder für die Anwendung.
 
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QLineEdit,
-    QListWidget, QListWidgetItem, QComboBox, QSpinBox, QSplitter,
-    QScrollArea, QGroupBox, QMessageBox, QDialog, QDialogButtonBox, QFormLayout
+    QListWidget, QListWidgetItem, QListView, QComboBox, QSpinBox, QSplitter,
+    QScrollArea, QGroupBox, QMessageBox, QDialog, QDialogButtonBox, QFormLayout,
+    QTextEdit, QCheckBox, QFileDialog
 )
-from PySide6.QtCore import Qt, Signal, Slot, QSize
+from PySide6.QtCore import Qt, Signal, Slot, QSize, QModelIndex, QTimer
 from PySide6.QtGui import QFont
 
-from app.gui.widgets.card_widget import CardWidget
+from app.gui.widgets.card_catalog_model import CardCatalogModel
+from app.logic import deck_stats
+from app.logic.deck_summary import DeckSummary
+from app.logic.format_rules import DeckValidation
 from app.models.card import Card
+from app.models.card_query import CardQuery
 from app.models.deck import Deck, CardInDeck
 from app.models.player import Player
+from app.utils import deck_io
 
 from pony.orm import db_session, select, commit
 
+# Dateifilter für Import und Export von Decklisten und ihr Format
+DECK_FILE_FILTERS = {
+    "MTG Arena (*.txt)": "arena",
+    "Textliste (*.txt)": "text",
+    "MTGO (*.dek)": "dek"
+}
+
+# Wartezeit nach der letzten Eingabe im Suchfeld, bevor gesucht wird (ms)
+SEARCH_DEBOUNCE_MS = 250
+
+# Farbfilter des Katalogs als Ausdruck der Suchsprache
+CATALOG_COLOR_FILTERS = {
+    "White": "c:w",
+    "Blue": "c:u",
+    "Black": "c:b",
+    "Red": "c:r",
+    "Green": "c:g",
+    "Multicolor": "c:m",
+    "Colorless": "c:c"
+}
+
+# Kurzhilfe zur Suchsprache (Tooltip des Suchfelds)
+SEARCH_SYNTAX_HELP = (
+    "Wörter suchen in Name, Typ und Regeltext.\n"
+    "n:name  t:typ  o:\"regeltext\"  c>=ur  c:m  c:c  cmc<=3\n"
+    "pow>=4  tou<2  r:mythic  r>=rare  set:NEO\n"
+    "-begriff schließt aus, \"or\" verknüpft Alternativen, Klammern gruppieren."
+)
+
 
 class DeckBuilderWidget(QWidget):
     """Widget für den Deck-Builder."""
@@ -37,9 +72,15 @@ class DeckBuilderWidget(QWidget):
         self.current_player = None
         self.current_deck = None
         self.current_deck_id = None
-        self.card_catalog = []
+        self.deck_summary = None
+        self.deck_validation = None
+        self.commander_id = None
         self.deck_cards = []
         
+        # Einträge der Deckliste: Karten-ID -> Element, Haupttyp -> Überschrift
+        self.deck_items = {}
+        self.group_items = {}
+        
         self.init_ui()
         self.load_card_catalog()
         self.load_players()
@@ -77,6 +118,15 @@ class DeckBuilderWidget(QWidget):
         self.save_deck_button = QPushButton("Deck speichern")
         toolbar_layout.addWidget(self.save_deck_button)
         
+        self.stats_button = QPushButton("Statistik")
+        toolbar_layout.addWidget(self.stats_button)
+        
+        self.import_button = QPushButton("Importieren")
+        toolbar_layout.addWidget(self.import_button)
+        
+        self.export_button = QPushButton("Exportieren")
+        toolbar_layout.addWidget(self.export_button)
+        
         # Hauptbereich mit Splitter
         splitter = QSplitter(Qt.Horizontal)
         main_layout.addWidget(splitter, 1)
@@ -91,12 +141,25 @@ class DeckBuilderWidget(QWidget):
         catalog_layout.addLayout(search_layout)
         
         self.search_field = QLineEdit()
-        self.search_field.setPlaceholderText("Suche nach Karten...")
+        self.search_field.setPlaceholderText("Suche nach Karten... (z.B. t:creature c>=ur cmc<=3)")
+        self.search_field.setToolTip(SEARCH_SYNTAX_HELP)
         search_layout.addWidget(self.search_field)
         
         self.search_button = QPushButton("Suchen")
         search_layout.addWidget(self.search_button)
         
+        # Suche während der Eingabe erst nach einer kurzen Pause starten
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.update_catalog_display)
+        
+        # Fehlermeldung bei ungültiger Suchanfrage
+        self.query_error_label = QLabel()
+        self.query_error_label.setStyleSheet("color: #c0392b;")
+        self.query_error_label.hide()
+        catalog_layout.addWidget(self.query_error_label)
+        
         # Filter
         filter_layout = QHBoxLayout()
         catalog_layout.addLayout(filter_layout)
@@ -117,8 +180,12 @@ class DeckBuilderWidget(QWidget):
         
         catalog_group_layout = QVBoxLayout(catalog_group)
         
-        self.catalog_list = QListWidget()
-        self.catalog_list.setSelectionMode(QListWidget.SingleSelection)
+        # Die Ansicht lädt über das Modell nur die sichtbaren Seiten nach
+        self.catalog_model = CardCatalogModel(parent=self)
+        self.catalog_list = QListView()
+        self.catalog_list.setModel(self.catalog_model)
+        self.catalog_list.setSelectionMode(QListView.SingleSelection)
+        self.catalog_list.setUniformItemSizes(True)
         catalog_group_layout.addWidget(self.catalog_list)
         
         # Button zum Hinzufügen
@@ -151,6 +218,11 @@ class DeckBuilderWidget(QWidget):
         self.card_count_label = QLabel("0 Karten")
         deck_info_layout.addWidget(self.card_count_label)
         
+        # Ergebnis der Formatprüfung (wird bei jeder Änderung aktualisiert)
+        self.legality_label = QLabel()
+        self.legality_label.setWordWrap(True)
+        deck_layout.addWidget(self.legality_label)
+        
         # Deck-Inhalt
         deck_group = QGroupBox("Deck-Inhalt")
         deck_layout.addWidget(deck_group, 1)
@@ -167,6 +239,9 @@ class DeckBuilderWidget(QWidget):
         
         remove_layout.addStretch()
         
+        self.commander_button = QPushButton("Als Commander festlegen")
+        remove_layout.addWidget(self.commander_button)
+        
         self.remove_button = QPushButton("Aus Deck entfernen")
         remove_layout.addWidget(self.remove_button)
         
@@ -180,16 +255,22 @@ class DeckBuilderWidget(QWidget):
         # Signale verbinden
         self.new_deck_button.clicked.connect(self.on_new_deck)
         self.save_deck_button.clicked.connect(self.on_save_deck)
+        self.stats_button.clicked.connect(self.on_show_stats)
+        self.import_button.clicked.connect(self.on_import_decks)
+        self.export_button.clicked.connect(self.on_export_deck)
         self.player_combo.currentIndexChanged.connect(self.on_player_changed)
         self.deck_combo.currentIndexChanged.connect(self.on_deck_changed)
         self.search_button.clicked.connect(self.on_search)
+        self.search_field.textChanged.connect(self.on_search_text_changed)
         self.search_field.returnPressed.connect(self.on_search)
         self.type_combo.currentIndexChanged.connect(self.on_filter_changed)
         self.color_combo.currentIndexChanged.connect(self.on_filter_changed)
-        self.catalog_list.itemClicked.connect(self.on_catalog_item_clicked)
+        self.catalog_list.clicked.connect(self.on_catalog_item_clicked)
         self.deck_list.itemClicked.connect(self.on_deck_item_clicked)
         self.add_button.clicked.connect(self.on_add_to_deck)
         self.remove_button.clicked.connect(self.on_remove_from_deck)
+        self.commander_button.clicked.connect(self.on_set_commander)
+        self.format_combo.currentIndexChanged.connect(self.update_legality_display)
     
     @db_session
     def load_players(self):
@@ -256,123 +337,238 @@ class DeckBuilderWidget(QWidget):
         else:
             self.deck_combo.setCurrentIndex(0)
     
-    @db_session
     def load_card_catalog(self):
-        """Lädt den Kartenkatalog aus der Datenbank."""
-        # Karten laden
-        self.card_catalog = list(select(c for c in Card).order_by(Card.name)[:])
-        
-        # Kartenkataloganzeige aktualisieren
+        """Lädt den Kartenkatalog neu aus der Datenbank (verwirft zwischengespeicherte Seiten)."""
+        self.catalog_model.clear_cache()
         self.update_catalog_display()
     
-    def update_catalog_display(self):
-        """Aktualisiert die Anzeige des Kartenkatalogs basierend auf den Filtern."""
-        # Liste leeren
-        self.catalog_list.clear()
-        
-        # Filter anwenden
-        filtered_cards = self.apply_filters(self.card_catalog)
-        
-        # Karten zur Liste hinzufügen
-        for card in filtered_cards:
-            item = QListWidgetItem(f"{card.name} ({card.card_type})")
-            item.setData(Qt.UserRole, card.id)
-            self.catalog_list.addItem(item)
-    
-    def apply_filters(self, cards):
+    def build_catalog_query(self):
         """
-        Wendet die aktuellen Filter auf die Kartenliste an.
-        
-        Args:
-            cards (list): Die zu filternden Karten.
+        Setzt die Suchanfrage aus Suchfeld und Filtern zusammen.
         
         Returns:
-            list: Die gefilterten Karten.
+            str: Die Suchanfrage in der Suchsprache von card_query.
         """
-        filtered_cards = []
+        parts = []
+        
+        # Suchtext (geklammert, damit ein "or" die Filter nicht aufhebt)
+        search_text = self.search_field.text().strip()
+        if search_text:
+            parts.append(f"({search_text})")
         
         # Typ-Filter
         selected_type = self.type_combo.currentText()
+        if selected_type != "Alle":
+            parts.append(f't:"{selected_type}"')
         
         # Farb-Filter
         selected_color = self.color_combo.currentText()
+        if selected_color != "Alle":
+            parts.append(CATALOG_COLOR_FILTERS[selected_color])
         
-        # Suchtext
-        search_text = self.search_field.text().lower()
+        return " ".join(parts)
+    
+    def update_catalog_display(self):
+        """Führt die Suchanfrage aus und zeigt die Ergebnisse im Kartenkatalog an."""
+        query = CardQuery(self.build_catalog_query())
         
-        for card in cards:
-            # Typ-Filter
-            if selected_type != "Alle" and selected_type not in card.card_type:
-                continue
-            
-            # Farb-Filter
-            if selected_color != "Alle":
-                if selected_color == "Multicolor" and len(card.get_colors_list()) <= 1:
-                    continue
-                elif selected_color == "Colorless" and len(card.get_colors_list()) > 0:
-                    continue
-                elif selected_color != "Multicolor" and selected_color != "Colorless" and selected_color not in card.colors:
-                    continue
-            
-            # Suchtext
-            if search_text and (
-                search_text not in card.name.lower() and 
-                (not card.rules_text or search_text not in card.rules_text.lower())
-            ):
-                continue
-            
-            filtered_cards.append(card)
+        if query.error:
+            self.query_error_label.setText(query.error)
+            self.query_error_label.show()
+        else:
+            self.query_error_label.hide()
         
-        return filtered_cards
+        # Die erste Seite fordert die Ansicht selbst über fetchMore an
+        self.catalog_model.set_query(query)
+    
+    def load_deck_summary(self):
+        """Lädt die Kennzahlen des aktuellen Decks (eine Abfrage beim Öffnen des Decks)."""
+        self.deck_summary = DeckSummary.load(self.current_deck_id) if self.current_deck_id else None
     
-    @db_session
     def update_deck_display(self):
-        """Aktualisiert die Anzeige des aktuellen Decks."""
+        """Baut die Anzeige des aktuellen Decks aus der Deck-Zusammenfassung neu auf (beim Öffnen eines Decks)."""
         # Liste leeren
         self.deck_list.clear()
+        self.deck_items.clear()
+        self.group_items.clear()
         
         # Wenn kein Deck ausgewählt ist, abbrechen
-        if not self.current_deck:
+        if not self.current_deck or self.deck_summary is None:
             self.deck_name_label.setText("Kein Deck ausgewählt")
             self.card_count_label.setText("0 Karten")
+            self.legality_label.clear()
+            self.deck_validation = None
             return
         
         # Deck-Informationen anzeigen
         self.deck_name_label.setText(f"{self.current_deck.name} ({self.current_deck.format})")
         
-        # Karten nach Typ sortieren
-        cards_by_type = {}
-        total_cards = 0
-        
-        for card_in_deck in self.current_deck.cards:
-            card = card_in_deck.card
-            card_type = card.card_type.split("—")[0].strip()  # Haupttyp (vor dem Strich)
-            
-            if card_type not in cards_by_type:
-                cards_by_type[card_type] = []
-            
-            cards_by_type[card_type].append((card, card_in_deck.quantity))
-            total_cards += card_in_deck.quantity
-        
         # Kartenanzahl anzeigen
-        self.card_count_label.setText(f"{total_cards} Karten")
+        self.card_count_label.setText(f"{self.deck_summary.card_count} Karten")
         
         # Karten nach Typ zur Liste hinzufügen
-        for card_type in sorted(cards_by_type.keys()):
+        for card_type, type_count, entries in self.deck_summary.entries_by_type():
             # Typ-Überschrift
-            type_item = QListWidgetItem(f"--- {card_type} ({sum(q for _, q in cards_by_type[card_type])}) ---")
-            type_item.setFlags(Qt.NoItemFlags)  # Nicht auswählbar
-            font = type_item.font()
-            font.setBold(True)
-            type_item.setFont(font)
+            type_item = self.create_group_item(card_type)
             self.deck_list.addItem(type_item)
             
             # Karten dieses Typs
-            for card, quantity in sorted(cards_by_type[card_type], key=lambda x: x[0].name):
-                item = QListWidgetItem(f"{quantity}x {card.name}")
-                item.setData(Qt.UserRole, card.id)
-                item.setData(Qt.UserRole + 1, quantity)
+            for entry in entries:
+                item = QListWidgetItem()
+                self.set_deck_item_entry(item, entry)
                 self.deck_list.addItem(item)
+                self.deck_items[entry.card_id] = item
+        
+        self.update_legality_display()
+    
+    def create_group_item(self, group):
+        """
+        Erstellt die Überschrift einer Gruppe der Deckliste.
+        
+        Args:
+            group (str): Der Haupttyp der Gruppe.
+        
+        Returns:
+            QListWidgetItem: Die Überschrift.
+        """
+        type_item = QListWidgetItem(f"--- {group} ({self.deck_summary.counts_by_type.get(group, 0)}) ---")
+        type_item.setFlags(Qt.NoItemFlags)  # Nicht auswählbar
+        font = type_item.font()
+        font.setBold(True)
+        type_item.setFont(font)
+        self.group_items[group] = type_item
+        return type_item
+    
+    def set_deck_item_entry(self, item, entry):
+        """
+        Zeigt eine Karte des Decks in einem Element der Deckliste an.
+        
+        Args:
+            item (QListWidgetItem): Das Element.
+            entry (DeckEntry): Die Karte.
+        """
+        commander_mark = " (Commander)" if entry.card_id == self.commander_id else ""
+        item.setText(f"{entry.quantity}x {entry.name}{commander_mark}")
+        item.setData(Qt.UserRole, entry.card_id)
+        item.setData(Qt.UserRole + 1, entry.quantity)
+        item.setData(Qt.UserRole + 2, entry.group)  # Gruppe (Haupttyp) für das Entfernen
+    
+    def update_deck_entry(self, card_id, name):
+        """
+        Aktualisiert nach einer Änderung nur die Zeile einer Karte, die Überschrift
+        ihrer Gruppe und die von der Karte abhängigen Formatprüfungen.
+        
+        Args:
+            card_id (int): Die ID der geänderten Karte.
+            name (str): Der Name der Karte (auch wenn sie nicht mehr im Deck ist).
+        """
+        entry = self.deck_summary.entries.get(card_id)
+        item = self.deck_items.get(card_id)
+        
+        if entry is None:
+            # Karte entfernt
+            if item is None:
+                return
+            group = item.data(Qt.UserRole + 2)
+            self.deck_list.takeItem(self.deck_list.row(item))
+            del self.deck_items[card_id]
+        elif item is None:
+            # Neue Karte: an der alphabetischen Position ihrer Gruppe einfügen
+            group = entry.group
+            if group not in self.group_items:
+                self.update_group_item(group)
+            item = QListWidgetItem()
+            self.set_deck_item_entry(item, entry)
+            self.deck_list.insertItem(self.deck_entry_row(entry), item)
+            self.deck_items[card_id] = item
+        else:
+            group = entry.group
+            self.set_deck_item_entry(item, entry)
+        
+        self.update_group_item(group)
+        self.card_count_label.setText(f"{self.deck_summary.card_count} Karten")
+        
+        if self.deck_validation is not None:
+            self.deck_validation.update_card(card_id, name)
+            self.show_legality()
+    
+    def update_group_item(self, group):
+        """
+        Aktualisiert die Überschrift einer Gruppe (und entfernt sie, wenn die Gruppe leer ist).
+        
+        Args:
+            group (str): Der Haupttyp der Gruppe.
+        """
+        type_item = self.group_items.get(group)
+        type_count = self.deck_summary.counts_by_type.get(group, 0)
+        
+        if type_count == 0:
+            if type_item is not None:
+                self.deck_list.takeItem(self.deck_list.row(type_item))
+                del self.group_items[group]
+        elif type_item is None:
+            # Neue Gruppe vor der ersten Gruppe mit größerem Namen einfügen
+            self.deck_list.insertItem(self.group_end_row(group), self.create_group_item(group))
+        else:
+            type_item.setText(f"--- {group} ({type_count}) ---")
+    
+    def group_end_row(self, group):
+        """
+        Gibt die Zeile hinter den Karten einer Gruppe zurück.
+        
+        Args:
+            group (str): Der Haupttyp der Gruppe.
+        
+        Returns:
+            int: Die Zeile der Überschrift der nächsten Gruppe bzw. das Listenende.
+        """
+        following = [other for other in self.group_items if other > group]
+        return self.deck_list.row(self.group_items[min(following)]) if following else self.deck_list.count()
+    
+    def deck_entry_row(self, entry):
+        """
+        Bestimmt die Zeile, an der eine neue Karte in ihre (bereits angezeigte) Gruppe eingefügt wird.
+        
+        Args:
+            entry (DeckEntry): Die Karte.
+        
+        Returns:
+            int: Die Zeile.
+        """
+        # Binäre Suche über die alphabetisch sortierten Karten der Gruppe
+        low = self.deck_list.row(self.group_items[entry.group]) + 1
+        high = self.group_end_row(entry.group)
+        while low < high:
+            middle = (low + high) // 2
+            other = self.deck_summary.entries.get(self.deck_list.item(middle).data(Qt.UserRole))
+            if other is not None and other.name <= entry.name:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+    
+    @Slot()
+    def update_legality_display(self):
+        """Prüft das aktuelle Deck gegen das gewählte Format und zeigt das Ergebnis an."""
+        if self.deck_summary is None:
+            self.deck_validation = None
+            self.legality_label.clear()
+            return
+        
+        self.deck_validation = DeckValidation(self.deck_summary, self.format_combo.currentText(), self.commander_id)
+        self.show_legality()
+    
+    def show_legality(self):
+        """Zeigt das Ergebnis der Formatprüfung an."""
+        format_name = self.format_combo.currentText()
+        valid, error = self.deck_validation.result()
+        
+        if valid:
+            self.legality_label.setText(f"Legal in {format_name}")
+            self.legality_label.setStyleSheet("color: #27ae60;")
+        else:
+            self.legality_label.setText(error)
+            self.legality_label.setStyleSheet("color: #c0392b;")
     
     @Slot()
     def on_player_changed(self):
@@ -412,6 +608,8 @@ class DeckBuilderWidget(QWidget):
         if deck_id is None or deck_id == -1:
             self.current_deck = None
             self.current_deck_id = None
+            self.deck_summary = None
+            self.commander_id = None
             self.update_deck_display()
             return
         
@@ -419,6 +617,10 @@ class DeckBuilderWidget(QWidget):
         with db_session:
             self.current_deck = Deck.get(id=deck_id)
             self.current_deck_id = deck_id
+            commander = self.current_deck.commander if self.current_deck else None
+            self.commander_id = commander.id if commander else None
+        
+        self.load_deck_summary()
         
         # Format im Combo-Box setzen
         if self.current_deck:
@@ -470,6 +672,8 @@ class DeckBuilderWidget(QWidget):
         # Neues Deck als aktuelles Deck setzen
         self.current_deck = deck
         self.current_deck_id = deck.id
+        self.deck_summary = DeckSummary()
+        self.commander_id = None
         
         # Decks neu laden
         self.load_decks()
@@ -506,26 +710,119 @@ class DeckBuilderWidget(QWidget):
         
         QMessageBox.information(self, "Erfolg", f"Deck '{self.current_deck.name}' wurde gespeichert.")
     
+    @Slot()
+    def on_show_stats(self):
+        """Zeigt die Wahrscheinlichkeiten für Starthände und Spielzüge des Decks."""
+        if not self.current_deck_id:
+            QMessageBox.warning(self, "Fehler", "Kein Deck ausgewählt.")
+            return
+        
+        profile = self.deck_summary.to_profile() if self.deck_summary else None
+        if not profile or profile['deck_size'] == 0:
+            QMessageBox.warning(self, "Fehler", "Das Deck enthält keine Karten.")
+            return
+        
+        dialog = DeckStatsDialog(profile, self)
+        dialog.exec()
+    
+    @Slot()
+    def on_import_decks(self):
+        """Importiert eine oder mehrere Deckdateien für den aktuellen Spieler."""
+        paths, _ = QFileDialog.getOpenFileNames(
+            self, "Decks importieren", "", "Decklisten (*.dek *.txt *.dec);;Alle Dateien (*)"
+        )
+        if not paths:
+            return
+        
+        # Wenn kein Spieler ausgewählt ist, Dummy-Spieler erstellen
+        if not self.current_player:
+            self.create_dummy_player()
+        
+        deck_lists = []
+        errors = []
+        for path in paths:
+            deck_list, error = deck_io.read_deck_file(path)
+            if error:
+                errors.append(error)
+            else:
+                deck_lists.append(deck_list)
+        
+        results = []
+        if deck_lists:
+            results, error = deck_io.import_deck_lists(
+                deck_lists, self.current_player.id, self.format_combo.currentText()
+            )
+            if error:
+                errors.append(error)
+        
+        # Unbekannte Karten mit Vorschlägen melden
+        for result in results:
+            for name, suggestions in result['unknown'].items():
+                hint = f" (meinten Sie: {', '.join(suggestions)}?)" if suggestions else ""
+                errors.append(f"{result['name']}: unbekannte Karte '{name}'{hint}")
+        
+        if results:
+            self.load_decks()
+            index = self.deck_combo.findData(results[-1]['deck_id'])
+            if index >= 0:
+                self.deck_combo.setCurrentIndex(index)
+        
+        message = f"{len(results)} Deck(s) importiert."
+        if errors:
+            QMessageBox.warning(self, "Import", message + "\n\n" + "\n".join(errors))
+        else:
+            QMessageBox.information(self, "Import", message)
+    
+    @Slot()
+    def on_export_deck(self):
+        """Exportiert das aktuelle Deck als Arena-, Text- oder MTGO-Liste."""
+        if not self.current_deck_id:
+            QMessageBox.warning(self, "Fehler", "Kein Deck ausgewählt.")
+            return
+        
+        path, selected_filter = QFileDialog.getSaveFileName(
+            self, "Deck exportieren", f"{self.current_deck.name}.txt", ";;".join(DECK_FILE_FILTERS)
+        )
+        if not path:
+            return
+        
+        success, error = deck_io.export_deck_file(self.current_deck_id, path, DECK_FILE_FILTERS.get(selected_filter))
+        if not success:
+            QMessageBox.warning(self, "Fehler", error)
+    
     @Slot()
     def on_search(self):
         """Wird aufgerufen, wenn nach Karten gesucht werden soll."""
+        self.search_timer.stop()
         self.update_catalog_display()
     
+    @Slot(str)
+    def on_search_text_changed(self, text):
+        """
+        Wird aufgerufen, wenn sich der Text im Suchfeld ändert.
+        
+        Args:
+            text (str): Der neue Suchtext.
+        """
+        # Jede Eingabe verschiebt die Suche, bis der Benutzer kurz pausiert
+        self.search_timer.start()
+    
     @Slot()
     def on_filter_changed(self):
         """Wird aufgerufen, wenn ein Filter geändert wird."""
+        self.search_timer.stop()
         self.update_catalog_display()
     
-    @Slot(QListWidgetItem)
-    def on_catalog_item_clicked(self, item):
+    @Slot(QModelIndex)
+    def on_catalog_item_clicked(self, index):
         """
         Wird aufgerufen, wenn auf ein Element im Kartenkatalog geklickt wird.
         
         Args:
-            item (QListWidgetItem): Das angeklickte Element.
+            index (QModelIndex): Der Index des angeklickten Elements.
         """
-        # Karten-ID aus dem Item abrufen
-        card_id = item.data(Qt.UserRole)
+        # Karten-ID aus dem Modell abrufen
+        card_id = index.data(Qt.UserRole)
         
         # TODO: Kartenvorschau anzeigen
     
@@ -555,14 +852,14 @@ class DeckBuilderWidget(QWidget):
             return
         
         # Ausgewählte Karte abrufen
-        selected_items = self.catalog_list.selectedItems()
+        selected_indexes = self.catalog_list.selectionModel().selectedIndexes()
         
-        if not selected_items:
+        if not selected_indexes:
             QMessageBox.warning(self, "Fehler", "Keine Karte ausgewählt.")
             return
         
-        # Karten-ID aus dem Item abrufen
-        card_id = selected_items[0].data(Qt.UserRole)
+        # Karten-ID aus dem Modell abrufen
+        card_id = selected_indexes[0].data(Qt.UserRole)
         
         # Anzahl abrufen
         quantity = self.quantity_spin.value()
@@ -609,8 +906,9 @@ class DeckBuilderWidget(QWidget):
         
         commit()
         
-        # Deck-Anzeige aktualisieren
-        self.update_deck_display()
+        # Kennzahlen anpassen und die Zeile der Karte aktualisieren
+        self.deck_summary.add_card(card, quantity)
+        self.update_deck_entry(card.id, card.name)
     
     @Slot()
     def on_remove_from_deck(self):
@@ -636,6 +934,44 @@ class DeckBuilderWidget(QWidget):
         # Karte aus dem Deck entfernen
         self.remove_card_from_deck(card_id)
     
+    @Slot()
+    def on_set_commander(self):
+        """Legt die im Deck ausgewählte Karte als Commander des Decks fest."""
+        if not self.current_deck:
+            return
+        
+        selected_items = self.deck_list.selectedItems()
+        card_id = selected_items[0].data(Qt.UserRole) if selected_items else None
+        
+        if card_id is None:
+            QMessageBox.warning(self, "Fehler", "Keine Karte ausgewählt.")
+            return
+        
+        with db_session:
+            deck = Deck.get(id=self.current_deck_id)
+            card = Card.get(id=card_id)
+            
+            if not deck or not card:
+                QMessageBox.warning(self, "Fehler", "Deck oder Karte nicht gefunden.")
+                return
+            
+            deck.commander = card
+            commit()
+        
+        previous_commander_id = self.commander_id
+        self.commander_id = card_id
+        
+        # Nur die Zeilen des alten und neuen Commanders neu beschriften
+        for changed_id in (previous_commander_id, card_id):
+            item = self.deck_items.get(changed_id)
+            entry = self.deck_summary.entries.get(changed_id)
+            if item is not None and entry is not None:
+                self.set_deck_item_entry(item, entry)
+        
+        if self.deck_validation is not None:
+            self.deck_validation.set_commander(card_id)
+            self.show_legality()
+    
     @db_session
     def remove_card_from_deck(self, card_id):
         """
@@ -697,8 +1033,9 @@ class DeckBuilderWidget(QWidget):
             
             commit()
             
-            # Deck-Anzeige aktualisieren
-            self.update_deck_display()
+            # Kennzahlen anpassen und die Zeile der Karte aktualisieren
+            self.deck_summary.remove_card(card_id, remove_quantity)
+            self.update_deck_entry(card_id, card.name)
 
 
 class NewDeckDialog(QDialog):
@@ -745,3 +1082,127 @@ class NewDeckDialog(QDialog):
         if self.result() == QDialog.Accepted:
             return self.name_edit.text().strip(), self.format_combo.currentText()
         return None, None
+
+
+class DeckStatsDialog(QDialog):
+    """Dialog mit Wahrscheinlichkeiten für Starthände, Landdrops und Spielzüge nach Kurve."""
+    
+    def __init__(self, profile, parent=None):
+        """
+        Initialisiert den Dialog.
+        
+        Args:
+            profile (dict): Das Deckprofil (siehe deck_stats.build_deck_profile).
+            parent (QWidget, optional): Das Eltern-Widget.
+        """
+        super().__init__(parent)
+        
+        self.profile = profile
+        self.simulation = None
+        
+        self.setWindowTitle("Deck-Statistik")
+        self.resize(560, 620)
+        self.init_ui()
+        self.update_display()
+    
+    def init_ui(self):
+        """Initialisiert die Benutzeroberfläche."""
+        layout = QVBoxLayout(self)
+        
+        # Optionen
+        options_layout = QHBoxLayout()
+        layout.addLayout(options_layout)
+        
+        self.on_the_draw_check = QCheckBox("Nicht beginnend (mit Ziehen im ersten Zug)")
+        options_layout.addWidget(self.on_the_draw_check)
+        options_layout.addStretch()
+        
+        options_layout.addWidget(QLabel("Länder behalten:"))
+        self.keep_min_spin = QSpinBox()
+        self.keep_min_spin.setRange(0, 7)
+        self.keep_min_spin.setValue(2)
+        options_layout.addWidget(self.keep_min_spin)
+        options_layout.addWidget(QLabel("bis"))
+        self.keep_max_spin = QSpinBox()
+        self.keep_max_spin.setRange(0, 7)
+        self.keep_max_spin.setValue(5)
+        options_layout.addWidget(self.keep_max_spin)
+        
+        # Ergebnisse
+        self.result_view = QTextEdit()
+        self.result_view.setReadOnly(True)
+        layout.addWidget(self.result_view, 1)
+        
+        # Buttons
+        button_layout = QHBoxLayout()
+        layout.addLayout(button_layout)
+        
+        self.simulate_button = QPushButton("Mit Mulligans simulieren")
+        button_layout.addWidget(self.simulate_button)
+        button_layout.addStretch()
+        
+        self.button_box = QDialogButtonBox(QDialogButtonBox.Close)
+        self.button_box.rejected.connect(self.reject)
+        button_layout.addWidget(self.button_box)
+        
+        # Signale verbinden
+        self.on_the_draw_check.toggled.connect(self.on_options_changed)
+        self.keep_min_spin.valueChanged.connect(self.on_options_changed)
+        self.keep_max_spin.valueChanged.connect(self.on_options_changed)
+        self.simulate_button.clicked.connect(self.on_simulate)
+    
+    def update_display(self):
+        """Berechnet die exakten Wahrscheinlichkeiten und zeigt sie mit der letzten Simulation an."""
+        profile = self.profile
+        on_the_draw = self.on_the_draw_check.isChecked()
+        turns = range(1, 7)
+        
+        html = f"<h3>{profile['deck_size']} Karten, davon {profile['land_count']} Länder</h3>"
+        
+        # Länder auf der Starthand
+        html += "<h4>Länder auf der Starthand (ohne Mulligan)</h4><table cellpadding='3'>"
+        for lands, probability in enumerate(deck_stats.opening_hand_land_distribution(profile)):
+            html += f"<tr><td>{lands} Länder</td><td align='right'>{probability:.1%}</td></tr>"
+        html += "</table>"
+        
+        # Landdrops und Spielzüge nach Kurve
+        html += "<h4>Pro Zug (exakt, ohne Mulligan)</h4><table cellpadding='3'>"
+        html += "<tr><th>Zug</th><th>Landdrop</th><th>Zauber nach Kurve</th></tr>"
+        for turn in turns:
+            land_drop = deck_stats.land_drop_probability(profile, turn, on_the_draw)
+            on_curve = deck_stats.on_curve_probability(profile, turn, on_the_draw)
+            html += f"<tr><td>{turn}</td><td align='right'>{land_drop:.1%}</td><td align='right'>{on_curve:.1%}</td></tr>"
+        html += "</table>"
+        
+        # Ergebnis der Simulation
+        if self.simulation:
+            result = self.simulation
+            html += f"<h4>Mit London-Mulligan ({result['trials']:,} simulierte Spiele)</h4>"
+            html += f"<p>Mulligan-Rate: {result['mulligan_rate']:.1%}, durchschnittlich {result['average_mulligans']:.2f} Mulligans</p>"
+            html += "<table cellpadding='3'><tr><th>Zug</th><th>Alle Landdrops</th><th>Zauber nach Kurve</th></tr>"
+            for turn, (land_drops, on_curve) in enumerate(zip(result['land_drops'], result['on_curve']), 1):
+                html += f"<tr><td>{turn}</td><td align='right'>{land_drops:.1%}</td><td align='right'>{on_curve:.1%}</td></tr>"
+            html += "</table>"
+        
+        self.result_view.setHtml(html)
+    
+    @Slot()
+    def on_options_changed(self):
+        """Wird aufgerufen, wenn sich die Optionen ändern (die Simulation wird verworfen)."""
+        self.simulation = None
+        self.update_display()
+    
+    @Slot()
+    def on_simulate(self):
+        """Führt die Monte-Carlo-Simulation mit den aktuellen Optionen aus."""
+        self.simulation = deck_stats.simulate_games(
+            self.profile,
+            on_the_draw=self.on_the_draw_check.isChecked(),
+            keep_min_lands=self.keep_min_spin.value(),
+            keep_max_lands=self.keep_max_spin.value()
+        )
+        
+        if not self.simulation:
+            QMessageBox.warning(self, "Fehler", "Das Deck ist für eine Simulation zu klein.")
+        
+        self.update_display()
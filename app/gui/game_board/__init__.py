@@ -6,16 +6,25 @@ Dieses Paket enthält alle Module, die für das Spielbrett benötigt werden.
 
 from app.gui.game_board.main_board import GameBoardWidget
 from app.gui.game_board.zones import GameZone, BattlefieldZone
+from app.gui.game_board.battlefield_scene import SceneBattlefieldZone, CardItem
+from app.gui.game_board.card_list_zone import CardListZone, ZoneCard
 from app.gui.game_board.card_widget import CardWidget, DraggableCardWidget
-from app.gui.game_board.card_display import create_card_widget, show_card_details
+from app.gui.game_board.card_display import CardWidgetPool, create_card_widget, show_card_details
+from app.gui.game_board.refresh_scheduler import RefreshScheduler
 from app.gui.game_board.game_dialogs import NewGameDialog, LoadGameDialog
 
 __all__ = [
     'GameBoardWidget',
     'GameZone',
     'BattlefieldZone',
+    'SceneBattlefieldZone',
+    'CardItem',
+    'CardListZone',
+    'ZoneCard',
     'CardWidget',
     'DraggableCardWidget',
+    'CardWidgetPool',
+    'RefreshScheduler',
     'create_card_widget', 
     'show_card_details',
     'NewGameDialog',
@@ -0,0 +1,561 @@
+"""
+Spielfeld-Darstellung mit QGraphicsScene für die Magic the Gathering Desktop App.
+
+Dieses Modul enthält eine Alternative zur widgetbasierten BattlefieldZone für
+große Spielfelder (z.B. Token-Armeen). Jede Karte ist ein leichtgewichtiges
+QGraphicsItem statt eines Widgets mit Labels und Stylesheet; ihr Aussehen wird
+einmal als Pixmap gezeichnet und über QPixmapCache zwischen gleich aussehenden
+Karten geteilt. Die Szene indiziert die Karten in einem BSP-Baum, sodass beim
+Scrollen nur die sichtbaren Karten gezeichnet werden. Das Tappen wird als
+Drehung animiert.
+
+Die Zone bietet dieselbe Schnittstelle wie BattlefieldZone, sodass das
+Spielbrett beide Darstellungen gleich behandeln kann.
+"""
+
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QLabel, QGraphicsView, QGraphicsScene, QGraphicsObject, QGraphicsSimpleTextItem
+)
+from PySide6.QtCore import Qt, QRectF, QPoint, QPropertyAnimation, QEasingCurve, Signal
+from PySide6.QtGui import QPainter, QPixmap, QPixmapCache, QColor, QPen
+
+from app.gui.game_board.card_display import connect_card_signals
+from app.gui.game_board.card_widget import DISPLAY_KEYS, get_card_fonts, get_card_palette
+
+# Größe einer Karte in der Szene (Standard-MTG-Karte: 63 x 88 mm = 1:1.4)
+CARD_WIDTH = 100
+CARD_HEIGHT = 140
+
+# Abstand zwischen Karten und zwischen den Bereichen
+CARD_SPACING = 4
+SECTION_SPACING = 12
+
+# Höhe der Überschriften der Bereiche
+SECTION_TITLE_HEIGHT = 18
+
+# Dauer der Tapp-Animation in Millisekunden
+TAP_ANIMATION_MS = 150
+
+# Bereiche des Spielfelds: (Titel, Kartentyp); der letzte Bereich nimmt alle übrigen Karten auf
+SCENE_SECTIONS = (
+    ("Länder", 'Land'),
+    ("Kreaturen", 'Creature'),
+    ("Andere Permanents", None)
+)
+
+# Farben der Markierung angreifender und blockender Karten
+ATTACKING_COLOR = '#cc0000'
+BLOCKING_COLOR = '#0033cc'
+
+
+def render_card_pixmap(card_data, face_down, attacking, blocking):
+    """
+    Zeichnet das Aussehen einer Karte als Pixmap.
+
+    Gleich aussehende Karten (z.B. Token derselben Art) teilen sich eine
+    Pixmap aus dem QPixmapCache.
+
+    Args:
+        card_data (dict): Die Daten der Karte.
+        face_down (bool): Ob die Karte verdeckt angezeigt wird.
+        attacking (bool): Ob die Karte angreift.
+        blocking (bool): Ob die Karte blockt.
+
+    Returns:
+        QPixmap: Das Bild der Karte.
+    """
+    values = () if face_down else tuple(str(card_data.get(key)) for key in DISPLAY_KEYS)
+    cache_key = f"scene_card|{face_down}|{attacking}|{blocking}|" + "|".join(values)
+
+    pixmap = QPixmapCache.find(cache_key)
+    if pixmap is not None and not pixmap.isNull():
+        return pixmap
+
+    pixmap = QPixmap(CARD_WIDTH, CARD_HEIGHT)
+    palette = get_card_palette(card_data, face_down)
+    fonts = get_card_fonts()
+    pixmap.fill(palette.background)
+
+    painter = QPainter(pixmap)
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.setRenderHint(QPainter.TextAntialiasing)
+
+    # Rahmen nach Kartentyp bzw. Kampfstatus
+    if attacking:
+        painter.setPen(QPen(QColor(ATTACKING_COLOR), 4))
+    elif blocking:
+        painter.setPen(QPen(QColor(BLOCKING_COLOR), 4))
+    else:
+        painter.setPen(palette.border_pen or QPen(QColor('#666666'), 2))
+    painter.drawRect(1, 1, CARD_WIDTH - 2, CARD_HEIGHT - 2)
+
+    if face_down:
+        painter.setPen(QColor('white'))
+        painter.drawText(QRectF(0, 0, CARD_WIDTH, CARD_HEIGHT), Qt.AlignCenter, "Karte")
+        painter.end()
+        QPixmapCache.insert(cache_key, pixmap)
+        return pixmap
+
+    painter.setPen(QColor('black'))
+
+    # Name
+    painter.setFont(fonts.name)
+    painter.drawText(
+        QRectF(4, 4, CARD_WIDTH - 8, 48), Qt.AlignHCenter | Qt.AlignTop | Qt.TextWordWrap,
+        card_data.get('name', 'Unbekannte Karte')
+    )
+
+    # Typ
+    painter.setFont(fonts.type)
+    painter.drawText(
+        QRectF(4, 56, CARD_WIDTH - 8, 40), Qt.AlignHCenter | Qt.AlignTop | Qt.TextWordWrap,
+        card_data.get('type', '')
+    )
+
+    # Stärke und Widerstandskraft unten rechts
+    if 'Creature' in card_data.get('type', ''):
+        painter.setFont(fonts.power)
+        painter.drawText(
+            QRectF(4, CARD_HEIGHT - 22, CARD_WIDTH - 8, 18), Qt.AlignRight | Qt.AlignVCenter,
+            f"{card_data.get('power', 0)}/{card_data.get('toughness', 0)}"
+        )
+
+    painter.end()
+    QPixmapCache.insert(cache_key, pixmap)
+    return pixmap
+
+
+def create_card_item(card, zone, owner_id, parent_widget, show_face=True):
+    """
+    Erstellt ein Szenenelement für eine Karte (Gegenstück zu create_card_widget).
+
+    Args:
+        card (dict): Die Karteninformationen.
+        zone (str): Die Zone, in der sich die Karte befindet.
+        owner_id (str): Die ID des Besitzers.
+        parent_widget: Das Eltern-Widget, das Zugriff auf die Spiellogik hat.
+        show_face (bool, optional): Ob die Vorderseite der Karte angezeigt werden soll.
+
+    Returns:
+        CardItem: Das erstellte Element.
+    """
+    card_data = card.copy()
+    card_data['owner_id'] = owner_id
+    card_data['zone'] = zone
+
+    item = CardItem(card_data, zone)
+    if not show_face:
+        item.set_face_down(True)
+
+    item.source_card = card
+    connect_card_signals(item, parent_widget)
+    return item
+
+
+class CardItem(QGraphicsObject):
+    """
+    Karte auf dem Spielfeld als Element einer QGraphicsScene.
+
+    Bietet dieselben Signale und Zugriffsmethoden wie CardWidget, sodass die
+    Kartenaktionen aus card_display unverändert verwendet werden können.
+    """
+
+    # Signale (wie bei CardWidget)
+    clicked = Signal(object)
+    double_clicked = Signal(object)
+    right_clicked = Signal(object, QPoint)
+
+    def __init__(self, card_data, zone=None):
+        """
+        Initialisiert die Karte.
+
+        Args:
+            card_data (dict): Die Daten der Karte.
+            zone (str, optional): Die Zone, in der sich die Karte befindet.
+        """
+        super().__init__()
+
+        self._card_data = card_data
+        self._tapped = card_data.get('tapped', False)
+        self._attacking = card_data.get('attacking', False)
+        self._blocking = card_data.get('blocking', False)
+        self._face_down = False
+        self._pixmap = None
+        self.zone = zone
+        self.source_card = None
+
+        # Gedreht wird um die Kartenmitte
+        self.setTransformOriginPoint(CARD_WIDTH / 2, CARD_HEIGHT / 2)
+        self.setRotation(90 if self._tapped else 0)
+
+        self._tap_animation = QPropertyAnimation(self, b"rotation", self)
+        self._tap_animation.setDuration(TAP_ANIMATION_MS)
+        self._tap_animation.setEasingCurve(QEasingCurve.OutCubic)
+
+        self.setAcceptedMouseButtons(Qt.LeftButton | Qt.RightButton)
+        self.setCursor(Qt.PointingHandCursor)
+
+    def boundingRect(self):
+        """
+        Gibt die Umrisse der Karte zurück.
+
+        Returns:
+            QRectF: Die Umrisse in Elementkoordinaten.
+        """
+        return QRectF(0, 0, CARD_WIDTH, CARD_HEIGHT)
+
+    def paint(self, painter, option, widget=None):
+        """
+        Zeichnet die Karte aus ihrer zwischengespeicherten Pixmap.
+
+        Args:
+            painter (QPainter): Der Painter.
+            option (QStyleOptionGraphicsItem): Die Zeichenoptionen.
+            widget (QWidget, optional): Das Widget, auf das gezeichnet wird.
+        """
+        if self._pixmap is None:
+            self._pixmap = render_card_pixmap(self._card_data, self._face_down, self._attacking, self._blocking)
+        painter.drawPixmap(0, 0, self._pixmap)
+
+    def footprint_width(self):
+        """
+        Gibt die Breite zurück, die die Karte in ihrer Reihe einnimmt.
+
+        Returns:
+            int: Die Breite (getappte Karten liegen quer).
+        """
+        return CARD_HEIGHT if self._tapped else CARD_WIDTH
+
+    def update_display(self):
+        """Verwirft die zwischengespeicherte Pixmap und zeichnet die Karte neu."""
+        self._pixmap = None
+        self.update()
+
+    def _animate_rotation(self):
+        """Dreht die Karte animiert in die Lage, die ihrem Tapp-Status entspricht."""
+        target = 90 if self._tapped else 0
+        self._tap_animation.stop()
+        if self.scene() is None or not self.isVisible():
+            self.setRotation(target)
+            return
+
+        self._tap_animation.setStartValue(self.rotation())
+        self._tap_animation.setEndValue(target)
+        self._tap_animation.start()
+
+    def mousePressEvent(self, event):
+        """
+        Behandelt Mausklick-Events.
+
+        Args:
+            event (QGraphicsSceneMouseEvent): Das Mausklick-Event.
+        """
+        if event.button() == Qt.LeftButton:
+            self.clicked.emit(self)
+        elif event.button() == Qt.RightButton:
+            self.right_clicked.emit(self, event.screenPos())
+
+    def mouseDoubleClickEvent(self, event):
+        """
+        Behandelt Doppelklick-Events.
+
+        Args:
+            event (QGraphicsSceneMouseEvent): Das Doppelklick-Event.
+        """
+        if event.button() == Qt.LeftButton:
+            self.double_clicked.emit(self)
+
+    def get_card_data(self):
+        """
+        Gibt die Kartendaten zurück.
+
+        Returns:
+            dict: Die Kartendaten.
+        """
+        return self._card_data
+
+    def set_card_data(self, card_data, face_down=False):
+        """
+        Übernimmt neue Daten derselben Karte (siehe CardWidget.set_card_data).
+
+        Args:
+            card_data (dict): Die neuen Daten der Karte.
+            face_down (bool, optional): Ob die Karte verdeckt angezeigt wird.
+        """
+        old_data = self._card_data
+        self._card_data = card_data
+
+        tapped = card_data.get('tapped', False)
+        if tapped != self._tapped:
+            self._tapped = tapped
+            self._animate_rotation()
+
+        state = (card_data.get('attacking', False), card_data.get('blocking', False), face_down)
+        if (
+            state != (self._attacking, self._blocking, self._face_down)
+            or any(card_data.get(key) != old_data.get(key) for key in DISPLAY_KEYS)
+        ):
+            self._attacking, self._blocking, self._face_down = state
+            self.update_display()
+
+    def is_tapped(self):
+        """
+        Prüft, ob die Karte getappt ist.
+
+        Returns:
+            bool: True, wenn die Karte getappt ist, sonst False.
+        """
+        return self._tapped
+
+    def set_tapped(self, tapped):
+        """
+        Setzt den Tapp-Status der Karte.
+
+        Args:
+            tapped (bool): Der neue Tapp-Status.
+        """
+        if self._tapped != tapped:
+            self._tapped = tapped
+            self._card_data['tapped'] = tapped
+            self._animate_rotation()
+
+    def is_attacking(self):
+        """
+        Prüft, ob die Karte angreift.
+
+        Returns:
+            bool: True, wenn die Karte angreift, sonst False.
+        """
+        return self._attacking
+
+    def set_attacking(self, attacking):
+        """
+        Setzt den Angriffs-Status der Karte.
+
+        Args:
+            attacking (bool): Der neue Angriffs-Status.
+        """
+        if self._attacking != attacking:
+            self._attacking = attacking
+            self._card_data['attacking'] = attacking
+            self.update_display()
+
+    def is_blocking(self):
+        """
+        Prüft, ob die Karte blockt.
+
+        Returns:
+            bool: True, wenn die Karte blockt, sonst False.
+        """
+        return self._blocking
+
+    def set_blocking(self, blocking):
+        """
+        Setzt den Block-Status der Karte.
+
+        Args:
+            blocking (bool): Der neue Block-Status.
+        """
+        if self._blocking != blocking:
+            self._blocking = blocking
+            self._card_data['blocking'] = blocking
+            self.update_display()
+
+    def is_face_down(self):
+        """
+        Prüft, ob die Karte verdeckt ist.
+
+        Returns:
+            bool: True, wenn die Karte verdeckt ist, sonst False.
+        """
+        return self._face_down
+
+    def set_face_down(self, face_down):
+        """
+        Setzt den Verdeckt-Status der Karte.
+
+        Args:
+            face_down (bool): Der neue Verdeckt-Status.
+        """
+        if self._face_down != face_down:
+            self._face_down = face_down
+            self.update_display()
+
+
+class SceneBattlefieldZone(QWidget):
+    """
+    Spielfeldzone, deren Karten in einer QGraphicsScene dargestellt werden.
+
+    Die Karten werden wie bei BattlefieldZone nach Ländern, Kreaturen und
+    anderen Permanents getrennt und in Reihen angeordnet, die bei Bedarf an
+    der Breite der Ansicht umbrechen.
+    """
+
+    def __init__(self, name, player_id=None, parent=None):
+        """
+        Initialisiert ein neues Spielfeld.
+
+        Args:
+            name (str): Der Name des Spielfelds.
+            player_id (str, optional): Die ID des Spielers, dem das Spielfeld gehört.
+            parent (QWidget, optional): Das übergeordnete Widget.
+        """
+        super().__init__(parent)
+        self.name = name
+        self.player_id = player_id
+        self.cards = []
+        self.cards_by_id = {}
+
+        # Layout
+        self.layout = QVBoxLayout(self)
+
+        # Titel
+        self.title = QLabel(name)
+        self.title.setAlignment(Qt.AlignCenter)
+        self.layout.addWidget(self.title)
+
+        # Szene mit BSP-Index: Zeichnen und Trefferprüfung betreffen nur sichtbare Karten
+        self.scene = QGraphicsScene(self)
+        self.scene.setItemIndexMethod(QGraphicsScene.BspTreeIndex)
+
+        self.view = QGraphicsView(self.scene)
+        self.view.setAlignment(Qt.AlignLeft | Qt.AlignTop)
+        self.view.setRenderHint(QPainter.SmoothPixmapTransform)
+        self.view.setViewportUpdateMode(QGraphicsView.MinimalViewportUpdate)
+        self.view.setOptimizationFlag(QGraphicsView.DontSavePainterState)
+        self.view.setCacheMode(QGraphicsView.CacheBackground)
+        self.layout.addWidget(self.view)
+
+        # Überschriften der Bereiche
+        self.section_titles = []
+        for title, _ in SCENE_SECTIONS:
+            title_item = QGraphicsSimpleTextItem(title)
+            font = title_item.font()
+            font.setBold(True)
+            title_item.setFont(font)
+            self.scene.addItem(title_item)
+            self.section_titles.append(title_item)
+
+        self._layout_width = 0
+        self._arrange()
+
+    def _section_index(self, card_item):
+        """
+        Gibt den Bereich zurück, zu dem eine Karte gehört.
+
+        Args:
+            card_item (CardItem): Die Karte.
+
+        Returns:
+            int: Der Index des Bereichs in SCENE_SECTIONS.
+        """
+        card_type = card_item.get_card_data().get('type', '')
+        for index, (_, type_name) in enumerate(SCENE_SECTIONS):
+            if type_name is None or type_name in card_type:
+                return index
+        return len(SCENE_SECTIONS) - 1
+
+    def _arrange(self):
+        """Ordnet die Karten in den Reihen ihrer Bereiche an."""
+        sections = [[] for _ in SCENE_SECTIONS]
+        for card_item in self.cards:
+            sections[self._section_index(card_item)].append(card_item)
+
+        row_width = max(self.view.viewport().width(), CARD_HEIGHT + CARD_SPACING)
+        self._layout_width = row_width
+        y = 0
+        scene_width = 0
+
+        for title_item, section_cards in zip(self.section_titles, sections):
+            title_item.setPos(0, y)
+            y += SECTION_TITLE_HEIGHT
+
+            x = 0
+            for card_item in section_cards:
+                width = card_item.footprint_width()
+                if x and x + width > row_width:
+                    # Umbruch in die nächste Reihe
+                    x = 0
+                    y += CARD_HEIGHT + CARD_SPACING
+
+                # Die Karte wird um ihre Mitte gedreht: Mitte des Platzes anpeilen
+                card_item.setPos(x + (width - CARD_WIDTH) / 2, y)
+                x += width + CARD_SPACING
+                scene_width = max(scene_width, x)
+
+            y += (CARD_HEIGHT if section_cards else 0) + SECTION_SPACING
+
+        self.scene.setSceneRect(0, 0, max(scene_width, row_width - CARD_SPACING), y)
+
+    def resizeEvent(self, event):
+        """
+        Ordnet die Karten neu an, wenn sich die Breite der Ansicht ändert.
+
+        Args:
+            event (QResizeEvent): Das Resize-Event.
+        """
+        super().resizeEvent(event)
+        if self.view.viewport().width() != self._layout_width:
+            self._arrange()
+
+    def take_missing(self, card_ids):
+        """
+        Nimmt alle Karten aus der Zone, die nicht mehr in ihr liegen.
+
+        Args:
+            card_ids (set): Die Schlüssel der Karten, die in der Zone bleiben.
+
+        Returns:
+            dict: Schlüssel -> entnommene Karte.
+        """
+        taken = {}
+        for key, card_item in list(self.cards_by_id.items()):
+            if key not in card_ids:
+                self.cards.remove(card_item)
+                del self.cards_by_id[key]
+                card_item.hide()
+                taken[key] = card_item
+        return taken
+
+    def place_cards(self, entries):
+        """
+        Zeigt die Karten in der angegebenen Reihenfolge an.
+
+        Args:
+            entries (list): (Schlüssel, Karte) in der Reihenfolge des Spielzustands.
+        """
+        for _, card_item in entries:
+            if card_item.scene() is not self.scene:
+                if card_item.scene() is not None:
+                    card_item.scene().removeItem(card_item)
+                self.scene.addItem(card_item)
+            card_item.show()
+
+        self.cards = [card_item for _, card_item in entries]
+        self.cards_by_id = dict(entries)
+        self._arrange()
+
+    def add_card(self, card_item):
+        """
+        Fügt eine Karte zum Spielfeld hinzu.
+
+        Args:
+            card_item (CardItem): Die hinzuzufügende Karte.
+        """
+        self.place_cards(list(self.cards_by_id.items()) + [(card_item.get_card_data().get('id'), card_item)])
+
+    def remove_card(self, card_item):
+        """
+        Entfernt eine Karte aus dem Spielfeld.
+
+        Args:
+            card_item (CardItem): Die zu entfernende Karte.
+        """
+        if card_item in self.cards:
+            self.take_missing({key for key, item in self.cards_by_id.items() if item is not card_item})
+            self._arrange()
+
+    def clear(self):
+        """Entfernt alle Karten aus dem Spielfeld."""
+        self.take_missing(set())
+        self._arrange()
@@ -10,6 +10,9 @@ from PySide6.QtGui import QColor, QPalette, QCursor
 
 from app.gui.game_board.card_widget import CardWidget, DraggableCardWidget
 
+# Maximale Anzahl freier Karten-Widgets, die zur Wiederverwendung bereitgehalten werden
+CARD_WIDGET_POOL_SIZE = 200
+
 
 def create_card_widget(card, zone, owner_id, parent_widget, show_face=True):
     """
@@ -39,14 +42,195 @@ def create_card_widget(card, zone, owner_id, parent_widget, show_face=True):
     if not show_face:
         widget.set_face_down(True)
     
-    # Verbinde Signale
-    widget.clicked.connect(lambda: on_card_clicked(widget, parent_widget))
-    widget.double_clicked.connect(lambda: on_card_double_clicked(widget, parent_widget))
-    widget.right_clicked.connect(lambda pos: show_card_context_menu(pos, widget, parent_widget))
+    # Quelle der Daten (unveränderte Karten werden beim Abgleich übersprungen)
+    widget.source_card = card
     
+    connect_card_signals(widget, parent_widget)
     return widget
 
 
+def connect_card_signals(widget, parent_widget):
+    """
+    Verbindet die Signale einer Kartendarstellung mit den Kartenaktionen.
+    
+    Die Verbindungen werden nur einmal beim Erstellen hergestellt. Die Signale
+    übergeben die Darstellung selbst, sodass sie auch nach dem
+    Wiederverwenden für eine andere Karte gültig bleiben.
+    
+    Args:
+        widget: Das Karten-Widget oder Szenenelement.
+        parent_widget: Das Eltern-Widget, das Zugriff auf die Spiellogik hat.
+    """
+    widget.clicked.connect(lambda card_widget: on_card_clicked(card_widget, parent_widget))
+    widget.double_clicked.connect(lambda card_widget: on_card_double_clicked(card_widget, parent_widget))
+    widget.right_clicked.connect(
+        lambda card_widget, pos: show_card_context_menu(pos, card_widget, parent_widget)
+    )
+
+
+def update_card_widget(widget, card, zone, owner_id, show_face=True):
+    """
+    Aktualisiert ein vorhandenes Karten-Widget mit den neuen Daten seiner Karte.
+    
+    Wird beim Abgleich der Zonen anstelle von create_card_widget verwendet,
+    wenn für die Karte bereits ein Widget existiert (auch aus einer anderen Zone).
+    
+    Args:
+        widget (DraggableCardWidget): Das vorhandene Widget der Karte.
+        card (dict): Die Karteninformationen.
+        zone (str): Die Zone, in der sich die Karte befindet.
+        owner_id (str): Die ID des Besitzers.
+        show_face (bool, optional): Ob die Vorderseite der Karte angezeigt werden soll.
+    
+    Returns:
+        DraggableCardWidget: Das aktualisierte Widget.
+    """
+    # Die Sichten liefern für unveränderte Zonen dieselben Kartenobjekte
+    if widget.source_card is card and widget.zone == zone:
+        return widget
+    
+    card_data = card.copy()
+    card_data['owner_id'] = owner_id
+    card_data['zone'] = zone
+    
+    widget.zone = zone
+    widget.source_card = card
+    widget.set_card_data(card_data, not show_face)
+    
+    return widget
+
+
+class CardWidgetPool:
+    """
+    Vorrat wiederverwendbarer Karten-Widgets für das Spielbrett.
+
+    Widgets von Karten, die nicht mehr angezeigt werden, werden nicht
+    gelöscht, sondern ausgeblendet zurückgelegt und später an die Daten einer
+    anderen Karte gebunden. Layout, Labels und Signalverbindungen werden so nur
+    beim ersten Erstellen eines Widgets aufgebaut.
+    
+    Über factory lässt sich der Vorrat auch für andere Kartendarstellungen
+    (z.B. die Szenenelemente des Spielfelds) verwenden.
+    """
+
+    def __init__(self, parent_widget, max_size=CARD_WIDGET_POOL_SIZE, factory=None):
+        """
+        Initialisiert einen leeren Vorrat.
+
+        Args:
+            parent_widget: Das Eltern-Widget, das Zugriff auf die Spiellogik hat.
+            max_size (int, optional): Maximale Anzahl freier Widgets.
+            factory (callable, optional): Erstellt neue Darstellungen
+                (Signatur wie create_card_widget, Standard: create_card_widget).
+        """
+        self.parent_widget = parent_widget
+        self.max_size = max_size
+        self.factory = factory or create_card_widget
+        self.free = []
+
+        # Statistik: neu erstellte und wiederverwendete Widgets
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, card, zone, owner_id, show_face=True):
+        """
+        Gibt ein Widget für eine Karte zurück (wiederverwendet oder neu erstellt).
+
+        Args:
+            card (dict): Die Karteninformationen.
+            zone (str): Die Zone, in der sich die Karte befindet.
+            owner_id (str): Die ID des Besitzers.
+            show_face (bool, optional): Ob die Vorderseite der Karte angezeigt werden soll.
+
+        Returns:
+            DraggableCardWidget: Das an die Karte gebundene Widget.
+        """
+        if self.free:
+            self.reused += 1
+            return update_card_widget(self.free.pop(), card, zone, owner_id, show_face)
+
+        self.created += 1
+        return self.factory(card, zone, owner_id, self.parent_widget, show_face)
+
+    def release(self, widget):
+        """
+        Legt das Widget einer nicht mehr angezeigten Karte zurück.
+
+        Ist der Vorrat voll, wird das Widget gelöscht.
+
+        Args:
+            widget (DraggableCardWidget): Das Widget.
+        """
+        widget.hide()
+        widget.source_card = None
+
+        if len(self.free) < self.max_size:
+            self.free.append(widget)
+        else:
+            widget.deleteLater()
+
+
+def resolve_card_id(card, parent_widget):
+    """
+    Ermittelt die Instanz-ID einer angezeigten Karte.
+    
+    Verdeckte Karten tragen in der Sicht nur eine undurchsichtige ID, die
+    das Spielbrett für Aktionen im Spielmotor auflöst.
+    
+    Args:
+        card (dict): Die angezeigten Kartendaten.
+        parent_widget: Das Eltern-Widget, das Zugriff auf die Spiellogik hat.
+    
+    Returns:
+        str: Die Instanz-ID der Karte.
+    """
+    return parent_widget.game_engine.state_views.resolve_alias(card.get('id'))
+
+
+def get_battlefield_card(card, parent_widget):
+    """
+    Gibt eine angezeigte Karte des Spielfelds aus dem Spielzustand zurück.
+    
+    Args:
+        card (dict): Die angezeigten Kartendaten.
+        parent_widget: Das Eltern-Widget, das Zugriff auf die Spiellogik hat.
+    
+    Returns:
+        dict: Die Karte im Spielzustand oder None, wenn sie nicht auf dem Spielfeld liegt.
+    """
+    state_card, zone, _ = parent_widget.game_engine.get_card_by_id(resolve_card_id(card, parent_widget))
+    return state_card if zone == 'battlefield' else None
+
+
+def set_card_state(card, parent_widget, error_message, **fields):
+    """
+    Setzt Statusfelder einer Karte über den Spielmotor und plant die Aktualisierung.
+    
+    Das Karten-Widget wird nicht direkt verändert; es übernimmt den neuen
+    Zustand beim nächsten Abgleich des Spielfelds.
+    
+    Args:
+        card (dict): Die angezeigten Kartendaten.
+        parent_widget: Das Eltern-Widget, das Zugriff auf die Spiellogik hat.
+        error_message (str): Einleitung der Fehlermeldung, falls die Änderung scheitert.
+        **fields: Die neuen Werte der Statusfelder (z.B. tapped=True).
+    
+    Returns:
+        bool: True, wenn der Zustand geändert wurde, sonst False.
+    """
+    game_state, error = parent_widget.game_engine.set_card_state(resolve_card_id(card, parent_widget), **fields)
+    
+    if error:
+        QMessageBox.warning(parent_widget, "Fehler", f"{error_message}: {error}")
+        return False
+    
+    # Spielzustand übernehmen, speichern und das Spielfeld aktualisieren
+    parent_widget.game_state = game_state
+    parent_widget.commit_game_state()
+    parent_widget.update_ui('battlefield')
+    return True
+
+
 def on_card_clicked(card_widget, parent_widget):
     """
     Wird aufgerufen, wenn eine Karte angeklickt wird.
@@ -172,7 +356,8 @@ def show_card_details(card):
         html_content += f"<p><b>Stärke/Widerstandskraft:</b> {card.get('power', '-')}/{card.get('toughness', '-')}</p>"
     
     # Regeltext
-    html_content += f"<p><b>Regeltext:</b></p><p>{card.get('rules_text', 'Kein Regeltext').replace('\\n', '<br>')}</p>"
+    rules_text = (card.get('rules_text') or 'Kein Regeltext').replace('\n', '<br>')
+    html_content += f"<p><b>Regeltext:</b></p><p>{rules_text}</p>"
     
     # Farben
     colors = card.get('colors', [])
@@ -223,7 +408,7 @@ def play_card(card, parent_widget):
     if result == QMessageBox.Yes:
         # Rufe die GameEngine auf, um die Karte zu spielen
         game_state, error = parent_widget.game_engine.move_card(
-            card['id'], 'hand', 'battlefield', player_id
+            resolve_card_id(card, parent_widget), 'hand', 'battlefield', player_id
         )
         
         if error:
@@ -236,10 +421,10 @@ def play_card(card, parent_widget):
         
         # Aktualisiere den Spielzustand
         parent_widget.game_state = game_state
-        parent_widget.game_engine.save_game_state()
+        parent_widget.commit_game_state()
         
         # UI aktualisieren
-        parent_widget.update_ui()
+        parent_widget.update_ui('hand', 'battlefield')
         
         # Statusmeldung
         parent_widget.status_bar.showMessage(f"Karte '{card.get('name', 'Unbekannt')}' wurde gespielt.")
@@ -268,7 +453,7 @@ def discard_card(card, parent_widget):
     if result == QMessageBox.Yes:
         # Rufe die GameEngine auf, um die Karte abzuwerfen
         game_state, error = parent_widget.game_engine.move_card(
-            card['id'], 'hand', 'graveyard', player_id
+            resolve_card_id(card, parent_widget), 'hand', 'graveyard', player_id
         )
         
         if error:
@@ -281,10 +466,10 @@ def discard_card(card, parent_widget):
         
         # Aktualisiere den Spielzustand
         parent_widget.game_state = game_state
-        parent_widget.game_engine.save_game_state()
+        parent_widget.commit_game_state()
         
         # UI aktualisieren
-        parent_widget.update_ui()
+        parent_widget.update_ui('hand', 'graveyard')
         
         # Statusmeldung
         parent_widget.status_bar.showMessage(f"Karte '{card.get('name', 'Unbekannt')}' wurde abgeworfen.")
@@ -298,7 +483,6 @@ def tap_card(card_widget, parent_widget):
         card_widget (CardWidget): Das Widget der zu tappenden Karte.
         parent_widget: Das Eltern-Widget, das Zugriff auf die Spiellogik hat.
     """
-    # Karte tappen
     card_data = card_widget.get_card_data()
     
     # Bestätigungsdialog
@@ -311,20 +495,9 @@ def tap_card(card_widget, parent_widget):
     )
     
     if result == QMessageBox.Yes:
-        # Karte tappen
-        card_widget.set_tapped(True)
-        
-        # Aktualisiere Karte im Spielzustand
-        for card in parent_widget.game_state.get('battlefield', []):
-            if card.get('id') == card_data.get('id'):
-                card['tapped'] = True
-                break
-        
-        # Spielzustand speichern
-        parent_widget.game_engine.save_game_state()
-        
-        # UI aktualisieren
-        parent_widget.update_ui()
+        # Karte im Spielzustand tappen (das Widget folgt beim nächsten Abgleich)
+        if not set_card_state(card_data, parent_widget, "Die Karte konnte nicht getappt werden", tapped=True):
+            return
         
         # Statusmeldung
         parent_widget.status_bar.showMessage(f"Karte '{card_data.get('name', 'Unbekannt')}' wurde getappt.")
@@ -338,7 +511,6 @@ def untap_card(card_widget, parent_widget):
         card_widget (CardWidget): Das Widget der zu enttappenden Karte.
         parent_widget: Das Eltern-Widget, das Zugriff auf die Spiellogik hat.
     """
-    # Karte enttappen
     card_data = card_widget.get_card_data()
     
     # Bestätigungsdialog
@@ -351,20 +523,9 @@ def untap_card(card_widget, parent_widget):
     )
     
     if result == QMessageBox.Yes:
-        # Karte enttappen
-        card_widget.set_tapped(False)
-        
-        # Aktualisiere Karte im Spielzustand
-        for card in parent_widget.game_state.get('battlefield', []):
-            if card.get('id') == card_data.get('id'):
-                card['tapped'] = False
-                break
-        
-        # Spielzustand speichern
-        parent_widget.game_engine.save_game_state()
-        
-        # UI aktualisieren
-        parent_widget.update_ui()
+        # Karte im Spielzustand enttappen (das Widget folgt beim nächsten Abgleich)
+        if not set_card_state(card_data, parent_widget, "Die Karte konnte nicht enttappt werden", tapped=False):
+            return
         
         # Statusmeldung
         parent_widget.status_bar.showMessage(f"Karte '{card_data.get('name', 'Unbekannt')}' wurde enttappt.")
@@ -378,11 +539,11 @@ def attack_with_card(card_widget, parent_widget):
         card_widget (CardWidget): Das Widget der angreifenden Karte.
         parent_widget: Das Eltern-Widget, das Zugriff auf die Spiellogik hat.
     """
-    # Karte angreifen lassen
     card_data = card_widget.get_card_data()
+    state_card = get_battlefield_card(card_data, parent_widget)
     
     # Prüfe, ob die Karte angreifen kann (nicht getappt, ist eine Kreatur, etc.)
-    if card_widget.is_tapped():
+    if state_card is not None and state_card.get('tapped', False):
         QMessageBox.warning(
             parent_widget,
             "Fehler",
@@ -408,22 +569,11 @@ def attack_with_card(card_widget, parent_widget):
     )
     
     if result == QMessageBox.Yes:
-        # Karte als angreifend markieren
-        card_widget.set_attacking(True)
-        card_widget.set_tapped(True)  # Angreifende Kreaturen werden getappt
-        
-        # Aktualisiere Karte im Spielzustand
-        for card in parent_widget.game_state.get('battlefield', []):
-            if card.get('id') == card_data.get('id'):
-                card['attacking'] = True
-                card['tapped'] = True
-                break
-        
-        # Spielzustand speichern
-        parent_widget.game_engine.save_game_state()
-        
-        # UI aktualisieren
-        parent_widget.update_ui()
+        # Karte als angreifend markieren (angreifende Kreaturen werden getappt)
+        if not set_card_state(
+            card_data, parent_widget, "Die Karte konnte nicht angreifen", attacking=True, tapped=True
+        ):
+            return
         
         # Statusmeldung
         parent_widget.status_bar.showMessage(f"Karte '{card_data.get('name', 'Unbekannt')}' greift an.")
@@ -437,11 +587,11 @@ def block_with_card(card_widget, parent_widget):
         card_widget (CardWidget): Das Widget der blockenden Karte.
         parent_widget: Das Eltern-Widget, das Zugriff auf die Spiellogik hat.
     """
-    # Karte blocken lassen
     card_data = card_widget.get_card_data()
+    state_card = get_battlefield_card(card_data, parent_widget)
     
     # Prüfe, ob die Karte blocken kann (nicht getappt, ist eine Kreatur, etc.)
-    if card_widget.is_tapped():
+    if state_card is not None and state_card.get('tapped', False):
         QMessageBox.warning(
             parent_widget,
             "Fehler",
@@ -485,21 +635,12 @@ def block_with_card(card_widget, parent_widget):
     )
     
     if result == QMessageBox.Yes:
-        # Karte als blockend markieren
-        card_widget.set_blocking(True)
-        
-        # Aktualisiere Karte im Spielzustand
-        for card in parent_widget.game_state.get('battlefield', []):
-            if card.get('id') == card_data.get('id'):
-                card['blocking'] = True
-                card['blocking_id'] = attacking_card.get('id')  # Speichern, welche Kreatur geblockt wird
-                break
-        
-        # Spielzustand speichern
-        parent_widget.game_engine.save_game_state()
-        
-        # UI aktualisieren
-        parent_widget.update_ui()
+        # Karte als blockend markieren und speichern, welche Kreatur geblockt wird
+        if not set_card_state(
+            card_data, parent_widget, "Die Karte konnte nicht blocken",
+            blocking=True, blocking_id=attacking_card.get('id')
+        ):
+            return
         
         # Statusmeldung
         parent_widget.status_bar.showMessage(
@@ -0,0 +1,441 @@
+"""
+Virtualisierte Kartenzonen für die Magic the Gathering Desktop App.
+
+Dieses Modul enthält Zonen für Hand, Friedhof und Exil, die auch mit
+Hunderten von Karten (z.B. Mill-Decks oder exilierten Bibliotheken) flüssig
+bleiben. Statt eines Widgets pro Karte liegen die Karten in einem Listenmodell;
+gezeichnet werden nur die sichtbaren Karten, jeweils aus der zwischengespeicherten
+Pixmap ihres Aussehens (siehe battlefield_scene.render_card_pixmap).
+
+Die Zone zeigt die Karten entweder als Liste (QListView) oder aufgefächert:
+Die Karten überlappen sich wie in der Hand gehalten, sodass viele Karten auf
+wenig Platz passen.
+
+Die Zonen bieten dieselben Signale wie die Karten-Widgets; statt eines Widgets
+übergeben sie ein ZoneCard-Objekt mit derselben Schnittstelle (get_card_data,
+is_tapped), sodass die Kartenaktionen aus card_display unverändert funktionieren.
+"""
+
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QLabel, QListView, QAbstractScrollArea, QAbstractItemView, QStyledItemDelegate
+)
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, QPoint, QSize, Signal
+from PySide6.QtGui import QPainter
+
+from app.gui.game_board.battlefield_scene import CARD_WIDTH, CARD_HEIGHT, CARD_SPACING, render_card_pixmap
+
+# Minimal sichtbarer Streifen einer überdeckten Karte in der aufgefächerten Darstellung
+FAN_MIN_OFFSET = 24
+
+# Scrollschritt der aufgefächerten Darstellung (Pixel pro Mausrad-Raste)
+FAN_SCROLL_STEP = 60
+
+
+class ZoneCard:
+    """
+    Eine Karte in einer virtualisierten Zone.
+
+    Bietet die Schnittstelle der Karten-Widgets, die die Kartenaktionen benötigen.
+
+    Attribute:
+        key: Der Schlüssel der Karte in der Zone.
+        source_card (dict): Die Kartendaten aus der Sicht (unveränderte Karten werden übersprungen).
+        card_data (dict): Die Kartendaten samt Besitzer und Zone.
+        face_down (bool): Ob die Karte verdeckt angezeigt wird.
+    """
+
+    __slots__ = ('key', 'source_card', 'card_data', 'face_down')
+
+    def __init__(self, key, card, zone, owner_id, show_face=True):
+        """
+        Initialisiert die Karte.
+
+        Args:
+            key: Der Schlüssel der Karte in der Zone.
+            card (dict): Die Karteninformationen.
+            zone (str): Die Zone, in der sich die Karte befindet.
+            owner_id (str): Die ID des Besitzers.
+            show_face (bool, optional): Ob die Vorderseite der Karte angezeigt werden soll.
+        """
+        self.key = key
+        self.source_card = card
+        self.card_data = card.copy()
+        self.card_data['owner_id'] = owner_id
+        self.card_data['zone'] = zone
+        self.face_down = not show_face
+
+    def get_card_data(self):
+        """
+        Gibt die Kartendaten zurück.
+
+        Returns:
+            dict: Die Kartendaten.
+        """
+        return self.card_data
+
+    def is_tapped(self):
+        """
+        Prüft, ob die Karte getappt ist.
+
+        Returns:
+            bool: True, wenn die Karte getappt ist, sonst False.
+        """
+        return self.card_data.get('tapped', False)
+
+    def pixmap(self):
+        """
+        Gibt das zwischengespeicherte Aussehen der Karte zurück.
+
+        Returns:
+            QPixmap: Das Bild der Karte.
+        """
+        return render_card_pixmap(self.card_data, self.face_down, False, False)
+
+
+class ZoneCardModel(QAbstractListModel):
+    """
+    Listenmodell der Karten einer Zone.
+
+    Die Karten liegen als ZoneCard unter Qt.UserRole.
+    """
+
+    def __init__(self, parent=None):
+        """
+        Initialisiert ein leeres Modell.
+
+        Args:
+            parent (QObject, optional): Das Eltern-Objekt.
+        """
+        super().__init__(parent)
+        self.cards = []
+
+    def set_cards(self, zone_name, keyed_cards):
+        """
+        Übernimmt den neuen Inhalt der Zone.
+
+        Unveränderte Karten behalten ihr ZoneCard-Objekt. Bleibt die Reihenfolge
+        der Karten gleich, werden nur geänderte Zeilen gemeldet, sonst wird das
+        Modell zurückgesetzt.
+
+        Args:
+            zone_name (str): Der Name der Zone.
+            keyed_cards (list): (Schlüssel, Karte, Besitzer-ID, Vorderseite zeigen) in der Reihenfolge des Spielzustands.
+        """
+        current = {card.key: card for card in self.cards}
+        cards = []
+        changed_rows = []
+        for row, (key, card, owner_id, show_face) in enumerate(keyed_cards):
+            zone_card = current.get(key)
+            if (zone_card is None or zone_card.source_card is not card
+                    or zone_card.face_down == show_face or zone_card.card_data['zone'] != zone_name):
+                zone_card = ZoneCard(key, card, zone_name, owner_id, show_face)
+                changed_rows.append(row)
+            cards.append(zone_card)
+
+        if [card.key for card in cards] != [card.key for card in self.cards]:
+            self.beginResetModel()
+            self.cards = cards
+            self.endResetModel()
+            return
+
+        self.cards = cards
+        for row in changed_rows:
+            index = self.index(row)
+            self.dataChanged.emit(index, index)
+
+    def rowCount(self, parent=QModelIndex()):
+        """
+        Gibt die Anzahl der Karten zurück.
+
+        Args:
+            parent (QModelIndex, optional): Der Elternindex (Listen haben keine Kinder).
+
+        Returns:
+            int: Die Anzahl der Karten.
+        """
+        return 0 if parent.isValid() else len(self.cards)
+
+    def data(self, index, role=Qt.DisplayRole):
+        """
+        Gibt die Daten einer Zeile zurück.
+
+        Args:
+            index (QModelIndex): Der Index der Zeile.
+            role (int, optional): Die Rolle.
+
+        Returns:
+            Der Kartenname (DisplayRole), die ZoneCard (UserRole) oder None.
+        """
+        if not index.isValid() or index.row() >= len(self.cards):
+            return None
+
+        zone_card = self.cards[index.row()]
+        if role == Qt.UserRole:
+            return zone_card
+        if role == Qt.DisplayRole:
+            return "Karte" if zone_card.face_down else zone_card.card_data.get('name', '')
+        return None
+
+
+class CardPixmapDelegate(QStyledItemDelegate):
+    """Zeichnet eine Karte der Listendarstellung aus ihrer zwischengespeicherten Pixmap."""
+
+    def paint(self, painter, option, index):
+        """
+        Zeichnet die Karte.
+
+        Args:
+            painter (QPainter): Der Maler.
+            option (QStyleOptionViewItem): Die Darstellungsoptionen (Rechteck der Zeile).
+            index (QModelIndex): Der Index der Karte.
+        """
+        zone_card = index.data(Qt.UserRole)
+        if zone_card is not None:
+            painter.drawPixmap(option.rect.topLeft(), zone_card.pixmap())
+
+    def sizeHint(self, option, index):
+        """
+        Gibt die Größe einer Karte zurück.
+
+        Returns:
+            QSize: Die Größe.
+        """
+        return QSize(CARD_WIDTH, CARD_HEIGHT)
+
+
+class FannedCardView(QAbstractScrollArea):
+    """
+    Aufgefächerte Darstellung der Karten eines Modells.
+
+    Die Karten liegen nebeneinander und überlappen sich, sobald der Platz nicht
+    reicht (bis auf FAN_MIN_OFFSET); danach wird horizontal gescrollt. Gezeichnet
+    werden nur die Karten im sichtbaren Bereich.
+    """
+
+    # Index der Karte und Position im Viewport
+    card_clicked = Signal(int)
+    card_double_clicked = Signal(int)
+    card_right_clicked = Signal(int, QPoint)
+
+    def __init__(self, model, parent=None):
+        """
+        Initialisiert die Darstellung.
+
+        Args:
+            model (ZoneCardModel): Das Modell der Karten.
+            parent (QWidget, optional): Das Eltern-Widget.
+        """
+        super().__init__(parent)
+        self.model = model
+
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.horizontalScrollBar().setSingleStep(FAN_SCROLL_STEP)
+        self.setMinimumHeight(CARD_HEIGHT + self.horizontalScrollBar().sizeHint().height() + 2 * self.frameWidth())
+
+        model.modelReset.connect(self._update_layout)
+        model.dataChanged.connect(self._update_layout)
+
+    def _step(self):
+        """
+        Gibt den Abstand zwischen zwei Karten zurück.
+
+        Returns:
+            int: Der Abstand in Pixeln.
+        """
+        count = self.model.rowCount()
+        if count <= 1:
+            return CARD_WIDTH + CARD_SPACING
+
+        available = self.viewport().width() - CARD_WIDTH
+        return max(FAN_MIN_OFFSET, min(CARD_WIDTH + CARD_SPACING, available // (count - 1)))
+
+    def _update_layout(self, *args):
+        """Passt den Scrollbereich an die Anzahl der Karten an und zeichnet neu."""
+        count = self.model.rowCount()
+        content_width = (count - 1) * self._step() + CARD_WIDTH if count else 0
+
+        scroll_bar = self.horizontalScrollBar()
+        scroll_bar.setRange(0, max(0, content_width - self.viewport().width()))
+        scroll_bar.setPageStep(self.viewport().width())
+        self.viewport().update()
+
+    def card_at(self, pos):
+        """
+        Gibt die oberste Karte an einer Position zurück.
+
+        Args:
+            pos (QPoint): Die Position im Viewport.
+
+        Returns:
+            int: Der Index der Karte oder -1, wenn dort keine Karte liegt.
+        """
+        count = self.model.rowCount()
+        x = pos.x() + self.horizontalScrollBar().value()
+        if not count or x < 0 or not 0 <= pos.y() < CARD_HEIGHT:
+            return -1
+
+        # Spätere Karten liegen über früheren
+        step = self._step()
+        row = min(count - 1, x // step)
+        return row if x < row * step + CARD_WIDTH else -1
+
+    def paintEvent(self, event):
+        """
+        Zeichnet die sichtbaren Karten von links nach rechts.
+
+        Args:
+            event (QPaintEvent): Das Zeichenereignis.
+        """
+        count = self.model.rowCount()
+        if not count:
+            return
+
+        step = self._step()
+        offset = self.horizontalScrollBar().value()
+        rect = event.rect()
+        left = rect.left() + offset
+        right = rect.right() + offset
+
+        # Karte i belegt [i * step, i * step + CARD_WIDTH)
+        first = max(0, (left - CARD_WIDTH) // step + 1)
+        last = min(count - 1, right // step)
+
+        painter = QPainter(self.viewport())
+        for row in range(first, last + 1):
+            painter.drawPixmap(row * step - offset, 0, self.model.cards[row].pixmap())
+        painter.end()
+
+    def resizeEvent(self, event):
+        """
+        Passt den Abstand der Karten an die neue Breite an.
+
+        Args:
+            event (QResizeEvent): Das Ereignis.
+        """
+        super().resizeEvent(event)
+        self._update_layout()
+
+    def wheelEvent(self, event):
+        """
+        Scrollt mit dem Mausrad horizontal.
+
+        Args:
+            event (QWheelEvent): Das Ereignis.
+        """
+        delta = event.angleDelta().y() or event.angleDelta().x()
+        scroll_bar = self.horizontalScrollBar()
+        scroll_bar.setValue(scroll_bar.value() - delta // 120 * scroll_bar.singleStep())
+        event.accept()
+
+    def mousePressEvent(self, event):
+        """
+        Meldet Klicks auf eine Karte.
+
+        Args:
+            event (QMouseEvent): Das Mausereignis.
+        """
+        row = self.card_at(event.position().toPoint())
+        if row < 0:
+            return
+
+        if event.button() == Qt.LeftButton:
+            self.card_clicked.emit(row)
+        elif event.button() == Qt.RightButton:
+            self.card_right_clicked.emit(row, event.position().toPoint())
+
+    def mouseDoubleClickEvent(self, event):
+        """
+        Meldet Doppelklicks auf eine Karte.
+
+        Args:
+            event (QMouseEvent): Das Mausereignis.
+        """
+        row = self.card_at(event.position().toPoint())
+        if row >= 0 and event.button() == Qt.LeftButton:
+            self.card_double_clicked.emit(row)
+
+
+class CardListZone(QWidget):
+    """
+    Virtualisierte Spielzone für Hand, Friedhof und Exil.
+
+    Die Zone wird über set_cards mit dem Inhalt aus dem Spielzustand gefüllt und
+    hält keine Widgets pro Karte.
+    """
+
+    # Signale wie bei den Karten-Widgets (statt des Widgets wird die ZoneCard übergeben)
+    clicked = Signal(object)
+    double_clicked = Signal(object)
+    right_clicked = Signal(object, QPoint)
+
+    def __init__(self, name, fanned=False, parent=None):
+        """
+        Initialisiert die Zone.
+
+        Args:
+            name (str): Der Name der Zone.
+            fanned (bool, optional): True für die aufgefächerte Darstellung, sonst eine Liste.
+            parent (QWidget, optional): Das Eltern-Widget.
+        """
+        super().__init__(parent)
+        self.name = name
+        self.fanned = fanned
+        self.model = ZoneCardModel(self)
+
+        layout = QVBoxLayout(self)
+
+        # Titel
+        self.title = QLabel(name)
+        self.title.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.title)
+
+        if fanned:
+            self.view = FannedCardView(self.model)
+            self.view.card_clicked.connect(lambda row: self.clicked.emit(self.model.cards[row]))
+            self.view.card_double_clicked.connect(lambda row: self.double_clicked.emit(self.model.cards[row]))
+            self.view.card_right_clicked.connect(
+                lambda row, pos: self.right_clicked.emit(self.model.cards[row], pos)
+            )
+        else:
+            self.view = QListView()
+            self.view.setModel(self.model)
+            self.view.setItemDelegate(CardPixmapDelegate(self.view))
+            self.view.setUniformItemSizes(True)
+            self.view.setSpacing(CARD_SPACING // 2)
+            self.view.setSelectionMode(QAbstractItemView.NoSelection)
+            self.view.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+            self.view.setContextMenuPolicy(Qt.CustomContextMenu)
+            self.view.clicked.connect(lambda index: self.clicked.emit(index.data(Qt.UserRole)))
+            self.view.doubleClicked.connect(lambda index: self.double_clicked.emit(index.data(Qt.UserRole)))
+            self.view.customContextMenuRequested.connect(self._on_context_menu)
+        layout.addWidget(self.view)
+
+    def _on_context_menu(self, pos):
+        """
+        Meldet einen Rechtsklick in der Listendarstellung.
+
+        Args:
+            pos (QPoint): Die Position im Viewport.
+        """
+        index = self.view.indexAt(pos)
+        if index.isValid():
+            self.right_clicked.emit(index.data(Qt.UserRole), pos)
+
+    @property
+    def cards(self):
+        """Die Karten der Zone (ZoneCard) in der angezeigten Reihenfolge."""
+        return self.model.cards
+
+    def set_cards(self, zone_name, keyed_cards):
+        """
+        Zeigt den neuen Inhalt der Zone an.
+
+        Args:
+            zone_name (str): Der Name der Zone im Spielzustand.
+            keyed_cards (list): (Schlüssel, Karte, Besitzer-ID, Vorderseite zeigen) in der Reihenfolge des Spielzustands.
+        """
+        self.model.set_cards(zone_name, keyed_cards)
+
+    def clear(self):
+        """Entfernt alle Karten aus der Zone."""
+        self.model.set_cards(None, [])
@@ -4,13 +4,192 @@ Widget-Klassen für Karten im Spielbrett.
 Dieses Modul enthält die Widget-Klassen für Karten im Spielbrett.
 """
 
-from PySide6.QtWidgets import QLabel, QMenu, QVBoxLayout, QWidget, QFrame
-from PySide6.QtCore import Qt, QMimeData, Signal, Property, QPoint
-from PySide6.QtGui import QDrag, QPixmap, QPainter, QColor, QPen, QBrush, QFont, QFontMetrics
+from PySide6.QtWidgets import QLabel, QVBoxLayout, QFrame
+from PySide6.QtCore import Qt, QMimeData, Signal, QPoint
+from PySide6.QtGui import QDrag, QPixmap, QPainter, QColor, QPen, QFont, QFontMetrics, QPalette
+from PySide6.QtWidgets import QApplication
 import json
 
+# Hintergrundfarben einfarbiger Karten (in dieser Reihenfolge geprüft)
+COLOR_BACKGROUNDS = {
+    'White': '#ffffee',
+    'Blue': '#aaddff',
+    'Black': '#aaaaaa',
+    'Red': '#ffaaaa',
+    'Green': '#aaffaa'
+}
 
-class CardWidget(QWidget):
+# Hintergrundfarben für verdeckte, farblose, mehrfarbige und sonstige Karten
+FACE_DOWN_BACKGROUND = '#000066'
+COLORLESS_BACKGROUND = '#bbbbbb'
+MULTICOLOR_BACKGROUND = '#ddcc77'
+DEFAULT_BACKGROUND = '#eeeeee'
+
+# Rahmenfarben nach Kartentyp (der erste passende Typ gilt)
+TYPE_BORDERS = (
+    ('Land', '#663300'),
+    ('Artifact', '#777777'),
+    ('Enchantment', '#ffcc00'),
+    ('Creature', '#009900'),
+    ('Planeswalker', '#ff6600')
+)
+
+# Kartendaten, die die Anzeige einer Karte bestimmen (neben Tapp-, Angriffs- und Block-Status)
+DISPLAY_KEYS = ('name', 'type', 'colors', 'power', 'toughness')
+
+# Breite des Rahmens nach Kartentyp
+TYPE_BORDER_WIDTH = 2
+
+# Schriftgrößen (in Pixeln) für Name, Typ sowie Stärke/Widerstandskraft
+NAME_FONT_SIZE = 10
+TYPE_FONT_SIZE = 8
+POWER_FONT_SIZE = 12
+
+# Zwischengespeicherte Zeichenmittel je Kartenaussehen (siehe get_card_palette)
+_palette_cache = {}
+
+# Gemeinsame Schriften der Karten (siehe get_card_fonts)
+_card_fonts = None
+
+
+def card_colors(card_data, face_down=False):
+    """
+    Bestimmt Hintergrund- und Rahmenfarbe einer Karte nach dem MTG-Farbsystem.
+    
+    Args:
+        card_data (dict): Die Daten der Karte.
+        face_down (bool, optional): Ob die Karte verdeckt angezeigt wird.
+    
+    Returns:
+        str: Die Hintergrundfarbe.
+        str: Die Rahmenfarbe oder None, wenn der Kartentyp keinen eigenen Rahmen hat.
+    """
+    if face_down:
+        # Kartenrückseite: Dunkelblau
+        return FACE_DOWN_BACKGROUND, None
+    
+    colors = card_data.get('colors', [])
+    if not colors:
+        background = COLORLESS_BACKGROUND
+    elif len(colors) > 1:
+        background = MULTICOLOR_BACKGROUND
+    else:
+        background = next(
+            (value for color, value in COLOR_BACKGROUNDS.items() if color in colors), DEFAULT_BACKGROUND
+        )
+    
+    border = dict(TYPE_BORDERS).get(type_class(card_data.get('type', '')))
+    return background, border
+
+
+def type_class(card_type):
+    """
+    Gibt die Typklasse einer Typzeile zurück, nach der sich der Rahmen richtet.
+    
+    Args:
+        card_type (str): Die Typzeile der Karte.
+    
+    Returns:
+        str: Der erste passende Typ aus TYPE_BORDERS oder eine leere Zeichenkette.
+    """
+    return next((type_name for type_name, _ in TYPE_BORDERS if type_name in card_type), '')
+
+
+class CardPalette:
+    """
+    Vorberechnete Zeichenmittel für ein Kartenaussehen.
+    
+    Attribute:
+        background (QColor): Die Hintergrundfarbe.
+        border_pen (QPen): Der Stift für den Rahmen nach Kartentyp oder None.
+        palette (QPalette): Die Widget-Palette mit der Hintergrundfarbe.
+    """
+    
+    __slots__ = ('background', 'border_pen', 'palette')
+    
+    def __init__(self, background, border):
+        """
+        Erstellt die Zeichenmittel.
+        
+        Args:
+            background (str): Die Hintergrundfarbe.
+            border (str): Die Rahmenfarbe oder None.
+        """
+        self.background = QColor(background)
+        self.border_pen = QPen(QColor(border), TYPE_BORDER_WIDTH) if border else None
+        
+        app = QApplication.instance()
+        self.palette = QPalette(app.palette()) if app is not None else QPalette()
+        self.palette.setColor(QPalette.Window, self.background)
+
+
+def get_card_palette(card_data, face_down=False):
+    """
+    Gibt die Zeichenmittel für das Aussehen einer Karte zurück.
+    
+    Die Zeichenmittel werden je (Farben, Typklasse, verdeckt) nur einmal
+    erstellt und von allen Karten gleichen Aussehens geteilt.
+    
+    Args:
+        card_data (dict): Die Daten der Karte.
+        face_down (bool, optional): Ob die Karte verdeckt angezeigt wird.
+    
+    Returns:
+        CardPalette: Die Zeichenmittel.
+    """
+    if face_down:
+        key = (None, None, True)
+    else:
+        key = (tuple(card_data.get('colors') or ()), type_class(card_data.get('type', '')), False)
+    
+    palette = _palette_cache.get(key)
+    if palette is None:
+        palette = CardPalette(*card_colors(card_data, face_down))
+        _palette_cache[key] = palette
+    return palette
+
+
+class CardFonts:
+    """
+    Gemeinsame Schriften der Karten.
+    
+    Attribute:
+        name (QFont): Schrift des Kartennamens.
+        type (QFont): Schrift der Typzeile.
+        power (QFont): Schrift für Stärke/Widerstandskraft.
+        power_metrics (QFontMetrics): Maße der Schrift für Stärke/Widerstandskraft.
+    """
+    
+    def __init__(self):
+        """Erstellt die Schriften."""
+        self.name = QFont()
+        self.name.setBold(True)
+        self.name.setPixelSize(NAME_FONT_SIZE)
+        
+        self.type = QFont()
+        self.type.setPixelSize(TYPE_FONT_SIZE)
+        
+        self.power = QFont()
+        self.power.setBold(True)
+        self.power.setPixelSize(POWER_FONT_SIZE)
+        self.power_metrics = QFontMetrics(self.power)
+
+
+def get_card_fonts():
+    """
+    Gibt die gemeinsamen Schriften der Karten zurück (beim ersten Aufruf erstellt).
+    
+    Returns:
+        CardFonts: Die Schriften.
+    """
+    global _card_fonts
+    
+    if _card_fonts is None:
+        _card_fonts = CardFonts()
+    return _card_fonts
+
+
+class CardWidget(QFrame):
     """Widget für eine Karte im Spielbrett."""
     
     # Signale
@@ -32,6 +211,10 @@ class CardWidget(QWidget):
         self._attacking = card_data.get('attacking', False)
         self._blocking = card_data.get('blocking', False)
         self._face_down = False
+        self._palette = None
+        
+        # Hintergrund über die Palette statt über ein Stylesheet
+        self.setAutoFillBackground(True)
         
         # Layout und Widgets
         self.init_ui()
@@ -48,19 +231,20 @@ class CardWidget(QWidget):
         self.layout = QVBoxLayout(self)
         self.layout.setContentsMargins(0, 0, 0, 0)
         self.layout.setSpacing(0)
+        fonts = get_card_fonts()
         
         # Label für den Namen
         self.name_label = QLabel(self._card_data.get('name', 'Unbekannte Karte'))
         self.name_label.setAlignment(Qt.AlignCenter)
         self.name_label.setWordWrap(True)
-        self.name_label.setStyleSheet("font-weight: bold; font-size: 10px;")
+        self.name_label.setFont(fonts.name)
         self.layout.addWidget(self.name_label)
         
         # Label für den Typ
         self.type_label = QLabel(self._card_data.get('type', ''))
         self.type_label.setAlignment(Qt.AlignCenter)
         self.type_label.setWordWrap(True)
-        self.type_label.setStyleSheet("font-size: 8px;")
+        self.type_label.setFont(fonts.type)
         self.layout.addWidget(self.type_label)
         
         # Rahmen
@@ -75,47 +259,12 @@ class CardWidget(QWidget):
     
     def update_background_color(self):
         """Aktualisiert die Hintergrundfarbe basierend auf dem Kartentyp."""
-        card_type = self._card_data.get('type', '')
-        
-        if self._face_down:
-            # Kartenrückseite: Dunkelblau
-            self.setStyleSheet("background-color: #000066;")
-            return
-        
-        # Kartenfarbe basierend auf dem MTG-Farben-System
-        card_colors = self._card_data.get('colors', [])
-        
-        if not card_colors:
-            # Farblos
-            self.setStyleSheet("background-color: #bbbbbb;")
-        elif len(card_colors) > 1:
-            # Mehrfarbig
-            self.setStyleSheet("background-color: #ddcc77;")
-        elif 'White' in card_colors:
-            self.setStyleSheet("background-color: #ffffee;")
-        elif 'Blue' in card_colors:
-            self.setStyleSheet("background-color: #aaddff;")
-        elif 'Black' in card_colors:
-            self.setStyleSheet("background-color: #aaaaaa;")
-        elif 'Red' in card_colors:
-            self.setStyleSheet("background-color: #ffaaaa;")
-        elif 'Green' in card_colors:
-            self.setStyleSheet("background-color: #aaffaa;")
-        else:
-            # Standard: Hellgrau
-            self.setStyleSheet("background-color: #eeeeee;")
-        
-        # Spezifische Rahmenfarbe für bestimmte Kartentypen
-        if 'Land' in card_type:
-            self.setStyleSheet(self.styleSheet() + "border: 2px solid #663300;")
-        elif 'Artifact' in card_type:
-            self.setStyleSheet(self.styleSheet() + "border: 2px solid #777777;")
-        elif 'Enchantment' in card_type:
-            self.setStyleSheet(self.styleSheet() + "border: 2px solid #ffcc00;")
-        elif 'Creature' in card_type:
-            self.setStyleSheet(self.styleSheet() + "border: 2px solid #009900;")
-        elif 'Planeswalker' in card_type:
-            self.setStyleSheet(self.styleSheet() + "border: 2px solid #ff6600;")
+        palette = get_card_palette(self._card_data, self._face_down)
+        
+        # Die Palette wird nur bei geändertem Aussehen neu gesetzt
+        if palette is not self._palette:
+            self._palette = palette
+            self.setPalette(palette.palette)
     
     def update_display(self):
         """Aktualisiert die Anzeige des Widgets."""
@@ -160,26 +309,25 @@ class CardWidget(QWidget):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
         
+        # Rahmen nach Kartentyp
+        if self._palette is not None and self._palette.border_pen is not None:
+            painter.setPen(self._palette.border_pen)
+            painter.drawRect(1, 1, self.width() - TYPE_BORDER_WIDTH, self.height() - TYPE_BORDER_WIDTH)
+        
         # Für Kreaturen zeichnen wir Stärke und Widerstandskraft
         if 'Creature' in self._card_data.get('type', '') and not self._face_down:
             power = self._card_data.get('power', 0)
             toughness = self._card_data.get('toughness', 0)
             
             text = f"{power}/{toughness}"
-            font = QFont()
-            font.setBold(True)
-            painter.setFont(font)
+            fonts = get_card_fonts()
+            painter.setPen(self.palette().color(QPalette.WindowText))
+            painter.setFont(fonts.power)
             
             # Positionierung unten rechts
-            metrics = QFontMetrics(font)
-            text_width = metrics.horizontalAdvance(text)
-            
-            if self._tapped:
-                x = self.width() - text_width - 5
-                y = self.height() - 5
-            else:
-                x = self.width() - text_width - 5
-                y = self.height() - 5
+            text_width = fonts.power_metrics.horizontalAdvance(text)
+            x = self.width() - text_width - 5
+            y = self.height() - 5
             
             painter.drawText(x, y, text)
         
@@ -218,6 +366,31 @@ class CardWidget(QWidget):
         """
         return self._card_data
     
+    def set_card_data(self, card_data, face_down=False):
+        """Übernimmt neue Daten derselben Karte.
+        
+        Die Anzeige wird nur neu aufgebaut, wenn sich ein angezeigter Wert
+        (Status, Name, Typ, Farben, Stärke/Widerstandskraft) geändert hat.
+        
+        Args:
+            card_data (dict): Die neuen Daten der Karte.
+            face_down (bool, optional): Ob die Karte verdeckt angezeigt wird.
+        """
+        old_data = self._card_data
+        state = (
+            card_data.get('tapped', False), card_data.get('attacking', False),
+            card_data.get('blocking', False), face_down
+        )
+        changed = (
+            state != (self._tapped, self._attacking, self._blocking, self._face_down)
+            or any(card_data.get(key) != old_data.get(key) for key in DISPLAY_KEYS)
+        )
+        
+        self._card_data = card_data
+        if changed:
+            self._tapped, self._attacking, self._blocking, self._face_down = state
+            self.update_display()
+    
     # Getter/Setter für Status
     def is_tapped(self):
         """Prüft, ob die Karte getappt ist.
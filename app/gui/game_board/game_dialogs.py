@@ -6,7 +6,7 @@ Dieses Modul enthält Dialoge für die Interaktion mit dem Spielbrett.
 
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QLabel, 
-    QComboBox, QDialogButtonBox, QMessageBox
+    QComboBox, QDialogButtonBox, QMessageBox, QListWidget, QListWidgetItem
 )
 from PySide6.QtCore import Qt, Slot
 
@@ -207,3 +207,67 @@ class LoadGameDialog(QDialog):
             int: Die ID des ausgewählten Spiels oder None, wenn kein Spiel ausgewählt ist.
         """
         return self.game_combo.currentData() if self.game_combo.count() > 0 else None
+
+
+class BottomCardsDialog(QDialog):
+    """Dialog zur Auswahl der Karten, die nach einem Mulligan unter die Bibliothek gelegt werden."""
+    
+    def __init__(self, hand, count, parent=None):
+        """
+        Initialisiert den Dialog.
+        
+        Args:
+            hand (list): Die Karten auf der Hand.
+            count (int): Die Anzahl der zu wählenden Karten.
+            parent (QWidget, optional): Das Eltern-Widget.
+        """
+        super().__init__(parent)
+        
+        self.count = count
+        
+        self.setWindowTitle("Karten unter die Bibliothek legen")
+        self.init_ui(hand)
+    
+    def init_ui(self, hand):
+        """
+        Initialisiert die Benutzeroberfläche.
+        
+        Args:
+            hand (list): Die Karten auf der Hand.
+        """
+        layout = QVBoxLayout(self)
+        
+        layout.addWidget(QLabel(f"Wählen Sie {self.count} Karte(n), die unter die Bibliothek gelegt werden:"))
+        
+        # Handkarten
+        self.card_list = QListWidget()
+        self.card_list.setSelectionMode(QListWidget.MultiSelection)
+        for card in hand:
+            item = QListWidgetItem(f"{card.get('name', 'Unbekannt')} ({card.get('mana_cost', '')})")
+            item.setData(Qt.UserRole, card['id'])
+            self.card_list.addItem(item)
+        layout.addWidget(self.card_list)
+        
+        # Buttons
+        self.button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        self.button_box.accepted.connect(self.accept)
+        self.button_box.rejected.connect(self.reject)
+        layout.addWidget(self.button_box)
+        
+        self.card_list.itemSelectionChanged.connect(self.on_selection_changed)
+        self.on_selection_changed()
+    
+    @Slot()
+    def on_selection_changed(self):
+        """Aktiviert OK nur, wenn genau die geforderte Anzahl an Karten gewählt ist."""
+        selected = len(self.card_list.selectedItems())
+        self.button_box.button(QDialogButtonBox.Ok).setEnabled(selected == self.count)
+    
+    def get_card_ids(self):
+        """
+        Gibt die Instanz-IDs der gewählten Karten zurück.
+        
+        Returns:
+            list: Die IDs in der Reihenfolge der Auswahl.
+        """
+        return [item.data(Qt.UserRole) for item in self.card_list.selectedItems()]
@@ -1,19 +1,73 @@
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel,
     QPushButton, QGroupBox, QScrollArea, QSplitter, QFrame,
-    QStatusBar, QDialog, QMessageBox
+    QStatusBar, QDialog, QMessageBox, QComboBox
 )
-from PySide6.QtCore import Qt, Signal, Slot, QSize
+from PySide6.QtCore import Qt, Signal, Slot, QSize, QTimer, QCoreApplication
 from PySide6.QtGui import QFont, QColor, QPalette
 
-from app.gui.game_board.card_display import create_card_widget, show_card_details
-from app.gui.game_board.game_dialogs import NewGameDialog, LoadGameDialog
-from app.logic.game_engine import GameEngine
+from app.gui.game_board.card_display import CardWidgetPool, connect_card_signals, update_card_widget, show_card_details
+from app.gui.game_board.game_dialogs import NewGameDialog, LoadGameDialog, BottomCardsDialog
+from app.logic.game_host import GameHost
+from app.logic.phases import Step, TURN_ORDER, STEP_INDEX, STEP_NAMES, get_step_name, parse_step
 from app.gui.game_board.zones import GameZone, BattlefieldZone
+from app.gui.game_board.battlefield_scene import SceneBattlefieldZone, create_card_item
+from app.gui.game_board.card_list_zone import CardListZone
+from app.gui.game_board.refresh_scheduler import (
+    RefreshScheduler, REFRESH_INFO, REFRESH_PHASES, CARD_ZONE_NAMES, REFRESH_ALL
+)
 
 from pony.orm import db_session
 import random
 
+# Darstellungen der Spielfelder: QGraphicsScene (für große Spielfelder) oder
+# die widgetbasierte Zone als Ausweichlösung
+BATTLEFIELD_RENDERERS = {
+    'scene': SceneBattlefieldZone,
+    'widgets': BattlefieldZone
+}
+
+# Standarddarstellung der Spielfelder
+DEFAULT_BATTLEFIELD_RENDERER = 'scene'
+
+# Darstellung der Lebenspunkte: (Mindestwert, Stylesheet), der erste passende Eintrag gilt
+LIFE_STYLES = (
+    (11, "font-weight: bold; color: green;"),
+    (6, "font-weight: bold; color: orange;"),
+    (None, "font-weight: bold; color: red;")
+)
+
+# Markierung der Schaltfläche der aktuellen Phase
+CURRENT_PHASE_STYLE = "background-color: lightblue;"
+
+
+def life_style(life):
+    """
+    Gibt das Stylesheet für eine Lebenspunkteanzeige zurück.
+
+    Args:
+        life (int): Die Lebenspunkte.
+
+    Returns:
+        str: Das Stylesheet.
+    """
+    return next(style for minimum, style in LIFE_STYLES if minimum is None or life >= minimum)
+
+
+def set_style_sheet(widget, style):
+    """
+    Setzt das Stylesheet eines Widgets nur, wenn es sich ändert.
+
+    Das Setzen eines Stylesheets lässt Qt es neu parsen und das Widget neu
+    polieren, auch wenn es gleich bleibt.
+
+    Args:
+        widget (QWidget): Das Widget.
+        style (str): Das Stylesheet.
+    """
+    if widget.styleSheet() != style:
+        widget.setStyleSheet(style)
+
 
 class GameBoardWidget(QWidget):
     """Hauptspielfeld-Widget für Magic the Gathering."""
@@ -22,7 +76,7 @@ class GameBoardWidget(QWidget):
     phase_changed = Signal(str)  # Emittiert bei Phasenwechsel
     game_state_changed = Signal(dict)  # Emittiert bei Änderung des Spielstatus
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, battlefield_renderer=DEFAULT_BATTLEFIELD_RENDERER):
         """
         Initialisiert
         das
@@ -31,10 +85,21 @@ class GameBoardWidget(QWidget):
         Args:
         parent(QWidget, optional): Das
         Eltern - Widget.
+        battlefield_renderer (str, optional): Die Darstellung der Spielfelder
+            (Schlüssel aus BATTLEFIELD_RENDERERS).
         """
         super().__init__(parent)
+        
+        # Darstellung der Spielfelder (unbekannte Werte: widgetbasierte Zone)
+        self.battlefield_zone_class = BATTLEFIELD_RENDERERS.get(battlefield_renderer, BattlefieldZone)
 
-        # Spielzustand und Engine
+        # Spielzustand und Engine (der Host verwaltet alle geöffneten Spiele)
+        self.game_host = GameHost()
+        
+        # Beim Beenden alle ausstehenden Spielstände schreiben
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.game_host.shutdown)
         self.game_engine = None
         self.game_state = None
         self.active_player_id = None
@@ -42,6 +107,16 @@ class GameBoardWidget(QWidget):
         self.current_phase = None
         self.player1_id = None
         self.player2_id = None
+        
+        # Platzhalter für die oberste Karte der Bibliotheken (Spieler-ID -> Karte)
+        self._library_top_cards = {}
+        
+        # Wiederverwendbare Karten-Widgets und Szenenelemente der Spielfelder
+        self.card_pool = CardWidgetPool(self)
+        self.item_pool = CardWidgetPool(self, factory=create_card_item)
+
+        # Gesammelte Aktualisierung der geänderten Bereiche (höchstens einmal pro Frame)
+        self.refresh_scheduler = RefreshScheduler(self._refresh, self)
 
         # Initialisiere das Layout
         self.init_ui()
@@ -142,7 +217,7 @@ class GameBoardWidget(QWidget):
 
         player1_life_label = QLabel("Leben:")
         self.player1_life_value = QLabel("20")
-        self.player1_life_value.setStyleSheet("font-weight: bold; color: green;")
+        self.player1_life_value.setStyleSheet(life_style(20))
         player_info_layout.addWidget(player1_life_label, 0, 2)
         player_info_layout.addWidget(self.player1_life_value, 0, 3)
 
@@ -160,7 +235,7 @@ class GameBoardWidget(QWidget):
 
         player2_life_label = QLabel("Leben:")
         self.player2_life_value = QLabel("20")
-        self.player2_life_value.setStyleSheet("font-weight: bold; color: green;")
+        self.player2_life_value.setStyleSheet(life_style(20))
         player_info_layout.addWidget(player2_life_label, 1, 2)
         player_info_layout.addWidget(self.player2_life_value, 1, 3)
 
@@ -188,6 +263,16 @@ class GameBoardWidget(QWidget):
         self.end_game_button.setEnabled(False)  # Zu Beginn deaktiviert
         game_control_layout.addWidget(self.end_game_button)
 
+        self.undo_button = QPushButton("Rückgängig")
+        self.undo_button.clicked.connect(self.on_undo)
+        self.undo_button.setEnabled(False)  # Zu Beginn deaktiviert
+        game_control_layout.addWidget(self.undo_button)
+
+        # Auswahl zwischen den geöffneten Spielen
+        self.open_games_combo = QComboBox()
+        self.open_games_combo.activated.connect(self.on_open_game_selected)
+        game_control_layout.addWidget(self.open_games_combo)
+
         layout.addWidget(game_control_box)
 
         return widget
@@ -211,33 +296,58 @@ class GameBoardWidget(QWidget):
         upper_layout = QHBoxLayout(upper_widget)
         upper_layout.setContentsMargins(0, 0, 0, 0)
 
-        # Hand
-        self.hand_zones = getattr(self, 'hand_zones', {})
-        player_id = str(self.player2_id) if is_top else str(self.player1_id)
-        player_name = f"Spieler {player_id}"
-        self.hand_zones[player_id] = GameZone(f"Hand - {player_name}")
-        upper_layout.addWidget(self.hand_zones[player_id], 2)  # Hand bekommt mehr Platz
+        # Die Zonen werden zunächst dem Sitzplatz zugeordnet und beim Binden
+        # eines Spiels unter der Spieler-ID eingetragen (siehe _assign_player_zones)
+        self.seat_zones = getattr(self, 'seat_zones', {})
+        player_name = "Spieler 2" if is_top else "Spieler 1"
+
+        # Hand (aufgefächert, ohne Widget pro Karte)
+        hand_zone = self._create_card_list_zone(f"Hand - {player_name}", fanned=True)
+        upper_layout.addWidget(hand_zone, 2)  # Hand bekommt mehr Platz
 
         # Bibliothek
-        self.library_zones = getattr(self, 'library_zones', {})
-        self.library_zones[player_id] = GameZone(f"Bibliothek - {player_name}")
-        upper_layout.addWidget(self.library_zones[player_id], 1)
+        library_zone = GameZone(f"Bibliothek - {player_name}")
+        upper_layout.addWidget(library_zone, 1)
 
         # Friedhof
-        self.graveyard_zones = getattr(self, 'graveyard_zones', {})
-        self.graveyard_zones[player_id] = GameZone(f"Friedhof - {player_name}")
-        upper_layout.addWidget(self.graveyard_zones[player_id], 1)
+        graveyard_zone = self._create_card_list_zone(f"Friedhof - {player_name}")
+        upper_layout.addWidget(graveyard_zone, 1)
 
         zone_layout.addWidget(upper_widget)
 
         # Battlefield
-        self.battlefield_zones = getattr(self, 'battlefield_zones', {})
-        self.battlefield_zones[player_id] = BattlefieldZone(f"Spielfeld - {player_name}", player_id)
-        zone_layout.addWidget(self.battlefield_zones[player_id], 3)  # Battlefield bekommt viel Platz
+        battlefield_zone = self.battlefield_zone_class(f"Spielfeld - {player_name}")
+        zone_layout.addWidget(battlefield_zone, 3)  # Battlefield bekommt viel Platz
+
+        self.seat_zones[is_top] = {
+            'hand': hand_zone,
+            'library': library_zone,
+            'graveyard': graveyard_zone,
+            'battlefield': battlefield_zone
+        }
+        self.hand_zones = {}
+        self.library_zones = {}
+        self.graveyard_zones = {}
+        self.battlefield_zones = {}
 
         return zone_widget
 
 
+    def _create_card_list_zone(self, name, fanned=False):
+        """Erstellt eine virtualisierte Zone und verbindet sie mit den Kartenaktionen.
+
+        Args:
+            name (str): Der Name der Zone.
+            fanned (bool, optional): True für die aufgefächerte Darstellung.
+
+        Returns:
+            CardListZone: Die Zone.
+        """
+        zone = CardListZone(name, fanned)
+        connect_card_signals(zone, self)
+        return zone
+
+
     def _create_middle_zone(self):
         """Erstellt die mittlere Zone mit Stack und Exile.
 
@@ -252,7 +362,7 @@ class GameBoardWidget(QWidget):
         middle_layout.addWidget(self.stack_zone)
 
         # Exile
-        self.exile_zone = GameZone("Exile")
+        self.exile_zone = self._create_card_list_zone("Exile")
         middle_layout.addWidget(self.exile_zone)
 
         return middle_widget
@@ -284,29 +394,14 @@ class GameBoardWidget(QWidget):
 
         self.phase_buttons = {}
 
-        # Phasen definieren
-        phases = [
-            ('untap', 'Enttappen'),
-            ('upkeep', 'Versorgung'),
-            ('draw', 'Ziehen'),
-            ('main1', 'Hauptphase 1'),
-            ('combat_begin', 'Kampf: Beginn'),
-            ('combat_attackers', 'Kampf: Angreifer'),
-            ('combat_blockers', 'Kampf: Blocker'),
-            ('combat_damage', 'Kampf: Schaden'),
-            ('combat_end', 'Kampf: Ende'),
-            ('main2', 'Hauptphase 2'),
-            ('end', 'Ende'),
-            ('cleanup', 'Aufräumen')
-        ]
-
-        for phase_id, phase_name in phases:
-            button = QPushButton(phase_name)
-        button.setProperty('phase_id', phase_id)
-        button.clicked.connect(self.on_phase_button_clicked)
-        button.setEnabled(False)  # Zu Beginn deaktiviert
-        phases_layout.addWidget(button)
-        self.phase_buttons[phase_id] = button
+        # Phasen-Buttons in der Reihenfolge des Zuges
+        for step in TURN_ORDER:
+            button = QPushButton(STEP_NAMES[step])
+            button.setProperty('phase_id', step.value)
+            button.clicked.connect(self.on_phase_button_clicked)
+            button.setEnabled(False)  # Zu Beginn deaktiviert
+            phases_layout.addWidget(button)
+            self.phase_buttons[step] = button
 
         action_layout.addWidget(phases_group)
 
@@ -314,6 +409,16 @@ class GameBoardWidget(QWidget):
         player_actions_group = QGroupBox("Spieleraktionen")
         player_actions_layout = QHBoxLayout(player_actions_group)
 
+        self.mulligan_button = QPushButton("Mulligan")
+        self.mulligan_button.clicked.connect(self.on_mulligan)
+        self.mulligan_button.setEnabled(False)  # Zu Beginn deaktiviert
+        player_actions_layout.addWidget(self.mulligan_button)
+
+        self.keep_hand_button = QPushButton("Hand behalten")
+        self.keep_hand_button.clicked.connect(self.on_keep_hand)
+        self.keep_hand_button.setEnabled(False)  # Zu Beginn deaktiviert
+        player_actions_layout.addWidget(self.keep_hand_button)
+
         self.draw_card_button = QPushButton("Karte ziehen")
         self.draw_card_button.clicked.connect(self.on_draw_card)
         self.draw_card_button.setEnabled(False)  # Zu Beginn deaktiviert
@@ -343,29 +448,18 @@ class GameBoardWidget(QWidget):
         if result == QDialog.Accepted:
             player1_id, player2_id, deck1_id, deck2_id = dialog.get_game_info()
 
-            # Erstelle eine neue Game Engine
-            self.game_engine = GameEngine()
+            # Erstelle ein neues Spiel im Host (das bisherige Spiel wird pausiert)
+            engine = self.game_host.create_game(player1_id, player2_id, deck1_id, deck2_id)
 
-            # Erstelle ein neues Spiel
-            game_id = self.game_engine.create_game(player1_id, player2_id, deck1_id, deck2_id)
-
-            if game_id:
-                self.player1_id = player1_id
-                self.player2_id = player2_id
-                self.game_state = self.game_engine.game_state
-                self.active_player_id = self.game_state['active_player_id']
-                self.inactive_player_id = str(player2_id) if self.active_player_id == str(player1_id) else str(player1_id)
-                self.current_phase = self.game_state['phase']
-
-                # UI aktualisieren
-                self.update_ui()
-                self.enable_game_controls(True)
+            if engine:
+                self._bind_engine(engine)
 
                 # Statusmeldung
-                self.status_bar.showMessage(f"Neues Spiel gestartet (ID: {game_id})")
+                self.status_bar.showMessage(f"Neues Spiel gestartet (ID: {engine.game_id})")
             else:
-                QMessageBox.critical(self, "Fehler", "Fehler beim Erstellen des Spiels.") \
-    @ Slot()
+                QMessageBox.critical(self, "Fehler", "Fehler beim Erstellen des Spiels.")
+
+    @Slot()
     def on_load_game(self):
         """Wird aufgerufen, wenn ein Spiel geladen werden soll."""
         dialog = LoadGameDialog(self)
@@ -378,31 +472,113 @@ class GameBoardWidget(QWidget):
                 QMessageBox.warning(self, "Warnung", "Kein Spiel ausgewählt.")
                 return
 
-            # Erstelle eine neue Game Engine und lade das Spiel
-            self.game_engine = GameEngine(game_id)
+            # Öffne das Spiel im Host (bereits geöffnete Spiele werden nicht neu geladen)
+            engine = self.game_host.open_game(game_id)
 
-            if self.game_engine.game_state:
-                self.game_state = self.game_engine.game_state
-                self.active_player_id = self.game_state['active_player_id']
+            if engine and engine.game_state:
+                self._bind_engine(engine)
 
-                # Bestimme die Spieler-IDs
-                player_ids = list(self.game_state['players'].keys())
-                self.player1_id = int(player_ids[0])
-                self.player2_id = int(player_ids[1])
+                # Statusmeldung
+                self.status_bar.showMessage(f"Spiel geladen (ID: {game_id})")
+            else:
+                QMessageBox.critical(self, "Fehler", "Fehler beim Laden des Spiels.")
 
-                # Bestimme den inaktiven Spieler
-                self.inactive_player_id = player_ids[1] if self.active_player_id == player_ids[0] else player_ids[0]
+    @Slot(int)
+    def on_open_game_selected(self, index):
+        """
+        Wird aufgerufen, wenn ein anderes geöffnetes Spiel ausgewählt wird.
 
-                self.current_phase = self.game_state['phase']
+        Args:
+            index (int): Der Index des ausgewählten Eintrags.
+        """
+        game_id = self.open_games_combo.itemData(index)
 
-                # UI aktualisieren
-                self.update_ui()
-                self.enable_game_controls(True)
+        if game_id is None or game_id == self.game_host.active_game_id:
+            return
 
-                # Statusmeldung
-                self.status_bar.showMessage(f"Spiel geladen (ID: {game_id})")
-            else:
-                QMessageBox.critical(self, "Fehler", "Fehler beim Laden des Spiels.") \
+        engine = self.game_host.activate(game_id)
+
+        if engine:
+            self._bind_engine(engine)
+            self.status_bar.showMessage(f"Zu Spiel {game_id} gewechselt.")
+
+    @Slot()
+    def on_undo(self):
+        """Wird aufgerufen, wenn die letzte Änderung rückgängig gemacht werden soll."""
+        if not self.game_engine:
+            return
+
+        engine = self.game_host.undo()
+
+        if not engine:
+            self.status_bar.showMessage("Nichts rückgängig zu machen.")
+            return
+
+        self._bind_engine(engine)
+        QTimer.singleShot(0, self.game_host.flush_saves)
+        self.status_bar.showMessage("Letzte Änderung rückgängig gemacht.")
+
+    def _bind_engine(self, engine):
+        """
+        Zeigt das Spiel eines Spielmotors auf dem Spielbrett an.
+
+        Args:
+            engine (GameEngine): Der anzuzeigende Spielmotor.
+        """
+        self.game_engine = engine
+        self.game_state = engine.game_state
+        self.active_player_id = self.game_state['active_player_id']
+
+        # Bestimme die Spieler-IDs
+        player_ids = list(self.game_state['players'].keys())
+        self.player1_id = int(player_ids[0])
+        self.player2_id = int(player_ids[1])
+
+        # Bestimme den inaktiven Spieler
+        self.inactive_player_id = player_ids[1] if self.active_player_id == player_ids[0] else player_ids[0]
+
+        self.current_phase = self.game_state['phase']
+
+        # Zonen den Spielern zuordnen
+        self._assign_player_zones()
+
+        # UI aktualisieren
+        self.update_ui()
+        self.enable_game_controls(self.current_phase != 'ended')
+        self._update_open_games()
+
+    def _assign_player_zones(self):
+        """Trägt die Zonen der Sitzplätze unter den IDs der Spieler des aktuellen Spiels ein."""
+        for zone_dict in [self.hand_zones, self.library_zones, self.graveyard_zones, self.battlefield_zones]:
+            zone_dict.clear()
+
+        for is_top, player_id in ((False, str(self.player1_id)), (True, str(self.player2_id))):
+            zones = self.seat_zones[is_top]
+            self.hand_zones[player_id] = zones['hand']
+            self.library_zones[player_id] = zones['library']
+            self.graveyard_zones[player_id] = zones['graveyard']
+            self.battlefield_zones[player_id] = zones['battlefield']
+            zones['battlefield'].player_id = player_id
+
+    def _update_open_games(self):
+        """Aktualisiert die Auswahl der geöffneten Spiele."""
+        self.open_games_combo.clear()
+
+        for game in self.game_host.list_games():
+            label = f"{' vs. '.join(game['player_names'])} (ID {game['game_id']}, Runde {game['turn_number']})"
+            self.open_games_combo.addItem(label, game['game_id'])
+
+            if game['active']:
+                self.open_games_combo.setCurrentIndex(self.open_games_combo.count() - 1)
+
+    def commit_game_state(self):
+        """
+        Übernimmt den aktuellen Spielzustand als Undo-Punkt und speichert ihn.
+
+        Das Speichern erfolgt gesammelt nach Abschluss der aktuellen Aktion.
+        """
+        self.game_host.record()
+        QTimer.singleShot(0, self.game_host.flush_saves)
 
     @Slot()
     def on_end_game(self):
@@ -460,8 +636,13 @@ class GameBoardWidget(QWidget):
                     # UI aktualisieren
                     self.game_state = self.game_engine.game_state
                     self.update_ui()
+                    self.refresh_scheduler.flush()
                     self.enable_game_controls(False)
 
+                    # Beendete Spiele bleiben nicht im Host geöffnet
+                    self.game_host.close_game(self.game_engine.game_id)
+                    self._update_open_games()
+
                     # Statusmeldung
                     winner_text = f"Gewinner: {self.game_state['players'][str(winner_id)]['name']}" if winner_id else "Unentschieden"
                     self.status_bar.showMessage(f"Spiel beendet. {winner_text}")
@@ -485,85 +666,80 @@ class GameBoardWidget(QWidget):
             QMessageBox.warning(self, "Warnung", f"Fehler beim Phasenwechsel: {error}")
             return
 
-        # Aktualisiere die aktuelle Phase
-        self.current_phase = phase_id
+        # Aktualisiere die aktuelle Phase und den aktiven Spieler
+        # (Enttappen und Ziehen führt die Engine beim Betreten des Schritts aus)
+        self.current_phase = self.game_state['phase']
+        self.active_player_id = self.game_state['active_player_id']
 
         # Speichere den Spielzustand
-        self.game_engine.save_game_state()
+        self.commit_game_state()
 
         # UI aktualisieren
         self.update_ui()
 
-        # Phasenspezifische Aktionen
-        self._handle_phase_specific_actions(phase_id)
-
         # Statusmeldung
         self.status_bar.showMessage(f"Phase gewechselt zu: {self._get_phase_name(phase_id)}")
 
 
     def _get_phase_name(self, phase_id):
         """
-        Gibt
-        den
-        Namen
-        einer
-        Phase
-        zurück.
+        Gibt den Namen einer Phase zurück.
 
         Args:
-        phase_id(str): Die
-        ID
-        der
-        Phase.
-
+            phase_id (str): Die ID der Phase.
 
         Returns:
-        str: Der
-        Name
-        der
-        Phase.
+            str: Der Name der Phase.
         """
-        phase_names = {
-            'untap': 'Enttappen',
-            'upkeep': 'Versorgung',
-            'draw': 'Ziehen',
-            'main1': 'Hauptphase 1',
-            'combat_begin': 'Kampf: Beginn',
-            'combat_attackers': 'Kampf: Angreifer',
-            'combat_blockers': 'Kampf: Blocker',
-            'combat_damage': 'Kampf: Schaden',
-            'combat_end': 'Kampf: Ende',
-            'main2': 'Hauptphase 2',
-            'end': 'Ende',
-            'cleanup': 'Aufräumen',
-            'setup': 'Einrichtung'
-        }
+        return get_step_name(phase_id)
 
-        return phase_names.get(phase_id, phase_id)
 
+    @Slot()
+    def on_mulligan(self):
+        """Wird aufgerufen, wenn der entscheidende Spieler einen Mulligan nimmt."""
+        player_id = self.game_engine.get_undecided_player_id() if self.game_engine else None
+        if not player_id:
+            return
 
-    def _handle_phase_specific_actions(self, phase_id):
-        """
-        Führt
-        phasenspezifische
-        Aktionen
-        aus.
+        self.game_state, error = self.game_engine.take_mulligan(player_id)
 
-        Args:
-        phase_id(str): Die
-        ID
-        der
-        Phase.
+        if error:
+            QMessageBox.warning(self, "Warnung", f"Fehler beim Mulligan: {error}")
+            return
 
-        """
-        # In der Enttapp-Phase: Alle Karten des aktiven Spielers enttappen
-        if phase_id == 'untap':
-            self.on_untap_all()
+        self.commit_game_state()
+        self.update_ui()
 
-        # In der Ziehphase: Eine Karte ziehen
-        elif phase_id == 'draw':
-            self.on_draw_card()
+        player_data = self.game_state['players'][player_id]
+        self.status_bar.showMessage(f"{player_data['name']} nimmt einen Mulligan ({player_data['mulligans']}).")
 
+    @Slot()
+    def on_keep_hand(self):
+        """Wird aufgerufen, wenn der entscheidende Spieler seine Hand behält."""
+        player_id = self.game_engine.get_undecided_player_id() if self.game_engine else None
+        if not player_id:
+            return
+
+        player_data = self.game_state['players'][player_id]
+        bottom_card_ids = []
+
+        # Nach Mulligans wählt der Spieler die Karten für unter die Bibliothek
+        if player_data['mulligans']:
+            dialog = BottomCardsDialog(player_data['hand'], player_data['mulligans'], self)
+            if dialog.exec() != QDialog.Accepted:
+                return
+            bottom_card_ids = dialog.get_card_ids()
+
+        self.game_state, error = self.game_engine.keep_hand(player_id, bottom_card_ids)
+
+        if error:
+            QMessageBox.warning(self, "Warnung", f"Fehler beim Behalten der Hand: {error}")
+            return
+
+        self.commit_game_state()
+        self.update_ui()
+
+        self.status_bar.showMessage(f"{player_data['name']} behält {len(player_data['hand'])} Karte(n).")
 
     @Slot()
     def on_draw_card(self):
@@ -579,10 +755,10 @@ class GameBoardWidget(QWidget):
             return
 
         # Speichere den Spielzustand
-        self.game_engine.save_game_state()
+        self.commit_game_state()
 
         # UI aktualisieren
-        self.update_ui()
+        self.update_ui(REFRESH_INFO, 'hand', 'library')
 
         # Statusmeldung
         player_name = self.game_state['players'][self.active_player_id]['name']
@@ -594,18 +770,23 @@ class GameBoardWidget(QWidget):
         if not self.game_engine or not self.active_player_id:
             return
 
-        # Alle getappten Karten des aktiven Spielers im Spielfeld suchen
-        battlefield = self.game_state['battlefield']
-        for card in battlefield:
-            if card.get('controller_id') == self.active_player_id and card.get('tapped', False):
-                # Karte enttappen
-                card['tapped'] = False
+        # Alle getappten Karten des aktiven Spielers über den Spielmotor enttappen
+        card_ids = [
+            card['id'] for card in self.game_state['battlefield']
+            if card.get('controller_id') == self.active_player_id and card.get('tapped', False)
+        ]
+        for card_id in card_ids:
+            game_state, error = self.game_engine.set_card_state(card_id, tapped=False)
+            if error:
+                print(f"Fehler beim Enttappen von Karte {card_id}: {error}")
+                continue
+            self.game_state = game_state
 
         # Speichere den Spielzustand
-        self.game_engine.save_game_state()
+        self.commit_game_state()
 
         # UI aktualisieren
-        self.update_ui()
+        self.update_ui('battlefield')
 
         # Statusmeldung
         player_name = self.game_state['players'][self.active_player_id]['name']
@@ -631,7 +812,7 @@ class GameBoardWidget(QWidget):
         self.inactive_player_id = new_inactive_player_id
         
         # Speichere den Spielzustand
-        self.game_engine.save_game_state()
+        self.commit_game_state()
         
         # UI aktualisieren
         self.update_ui()
@@ -640,11 +821,50 @@ class GameBoardWidget(QWidget):
         player_name = self.game_state['players'][new_active_player_id]['name']
         self.status_bar.showMessage(f"Nächster Zug: {player_name} ist am Zug.")
         
-    def update_ui(self):
-        """Aktualisiert die Benutzeroberfläche basierend auf dem aktuellen Spielzustand."""
+    def update_ui(self, *regions):
+        """
+        Plant die Aktualisierung der Benutzeroberfläche.
+        
+        Die Bereiche werden nur markiert; alle Änderungen eines Durchlaufs der
+        Ereignisschleife werden gesammelt in einem Schritt gezeichnet (siehe
+        RefreshScheduler).
+        
+        Args:
+            *regions (str): Die geänderten Bereiche (REFRESH_INFO, REFRESH_PHASES
+                oder Zonennamen aus CARD_ZONE_NAMES); ohne Angabe alle Bereiche.
+        """
+        self.refresh_scheduler.mark(*(regions or REFRESH_ALL))
+    
+    def _refresh(self, regions):
+        """
+        Aktualisiert die geänderten Bereiche anhand des aktuellen Spielzustands.
+        
+        Args:
+            regions (set): Die geänderten Bereiche.
+        """
         if not self.game_state:
             return
+        
+        if REFRESH_INFO in regions:
+            self._update_game_info()
+        
+        # Zonen aktualisieren
+        zone_names = regions.intersection(CARD_ZONE_NAMES)
+        if zone_names:
+            self._update_zones(zone_names)
+        
+        if REFRESH_PHASES in regions:
+            # Aktualisiere die Phasen-Buttons
+            self._update_phase_buttons()
             
+            # Aktualisiere Spieleraktionen
+            self._update_player_actions()
+        
+        # Emittiere Signal für Spielzustandsänderung (einmal pro Aktualisierung)
+        self.game_state_changed.emit(self.game_state)
+    
+    def _update_game_info(self):
+        """Aktualisiert die Spielinfo (Zug, Phase, aktiver Spieler, Lebenspunkte, Bibliotheken)."""
         # Aktualisiere Spielinfo
         self.turn_value.setText(str(self.game_state.get('turn_number', 0)))
         self.phase_value.setText(self._get_phase_name(self.game_state.get('phase', 'setup')))
@@ -665,12 +885,7 @@ class GameBoardWidget(QWidget):
             self.player1_library_value.setText(str(len(player1_data['library'])))
             
             # Lebens-Status-Farbe anpassen
-            if player1_data['life'] > 10:
-                self.player1_life_value.setStyleSheet("font-weight: bold; color: green;")
-            elif player1_data['life'] > 5:
-                self.player1_life_value.setStyleSheet("font-weight: bold; color: orange;")
-            else:
-                self.player1_life_value.setStyleSheet("font-weight: bold; color: red;")
+            set_style_sheet(self.player1_life_value, life_style(player1_data['life']))
         
         if self.player2_id and str(self.player2_id) in self.game_state['players']:
             player2_data = self.game_state['players'][str(self.player2_id)]
@@ -679,123 +894,221 @@ class GameBoardWidget(QWidget):
             self.player2_library_value.setText(str(len(player2_data['library'])))
             
             # Lebens-Status-Farbe anpassen
-            if player2_data['life'] > 10:
-                self.player2_life_value.setStyleSheet("font-weight: bold; color: green;")
-            elif player2_data['life'] > 5:
-                self.player2_life_value.setStyleSheet("font-weight: bold; color: orange;")
-            else:
-                self.player2_life_value.setStyleSheet("font-weight: bold; color: red;")
+            set_style_sheet(self.player2_life_value, life_style(player2_data['life']))
         
-        # Zonen aktualisieren
-        self._update_zones()
-        
-        # Aktualisiere die Phasen-Buttons
-        self._update_phase_buttons()
-        
-        # Aktualisiere Spieleraktionen
-        self._update_player_actions()
+    def _update_zones(self, zone_names=CARD_ZONE_NAMES):
+        """
+        Gleicht die Spielzonen mit dem aktuellen Spielzustand ab.
         
-        # Emittiere Signal für Spielzustandsänderung
-        self.game_state_changed.emit(self.game_state)
+        Die Widgets werden nicht neu aufgebaut: Für jede Zone wird der neue
+        Inhalt über die Instanz-IDs mit den angezeigten Karten verglichen. Nur
+        neue Karten erhalten ein neues Widget, Karten, die die Zone wechseln,
+        nehmen ihr Widget mit, und geänderte Karten (getappt, angreifend ...)
+        werden an Ort und Stelle aktualisiert.
         
-    def _update_zones(self):
-        """Aktualisiert alle Spielzonen mit dem aktuellen Spielzustand."""
+        Args:
+            zone_names (iterable, optional): Die Namen der abzugleichenden Zonen
+                (siehe CARD_ZONE_NAMES); die übrigen Zonen bleiben unverändert.
+        """
         if not self.game_state:
             return
+        
+        # Sicht des Spielers am Gerät (verdeckte Informationen sind bereits entfernt)
+        view = self.game_engine.get_view(str(self.player1_id))
+        
+        # Neuer Inhalt jeder Zone: Zone -> (Zonenname, [(Karte, Besitzer, Vorderseite zeigen)])
+        # (Zonen ohne Spieler im aktuellen Spiel werden geleert)
+        targets = {zone: (None, []) for zone_name, zone in self._all_zones() if zone_name in zone_names}
+        
+        for player_id, player_data in view['players'].items():
+            # Hand (fremde Hände enthalten nur verdeckte Platzhalter)
+            if 'hand' in zone_names and player_id in self.hand_zones:
+                targets[self.hand_zones[player_id]] = ('hand', [
+                    (card, player_id, not card.get('face_down', False)) for card in player_data['hand']
+                ])
             
-        # Leere alle Zonen
-        for zone_dict in [self.hand_zones, self.library_zones, self.graveyard_zones, self.battlefield_zones]:
-            for zone in zone_dict.values():
-                zone.clear()
-                
-        self.stack_zone.clear()
-        self.exile_zone.clear()
-        
-        # Aktualisiere Spielerzonen
-        for player_id, player_data in self.game_state['players'].items():
-            # Hand
-            if player_id in self.hand_zones:
-                for card in player_data['hand']:
-                    # Für Spieler 1 zeigen wir die Karten, für Spieler 2 nicht (bei beiden Spielern am gleichen Gerät)
-                    show_face = (str(player_id) == str(self.player1_id))
-                    card_widget = create_card_widget(card, 'hand', player_id, self, show_face)
-                    self.hand_zones[player_id].add_card(card_widget)
-            
-            # Bibliothek
-            if player_id in self.library_zones and player_data['library']:
-                # Hier zeigen wir nur die Anzahl der Karten, nicht die Karten selbst
-                library_count = len(player_data['library'])
-                library_label = QLabel(f"{library_count} Karten")
-                library_label.setAlignment(Qt.AlignCenter)
-                library_label.setStyleSheet("font-weight: bold;")
-                self.library_zones[player_id].add_card(library_label)
-                
-                # Wir könnten auch die oberste Karte als verdeckt anzeigen
-                if library_count > 0:
-                    card = player_data['library'][0]  # Oberste Karte
-                    card_widget = create_card_widget(card, 'library', player_id, self, False)
-                    self.library_zones[player_id].add_card(card_widget)
+            # Bibliothek: nur die Anzahl und die oberste Karte verdeckt
+            if 'library' in zone_names and player_id in self.library_zones:
+                library_count = player_data['library_count']
+                library_zone = self.library_zones[player_id]
+                library_zone.set_info(f"{library_count} Karten" if library_count else "")
+                top_card = self._library_top_cards.setdefault(
+                    player_id, {'id': f"library_{player_id}", 'face_down': True}
+                )
+                targets[library_zone] = ('library', [(top_card, player_id, False)] if library_count else [])
             
             # Friedhof
-            if player_id in self.graveyard_zones:
-                for card in player_data['graveyard']:
-                    card_widget = create_card_widget(card, 'graveyard', player_id, self, True)
-                    self.graveyard_zones[player_id].add_card(card_widget)
-        
-        # Aktualisiere Battlefield
-        for card in self.game_state.get('battlefield', []):
-            controller_id = card.get('controller_id', '')
-            if controller_id in self.battlefield_zones:
-                card_widget = create_card_widget(card, 'battlefield', controller_id, self, True)
-                self.battlefield_zones[controller_id].add_card(card_widget)
-        
-        # Aktualisiere Stack
-        for card in self.game_state.get('stack', []):
-            card_widget = create_card_widget(card, 'stack', card.get('controller_id', ''), self, True)
-            self.stack_zone.add_card(card_widget)
-        
-        # Aktualisiere Exile
-        for card in self.game_state.get('exile', []):
-            card_widget = create_card_widget(card, 'exile', card.get('owner_id', ''), self, True)
-            self.exile_zone.add_card(card_widget)
+            if 'graveyard' in zone_names and player_id in self.graveyard_zones:
+                targets[self.graveyard_zones[player_id]] = ('graveyard', [
+                    (card, player_id, True) for card in player_data['graveyard']
+                ])
+        
+        # Battlefield (nach Beherrscher aufgeteilt)
+        if 'battlefield' in zone_names:
+            for zone in self.battlefield_zones.values():
+                targets[zone] = ('battlefield', [])
+            
+            for card in view['battlefield']:
+                controller_id = card.get('controller_id', '')
+                if controller_id in self.battlefield_zones:
+                    targets[self.battlefield_zones[controller_id]][1].append(
+                        (card, controller_id, not card.get('face_down', False))
+                    )
+        
+        # Stack und Exile
+        if 'stack' in zone_names:
+            targets[self.stack_zone] = ('stack', [
+                (card, card.get('controller_id', ''), True) for card in view['stack']
+            ])
+        if 'exile' in zone_names:
+            targets[self.exile_zone] = ('exile', [
+                (card, card.get('owner_id', ''), not card.get('face_down', False)) for card in view['exile']
+            ])
+        
+        # Während des Abgleichs nicht neu zeichnen (ein einziges Neuzeichnen am Ende)
+        self.setUpdatesEnabled(False)
+        try:
+            self._reconcile_zones(targets)
+        finally:
+            self.setUpdatesEnabled(True)
+    
+    def _all_zones(self):
+        """
+        Gibt alle Kartenzonen des Spielbretts mit ihren Namen zurück.
+        
+        Returns:
+            list: (Zonenname, Zone) der Zonen beider Sitzplätze sowie Stack und Exile.
+        """
+        zones = [(zone_name, zone) for seat in self.seat_zones.values() for zone_name, zone in seat.items()]
+        zones.extend([('stack', self.stack_zone), ('exile', self.exile_zone)])
+        return zones
+    
+    def _pool_for(self, zone):
+        """
+        Gibt den Vorrat zurück, aus dem eine Zone ihre Kartendarstellungen bezieht.
+        
+        Args:
+            zone (QWidget): Die Zone.
+        
+        Returns:
+            CardWidgetPool: Der Vorrat für Szenenelemente oder für Karten-Widgets
+                (None für virtualisierte Zonen ohne Widgets pro Karte).
+        """
+        if isinstance(zone, CardListZone):
+            return None
+        return self.item_pool if isinstance(zone, SceneBattlefieldZone) else self.card_pool
+    
+    def _reconcile_zones(self, targets):
+        """
+        Gleicht die angezeigten Karten-Widgets mit dem neuen Inhalt der Zonen ab.
+        
+        Args:
+            targets (dict): Zone -> (Zonenname, [(Karte, Besitzer-ID, Vorderseite zeigen)]).
+        """
+        # Schlüssel der Karten je Zone: die Instanz-ID, bei mehrfach
+        # vorkommenden IDs (Spieler mit gleichem Deck) ergänzt um die Wiederholung
+        keyed_targets = {}
+        for zone, (zone_name, cards) in targets.items():
+            seen = {}
+            keyed_cards = []
+            for card, owner_id, show_face in cards:
+                count = seen.get(card['id'], 0)
+                seen[card['id']] = count + 1
+                key = card['id'] if not count else (card['id'], count)
+                keyed_cards.append((key, card, owner_id, show_face))
+            keyed_targets[zone] = (zone_name, keyed_cards)
+        
+        # Zuerst alle Karten entnehmen, die ihre Zone verlassen haben, damit
+        # ihre Widgets in der neuen Zone weiterverwendet werden können
+        # (Schlüssel -> Liste von (Widget, Vorrat): gleiche Schlüssel können
+        # gleichzeitig aus mehreren Zonen stammen, z.B. bei gleichen Decks)
+        released = {}
+        for zone, (_, keyed_cards) in keyed_targets.items():
+            pool = self._pool_for(zone)
+            if pool is None:
+                continue
+            taken = zone.take_missing({key for key, _, _, _ in keyed_cards})
+            for key, widget in taken.items():
+                released.setdefault(key, []).append((widget, pool))
+        
+        for zone, (zone_name, keyed_cards) in keyed_targets.items():
+            pool = self._pool_for(zone)
+            if pool is None:
+                # Virtualisierte Zonen zeichnen ihre Karten selbst
+                zone.set_cards(zone_name, keyed_cards)
+                continue
+            
+            entries = []
+            for key, card, owner_id, show_face in keyed_cards:
+                widget = zone.cards_by_id.get(key)
+                if widget is None:
+                    widget = self._take_released(released, key, pool)
+                
+                if widget is None:
+                    widget = pool.acquire(card, zone_name, owner_id, show_face)
+                else:
+                    update_card_widget(widget, card, zone_name, owner_id, show_face)
+                entries.append((key, widget))
+            zone.place_cards(entries)
+        
+        # Widgets von Karten, die das Spiel verlassen haben (oder nicht mehr sichtbar sind)
+        for candidates in released.values():
+            for widget, pool in candidates:
+                pool.release(widget)
+    
+    @staticmethod
+    def _take_released(released, key, pool):
+        """
+        Entnimmt ein freigegebenes Widget einer Karte aus demselben Vorrat.
+        
+        Args:
+            released (dict): Schlüssel -> Liste von (Widget, Vorrat).
+            key: Der Schlüssel der Karte.
+            pool (CardWidgetPool): Der Vorrat der Zielzone.
+        
+        Returns:
+            Das Widget oder None, wenn keines weiterverwendet werden kann.
+        """
+        candidates = released.get(key)
+        if not candidates:
+            return None
+        
+        for index, (widget, widget_pool) in enumerate(candidates):
+            if widget_pool is pool:
+                del candidates[index]
+                if not candidates:
+                    del released[key]
+                return widget
+        return None
         
     def _update_phase_buttons(self):
         """Aktualisiert die Phasen-Buttons basierend auf der aktuellen Phase."""
         if not self.game_state:
             return
             
-        current_phase = self.game_state.get('phase', 'setup')
+        current_step = parse_step(self.game_state.get('phase', 'setup'))
         
-        # Aktiviere/Deaktiviere Phasen-Buttons basierend auf dem Spielzustand
-        phase_order = [
-            'untap', 'upkeep', 'draw', 'main1', 
-            'combat_begin', 'combat_attackers', 'combat_blockers', 'combat_damage', 'combat_end',
-            'main2', 'end', 'cleanup'
-        ]
-        
-        # Finde den Index der aktuellen Phase
-        if current_phase in phase_order:
-            current_phase_index = phase_order.index(current_phase)
-        else:
+        # Index der aktuellen Phase aus der vorberechneten Tabelle
+        # (in der Einrichtung ist der erste Schritt des Zuges der nächste)
+        if current_step == Step.SETUP:
             current_phase_index = -1
+        else:
+            current_phase_index = STEP_INDEX.get(current_step)
         
         # Setze Status der Buttons
-        for phase_id, button in self.phase_buttons.items():
-            # Aktiviere nur die aktuelle und die nächste Phase
-            if current_phase_index >= 0 and phase_id in phase_order:
-                phase_index = phase_order.index(phase_id)
-                enabled = (phase_index == current_phase_index or phase_index == current_phase_index + 1)
-                button.setEnabled(enabled)
-                
-                # Markiere die aktuelle Phase
-                if phase_index == current_phase_index:
-                    button.setStyleSheet("background-color: lightblue;")
-                else:
-                    button.setStyleSheet("")
-            else:
-                # Wenn wir uns in der Setup-Phase befinden, aktiviere keine Phasen-Buttons
+        for step, button in self.phase_buttons.items():
+            if current_phase_index is None:
+                # Nach Spielende sind keine Phasen-Buttons aktiv
                 button.setEnabled(False)
-                button.setStyleSheet("")
+                set_style_sheet(button, "")
+                continue
+            
+            # Aktiviere nur die aktuelle und die nächste Phase
+            phase_index = STEP_INDEX[step]
+            button.setEnabled(phase_index == current_phase_index or phase_index == current_phase_index + 1)
+            
+            # Markiere die aktuelle Phase
+            set_style_sheet(button, CURRENT_PHASE_STYLE if phase_index == current_phase_index else "")
                 
     def _update_player_actions(self):
         """Aktualisiert die Spieleraktionen basierend auf dem Spielzustand."""
@@ -806,14 +1119,19 @@ class GameBoardWidget(QWidget):
         current_phase = self.game_state.get('phase', 'setup')
         active_player_id = self.game_state.get('active_player_id', '')
         
+        # Mulligans sind nur vor Spielbeginn möglich, solange ein Spieler noch entscheidet
+        deciding_player_id = self.game_engine.get_undecided_player_id()
+        self.mulligan_button.setEnabled(bool(deciding_player_id))
+        self.keep_hand_button.setEnabled(bool(deciding_player_id))
+        
         # Karte ziehen ist nur in der Ziehphase aktiv
-        self.draw_card_button.setEnabled(current_phase == 'draw' and active_player_id)
+        self.draw_card_button.setEnabled(bool(current_phase == 'draw' and active_player_id))
         
         # Alles enttappen ist nur in der Enttapp-Phase aktiv
-        self.untap_all_button.setEnabled(current_phase == 'untap' and active_player_id)
+        self.untap_all_button.setEnabled(bool(current_phase == 'untap' and active_player_id))
         
         # Nächster Zug ist nur in der Aufräumphase aktiv
-        self.next_turn_button.setEnabled(current_phase == 'cleanup' and active_player_id)
+        self.next_turn_button.setEnabled(bool(current_phase == 'cleanup' and active_player_id))
         
     def enable_game_controls(self, enabled=True):
         """Aktiviert oder deaktiviert die Spielsteuerungselemente."""
@@ -821,10 +1139,13 @@ class GameBoardWidget(QWidget):
         for button in self.phase_buttons.values():
             button.setEnabled(enabled)
             
+        self.mulligan_button.setEnabled(enabled)
+        self.keep_hand_button.setEnabled(enabled)
         self.draw_card_button.setEnabled(enabled)
         self.untap_all_button.setEnabled(enabled)
         self.next_turn_button.setEnabled(enabled)
         self.end_game_button.setEnabled(enabled)
+        self.undo_button.setEnabled(enabled)
         
         if enabled:
             # Wenn aktiviert, aktualisiere den Status basierend auf dem Spielzustand
@@ -832,6 +1153,8 @@ class GameBoardWidget(QWidget):
             self._update_player_actions()
         else:
             # Wenn deaktiviert, alle Steuerelemente ausschalten
+            self.mulligan_button.setEnabled(False)
+            self.keep_hand_button.setEnabled(False)
             self.draw_card_button.setEnabled(False)
             self.untap_all_button.setEnabled(False)
             self.next_turn_button.setEnabled(False)
@@ -0,0 +1,86 @@
+"""
+Gesammelte Aktualisierung des Spielbretts für die Magic the Gathering Desktop App.
+
+Aktionen markieren nur die Bereiche des Spielbretts, die sich geändert haben
+(z.B. die Spielinfo oder eine bestimmte Zone). Alle Markierungen, die während
+eines Durchlaufs der Ereignisschleife anfallen, werden über einen Timer mit
+Wartezeit 0 zu einer einzigen Aktualisierung zusammengefasst; zwischen zwei
+Aktualisierungen liegt mindestens ein Frame.
+"""
+
+from PySide6.QtCore import QObject, QTimer, QElapsedTimer
+
+# Bereiche des Spielbretts, die einzeln aktualisiert werden (siehe GameBoardWidget.update_ui):
+# die Spielinfo, die Phasenleiste samt Spieleraktionen und jede Kartenzone
+REFRESH_INFO = 'info'
+REFRESH_PHASES = 'phases'
+CARD_ZONE_NAMES = ('hand', 'library', 'graveyard', 'battlefield', 'stack', 'exile')
+REFRESH_ALL = frozenset((REFRESH_INFO, REFRESH_PHASES) + CARD_ZONE_NAMES)
+
+# Mindestabstand zwischen zwei Aktualisierungen (ms, etwa 60 Bilder pro Sekunde)
+FRAME_INTERVAL_MS = 16
+
+
+class RefreshScheduler(QObject):
+    """
+    Sammelt geänderte Bereiche und aktualisiert sie höchstens einmal pro Frame.
+
+    Attribute:
+        dirty (set): Die seit der letzten Aktualisierung markierten Bereiche.
+        flush_count (int): Anzahl der ausgeführten Aktualisierungen.
+    """
+
+    def __init__(self, refresh, parent=None, frame_interval=FRAME_INTERVAL_MS):
+        """
+        Initialisiert den Planer.
+
+        Args:
+            refresh (callable): Erhält die Menge der geänderten Bereiche und aktualisiert sie.
+            parent (QObject, optional): Das Eltern-Objekt.
+            frame_interval (int, optional): Mindestabstand zwischen zwei Aktualisierungen in ms.
+        """
+        super().__init__(parent)
+
+        self.refresh = refresh
+        self.frame_interval = frame_interval
+        self.dirty = set()
+        self.flush_count = 0
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+
+        # Zeit seit der letzten Aktualisierung
+        self._last_flush = QElapsedTimer()
+
+    def mark(self, *regions):
+        """
+        Markiert Bereiche als geändert und plant die Aktualisierung.
+
+        Args:
+            *regions (str): Die geänderten Bereiche.
+        """
+        self.dirty.update(regions)
+        if not self.dirty or self._timer.isActive():
+            return
+
+        delay = 0
+        if self._last_flush.isValid():
+            delay = max(0, self.frame_interval - self._last_flush.elapsed())
+        self._timer.start(delay)
+
+    def flush(self):
+        """Aktualisiert alle markierten Bereiche sofort (auch vor Ablauf des Timers)."""
+        self._timer.stop()
+        if not self.dirty:
+            return
+
+        regions, self.dirty = self.dirty, set()
+        self._last_flush.start()
+        self.flush_count += 1
+        self.refresh(regions)
+
+    def cancel(self):
+        """Verwirft alle ausstehenden Markierungen."""
+        self._timer.stop()
+        self.dirty.clear()
@@ -1,7 +1,105 @@
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, QScrollArea, QFrame
 from PySide6.QtCore import Qt
 
-class GameZone(QWidget):
+
+def card_key(card_widget):
+    """
+    Gibt den Schlüssel zurück, unter dem ein Karten-Widget in seiner Zone eingetragen ist.
+
+    Args:
+        card_widget (QWidget): Das Widget der Karte.
+
+    Returns:
+        Die Instanz-ID der Karte oder das Widget selbst (z.B. für Beschriftungen).
+    """
+    if hasattr(card_widget, 'get_card_data'):
+        return card_widget.get_card_data().get('id', card_widget)
+    return card_widget
+
+
+class CardZoneMixin:
+    """
+    Abgleich der angezeigten Karten-Widgets einer Zone mit ihrem neuen Inhalt.
+
+    Die Widgets sind unter dem Schlüssel ihrer Karte eingetragen (cards_by_id;
+    die Instanz-ID, bei mehrfach vorkommenden IDs ergänzt um die Wiederholung). Beim Abgleich werden nur Widgets für neue Karten erstellt;
+    vorhandene Widgets bleiben bestehen und werden nur verschoben, wenn sich
+    ihre Position geändert hat. Die Klassen legen über _layout_for fest, in
+    welchem Layout (und ab welchem Index) eine Karte angezeigt wird.
+    """
+
+    def _layout_for(self, card_widget):
+        """
+        Gibt das Layout für ein Karten-Widget zurück.
+
+        Args:
+            card_widget (QWidget): Das Widget der Karte.
+
+        Returns:
+            QBoxLayout: Das Layout.
+            int: Der Index der ersten Karte im Layout (davor liegen z.B. Überschriften).
+        """
+        raise NotImplementedError
+
+    def _forget(self, card_widget):
+        """
+        Trägt ein Widget aus cards_by_id aus.
+
+        Args:
+            card_widget (QWidget): Das Widget.
+        """
+        for key, widget in list(self.cards_by_id.items()):
+            if widget is card_widget:
+                del self.cards_by_id[key]
+
+    def take_missing(self, card_ids):
+        """
+        Nimmt alle Karten aus der Zone, die nicht mehr in ihr liegen.
+
+        Die Widgets werden nicht gelöscht, sodass Karten, die nur die Zone
+        wechseln, ihr Widget in der neuen Zone weiterverwenden können.
+
+        Args:
+            card_ids (set): Die Schlüssel der Karten, die in der Zone bleiben.
+
+        Returns:
+            dict: Schlüssel -> Widget der entnommenen Karten.
+        """
+        taken = {}
+        for card_id, card_widget in list(self.cards_by_id.items()):
+            if card_id not in card_ids:
+                self.remove_card(card_widget)
+                taken[card_id] = card_widget
+        return taken
+
+    def place_cards(self, entries):
+        """
+        Zeigt die Karten-Widgets in der angegebenen Reihenfolge an.
+
+        Widgets, die bereits an der richtigen Stelle liegen, bleiben unberührt.
+
+        Args:
+            entries (list): (Schlüssel, Widget) in der Reihenfolge des Spielzustands.
+        """
+        next_index = {}
+        for _, card_widget in entries:
+            layout, first_index = self._layout_for(card_widget)
+            index = next_index.get(id(layout), first_index)
+            next_index[id(layout)] = index + 1
+
+            current_index = layout.indexOf(card_widget)
+            if current_index == index:
+                continue
+            if current_index >= 0:
+                layout.removeWidget(card_widget)
+            layout.insertWidget(index, card_widget)
+            card_widget.show()
+
+        self.cards = [card_widget for _, card_widget in entries]
+        self.cards_by_id = dict(entries)
+
+
+class GameZone(CardZoneMixin, QWidget):
     """Basisklasse für alle Spielzonen (Hand, Battlefield, Library, etc.).
 
     Eine GameZone repräsentiert einen Bereich auf dem Spielbrett, in dem Karten
@@ -18,6 +116,7 @@ class GameZone(QWidget):
         super().__init__(parent)
         self.name = name
         self.cards = []
+        self.cards_by_id = {}
         
         # Layout
         self.layout = QVBoxLayout(self)
@@ -27,6 +126,13 @@ class GameZone(QWidget):
         self.title.setAlignment(Qt.AlignCenter)
         self.layout.addWidget(self.title)
         
+        # Zusätzliche Angabe zur Zone (z.B. Anzahl der Karten einer Bibliothek)
+        self.info_label = QLabel()
+        self.info_label.setAlignment(Qt.AlignCenter)
+        self.info_label.setStyleSheet("font-weight: bold;")
+        self.info_label.hide()
+        self.layout.addWidget(self.info_label)
+        
         # Scrollbereich für Karten
         self.scroll = QScrollArea()
         self.scroll.setWidgetResizable(True)
@@ -35,6 +141,20 @@ class GameZone(QWidget):
         self.scroll.setWidget(self.scroll_content)
         self.layout.addWidget(self.scroll)
     
+    def _layout_for(self, card_widget):
+        """Gibt das Layout für ein Karten-Widget zurück (alle Karten liegen im selben Layout)."""
+        return self.cards_layout, 0
+    
+    def set_info(self, text):
+        """Setzt die zusätzliche Angabe zur Zone.
+
+        Args:
+            text (str): Der Text oder eine leere Zeichenkette, um die Angabe auszublenden.
+        """
+        if self.info_label.text() != text:
+            self.info_label.setText(text)
+        self.info_label.setVisible(bool(text))
+    
     def add_card(self, card_widget):
         """Fügt eine Karte zur Zone hinzu.
 
@@ -42,6 +162,7 @@ class GameZone(QWidget):
             card_widget (QWidget): Das Widget der hinzuzufügenden Karte.
         """
         self.cards.append(card_widget)
+        self.cards_by_id[card_key(card_widget)] = card_widget
         self.cards_layout.addWidget(card_widget)
     
     def remove_card(self, card_widget):
@@ -52,8 +173,11 @@ class GameZone(QWidget):
         """
         if card_widget in self.cards:
             self.cards.remove(card_widget)
+            self._forget(card_widget)
             self.cards_layout.removeWidget(card_widget)
-            card_widget.setParent(None)
+            
+            # Das Widget wird nur ausgeblendet und kann weiterverwendet werden
+            card_widget.hide()
     
     def clear(self):
         """Entfernt alle Karten aus der Zone."""
@@ -61,7 +185,7 @@ class GameZone(QWidget):
             self.remove_card(card)
 
 
-class BattlefieldZone(QWidget):
+class BattlefieldZone(CardZoneMixin, QWidget):
     """Spielfeldzone für Magic the Gathering.
     
     Diese Zone repräsentiert das Spielfeld, auf dem sich die gespielten Karten befinden.
@@ -80,6 +204,7 @@ class BattlefieldZone(QWidget):
         self.name = name
         self.player_id = player_id
         self.cards = []
+        self.cards_by_id = {}
         
         # Layout
         self.layout = QVBoxLayout(self)
@@ -147,6 +272,30 @@ class BattlefieldZone(QWidget):
             title_label.setAlignment(Qt.AlignCenter)
             widget.layout().insertWidget(0, title_label)
     
+    def _layout_for(self, card_widget):
+        """Gibt das Layout des Bereichs zurück, zu dessen Kartentyp die Karte gehört.
+        
+        Args:
+            card_widget (QWidget): Das Widget der Karte.
+        
+        Returns:
+            QBoxLayout: Das Layout des Bereichs.
+            int: Der Index der ersten Karte (davor liegt die Überschrift des Bereichs).
+        """
+        card_data = card_widget.get_card_data() if hasattr(card_widget, 'get_card_data') else None
+        card_type = card_data.get('type', '') if card_data else ''
+        
+        # Fallback, wenn kein Typ erkannt wird: andere Permanents
+        if 'Land' in card_type:
+            layout = self.land_layout
+        elif 'Creature' in card_type:
+            layout = self.creature_layout
+        else:
+            layout = self.other_layout
+        
+        # Die Überschrift des Bereichs liegt an erster Stelle
+        return layout, 1
+    
     def add_card(self, card_widget):
         """Fügt eine Karte zum Spielfeld hinzu.
         
@@ -154,20 +303,11 @@ class BattlefieldZone(QWidget):
             card_widget (QWidget): Das Widget der hinzuzufügenden Karte.
         """
         self.cards.append(card_widget)
+        self.cards_by_id[card_key(card_widget)] = card_widget
         
-        # Bestimme den Kartentyp und füge die Karte zum entsprechenden Bereich hinzu
-        card_data = card_widget.property('card_data')
-        if card_data and 'type' in card_data:
-            card_type = card_data['type']
-            if 'Land' in card_type:
-                self.land_layout.addWidget(card_widget)
-            elif 'Creature' in card_type:
-                self.creature_layout.addWidget(card_widget)
-            else:
-                self.other_layout.addWidget(card_widget)
-        else:
-            # Fallback, wenn kein Typ erkannt wird
-            self.other_layout.addWidget(card_widget)
+        # Die Karte kommt in den Bereich ihres Kartentyps
+        layout, _ = self._layout_for(card_widget)
+        layout.addWidget(card_widget)
     
     def remove_card(self, card_widget):
         """Entfernt eine Karte aus dem Spielfeld.
@@ -177,21 +317,14 @@ class BattlefieldZone(QWidget):
         """
         if card_widget in self.cards:
             self.cards.remove(card_widget)
+            self._forget(card_widget)
             
             # Entferne die Karte aus dem entsprechenden Layout
-            card_data = card_widget.property('card_data')
-            if card_data and 'type' in card_data:
-                card_type = card_data['type']
-                if 'Land' in card_type:
-                    self.land_layout.removeWidget(card_widget)
-                elif 'Creature' in card_type:
-                    self.creature_layout.removeWidget(card_widget)
-                else:
-                    self.other_layout.removeWidget(card_widget)
-            else:
-                self.other_layout.removeWidget(card_widget)
+            layout, _ = self._layout_for(card_widget)
+            layout.removeWidget(card_widget)
             
-            card_widget.setParent(None)
+            # Das Widget wird nur ausgeblendet und kann weiterverwendet werden
+            card_widget.hide()
     
     def clear(self):
         """Entfernt alle Karten aus dem Spielfeld."""
@@ -0,0 +1,280 @@
+"""
+Kartenkatalog-Modell für die Magic the Gathering Desktop App.
+
+Dieses Modul definiert ein Listenmodell, das die Ergebnisse einer Kartensuche
+seitenweise aus der Datenbank lädt. Die Ansicht fordert über canFetchMore und
+fetchMore nur so viele Seiten an, wie zum Anzeigen (und Scrollen) nötig sind.
+Die Abfragen laufen in einem eigenen Thread; jede neue Suchanfrage erhält eine
+Generationsnummer, sodass Ergebnisse veralteter Anfragen verworfen und noch
+nicht begonnene Abfragen übersprungen werden.
+Geladene Zeilen werden pro Suchanfrage zwischengespeichert, sodass ein
+Wechsel zurück zu einer vorherigen Suche ohne erneute Abfrage auskommt.
+"""
+
+from collections import OrderedDict
+
+from PySide6.QtCore import (
+    Qt, QAbstractListModel, QModelIndex, QObject, QThread, QCoreApplication, Signal, Slot
+)
+from pony.orm import db_session
+
+from app.models.card_query import CardQuery
+
+# Anzahl der Karten, die pro Seite aus der Datenbank geladen werden
+CATALOG_PAGE_SIZE = 200
+
+# Größe der ersten Seite einer Suche (klein, damit erste Treffer schnell erscheinen)
+CATALOG_FIRST_PAGE_SIZE = 50
+
+# Anzahl der Suchanfragen, deren geladene Zeilen zwischengespeichert werden
+QUERY_CACHE_SIZE = 8
+
+
+class CatalogSearchWorker(QObject):
+    """
+    Führt Katalogabfragen außerhalb des GUI-Threads aus.
+
+    Das Objekt lebt in einem eigenen QThread; Anfragen erreichen es über eine
+    Signal-Verbindung und werden der Reihe nach abgearbeitet.
+    """
+
+    # Generationsnummer, Zeilen der Seite, alle Ergebnisse geladen, Fehlermeldung
+    page_loaded = Signal(int, object, bool, str)
+
+    def __init__(self):
+        """Initialisiert den Worker."""
+        super().__init__()
+
+        # Generation der aktuellen Suchanfrage (wird vom GUI-Thread gesetzt)
+        self.generation = 0
+
+    def cancel(self, generation):
+        """
+        Markiert alle Anfragen älterer Generationen als veraltet.
+
+        Wird direkt aus dem GUI-Thread aufgerufen, damit bereits eingereihte
+        Anfragen übersprungen werden, ohne auf ihre Ausführung zu warten.
+
+        Args:
+            generation (int): Die Generation der neuen Suchanfrage.
+        """
+        self.generation = generation
+
+    @Slot(int, object, object, int)
+    def fetch_page(self, generation, query, after, limit):
+        """
+        Lädt eine Seite der Ergebnisse und meldet sie über page_loaded.
+
+        Args:
+            generation (int): Die Generation der Suchanfrage.
+            query (CardQuery): Die übersetzte Suchanfrage.
+            after (tuple): Schlüssel der vorherigen Seite oder None.
+            limit (int): Maximale Anzahl der Karten.
+        """
+        if generation != self.generation:
+            return
+
+        try:
+            with db_session:
+                rows, error = query.fetch_page(after, limit)
+        except Exception as e:
+            rows, error = [], str(e)
+
+        # Während der Abfrage wurde eine neue Suche gestartet
+        if generation != self.generation:
+            return
+
+        self.page_loaded.emit(generation, rows, len(rows) < limit, error or "")
+
+
+class CardCatalogModel(QAbstractListModel):
+    """
+    Listenmodell für den Kartenkatalog.
+
+    Jede Zeile ist ein Tupel mit den Spalten aus card_query.RESULT_COLUMNS
+    (id, name, card_type, mana_cost, colors), bei freien Suchbegriffen gefolgt
+    von der bm25-Gewichtung. Die Karten-ID liegt unter Qt.UserRole. Seiten
+    werden asynchron geladen und beim Eintreffen an die Liste angehängt.
+    """
+
+    # Wird ausgelöst, wenn eine Seite angefordert wird (Generation, Anfrage, Schlüssel, Limit)
+    page_requested = Signal(int, object, object, int)
+
+    def __init__(self, page_size=CATALOG_PAGE_SIZE, parent=None):
+        """
+        Initialisiert das Modell ohne Suchanfrage.
+
+        Args:
+            page_size (int, optional): Anzahl der Karten pro Seite.
+            parent (QObject, optional): Das Eltern-Objekt.
+        """
+        super().__init__(parent)
+
+        self.page_size = page_size
+        self.query = None
+        self.rows = []
+        self.page_key = None
+        self.exhausted = True
+        self.loading = False
+        self.generation = 0
+
+        # Suchanfrage -> (geladene Zeilen, Schlüssel der nächsten Seite, vollständig geladen)
+        self._query_cache = OrderedDict()
+
+        # Abfragen laufen in einem eigenen Thread
+        self.worker = CatalogSearchWorker()
+        self.worker_thread = QThread(self)
+        self.worker.moveToThread(self.worker_thread)
+        self.worker_thread.finished.connect(self.worker.deleteLater)
+        self.page_requested.connect(self.worker.fetch_page)
+        self.worker.page_loaded.connect(self.on_page_loaded)
+        self.worker_thread.start()
+
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.stop)
+
+    def stop(self):
+        """Bricht laufende Anfragen ab und beendet den Abfrage-Thread."""
+        if not self.worker_thread.isRunning():
+            return
+
+        self.generation += 1
+        self.worker.cancel(self.generation)
+        self.worker_thread.quit()
+        self.worker_thread.wait()
+
+    def set_query(self, query):
+        """
+        Setzt eine neue Suchanfrage und verwirft die angezeigten Zeilen.
+
+        Die erste Seite wird von der Ansicht über fetchMore angefordert.
+        Noch ausstehende Seiten der vorherigen Anfrage werden verworfen.
+
+        Args:
+            query (CardQuery): Die übersetzte Suchanfrage.
+        """
+        self._store_current()
+
+        self.generation += 1
+        self.worker.cancel(self.generation)
+
+        self.beginResetModel()
+        self.query = query
+        self.loading = False
+
+        cached = self._query_cache.pop(query.text, None) if query.error is None else None
+        if cached:
+            self.rows, self.page_key, self.exhausted = cached
+        else:
+            self.rows = []
+            self.page_key = None
+            self.exhausted = query.error is not None
+        self.endResetModel()
+
+    def clear_cache(self):
+        """Verwirft alle zwischengespeicherten Suchergebnisse (z.B. nach einem Kartenimport)."""
+        self._query_cache.clear()
+
+    def _store_current(self):
+        """Legt die Zeilen der aktuellen Suchanfrage im Zwischenspeicher ab."""
+        if self.query is None or self.query.error is not None or not self.rows:
+            return
+
+        self._query_cache[self.query.text] = (self.rows, self.page_key, self.exhausted)
+        self._query_cache.move_to_end(self.query.text)
+        while len(self._query_cache) > QUERY_CACHE_SIZE:
+            self._query_cache.popitem(last=False)
+
+    def rowCount(self, parent=QModelIndex()):
+        """
+        Gibt die Anzahl der bisher geladenen Zeilen zurück.
+
+        Args:
+            parent (QModelIndex, optional): Der Elternindex (Listen haben keine Kinder).
+
+        Returns:
+            int: Die Anzahl der Zeilen.
+        """
+        return 0 if parent.isValid() else len(self.rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        """
+        Gibt die Daten einer Zeile zurück.
+
+        Args:
+            index (QModelIndex): Der Index der Zeile.
+            role (int, optional): Die angeforderte Rolle.
+
+        Returns:
+            Der Anzeigetext, die Karten-ID (Qt.UserRole), die Manakosten als
+            Tooltip oder None.
+        """
+        if not index.isValid() or index.row() >= len(self.rows):
+            return None
+
+        card_id, name, card_type, mana_cost = self.rows[index.row()][:4]
+        if role == Qt.DisplayRole:
+            return f"{name} ({card_type})"
+        if role == Qt.UserRole:
+            return card_id
+        if role == Qt.ToolTipRole:
+            return f"{name} {mana_cost}" if mana_cost else name
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        """
+        Prüft, ob weitere Seiten geladen werden können.
+
+        Args:
+            parent (QModelIndex, optional): Der Elternindex.
+
+        Returns:
+            bool: True, wenn noch nicht alle Ergebnisse geladen sind.
+        """
+        return not parent.isValid() and not self.exhausted and not self.loading
+
+    def fetchMore(self, parent=QModelIndex()):
+        """
+        Fordert die nächste Seite der Suchergebnisse beim Abfrage-Thread an.
+
+        Args:
+            parent (QModelIndex, optional): Der Elternindex.
+        """
+        if parent.isValid() or self.exhausted or self.loading or self.query is None:
+            return
+
+        limit = self.page_size if self.rows else min(CATALOG_FIRST_PAGE_SIZE, self.page_size)
+        self.loading = True
+        self.page_requested.emit(self.generation, self.query, self.page_key, limit)
+
+    @Slot(int, object, bool, str)
+    def on_page_loaded(self, generation, rows, exhausted, error):
+        """
+        Hängt eine geladene Seite an die Liste an.
+
+        Args:
+            generation (int): Die Generation der Suchanfrage.
+            rows (list): Die Zeilen der Seite.
+            exhausted (bool): True, wenn keine weiteren Seiten folgen.
+            error (str): Fehlermeldung oder eine leere Zeichenkette.
+        """
+        # Ergebnis einer veralteten Suchanfrage
+        if generation != self.generation:
+            return
+
+        self.loading = False
+        if error:
+            print(f"Fehler beim Laden des Kartenkatalogs: {error}")
+            self.exhausted = True
+            return
+
+        self.exhausted = exhausted
+        if not rows:
+            return
+
+        first = len(self.rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self.rows.extend(rows)
+        self.page_key = CardQuery.page_key(rows)
+        self.endInsertRows()
@@ -0,0 +1,760 @@
+"""
+Kartenbilder für die Magic the Gathering Desktop App.
+
+Dieses Modul lädt Kartenbilder in der angezeigten Größe und hält sie auf zwei
+Ebenen vor:
+
+1. Im Speicher: ein LRU-Zwischenspeicher mit Speicherbudget, Schlüssel
+   (Karten-ID, Breite, Höhe, Seite, getappt). Werden mehr Bytes belegt als
+   das Budget erlaubt, fallen die am längsten nicht benutzten Bilder heraus.
+2. Auf der Festplatte: bereits verkleinerte Vorschaubilder unter
+   data/cards/.thumbs. Ein Vorschaubild wird neu erstellt, wenn das
+   Originalbild neuer ist.
+
+Ein Bild wird so pro Größe nur einmal dekodiert und skaliert; jedes weitere
+Neuzeichnen eines Spielbretts oder Katalogs liest es aus dem Speicher.
+
+Über request_pixmap werden Bilder außerhalb des GUI-Threads in einem
+QThreadPool geladen. QImageReader dekodiert dabei direkt in der Zielgröße
+(setScaledSize), sodass das Bild nie in voller Größe im Speicher liegt. Bis
+das Bild bereit ist, zeigt der Aufrufer einen Platzhalter; noch nicht
+begonnene Anfragen lassen sich abbrechen.
+
+Platzhalter für Karten ohne Bild werden ebenfalls nur einmal pro Karte und
+Größe gezeichnet und im selben Speicher abgelegt (get_placeholder);
+prewarm_placeholders zeichnet sie bei Bedarf im Hintergrund vor.
+"""
+
+import itertools
+import re
+from collections import OrderedDict
+from pathlib import Path
+
+from PySide6.QtCore import Qt, QObject, QRect, QRunnable, QThreadPool, Signal, Slot
+from PySide6.QtGui import QColor, QFont, QImage, QImageReader, QPainter, QPen, QPixmap, QTransform
+
+# Verzeichnis der Kartenbilder (relative Bildpfade der Karten beziehen sich hierauf)
+CARDS_DIR = Path(__file__).parent.parent.parent.parent / 'data' / 'cards'
+
+# Unterverzeichnis für die verkleinerten Vorschaubilder
+THUMBNAIL_DIR_NAME = '.thumbs'
+
+# Dateiformat der Vorschaubilder
+THUMBNAIL_FORMAT = 'png'
+
+# Speicherbudget des Zwischenspeichers im Speicher (in Bytes)
+IMAGE_MEMORY_BUDGET = 64 * 1024 * 1024
+
+# Anzahl der Threads, die Bilder dekodieren
+IMAGE_DECODE_THREADS = 2
+
+# Hintergrund der Platzhalter nach Kartentyp (erster Treffer in der Typzeile)
+PLACEHOLDER_BACKGROUNDS = (
+    ('creature', QColor(200, 200, 200)),
+    ('instant', QColor(200, 200, 255)),
+    ('sorcery', QColor(255, 200, 200)),
+    ('land', QColor(200, 255, 200)),
+)
+PLACEHOLDER_DEFAULT_BACKGROUND = QColor(255, 255, 200)
+
+# Schrift der Platzhalter und Schriftgrößen (Name, Typ, Regeltext, Stärke/Widerstandskraft)
+PLACEHOLDER_FONT_FAMILY = 'Arial'
+PLACEHOLDER_NAME_FONT_SIZE = 10
+PLACEHOLDER_TYPE_FONT_SIZE = 8
+PLACEHOLDER_RULES_FONT_SIZE = 7
+PLACEHOLDER_POWER_FONT_SIZE = 10
+
+# Anzahl der Platzhalter, die eine Hintergrundaufgabe auf einmal zurückliefert
+PLACEHOLDER_BATCH_SIZE = 50
+
+# Zeichen, die in Dateinamen der Vorschaubilder ersetzt werden
+UNSAFE_FILENAME_PATTERN = re.compile(r'[^\w.-]+')
+
+# Gemeinsamer Zwischenspeicher (siehe get_image_cache)
+_image_cache = None
+
+
+def pixmap_cost(pixmap):
+    """
+    Gibt den Speicherbedarf einer Pixmap zurück.
+
+    Args:
+        pixmap (QPixmap): Die Pixmap.
+
+    Returns:
+        int: Der Speicherbedarf in Bytes.
+    """
+    return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+
+def read_scaled_image(source_path, thumb_path, width, height):
+    """
+    Liest ein Kartenbild in der angegebenen Größe.
+
+    Ein aktuelles Vorschaubild wird direkt gelesen. Sonst dekodiert
+    QImageReader das Originalbild gleich in der Zielgröße, und das Ergebnis
+    wird als Vorschaubild gespeichert. Die Funktion verwendet nur QImage und
+    kann daher auch in Worker-Threads laufen.
+
+    Args:
+        source_path (Path): Der vollständige Pfad des Originalbilds.
+        thumb_path (Path): Der Pfad des Vorschaubilds.
+        width (int): Die Breite in Pixeln.
+        height (int): Die Höhe in Pixeln.
+
+    Returns:
+        QImage: Das skalierte Bild oder None, wenn das Bild nicht geladen werden konnte.
+        bool: True, wenn das Bild aus dem Vorschaubild stammt.
+    """
+    try:
+        source_mtime = source_path.stat().st_mtime
+    except OSError:
+        print(f"Kartenbild nicht gefunden: {source_path}")
+        return None, False
+
+    try:
+        if thumb_path.stat().st_mtime >= source_mtime:
+            image = QImageReader(str(thumb_path)).read()
+            if not image.isNull():
+                return image, True
+    except OSError:
+        pass
+
+    reader = QImageReader(str(source_path))
+    reader.setAutoTransform(True)
+    size = reader.size()
+    if size.isValid():
+        reader.setScaledSize(size.scaled(width, height, Qt.KeepAspectRatio))
+
+    image = reader.read()
+    if image.isNull():
+        print(f"Fehler beim Laden des Kartenbilds: {source_path} ({reader.errorString()})")
+        return None, False
+
+    # Formate ohne bekannte Größe werden nachträglich skaliert
+    if image.width() > width or image.height() > height:
+        image = image.scaled(width, height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+    try:
+        thumb_path.parent.mkdir(parents=True, exist_ok=True)
+        image.save(str(thumb_path), THUMBNAIL_FORMAT.upper())
+    except OSError as e:
+        print(f"Vorschaubild konnte nicht gespeichert werden: {e}")
+
+    return image, False
+
+
+def placeholder_key(card_data, width, height):
+    """
+    Bildet den Schlüssel eines Platzhalters im Speicher.
+
+    Stärke und Widerstandskraft gehören zum Schlüssel, da sie auf dem
+    Platzhalter stehen und sich im Spiel ändern können.
+
+    Args:
+        card_data (dict): Die Kartendaten.
+        width (int): Die Breite in Pixeln.
+        height (int): Die Höhe in Pixeln.
+
+    Returns:
+        tuple: Der Schlüssel.
+    """
+    card_id = card_data.get('card_id', card_data.get('id', card_data.get('name')))
+    return ('placeholder', card_id, width, height, card_data.get('power'), card_data.get('toughness'))
+
+
+def placeholder_fonts():
+    """
+    Erstellt die Schriften der Platzhalter.
+
+    Returns:
+        tuple: (Name, Typ, Regeltext, Stärke/Widerstandskraft)
+    """
+    name_font = QFont(PLACEHOLDER_FONT_FAMILY, PLACEHOLDER_NAME_FONT_SIZE)
+    name_font.setBold(True)
+    power_font = QFont(PLACEHOLDER_FONT_FAMILY, PLACEHOLDER_POWER_FONT_SIZE)
+    power_font.setBold(True)
+    return (
+        name_font,
+        QFont(PLACEHOLDER_FONT_FAMILY, PLACEHOLDER_TYPE_FONT_SIZE),
+        QFont(PLACEHOLDER_FONT_FAMILY, PLACEHOLDER_RULES_FONT_SIZE),
+        power_font,
+    )
+
+
+def render_placeholder_image(card_data, width, height, fonts=None):
+    """
+    Zeichnet den Platzhalter einer Karte ohne Bild.
+
+    Die Funktion zeichnet nur in ein QImage und kann daher auch in
+    Worker-Threads laufen.
+
+    Args:
+        card_data (dict): Die Kartendaten.
+        width (int): Die Breite in Pixeln.
+        height (int): Die Höhe in Pixeln.
+        fonts (tuple, optional): Die Schriften (siehe placeholder_fonts).
+
+    Returns:
+        QImage: Der Platzhalter.
+    """
+    name_font, type_font, rules_font, power_font = fonts or placeholder_fonts()
+    card_type = card_data.get('type', '')
+    type_lower = card_type.lower()
+
+    image = QImage(width, height, QImage.Format_ARGB32_Premultiplied)
+    image.fill(Qt.white)
+
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.Antialiasing)
+
+    # Rahmen
+    pen = QPen(QColor(0, 0, 0))
+    pen.setWidth(2)
+    painter.setPen(pen)
+    painter.drawRect(1, 1, width - 2, height - 2)
+
+    # Hintergrund je nach Kartentyp
+    background = PLACEHOLDER_DEFAULT_BACKGROUND
+    for type_name, color in PLACEHOLDER_BACKGROUNDS:
+        if type_name in type_lower:
+            background = color
+            break
+    painter.fillRect(2, 2, width - 4, height - 4, background)
+
+    # Name, Typ und Regeltext
+    painter.setFont(name_font)
+    painter.drawText(QRect(5, 5, width - 10, 20), Qt.AlignCenter, card_data.get('name', 'Unbekannte Karte'))
+
+    painter.setFont(type_font)
+    painter.drawText(QRect(5, 30, width - 10, 20), Qt.AlignCenter, card_type)
+
+    painter.setFont(rules_font)
+    painter.drawText(
+        QRect(5, 55, width - 10, height - 80), Qt.AlignLeft | Qt.TextWordWrap, card_data.get('rules_text') or ''
+    )
+
+    # Stärke/Widerstandskraft für Kreaturen
+    if 'creature' in type_lower:
+        pt_text = f"{card_data.get('power', '0')}/{card_data.get('toughness', '0')}"
+        painter.setFont(power_font)
+        painter.drawText(QRect(width - 30, height - 25, 25, 20), Qt.AlignRight, pt_text)
+
+    painter.end()
+    return image
+
+
+class PlaceholderRenderTask(QRunnable):
+    """Zeichnet Platzhalter im Hintergrund vor (siehe CardImageCache.prewarm_placeholders)."""
+
+    def __init__(self, cache, cards, width, height):
+        """
+        Initialisiert die Aufgabe.
+
+        Args:
+            cache (CardImageCache): Der Zwischenspeicher, der die Platzhalter erhält.
+            cards (list): Die Kartendaten (dicts).
+            width (int): Die Breite in Pixeln.
+            height (int): Die Höhe in Pixeln.
+        """
+        super().__init__()
+        self.cache = cache
+        self.cards = cards
+        self.width = width
+        self.height = height
+
+    def run(self):
+        """Zeichnet die Platzhalter und liefert sie in Gruppen an den Zwischenspeicher."""
+        fonts = placeholder_fonts()
+        batch = []
+        for card_data in self.cards:
+            key = placeholder_key(card_data, self.width, self.height)
+            batch.append((key, render_placeholder_image(card_data, self.width, self.height, fonts)))
+            if len(batch) >= PLACEHOLDER_BATCH_SIZE:
+                self.cache.placeholders_rendered.emit(batch)
+                batch = []
+        if batch:
+            self.cache.placeholders_rendered.emit(batch)
+
+
+class ImageDecodeTask(QRunnable):
+    """Lädt ein Kartenbild in einem Thread des QThreadPool."""
+
+    def __init__(self, cache, key, image_path, source_path, thumb_path, width, height):
+        """
+        Initialisiert die Aufgabe.
+
+        Args:
+            cache (CardImageCache): Der Zwischenspeicher, der das Ergebnis erhält.
+            key (tuple): Der Schlüssel des ungedrehten Bildes.
+            image_path (str): Der Bildpfad, wie ihn die Karte angibt.
+            source_path (Path): Der vollständige Pfad des Originalbilds.
+            thumb_path (Path): Der Pfad des Vorschaubilds.
+            width (int): Die Breite in Pixeln.
+            height (int): Die Höhe in Pixeln.
+        """
+        super().__init__()
+        self.setAutoDelete(False)
+
+        self.cache = cache
+        self.key = key
+        self.image_path = image_path
+        self.source_path = source_path
+        self.thumb_path = thumb_path
+        self.width = width
+        self.height = height
+        self.cancelled = False
+
+    def run(self):
+        """
+        Dekodiert das Bild und meldet es an den Zwischenspeicher.
+
+        Auch eine abgebrochene Aufgabe meldet sich (ohne Bild), damit der
+        Zwischenspeicher ihren Eintrag in den laufenden Anfragen entfernt.
+        """
+        if self.cancelled:
+            self.cache.image_loaded.emit(self, None, False)
+            return
+
+        image, from_thumbnail = read_scaled_image(self.source_path, self.thumb_path, self.width, self.height)
+        self.cache.image_loaded.emit(self, image, from_thumbnail)
+
+
+class CardImageCache(QObject):
+    """
+    Zweistufiger Zwischenspeicher für skalierte Kartenbilder.
+
+    Attribute:
+        cards_dir (Path): Verzeichnis der Kartenbilder.
+        thumbs_dir (Path): Verzeichnis der Vorschaubilder.
+        memory_budget (int): Maximaler Speicherbedarf der Bilder im Speicher (in Bytes).
+        memory_used (int): Aktueller Speicherbedarf (in Bytes).
+        hits (int): Anzahl der Treffer im Speicher.
+        disk_hits (int): Anzahl der aus Vorschaubildern geladenen Bilder.
+        decodes (int): Anzahl der dekodierten Originalbilder.
+    """
+
+    # Ladeaufgabe, geladenes Bild (oder None), aus Vorschaubild (aus einem Worker-Thread)
+    image_loaded = Signal(object, object, bool)
+
+    # Liste von (Schlüssel, QImage) vorgezeichneter Platzhalter (aus einem Worker-Thread)
+    placeholders_rendered = Signal(object)
+
+    def __init__(self, cards_dir=CARDS_DIR, memory_budget=IMAGE_MEMORY_BUDGET, parent=None):
+        """
+        Initialisiert den Zwischenspeicher.
+
+        Args:
+            cards_dir (str, optional): Verzeichnis der Kartenbilder.
+            memory_budget (int, optional): Speicherbudget in Bytes.
+            parent (QObject, optional): Das Eltern-Objekt.
+        """
+        super().__init__(parent)
+
+        self.cards_dir = Path(cards_dir)
+        self.thumbs_dir = self.cards_dir / THUMBNAIL_DIR_NAME
+        self.memory_budget = memory_budget
+        self.memory_used = 0
+
+        # Schlüssel -> (Pixmap, Speicherbedarf), zuletzt benutzte am Ende
+        self._pixmaps = OrderedDict()
+
+        # Bildpfade, die nicht geladen werden konnten (keine erneute Prüfung)
+        self._missing = set()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.decodes = 0
+
+        # Asynchrones Laden: Schlüssel des ungedrehten Bildes -> (Aufgabe, {Ticket: (Schlüssel, Bildpfad, Rückruf)})
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(IMAGE_DECODE_THREADS)
+        self._pending = {}
+        self._ticket_keys = {}
+        self._tickets = itertools.count(1)
+        self.image_loaded.connect(self._on_image_loaded)
+        self.placeholders_rendered.connect(self._on_placeholders_rendered)
+
+        # Schriften für im GUI-Thread gezeichnete Platzhalter (einmal erstellt)
+        self._placeholder_fonts = None
+
+    @staticmethod
+    def cache_key(card_id, width, height, face=0, tapped=False):
+        """
+        Bildet den Schlüssel eines Bildes im Speicher.
+
+        Args:
+            card_id: Die ID der Karte.
+            width (int): Die Breite in Pixeln.
+            height (int): Die Höhe in Pixeln.
+            face (int, optional): Die Seite der Karte (0 = Vorderseite).
+            tapped (bool, optional): Ob das Bild gedreht (getappt) ist.
+
+        Returns:
+            tuple: Der Schlüssel.
+        """
+        return (card_id, width, height, face, bool(tapped))
+
+    def resolve_path(self, image_path):
+        """
+        Gibt den vollständigen Pfad eines Kartenbilds zurück.
+
+        Args:
+            image_path (str): Der Bildpfad (relativ zu cards_dir oder absolut).
+
+        Returns:
+            Path: Der vollständige Pfad.
+        """
+        path = Path(image_path)
+        return path if path.is_absolute() else self.cards_dir / path
+
+    def thumbnail_path(self, source_path, width, height):
+        """
+        Gibt den Pfad des Vorschaubilds eines Kartenbilds zurück.
+
+        Args:
+            source_path (Path): Der vollständige Pfad des Originalbilds.
+            width (int): Die Breite in Pixeln.
+            height (int): Die Höhe in Pixeln.
+
+        Returns:
+            Path: Der Pfad des Vorschaubilds.
+        """
+        try:
+            relative = source_path.relative_to(self.cards_dir)
+        except ValueError:
+            relative = source_path
+        stem = UNSAFE_FILENAME_PATTERN.sub('_', str(relative.with_suffix(''))).strip('_')
+        return self.thumbs_dir / f"{stem}_{width}x{height}.{THUMBNAIL_FORMAT}"
+
+    def get(self, key):
+        """
+        Gibt ein Bild aus dem Speicher zurück.
+
+        Args:
+            key (tuple): Der Schlüssel (siehe cache_key).
+
+        Returns:
+            QPixmap: Das Bild oder None, wenn es nicht im Speicher liegt.
+        """
+        entry = self._pixmaps.get(key)
+        if entry is None:
+            return None
+
+        self._pixmaps.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, pixmap):
+        """
+        Legt ein Bild im Speicher ab und verdrängt bei Bedarf die ältesten Bilder.
+
+        Args:
+            key (tuple): Der Schlüssel (siehe cache_key).
+            pixmap (QPixmap): Das Bild.
+        """
+        old_entry = self._pixmaps.pop(key, None)
+        if old_entry is not None:
+            self.memory_used -= old_entry[1]
+
+        cost = pixmap_cost(pixmap)
+        self._pixmaps[key] = (pixmap, cost)
+        self.memory_used += cost
+        self._evict()
+
+    def set_memory_budget(self, memory_budget):
+        """
+        Ändert das Speicherbudget und verdrängt bei Bedarf Bilder.
+
+        Args:
+            memory_budget (int): Das neue Speicherbudget in Bytes.
+        """
+        self.memory_budget = memory_budget
+        self._evict()
+
+    def _evict(self):
+        """Verdrängt die am längsten nicht benutzten Bilder, bis das Budget eingehalten ist."""
+        # Das zuletzt abgelegte Bild bleibt auch dann erhalten, wenn es allein das Budget übersteigt
+        while self.memory_used > self.memory_budget and len(self._pixmaps) > 1:
+            _, (_, cost) = self._pixmaps.popitem(last=False)
+            self.memory_used -= cost
+
+    def clear(self):
+        """Leert den Speicher (die Vorschaubilder auf der Festplatte bleiben erhalten)."""
+        self._pixmaps.clear()
+        self._missing.clear()
+        self.memory_used = 0
+
+    def get_placeholder(self, card_data, width, height):
+        """
+        Gibt den Platzhalter einer Karte ohne Bild zurück.
+
+        Der Platzhalter wird pro Karte und Größe nur einmal gezeichnet.
+
+        Args:
+            card_data (dict): Die Kartendaten.
+            width (int): Die Breite in Pixeln.
+            height (int): Die Höhe in Pixeln.
+
+        Returns:
+            QPixmap: Der Platzhalter.
+        """
+        key = placeholder_key(card_data, width, height)
+        pixmap = self.get(key)
+        if pixmap is not None:
+            return pixmap
+
+        if self._placeholder_fonts is None:
+            self._placeholder_fonts = placeholder_fonts()
+        pixmap = QPixmap.fromImage(render_placeholder_image(card_data, width, height, self._placeholder_fonts))
+        self.put(key, pixmap)
+        return pixmap
+
+    def prewarm_placeholders(self, cards, width, height):
+        """
+        Zeichnet die Platzhalter mehrerer Karten im Hintergrund vor (z.B. nach dem Laden eines Decks).
+
+        Bereits vorhandene Platzhalter werden übersprungen.
+
+        Args:
+            cards (list): Die Kartendaten (dicts).
+            width (int): Die Breite in Pixeln.
+            height (int): Die Höhe in Pixeln.
+        """
+        missing = [
+            card_data for card_data in cards
+            if placeholder_key(card_data, width, height) not in self._pixmaps
+        ]
+        if missing:
+            self.thread_pool.start(PlaceholderRenderTask(self, missing, width, height))
+
+    @Slot(object)
+    def _on_placeholders_rendered(self, batch):
+        """
+        Übernimmt im Hintergrund gezeichnete Platzhalter.
+
+        Args:
+            batch (list): Liste von (Schlüssel, QImage).
+        """
+        for key, image in batch:
+            if key not in self._pixmaps:
+                self.put(key, QPixmap.fromImage(image))
+
+    def load_scaled_image(self, image_path, width, height):
+        """
+        Lädt ein Kartenbild in der angegebenen Größe.
+
+        Vorhandene, aktuelle Vorschaubilder werden direkt gelesen; sonst wird
+        das Originalbild dekodiert, skaliert und als Vorschaubild gespeichert.
+
+        Args:
+            image_path (str): Der Bildpfad (relativ zu cards_dir oder absolut).
+            width (int): Die Breite in Pixeln.
+            height (int): Die Höhe in Pixeln.
+
+        Returns:
+            QImage: Das skalierte Bild oder None, wenn das Bild nicht geladen werden konnte.
+        """
+        source_path = self.resolve_path(image_path)
+        image, from_thumbnail = read_scaled_image(
+            source_path, self.thumbnail_path(source_path, width, height), width, height
+        )
+        self._count_load(image, from_thumbnail)
+        return image
+
+    def _count_load(self, image, from_thumbnail):
+        """
+        Zählt ein geladenes Bild in der Statistik.
+
+        Args:
+            image (QImage): Das Bild oder None.
+            from_thumbnail (bool): Ob das Bild aus einem Vorschaubild stammt.
+        """
+        if image is None:
+            return
+        if from_thumbnail:
+            self.disk_hits += 1
+        else:
+            self.decodes += 1
+
+    def get_pixmap(self, card_id, image_path, width, height, face=0, tapped=False):
+        """
+        Gibt ein Kartenbild in der angegebenen Größe zurück.
+
+        Args:
+            card_id: Die ID der Karte.
+            image_path (str): Der Bildpfad (relativ zu cards_dir oder absolut).
+            width (int): Die Breite in Pixeln (vor dem Drehen).
+            height (int): Die Höhe in Pixeln (vor dem Drehen).
+            face (int, optional): Die Seite der Karte (0 = Vorderseite).
+            tapped (bool, optional): Ob das Bild um 90 Grad gedreht werden soll.
+
+        Returns:
+            QPixmap: Das Bild oder None, wenn kein Bild geladen werden konnte.
+        """
+        key = self.cache_key(card_id, width, height, face, tapped)
+        pixmap = self.get(key)
+        if pixmap is not None:
+            return pixmap
+
+        if not image_path or image_path in self._missing:
+            return None
+
+        # Getappte Bilder entstehen aus dem ungedrehten Bild
+        if tapped:
+            upright = self.get_pixmap(card_id, image_path, width, height, face)
+            if upright is None:
+                return None
+            pixmap = upright.transformed(QTransform().rotate(90))
+        else:
+            image = self.load_scaled_image(image_path, width, height)
+            if image is None:
+                self._missing.add(image_path)
+                return None
+            pixmap = QPixmap.fromImage(image)
+
+        self.put(key, pixmap)
+        return pixmap
+
+    def request_pixmap(self, card_id, image_path, width, height, callback, face=0, tapped=False):
+        """
+        Fordert ein Kartenbild an, ohne den GUI-Thread zu blockieren.
+
+        Liegt das Bild im Speicher, wird es sofort zurückgegeben. Sonst wird es
+        in einem Worker-Thread geladen und danach über callback geliefert
+        (None, wenn es nicht geladen werden konnte). Gleichzeitige Anfragen
+        desselben Bildes teilen sich eine Aufgabe, sofern diese nicht bereits
+        abgebrochen wurde.
+
+        Args:
+            card_id: Die ID der Karte.
+            image_path (str): Der Bildpfad (relativ zu cards_dir oder absolut).
+            width (int): Die Breite in Pixeln (vor dem Drehen).
+            height (int): Die Höhe in Pixeln (vor dem Drehen).
+            callback (callable): Erhält das Bild (QPixmap) oder None.
+            face (int, optional): Die Seite der Karte (0 = Vorderseite).
+            tapped (bool, optional): Ob das Bild um 90 Grad gedreht werden soll.
+
+        Returns:
+            QPixmap: Das Bild, wenn es bereits im Speicher liegt, sonst None.
+            int: Das Ticket der Anfrage für cancel (None, wenn nichts geladen wird).
+        """
+        key = self.cache_key(card_id, width, height, face, tapped)
+        pixmap = self.get(key)
+        if pixmap is not None:
+            return pixmap, None
+
+        # Die gedrehte Variante entsteht ohne erneutes Dekodieren
+        upright_key = self.cache_key(card_id, width, height, face)
+        if tapped and upright_key in self._pixmaps:
+            return self.get_pixmap(card_id, image_path, width, height, face, tapped), None
+
+        if not image_path or image_path in self._missing:
+            return None, None
+
+        ticket = next(self._tickets)
+        self._ticket_keys[ticket] = upright_key
+
+        pending = self._pending.get(upright_key)
+        if pending is None or pending[0].cancelled:
+            # Eine abgebrochene, aber bereits laufende Aufgabe liefert kein Bild mehr
+            source_path = self.resolve_path(image_path)
+            task = ImageDecodeTask(
+                self, upright_key, image_path, source_path,
+                self.thumbnail_path(source_path, width, height), width, height
+            )
+            pending = (task, {})
+            self._pending[upright_key] = pending
+            self.thread_pool.start(task)
+
+        pending[1][ticket] = (key, image_path, callback)
+        return None, ticket
+
+    def cancel(self, ticket):
+        """
+        Bricht eine Anfrage ab (z.B. wenn das Widget ausgeblendet oder wiederverwendet wird).
+
+        Hat ein Bild keine wartenden Anfragen mehr, wird seine Aufgabe aus der
+        Warteschlange genommen, sofern sie noch nicht begonnen hat.
+
+        Args:
+            ticket (int): Das Ticket aus request_pixmap.
+        """
+        upright_key = self._ticket_keys.pop(ticket, None)
+        pending = self._pending.get(upright_key)
+        if pending is None:
+            return
+
+        task, waiters = pending
+        waiters.pop(ticket, None)
+        if waiters:
+            return
+
+        task.cancelled = True
+        if self.thread_pool.tryTake(task):
+            del self._pending[upright_key]
+
+    @Slot(object, object, bool)
+    def _on_image_loaded(self, task, image, from_thumbnail):
+        """
+        Übernimmt ein im Worker-Thread geladenes Bild und benachrichtigt die Wartenden.
+
+        Args:
+            task (ImageDecodeTask): Die Aufgabe, die das Bild geladen hat.
+            image (QImage): Das Bild oder None (nicht ladbar oder abgebrochen).
+            from_thumbnail (bool): Ob das Bild aus einem Vorschaubild stammt.
+        """
+        # Nur den Eintrag dieser Aufgabe entfernen; eine neuere Aufgabe für
+        # dasselbe Bild (nach einem Abbruch) bleibt bestehen
+        waiters = {}
+        pending = self._pending.get(task.key)
+        if pending is not None and pending[0] is task:
+            del self._pending[task.key]
+            waiters = pending[1]
+
+        if image is None and task.cancelled:
+            # Vor dem Dekodieren abgebrochen: es gibt keine Wartenden mehr
+            return
+
+        self._count_load(image, from_thumbnail)
+
+        if image is None:
+            self._missing.add(task.image_path)
+        else:
+            self.put(task.key, QPixmap.fromImage(image))
+
+        for ticket, (key, image_path, callback) in waiters.items():
+            self._ticket_keys.pop(ticket, None)
+            card_id, width, height, face, tapped = key
+            pixmap = self.get_pixmap(card_id, image_path, width, height, face, tapped) if image is not None else None
+            try:
+                callback(pixmap)
+            except RuntimeError:
+                # Das Widget wurde inzwischen gelöscht
+                pass
+
+    def wait_for_pending(self, timeout_ms=-1):
+        """
+        Wartet, bis alle laufenden Ladeaufgaben beendet sind (z.B. beim Beenden).
+
+        Args:
+            timeout_ms (int, optional): Maximale Wartezeit in Millisekunden (-1 = unbegrenzt).
+
+        Returns:
+            bool: True, wenn alle Aufgaben beendet sind.
+        """
+        return self.thread_pool.waitForDone(timeout_ms)
+
+
+def get_image_cache():
+    """
+    Gibt den gemeinsamen Zwischenspeicher für Kartenbilder zurück.
+
+    Returns:
+        CardImageCache: Der Zwischenspeicher (beim ersten Aufruf erstellt).
+    """
+    global _image_cache
+
+    if _image_cache is None:
+        _image_cache = CardImageCache()
+    return _image_cache
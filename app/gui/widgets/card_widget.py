@@ -4,10 +4,29 @@ Karten-Widget für die Magic the Gathering Desktop App.
 Dieses Modul definiert ein Widget zur Darstellung von Magic-Karten in der GUI.
 """
 
-import os
 from PySide6.QtWidgets import QWidget, QLabel, QVBoxLayout, QSizePolicy
-from PySide6.QtGui import QPixmap, QImage, QPainter, QFont, QColor, QPen, QBrush
-from PySide6.QtCore import Qt, QSize, QRect, QPoint, Signal
+from PySide6.QtGui import QPainter, QColor, QPen
+from PySide6.QtCore import Qt, QSize, Signal
+
+from app.gui.widgets.card_images import get_image_cache
+
+# Standardkartengröße in Pixeln bei size_factor 1.0 (63 x 88 mm)
+CARD_BASE_WIDTH = 63
+CARD_BASE_HEIGHT = 88
+
+
+def card_size(size_factor=1.0):
+    """
+    Gibt die Größe eines Karten-Widgets zurück.
+    
+    Args:
+        size_factor (float, optional): Größenfaktor für die Karte (1.0 = Standardgröße).
+    
+    Returns:
+        int: Die Breite in Pixeln.
+        int: Die Höhe in Pixeln.
+    """
+    return int(CARD_BASE_WIDTH * size_factor), int(CARD_BASE_HEIGHT * size_factor)
 
 
 class CardWidget(QWidget):
@@ -34,9 +53,13 @@ class CardWidget(QWidget):
         self.highlighted = False
         self.selected = False
         
-        # Standardkartengrößen
-        self.card_width = int(63 * size_factor)   # Standardbreite: 63mm
-        self.card_height = int(88 * size_factor)  # Standardhöhe: 88mm
+        # Asynchrones Laden des Kartenbilds: (Karten-ID, Bildpfad) des noch fehlenden Bildes
+        # und Ticket der laufenden Anfrage (siehe card_images.CardImageCache.request_pixmap)
+        self._pending_image = None
+        self._image_ticket = None
+        
+        # Kartengröße
+        self.card_width, self.card_height = card_size(size_factor)
         
         # Widget-Größe basierend auf der Kartengröße setzen
         self.setMinimumSize(self.card_width, self.card_height)
@@ -64,6 +87,8 @@ class CardWidget(QWidget):
             card_data (dict): Die neuen Kartendaten.
         """
         self.card_data = card_data
+        self.cancel_image_request()
+        self._pending_image = None
         self.update_card_display()
     
     def update_card_display(self):
@@ -80,96 +105,69 @@ class CardWidget(QWidget):
     
     def load_card_image(self, image_path):
         """
-        Lädt das Kartenbild aus einer Datei.
+        Lädt das Kartenbild in der Größe des Widgets.
+        
+        Liegt das Bild im gemeinsamen Zwischenspeicher (siehe card_images), wird
+        es sofort angezeigt. Sonst erscheint zunächst der Platzhalter; das Bild
+        wird beim ersten Zeichnen des Widgets im Hintergrund angefordert und
+        ersetzt den Platzhalter, sobald es dekodiert ist. Widgets außerhalb des
+        sichtbaren Bereichs werden nicht gezeichnet und fordern daher nichts an.
         
         Args:
-            image_path (str): Der Pfad zum Kartenbild.
+            image_path (str): Der Pfad zum Kartenbild (relativ zu data/cards oder absolut).
         """
-        # Prüfe, ob die Bilddatei existiert
-        if not os.path.isfile(image_path):
-            print(f"Kartenbild nicht gefunden: {image_path}")
-            self.create_placeholder_image()
+        cache = get_image_cache()
+        card_id = self.card_data.get('card_id', self.card_data.get('id'))
+        pixmap = cache.get(cache.cache_key(card_id, self.card_width, self.card_height))
+        if pixmap is not None:
+            self.image_label.setPixmap(pixmap)
             return
         
-        # Lade das Bild und skaliere es
-        pixmap = QPixmap(image_path)
-        if pixmap.isNull():
-            print(f"Fehler beim Laden des Kartenbilds: {image_path}")
-            self.create_placeholder_image()
+        self.create_placeholder_image()
+        self._pending_image = (card_id, image_path)
+        self.update()
+    
+    def request_image(self):
+        """Fordert das noch fehlende Kartenbild beim Zwischenspeicher an."""
+        if self._pending_image is None or self._image_ticket is not None:
             return
         
-        scaled_pixmap = pixmap.scaled(
-            self.card_width, 
-            self.card_height, 
-            Qt.KeepAspectRatio, 
-            Qt.SmoothTransformation
+        card_id, image_path = self._pending_image
+        pixmap, self._image_ticket = get_image_cache().request_pixmap(
+            card_id, image_path, self.card_width, self.card_height, self._on_image_loaded
         )
+        if pixmap is not None:
+            self._on_image_loaded(pixmap)
+        elif self._image_ticket is None:
+            # Bild nicht vorhanden: der Platzhalter bleibt
+            self._pending_image = None
+    
+    def cancel_image_request(self):
+        """Bricht die laufende Anfrage des Kartenbilds ab (das Bild bleibt ausstehend)."""
+        if self._image_ticket is not None:
+            get_image_cache().cancel(self._image_ticket)
+            self._image_ticket = None
+    
+    def _on_image_loaded(self, pixmap):
+        """
+        Ersetzt den Platzhalter durch das geladene Kartenbild.
         
-        self.image_label.setPixmap(scaled_pixmap)
+        Args:
+            pixmap (QPixmap): Das Bild oder None, wenn es nicht geladen werden konnte.
+        """
+        self._image_ticket = None
+        self._pending_image = None
+        if pixmap is not None:
+            self.image_label.setPixmap(pixmap)
     
     def create_placeholder_image(self):
-        """Erstellt ein einfaches Platzhalterbild für die Karte."""
-        # Erstelle ein leeres Bild
-        image = QImage(self.card_width, self.card_height, QImage.Format_ARGB32)
-        image.fill(Qt.white)
-        
-        # Erstelle einen Maler für das Bild
-        painter = QPainter(image)
-        painter.setRenderHint(QPainter.Antialiasing)
-        
-        # Zeichne einen Rahmen
-        pen = QPen(QColor(0, 0, 0))
-        pen.setWidth(2)
-        painter.setPen(pen)
-        painter.drawRect(1, 1, self.card_width - 2, self.card_height - 2)
-        
-        # Fülle die Karte je nach Kartentyp mit einer Farbe
-        if self.card_data.get('type', '').lower().find('creature') != -1:
-            painter.fillRect(2, 2, self.card_width - 4, self.card_height - 4, QColor(200, 200, 200))
-        elif self.card_data.get('type', '').lower().find('instant') != -1:
-            painter.fillRect(2, 2, self.card_width - 4, self.card_height - 4, QColor(200, 200, 255))
-        elif self.card_data.get('type', '').lower().find('sorcery') != -1:
-            painter.fillRect(2, 2, self.card_width - 4, self.card_height - 4, QColor(255, 200, 200))
-        elif self.card_data.get('type', '').lower().find('land') != -1:
-            painter.fillRect(2, 2, self.card_width - 4, self.card_height - 4, QColor(200, 255, 200))
-        else:
-            painter.fillRect(2, 2, self.card_width - 4, self.card_height - 4, QColor(255, 255, 200))
-        
-        # Zeichne den Kartennamen
-        name = self.card_data.get('name', 'Unbekannte Karte')
-        font = QFont('Arial', 10)
-        font.setBold(True)
-        painter.setFont(font)
-        painter.drawText(QRect(5, 5, self.card_width - 10, 20), Qt.AlignCenter, name)
-        
-        # Zeichne den Kartentyp
-        card_type = self.card_data.get('type', '')
-        font = QFont('Arial', 8)
-        painter.setFont(font)
-        painter.drawText(QRect(5, 30, self.card_width - 10, 20), Qt.AlignCenter, card_type)
-        
-        # Zeichne den Regeltext
-        rules_text = self.card_data.get('rules_text', '')
-        font = QFont('Arial', 7)
-        painter.setFont(font)
-        painter.drawText(QRect(5, 55, self.card_width - 10, self.card_height - 80), Qt.AlignLeft | Qt.TextWordWrap, rules_text)
-        
-        # Zeichne Power/Toughness für Kreaturen
-        if self.card_data.get('type', '').lower().find('creature') != -1:
-            power = self.card_data.get('power', '0')
-            toughness = self.card_data.get('toughness', '0')
-            pt_text = f"{power}/{toughness}"
-            font = QFont('Arial', 10)
-            font.setBold(True)
-            painter.setFont(font)
-            painter.drawText(QRect(self.card_width - 30, self.card_height - 25, 25, 20), Qt.AlignRight, pt_text)
-        
-        # Beende den Maler
-        painter.end()
+        """
+        Zeigt einen Platzhalter für Karten ohne Bild.
         
-        # Erstelle ein Pixmap aus dem Bild und setze es für das Label
-        pixmap = QPixmap.fromImage(image)
-        self.image_label.setPixmap(pixmap)
+        Der Platzhalter wird pro Karte und Größe nur einmal gezeichnet und danach
+        aus dem gemeinsamen Zwischenspeicher übernommen (siehe card_images).
+        """
+        self.image_label.setPixmap(get_image_cache().get_placeholder(self.card_data, self.card_width, self.card_height))
     
     def set_tapped(self, tapped):
         """
@@ -230,6 +228,22 @@ class CardWidget(QWidget):
             painter.setPen(pen)
             painter.drawLine(5, 5, 15, 15)
             painter.drawLine(15, 5, 5, 15)
+        
+        painter.end()
+        
+        # Das Widget ist sichtbar: fehlendes Kartenbild jetzt anfordern
+        if self._pending_image is not None:
+            self.request_image()
+    
+    def hideEvent(self, event):
+        """
+        Bricht beim Ausblenden (z.B. beim Wiederverwenden) das Laden des Kartenbilds ab.
+        
+        Args:
+            event (QHideEvent): Das Ereignis.
+        """
+        self.cancel_image_request()
+        super().hideEvent(event)
     
     def mousePressEvent(self, event):
         """
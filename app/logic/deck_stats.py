@@ -0,0 +1,485 @@
+"""
+Deck-Statistiken für die Magic the Gathering Desktop App.
+
+Dieses Modul berechnet Wahrscheinlichkeiten für Starthände, Landdrops und
+Spielzüge nach Manakurve. Exakte Werte ohne Mulligans liefert die
+hypergeometrische Verteilung. Werte mit London-Mulligan werden per
+Monte-Carlo-Simulation geschätzt: mit numpy vektorisiert über alle Durchläufe,
+ohne numpy mit einer langsameren Implementierung in reinem Python.
+"""
+
+import math
+import random
+
+from pony.orm import db_session
+
+from app.logic.rules.rule_engine import OPENING_HAND_SIZE
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Manabeträge ab diesem Wert werden zu einer Gruppe zusammengefasst
+MAX_MANA_VALUE = 7
+
+# Kategorien der Simulation: 0 = Land, 1 + Manabetrag = Zauber
+LAND_CATEGORY = 0
+CATEGORY_COUNT = MAX_MANA_VALUE + 2
+
+# Standardanzahl der Durchläufe einer Simulation
+DEFAULT_TRIALS_VECTORIZED = 1000000
+DEFAULT_TRIALS_PYTHON = 20000
+
+# Durchläufe pro Block (begrenzt den Speicherbedarf der vektorisierten Simulation)
+TRIALS_PER_CHUNK = 250000
+
+
+def create_deck_profile(land_count, spell_counts):
+    """
+    Erstellt ein Deckprofil aus Landanzahl und Zaubern pro Manabetrag.
+
+    Args:
+        land_count (int): Die Anzahl der Länder.
+        spell_counts (dict): Anzahl der übrigen Karten pro Manabetrag.
+
+    Returns:
+        dict: Das Deckprofil mit deck_size, land_count und spell_counts.
+    """
+    grouped = {}
+    for mana_value, count in spell_counts.items():
+        if count > 0:
+            key = min(int(mana_value), MAX_MANA_VALUE)
+            grouped[key] = grouped.get(key, 0) + count
+
+    return {
+        'deck_size': land_count + sum(grouped.values()),
+        'land_count': land_count,
+        'spell_counts': grouped
+    }
+
+
+@db_session
+def build_deck_profile(deck_id):
+    """
+    Erstellt das Deckprofil eines gespeicherten Decks aus den Kartenanzahlen.
+
+    Args:
+        deck_id (int): Die ID des Decks.
+
+    Returns:
+        dict: Das Deckprofil oder None, wenn das Deck nicht existiert.
+    """
+    from app.models.deck import Deck
+
+    deck = Deck.get(id=deck_id)
+    if not deck:
+        return None
+
+    return deck.get_summary().to_profile()
+
+
+# Exakte Wahrscheinlichkeiten
+
+def hypergeometric_probability(population, successes, draws, hits):
+    """
+    Berechnet die Wahrscheinlichkeit, genau `hits` Treffer zu ziehen.
+
+    Args:
+        population (int): Die Anzahl der Karten im Deck.
+        successes (int): Die Anzahl der Treffer im Deck.
+        draws (int): Die Anzahl der gezogenen Karten.
+        hits (int): Die gewünschte Anzahl an Treffern.
+
+    Returns:
+        float: Die Wahrscheinlichkeit.
+    """
+    draws = min(draws, population)
+    if hits < 0 or hits > successes or hits > draws or draws - hits > population - successes:
+        return 0.0
+    return math.comb(successes, hits) * math.comb(population - successes, draws - hits) / math.comb(population, draws)
+
+
+def hypergeometric_at_least(population, successes, draws, min_hits):
+    """
+    Berechnet die Wahrscheinlichkeit, mindestens `min_hits` Treffer zu ziehen.
+
+    Args:
+        population (int): Die Anzahl der Karten im Deck.
+        successes (int): Die Anzahl der Treffer im Deck.
+        draws (int): Die Anzahl der gezogenen Karten.
+        min_hits (int): Die Mindestanzahl an Treffern.
+
+    Returns:
+        float: Die Wahrscheinlichkeit.
+    """
+    return sum(
+        hypergeometric_probability(population, successes, draws, hits)
+        for hits in range(max(min_hits, 0), min(successes, draws) + 1)
+    )
+
+
+def cards_seen(turn, on_the_draw=False, hand_size=OPENING_HAND_SIZE):
+    """
+    Gibt die Anzahl der bis zu einem Zug gesehenen Karten zurück.
+
+    Der beginnende Spieler zieht im ersten Zug keine Karte (Regel 103.8).
+
+    Args:
+        turn (int): Der Zug (ab 1).
+        on_the_draw (bool, optional): Ob der Spieler nicht beginnt.
+        hand_size (int, optional): Die Größe der Starthand.
+
+    Returns:
+        int: Die Anzahl der gesehenen Karten.
+    """
+    return hand_size + turn - (0 if on_the_draw else 1)
+
+
+def opening_hand_land_distribution(profile, hand_size=OPENING_HAND_SIZE):
+    """
+    Berechnet die Verteilung der Länder auf der Starthand.
+
+    Args:
+        profile (dict): Das Deckprofil.
+        hand_size (int, optional): Die Größe der Starthand.
+
+    Returns:
+        list: Wahrscheinlichkeiten für 0 bis `hand_size` Länder.
+    """
+    return [
+        hypergeometric_probability(profile['deck_size'], profile['land_count'], hand_size, lands)
+        for lands in range(hand_size + 1)
+    ]
+
+
+def land_drop_probability(profile, turn, on_the_draw=False):
+    """
+    Berechnet die Wahrscheinlichkeit, im angegebenen Zug den Landdrop zu treffen.
+
+    Args:
+        profile (dict): Das Deckprofil.
+        turn (int): Der Zug (ab 1).
+        on_the_draw (bool, optional): Ob der Spieler nicht beginnt.
+
+    Returns:
+        float: Die Wahrscheinlichkeit, bis zu diesem Zug mindestens `turn` Länder gesehen zu haben.
+    """
+    return hypergeometric_at_least(
+        profile['deck_size'], profile['land_count'], cards_seen(turn, on_the_draw), turn
+    )
+
+
+def on_curve_probability(profile, turn, on_the_draw=False):
+    """
+    Berechnet die Wahrscheinlichkeit, im angegebenen Zug einen Zauber nach Kurve zu spielen.
+
+    Nach Kurve heißt: mindestens `turn` Länder und mindestens ein Zauber mit
+    Manabetrag `turn` wurden bis zu diesem Zug gesehen (Farben werden nicht
+    berücksichtigt).
+
+    Args:
+        profile (dict): Das Deckprofil.
+        turn (int): Der Zug (ab 1).
+        on_the_draw (bool, optional): Ob der Spieler nicht beginnt.
+
+    Returns:
+        float: Die Wahrscheinlichkeit.
+    """
+    deck_size = profile['deck_size']
+    lands = profile['land_count']
+    spells = profile['spell_counts'].get(min(turn, MAX_MANA_VALUE), 0)
+    others = deck_size - lands - spells
+    seen = min(cards_seen(turn, on_the_draw), deck_size)
+
+    if deck_size <= 0:
+        return 0.0
+
+    # Multivariate hypergeometrische Verteilung über (Länder, passende Zauber, Rest)
+    total = math.comb(deck_size, seen)
+    probability = 0
+    for land_hits in range(turn, min(lands, seen) + 1):
+        for spell_hits in range(1, min(spells, seen - land_hits) + 1):
+            other_hits = seen - land_hits - spell_hits
+            if other_hits <= others:
+                probability += math.comb(lands, land_hits) * math.comb(spells, spell_hits) * math.comb(others, other_hits)
+    return probability / total
+
+
+# Monte-Carlo-Simulation
+
+def simulate_games(profile, trials=None, turns=6, on_the_draw=False,
+                   keep_min_lands=2, keep_max_lands=5, max_mulligans=2, seed=None):
+    """
+    Simuliert Starthände mit London-Mulligan und die ersten Züge.
+
+    Eine Hand wird behalten, wenn ihre Landanzahl im Bereich liegt oder keine
+    weiteren Mulligans erlaubt sind. Beim Behalten wird für jeden Mulligan ein
+    überzähliges Land oder der teuerste Zauber unter die Bibliothek gelegt.
+
+    Args:
+        profile (dict): Das Deckprofil.
+        trials (int, optional): Anzahl der Durchläufe. Wenn None, abhängig davon,
+            ob numpy verfügbar ist.
+        turns (int, optional): Anzahl der simulierten Züge.
+        on_the_draw (bool, optional): Ob der Spieler nicht beginnt.
+        keep_min_lands (int, optional): Mindestanzahl an Ländern einer behaltenen Hand.
+        keep_max_lands (int, optional): Höchstanzahl an Ländern einer behaltenen Hand.
+        max_mulligans (int, optional): Höchstanzahl an Mulligans.
+        seed (int, optional): Startwert des Zufallsgenerators.
+
+    Returns:
+        dict: Ergebnisse mit trials, mulligan_rate, average_mulligans, land_drops
+            (Wahrscheinlichkeit, bis zu jedem Zug alle Landdrops getroffen zu haben),
+            on_curve (Wahrscheinlichkeit pro Zug) und vectorized oder None, wenn das
+            Deck zu klein ist.
+    """
+    if trials is None:
+        trials = DEFAULT_TRIALS_VECTORIZED if np is not None else DEFAULT_TRIALS_PYTHON
+
+    draws = turns if on_the_draw else turns - 1
+    depth = OPENING_HAND_SIZE + max(draws, 0)
+    if depth > profile['deck_size'] or trials <= 0:
+        return None
+
+    options = (turns, on_the_draw, keep_min_lands, keep_max_lands, max_mulligans, depth)
+    counts = _category_counts(profile)
+
+    if np is not None:
+        totals = None
+        rng = np.random.default_rng(seed)
+        for start in range(0, trials, TRIALS_PER_CHUNK):
+            chunk = _simulate_chunk_numpy(rng, counts, min(TRIALS_PER_CHUNK, trials - start), options)
+            totals = chunk if totals is None else [a + b for a, b in zip(totals, chunk)]
+    else:
+        totals = _simulate_python(random.Random(seed), counts, trials, options)
+
+    mulligan_games, mulligan_total, land_drop_hits, on_curve_hits = totals
+    return {
+        'trials': trials,
+        'mulligan_rate': mulligan_games / trials,
+        'average_mulligans': mulligan_total / trials,
+        'land_drops': [int(hits) / trials for hits in land_drop_hits],
+        'on_curve': [int(hits) / trials for hits in on_curve_hits],
+        'vectorized': np is not None
+    }
+
+
+def _category_counts(profile):
+    """
+    Gibt die Anzahl der Karten pro Simulationskategorie zurück.
+
+    Args:
+        profile (dict): Das Deckprofil.
+
+    Returns:
+        list: Anzahl pro Kategorie (Index 0 = Länder, 1 + Manabetrag = Zauber).
+    """
+    counts = [0] * CATEGORY_COUNT
+    counts[LAND_CATEGORY] = profile['land_count']
+    for mana_value, count in profile['spell_counts'].items():
+        counts[1 + mana_value] += count
+    return counts
+
+
+def _simulate_chunk_numpy(rng, counts, trials, options):
+    """
+    Simuliert einen Block von Durchläufen vektorisiert mit numpy.
+
+    Args:
+        rng (numpy.random.Generator): Der Zufallsgenerator.
+        counts (list): Anzahl der Karten pro Kategorie.
+        trials (int): Anzahl der Durchläufe.
+        options (tuple): (turns, on_the_draw, keep_min_lands, keep_max_lands, max_mulligans, depth)
+
+    Returns:
+        list: [Spiele mit Mulligan, Mulligans gesamt, Landdrop-Treffer pro Zug, Kurven-Treffer pro Zug]
+    """
+    turns, on_the_draw, keep_min_lands, keep_max_lands, max_mulligans, depth = options
+
+    hands = np.zeros((trials, CATEGORY_COUNT), dtype=np.int16)
+    library_draws = np.zeros((trials, depth - OPENING_HAND_SIZE), dtype=np.int8)
+    mulligans = np.zeros(trials, dtype=np.int8)
+
+    # London-Mulligan: jede neue Hand ist eine neu gemischte Bibliothek
+    pending = np.arange(trials)
+    for attempt in range(max_mulligans + 1):
+        cards = _sample_top_cards(rng, counts, pending.size, depth)
+        hand = _count_categories(cards[:, :OPENING_HAND_SIZE])
+        lands = hand[:, LAND_CATEGORY]
+
+        keep = (lands >= keep_min_lands) & (lands <= keep_max_lands)
+        if attempt == max_mulligans:
+            keep[:] = True
+
+        kept = pending[keep]
+        hands[kept] = hand[keep]
+        library_draws[kept] = cards[keep, OPENING_HAND_SIZE:]
+        mulligans[kept] = attempt
+        pending = pending[~keep]
+        if not pending.size:
+            break
+
+    # Für jeden Mulligan eine Karte unter die Bibliothek legen
+    rows = np.arange(trials)
+    for step in range(max_mulligans):
+        _bottom_card_numpy(hands, rows, mulligans > step)
+
+    lands_seen = hands[:, LAND_CATEGORY].astype(np.int16)
+    spells_seen = hands[:, 1:] > 0
+    all_drops = np.ones(trials, dtype=bool)
+    land_drop_hits = []
+    on_curve_hits = []
+    draw_index = 0
+
+    for turn in range(1, turns + 1):
+        if on_the_draw or turn > 1:
+            drawn = library_draws[:, draw_index].astype(np.intp)
+            draw_index += 1
+            lands_seen += drawn == LAND_CATEGORY
+            spells_seen[rows, np.maximum(drawn - 1, 0)] |= drawn != LAND_CATEGORY
+
+        enough_lands = lands_seen >= turn
+        all_drops &= enough_lands
+        land_drop_hits.append(np.count_nonzero(all_drops))
+        on_curve_hits.append(np.count_nonzero(enough_lands & spells_seen[:, min(turn, MAX_MANA_VALUE)]))
+
+    return [
+        int(np.count_nonzero(mulligans)), int(mulligans.sum()),
+        np.array(land_drop_hits, dtype=np.int64), np.array(on_curve_hits, dtype=np.int64)
+    ]
+
+
+def _sample_top_cards(rng, counts, trials, depth):
+    """
+    Zieht für jeden Durchlauf die obersten Karten einer gemischten Bibliothek.
+
+    Statt die ganze Bibliothek zu mischen, wird Position für Position eine
+    Kategorie proportional zu den verbleibenden Karten gewählt. Die Schleife
+    läuft über die (wenigen) belegten Kategorien, jede Operation über alle
+    Durchläufe gleichzeitig.
+
+    Args:
+        rng (numpy.random.Generator): Der Zufallsgenerator.
+        counts (list): Anzahl der Karten pro Kategorie.
+        trials (int): Anzahl der Durchläufe.
+        depth (int): Anzahl der gezogenen Karten.
+
+    Returns:
+        numpy.ndarray: Kategorien der Karten (Durchläufe x depth).
+    """
+    categories = [category for category, count in enumerate(counts) if count > 0]
+    lookup = np.array(categories, dtype=np.int8)
+    remaining = np.array([counts[category] for category in categories], dtype=np.int16)[:, None].repeat(trials, axis=1)
+    total = sum(counts)
+    columns = np.arange(trials)
+    cards = np.empty((trials, depth), dtype=np.int8)
+
+    for position in range(depth):
+        picks = rng.integers(0, total - position, size=trials, dtype=np.int16)
+        cumulative = np.zeros(trials, dtype=np.int16)
+        chosen = np.zeros(trials, dtype=np.intp)
+        for index in range(len(categories) - 1):
+            cumulative += remaining[index]
+            chosen += picks >= cumulative
+        cards[:, position] = lookup[chosen]
+        remaining[chosen, columns] -= 1
+
+    return cards
+
+
+def _count_categories(cards):
+    """
+    Zählt die Karten pro Kategorie in jeder Zeile.
+
+    Args:
+        cards (numpy.ndarray): Kategorien der Karten (Durchläufe x Karten).
+
+    Returns:
+        numpy.ndarray: Anzahl pro Kategorie (Durchläufe x CATEGORY_COUNT).
+    """
+    trials = cards.shape[0]
+    offsets = np.arange(trials)[:, None] * CATEGORY_COUNT
+    flat_counts = np.bincount((cards + offsets).ravel(), minlength=trials * CATEGORY_COUNT)
+    return flat_counts.reshape(trials, CATEGORY_COUNT).astype(np.int16)
+
+
+def _bottom_card_numpy(hands, rows, selected):
+    """
+    Legt in den ausgewählten Durchläufen eine Karte der Hand unter die Bibliothek.
+
+    Args:
+        hands (numpy.ndarray): Karten pro Kategorie auf der Hand (wird verändert).
+        rows (numpy.ndarray): Die Zeilenindizes aller Durchläufe.
+        selected (numpy.ndarray): Maske der betroffenen Durchläufe.
+    """
+    lands = hands[:, LAND_CATEGORY]
+    spells = hands[:, 1:].sum(axis=1)
+
+    bottom_land = selected & ((lands > spells) | (spells == 0)) & (lands > 0)
+    hands[bottom_land, LAND_CATEGORY] -= 1
+
+    bottom_spell = selected & ~bottom_land & (spells > 0)
+    most_expensive = CATEGORY_COUNT - 1 - np.argmax(hands[:, :0:-1] > 0, axis=1)
+    hands[rows[bottom_spell], most_expensive[bottom_spell]] -= 1
+
+
+def _simulate_python(rng, counts, trials, options):
+    """
+    Simuliert die Durchläufe in reinem Python (wenn numpy nicht verfügbar ist).
+
+    Args:
+        rng (random.Random): Der Zufallsgenerator.
+        counts (list): Anzahl der Karten pro Kategorie.
+        trials (int): Anzahl der Durchläufe.
+        options (tuple): (turns, on_the_draw, keep_min_lands, keep_max_lands, max_mulligans, depth)
+
+    Returns:
+        list: [Spiele mit Mulligan, Mulligans gesamt, Landdrop-Treffer pro Zug, Kurven-Treffer pro Zug]
+    """
+    turns, on_the_draw, keep_min_lands, keep_max_lands, max_mulligans, depth = options
+    library = [category for category, count in enumerate(counts) for _ in range(count)]
+
+    mulligan_games = 0
+    mulligan_total = 0
+    land_drop_hits = [0] * turns
+    on_curve_hits = [0] * turns
+
+    for _ in range(trials):
+        for attempt in range(max_mulligans + 1):
+            cards = rng.sample(library, depth)
+            hand = [0] * CATEGORY_COUNT
+            for category in cards[:OPENING_HAND_SIZE]:
+                hand[category] += 1
+            if keep_min_lands <= hand[LAND_CATEGORY] <= keep_max_lands:
+                break
+
+        mulligan_games += attempt > 0
+        mulligan_total += attempt
+
+        for _ in range(attempt):
+            spells = sum(hand[1:])
+            if hand[LAND_CATEGORY] > 0 and (hand[LAND_CATEGORY] > spells or spells == 0):
+                hand[LAND_CATEGORY] -= 1
+            elif spells:
+                most_expensive = max(category for category in range(1, CATEGORY_COUNT) if hand[category])
+                hand[most_expensive] -= 1
+
+        lands_seen = hand[LAND_CATEGORY]
+        all_drops = True
+        draws = iter(cards[OPENING_HAND_SIZE:])
+
+        for turn in range(1, turns + 1):
+            if on_the_draw or turn > 1:
+                drawn = next(draws)
+                if drawn == LAND_CATEGORY:
+                    lands_seen += 1
+                else:
+                    hand[drawn] += 1
+
+            enough_lands = lands_seen >= turn
+            all_drops = all_drops and enough_lands
+            land_drop_hits[turn - 1] += all_drops
+            on_curve_hits[turn - 1] += enough_lands and hand[1 + min(turn, MAX_MANA_VALUE)] > 0
+
+    return [mulligan_games, mulligan_total, land_drop_hits, on_curve_hits]
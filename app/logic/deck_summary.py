@@ -0,0 +1,301 @@
+"""
+Deck-Zusammenfassung für die Magic the Gathering Desktop App.
+
+Dieses Modul hält für ein geöffnetes Deck die aggregierten Kennzahlen im
+Speicher: Anzahl pro Haupttyp, pro Kartenname und pro Farbe, die Manakurve der
+Nicht-Länder sowie die Gesamtzahl. Beim Öffnen werden alle Karten des Decks mit
+einer einzigen Abfrage geladen; jede Änderung (Hinzufügen, Entfernen) passt
+die Kennzahlen danach ohne weitere Datenbankzugriffe in O(1) an.
+"""
+
+from pony.orm import db_session
+
+from app.logic import deck_stats, format_rules
+from app.models.card import (
+    COLOR_BITS, TYPE_BITS, normalize_card_name, parse_color_identity, parse_copy_limit
+)
+from app.models.database import db
+
+# Abfrage aller Karten eines Decks samt der für Kennzahlen und Formatprüfung nötigen Spalten
+DECK_CARDS_SQL = '''SELECT c."id", c."name", c."card_type", c."color_mask", c."mana_value", c."type_mask",
+        c."rarity", c."mana_cost", c."rules_text", cid."quantity"
+    FROM "CardInDeck" cid JOIN "Card" c ON c."id" = cid."card"
+    WHERE cid."deck" = $deck_id
+'''
+
+# Schlüssel für farblose Karten in counts_by_color
+COLORLESS = 'Colorless'
+
+
+def main_type(card_type):
+    """
+    Gibt den Haupttyp einer Typzeile zurück (der Teil vor dem Strich).
+
+    Args:
+        card_type (str): Die Typzeile der Karte.
+
+    Returns:
+        str: Der Haupttyp, z.B. "Legendary Creature".
+    """
+    return card_type.split("—")[0].strip()
+
+
+class DeckEntry:
+    """
+    Eine Karte eines Decks mit ihrer Anzahl und den Werten für Kennzahlen und
+    Formatprüfung (einmal beim Laden berechnet).
+
+    Attribute:
+        card_id (int): Die ID der Karte.
+        name (str): Der Kartenname.
+        name_key (str): Der normalisierte Kartenname (für Bannlisten).
+        group (str): Der Haupttyp, nach dem die Deckliste gruppiert wird.
+        color_mask (int): Die Farb-Bitmaske.
+        identity_mask (int): Die Farbidentität als Bitmaske.
+        mana_value (int): Der Manabetrag.
+        type_mask (int): Die Typen-Bitmaske.
+        rarity (str): Die Seltenheit dieses Drucks.
+        is_land (bool): Ob die Karte ein Land ist.
+        is_basic (bool): Ob die Karte ein Standardland ist (ohne Kopienlimit).
+        copy_limit: Abweichendes Kopienlimit laut Regeltext oder None.
+        can_be_commander (bool): Ob die Karte laut Regeltext Commander sein darf.
+        quantity (int): Die Anzahl im Deck.
+    """
+
+    __slots__ = (
+        'card_id', 'name', 'name_key', 'group', 'color_mask', 'identity_mask', 'mana_value', 'type_mask',
+        'rarity', 'is_land', 'is_basic', 'copy_limit', 'can_be_commander', 'quantity'
+    )
+
+    def __init__(self, card_id, name, card_type, color_mask, mana_value, type_mask,
+                 rarity='', mana_cost='', rules_text='', quantity=0):
+        """
+        Initialisiert den Eintrag.
+
+        Args:
+            card_id (int): Die ID der Karte.
+            name (str): Der Kartenname.
+            card_type (str): Die Typzeile.
+            color_mask (int): Die Farb-Bitmaske.
+            mana_value (int): Der Manabetrag.
+            type_mask (int): Die Typen-Bitmaske.
+            rarity (str, optional): Die Seltenheit.
+            mana_cost (str, optional): Die Manakosten.
+            rules_text (str, optional): Der Regeltext.
+            quantity (int, optional): Die Anzahl im Deck.
+        """
+        self.card_id = card_id
+        self.name = name
+        self.name_key = normalize_card_name(name)
+        self.group = main_type(card_type)
+        self.color_mask = color_mask
+        self.identity_mask = parse_color_identity(mana_cost, rules_text, color_mask)
+        self.mana_value = mana_value
+        self.type_mask = type_mask
+        self.rarity = rarity
+        self.is_land = bool(type_mask & TYPE_BITS['Land'])
+        self.is_basic = bool(type_mask & TYPE_BITS['Basic'])
+        self.copy_limit = parse_copy_limit(rules_text)
+        self.can_be_commander = format_rules.COMMANDER_TEXT in (rules_text or '')
+        self.quantity = quantity
+
+    @classmethod
+    def from_card(cls, card, quantity=0):
+        """
+        Erstellt einen Eintrag aus einer Karten-Entität.
+
+        Args:
+            card (Card): Die Karte.
+            quantity (int, optional): Die Anzahl im Deck.
+
+        Returns:
+            DeckEntry: Der Eintrag.
+        """
+        return cls(
+            card.id, card.name, card.card_type, card.color_mask, card.mana_value, card.type_mask,
+            card.rarity, card.mana_cost, card.rules_text, quantity
+        )
+
+
+class DeckSummary:
+    """
+    Aggregierte Kennzahlen eines Decks.
+
+    Attribute:
+        entries (dict): Karten-ID -> DeckEntry
+        card_count (int): Gesamtzahl der Karten
+        land_count (int): Anzahl der Länder
+        counts_by_type (dict): Haupttyp -> Anzahl
+        counts_by_name (dict): Kartenname -> Anzahl
+        card_ids_by_name (dict): Kartenname -> Menge der Karten-IDs (Drucke) im Deck
+        counts_by_color (dict): Farbe (bzw. COLORLESS) -> Anzahl der Karten dieser Farbe
+        mana_curve (dict): Manabetrag -> Anzahl der Nicht-Länder
+    """
+
+    def __init__(self):
+        """Initialisiert eine leere Zusammenfassung."""
+        self.entries = {}
+        self.card_count = 0
+        self.land_count = 0
+        self.counts_by_type = {}
+        self.counts_by_name = {}
+        self.card_ids_by_name = {}
+        self.counts_by_color = {}
+        self.mana_curve = {}
+
+    @classmethod
+    @db_session
+    def load(cls, deck_id):
+        """
+        Lädt alle Karten eines Decks mit einer Abfrage.
+
+        Args:
+            deck_id (int): Die ID des Decks.
+
+        Returns:
+            DeckSummary: Die Zusammenfassung (leer, wenn das Deck keine Karten hat).
+        """
+        summary = cls()
+        for row in db.select(DECK_CARDS_SQL):
+            entry = DeckEntry(*row[:-1])
+            summary._add_entry(entry)
+            summary._apply(entry, row[-1])
+        return summary
+
+    def _add_entry(self, entry):
+        """
+        Nimmt einen Eintrag (noch ohne Exemplare) auf.
+
+        Args:
+            entry (DeckEntry): Der Eintrag.
+        """
+        self.entries[entry.card_id] = entry
+        self.card_ids_by_name.setdefault(entry.name, set()).add(entry.card_id)
+
+    def _apply(self, entry, delta):
+        """
+        Ändert die Anzahl eines Eintrags und passt alle Kennzahlen an.
+
+        Args:
+            entry (DeckEntry): Der Eintrag.
+            delta (int): Die Änderung der Anzahl (negativ beim Entfernen).
+        """
+        entry.quantity += delta
+        self.card_count += delta
+
+        _add_count(self.counts_by_type, entry.group, delta)
+        _add_count(self.counts_by_name, entry.name, delta)
+
+        if entry.color_mask:
+            for color, bit in COLOR_BITS.items():
+                if entry.color_mask & bit:
+                    _add_count(self.counts_by_color, color, delta)
+        else:
+            _add_count(self.counts_by_color, COLORLESS, delta)
+
+        if entry.is_land:
+            self.land_count += delta
+        else:
+            _add_count(self.mana_curve, entry.mana_value, delta)
+
+    def add_card(self, card, quantity):
+        """
+        Fügt Exemplare einer Karte hinzu.
+
+        Args:
+            card (Card): Die Karte (nur beim ersten Exemplar benötigt).
+            quantity (int): Die Anzahl der hinzugefügten Exemplare.
+        """
+        entry = self.entries.get(card.id)
+        if entry is None:
+            entry = DeckEntry.from_card(card)
+            self._add_entry(entry)
+        self._apply(entry, quantity)
+
+    def remove_card(self, card_id, quantity):
+        """
+        Entfernt Exemplare einer Karte.
+
+        Args:
+            card_id (int): Die ID der Karte.
+            quantity (int): Die Anzahl der entfernten Exemplare.
+        """
+        entry = self.entries.get(card_id)
+        if entry is None:
+            return
+
+        self._apply(entry, -min(quantity, entry.quantity))
+        if entry.quantity <= 0:
+            del self.entries[card_id]
+            card_ids = self.card_ids_by_name[entry.name]
+            card_ids.discard(card_id)
+            if not card_ids:
+                del self.card_ids_by_name[entry.name]
+
+    def get_quantity(self, card_id):
+        """
+        Gibt die Anzahl einer Karte im Deck zurück.
+
+        Args:
+            card_id (int): Die ID der Karte.
+
+        Returns:
+            int: Die Anzahl (0, wenn die Karte nicht im Deck ist).
+        """
+        entry = self.entries.get(card_id)
+        return entry.quantity if entry else 0
+
+    def entries_by_type(self):
+        """
+        Gruppiert die Einträge nach Haupttyp.
+
+        Returns:
+            list: (Haupttyp, Anzahl, nach Namen sortierte Einträge), nach Haupttyp sortiert.
+        """
+        groups = {}
+        for entry in self.entries.values():
+            groups.setdefault(entry.group, []).append(entry)
+
+        return [
+            (group, self.counts_by_type[group], sorted(groups[group], key=lambda entry: entry.name))
+            for group in sorted(groups)
+        ]
+
+    def to_profile(self):
+        """
+        Erstellt das Deckprofil für die Deck-Statistiken.
+
+        Returns:
+            dict: Das Deckprofil (siehe deck_stats.create_deck_profile).
+        """
+        return deck_stats.create_deck_profile(self.land_count, self.mana_curve)
+
+    def validate_format(self, format_name, commander_id=None):
+        """
+        Prüft das Deck gegen die Regeln eines Formats (siehe format_rules).
+
+        Args:
+            format_name (str): Das Format des Decks.
+            commander_id (int, optional): Die ID des Commanders.
+
+        Returns:
+            bool: True, wenn das Deck gültig ist, sonst False
+            str: Fehlermeldung, wenn das Deck ungültig ist, sonst None
+        """
+        return format_rules.validate_deck(self, format_name, commander_id)
+
+
+def _add_count(counts, key, delta):
+    """
+    Ändert einen Zähler und entfernt ihn, sobald er 0 erreicht.
+
+    Args:
+        counts (dict): Die Zähler.
+        key: Der Schlüssel.
+        delta (int): Die Änderung.
+    """
+    value = counts.get(key, 0) + delta
+    if value > 0:
+        counts[key] = value
+    else:
+        counts.pop(key, None)
@@ -0,0 +1,611 @@
+"""
+Formatregeln für die Magic the Gathering Desktop App.
+
+Dieses Modul prüft Decks gegen die Regeln der unterstützten Formate. Die Regeln
+sind tabellengesteuert (FORMAT_RULES): Deckgröße, Kopienlimit bzw. Singleton,
+Commander mit Farbidentität und erlaubte Seltenheiten. Bann- und
+Restriktionslisten werden aus Textdateien geladen und als Mengen
+normalisierter Kartennamen gehalten.
+
+Der Status einer Karte in einem Format wird einmal berechnet und danach aus
+dem Zwischenspeicher gelesen. Geprüft wird auf einer DeckSummary, sodass auch
+ein Commander-Deck mit 100 Karten bei jeder Änderung ohne Verzögerung und ohne
+Datenbankzugriff (außer für noch unbekannte Kartennamen in Pauper) geprüft
+werden kann. Für ein geöffnetes Deck hält DeckValidation die Ergebnisse der
+Prüfungen und berechnet nach einer Änderung nur die betroffenen neu.
+"""
+
+from pathlib import Path
+
+from pony.orm import db_session, select
+
+from app.models.card import ANY_NUMBER_OF_COPIES, TYPE_BITS, normalize_card_name
+
+# Mitgelieferte Bann- und Restriktionslisten (eine Datei pro Format)
+BANLIST_DIR = Path(__file__).parent / 'banlists'
+
+# Lokale Listen; eine Datei hier ersetzt die mitgelieferte Liste des Formats
+LOCAL_BANLIST_DIR = Path(__file__).parent.parent.parent / 'data' / 'banlists'
+
+# Präfix für eingeschränkte Karten in den Listen
+RESTRICTED_PREFIX = 'restricted:'
+
+# Status einer Karte in einem Format
+LEGAL = 'legal'
+BANNED = 'banned'
+RESTRICTED = 'restricted'
+NOT_LEGAL = 'not_legal'
+
+# Regeln der Formate (Schlüssel in Kleinbuchstaben)
+#   min_cards / max_cards: Deckgröße (max_cards None = beliebig)
+#   max_copies: Exemplare pro Kartenname (Standardländer ausgenommen)
+#   rarities: Seltenheiten, in denen eine Karte gedruckt worden sein muss
+#   commander_types: erlaubte Typkombinationen des Commanders (None = kein Commander)
+FORMAT_RULES = {
+    'standard': {'min_cards': 60, 'max_cards': None, 'max_copies': 4},
+    'modern': {'min_cards': 60, 'max_cards': None, 'max_copies': 4},
+    'legacy': {'min_cards': 60, 'max_cards': None, 'max_copies': 4},
+    'vintage': {'min_cards': 60, 'max_cards': None, 'max_copies': 4},
+    'pauper': {'min_cards': 60, 'max_cards': None, 'max_copies': 4, 'rarities': ('Common',)},
+    'commander': {
+        'min_cards': 100, 'max_cards': 100, 'max_copies': 1,
+        'commander_types': (('Legendary', 'Creature'),)
+    },
+    'brawl': {
+        'min_cards': 60, 'max_cards': 60, 'max_copies': 1,
+        'commander_types': (('Legendary', 'Creature'), ('Legendary', 'Planeswalker'))
+    }
+}
+
+# Regeltext von Karten, die unabhängig vom Typ Commander sein dürfen
+COMMANDER_TEXT = 'can be your commander'
+
+# Anzahl der Probleme, die validate_deck in der Fehlermeldung zusammenfasst
+MAX_REPORTED_PROBLEMS = 3
+
+
+def load_banlist(path):
+    """
+    Liest eine Bann- oder Restriktionsliste.
+
+    Jede Zeile enthält einen Kartennamen; RESTRICTED_PREFIX markiert
+    eingeschränkte Karten, Zeilen mit # sind Kommentare.
+
+    Args:
+        path (Path): Der Pfad zur Datei.
+
+    Returns:
+        dict: Normalisierter Kartenname -> BANNED oder RESTRICTED
+    """
+    banlist = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            status = BANNED
+            if line.lower().startswith(RESTRICTED_PREFIX):
+                status = RESTRICTED
+                line = line[len(RESTRICTED_PREFIX):].strip()
+            banlist[normalize_card_name(line)] = status
+    return banlist
+
+
+class FormatChecker:
+    """
+    Prüft Decks gegen die Regeln der Formate.
+
+    Die einzelnen Prüfungen stehen in self.checks und erhalten jeweils die
+    Regeln des Formats, die Deck-Zusammenfassung und den Commander; weitere
+    Prüfungen können dort ergänzt werden.
+    """
+
+    def __init__(self, banlist_dirs=None):
+        """
+        Initialisiert den Prüfer.
+
+        Args:
+            banlist_dirs (list, optional): Verzeichnisse mit Bannlisten; spätere
+                Verzeichnisse ersetzen die Listen früherer. Standard:
+                BANLIST_DIR, dann LOCAL_BANLIST_DIR.
+        """
+        self.banlist_dirs = banlist_dirs or [BANLIST_DIR, LOCAL_BANLIST_DIR]
+        self.rules = {name: dict(rules) for name, rules in FORMAT_RULES.items()}
+        self.banlists = {}
+
+        # (Format, normalisierter Name) -> Status der Karte
+        self._card_status = {}
+
+        # Normalisierter Name -> Seltenheiten aller Drucke
+        self._printed_rarities = {}
+
+        self.checks = [
+            self.check_deck_size,
+            self.check_card_status,
+            self.check_copies,
+            self.check_commander
+        ]
+
+    def register_format(self, format_name, rules):
+        """
+        Ergänzt oder ersetzt die Regeln eines Formats.
+
+        Args:
+            format_name (str): Der Name des Formats.
+            rules (dict): Die Regeln (siehe FORMAT_RULES).
+        """
+        key = format_name.lower()
+        self.rules[key] = dict(rules)
+        self.banlists.pop(key, None)
+        self._card_status = {
+            status_key: status for status_key, status in self._card_status.items() if status_key[0] != key
+        }
+
+    def reload_banlists(self):
+        """Verwirft geladene Bannlisten und zwischengespeicherte Kartenstatus."""
+        self.banlists.clear()
+        self._card_status.clear()
+
+    def get_banlist(self, format_name):
+        """
+        Gibt die Bann- und Restriktionsliste eines Formats zurück.
+
+        Args:
+            format_name (str): Der Name des Formats (Kleinbuchstaben).
+
+        Returns:
+            dict: Normalisierter Kartenname -> BANNED oder RESTRICTED
+        """
+        banlist = self.banlists.get(format_name)
+        if banlist is None:
+            banlist = {}
+            for directory in self.banlist_dirs:
+                path = Path(directory) / f'{format_name}.txt'
+                if path.is_file():
+                    try:
+                        banlist = load_banlist(path)
+                    except (OSError, UnicodeDecodeError) as e:
+                        print(f"Fehler beim Laden der Bannliste {path}: {e}")
+            self.banlists[format_name] = banlist
+        return banlist
+
+    def card_status(self, format_name, entry):
+        """
+        Gibt den Status einer Karte in einem Format zurück.
+
+        Args:
+            format_name (str): Der Name des Formats (Kleinbuchstaben).
+            entry (DeckEntry): Die Karte.
+
+        Returns:
+            str: LEGAL, BANNED, RESTRICTED oder NOT_LEGAL
+        """
+        key = (format_name, entry.name_key)
+        status = self._card_status.get(key)
+        if status is None:
+            status = self.get_banlist(format_name).get(entry.name_key, LEGAL)
+
+            rarities = self.rules[format_name].get('rarities')
+            if status == LEGAL and rarities:
+                printed = self._printed_rarities.get(entry.name_key, ())
+                if not any(rarity in rarities for rarity in printed):
+                    status = NOT_LEGAL
+
+            self._card_status[key] = status
+        return status
+
+    @db_session
+    def prefetch_printed_rarities(self, entries):
+        """
+        Lädt die Seltenheiten aller Drucke der noch unbekannten Kartennamen.
+
+        Args:
+            entries (iterable): Die Einträge (DeckEntry) des Decks.
+        """
+        from app.models.card import Card
+
+        missing = {entry.name: entry.name_key for entry in entries if entry.name_key not in self._printed_rarities}
+        if not missing:
+            return
+
+        names = list(missing)
+        for name_key in missing.values():
+            self._printed_rarities[name_key] = set()
+        for name, rarity in select((c.name, c.rarity) for c in Card if c.name in names):
+            self._printed_rarities[missing[name]].add(rarity)
+
+    def check_deck(self, summary, format_name, commander_id=None):
+        """
+        Prüft ein Deck gegen die Regeln eines Formats.
+
+        Args:
+            summary (DeckSummary): Die Zusammenfassung des Decks.
+            format_name (str): Der Name des Formats.
+            commander_id (int, optional): Die ID des Commanders.
+
+        Returns:
+            list: Die Probleme als Fehlermeldungen (leer, wenn das Deck gültig ist).
+        """
+        format_name = format_name.lower()
+        rules = self.rules.get(format_name)
+        if rules is None:
+            return []
+
+        if rules.get('rarities'):
+            self.prefetch_printed_rarities(summary.entries.values())
+
+        problems = []
+        for check in self.checks:
+            problems.extend(check(format_name, rules, summary, commander_id))
+        return problems
+
+    def check_deck_size(self, format_name, rules, summary, commander_id):
+        """Prüft Mindest- und Höchstgröße des Decks."""
+        if summary.card_count < rules['min_cards']:
+            return [f"Das Deck muss mindestens {rules['min_cards']} Karten enthalten"]
+        if rules.get('max_cards') is not None and summary.card_count > rules['max_cards']:
+            return [f"Das Deck darf höchstens {rules['max_cards']} Karten enthalten"]
+        return []
+
+    def check_card_status(self, format_name, rules, summary, commander_id):
+        """Prüft gebannte und im Format nicht erlaubte Karten."""
+        problems = []
+        for entry in summary.entries.values():
+            problem = self.card_status_problem(format_name, entry)
+            if problem:
+                problems.append(problem)
+        return problems
+
+    def card_status_problem(self, format_name, entry):
+        """
+        Prüft, ob eine Karte im Format gebannt oder nicht erlaubt ist.
+
+        Args:
+            format_name (str): Der Name des Formats (Kleinbuchstaben).
+            entry (DeckEntry): Die Karte.
+
+        Returns:
+            str: Die Fehlermeldung oder None.
+        """
+        status = self.card_status(format_name, entry)
+        if status == BANNED:
+            return f"{entry.name} ist in {format_name.title()} gebannt"
+        if status == NOT_LEGAL:
+            return f"{entry.name} ist in {format_name.title()} nicht erlaubt"
+        return None
+
+    def check_copies(self, format_name, rules, summary, commander_id):
+        """Prüft das Kopienlimit pro Kartenname (eingeschränkte Karten: ein Exemplar)."""
+        problems = []
+        for name in summary.counts_by_name:
+            problem = self.copies_problem(format_name, rules, summary, name)
+            if problem:
+                problems.append(problem)
+        return problems
+
+    def copies_problem(self, format_name, rules, summary, name):
+        """
+        Prüft das Kopienlimit eines Kartennamens.
+
+        Args:
+            format_name (str): Der Name des Formats (Kleinbuchstaben).
+            rules (dict): Die Regeln des Formats.
+            summary (DeckSummary): Die Zusammenfassung des Decks.
+            name (str): Der Kartenname.
+
+        Returns:
+            str: Die Fehlermeldung oder None.
+        """
+        limit = None
+        for card_id in summary.card_ids_by_name.get(name, ()):
+            entry = summary.entries[card_id]
+            if self.card_status(format_name, entry) == RESTRICTED:
+                entry_limit = 1
+            elif entry.is_basic and entry.is_land:
+                entry_limit = ANY_NUMBER_OF_COPIES
+            elif entry.copy_limit is not None:
+                entry_limit = entry.copy_limit
+            else:
+                entry_limit = rules['max_copies']
+            limit = entry_limit if limit is None else min(limit, entry_limit)
+
+        if limit is not None and summary.counts_by_name.get(name, 0) > limit:
+            return f"Das Deck enthält mehr als {limit} Exemplar(e) von {name}"
+        return None
+
+    def check_commander(self, format_name, rules, summary, commander_id):
+        """Prüft Commander und Farbidentität der übrigen Karten."""
+        commander, problem = self.commander_problem(rules, summary, commander_id)
+        if problem:
+            return [problem]
+        if commander is None:
+            return []
+
+        problems = []
+        for entry in summary.entries.values():
+            problem = self.identity_problem(entry, commander)
+            if problem:
+                problems.append(problem)
+        return problems
+
+    def commander_problem(self, rules, summary, commander_id):
+        """
+        Prüft den Commander selbst (ohne die Farbidentität der übrigen Karten).
+
+        Args:
+            rules (dict): Die Regeln des Formats.
+            summary (DeckSummary): Die Zusammenfassung des Decks.
+            commander_id (int): Die ID des Commanders oder None.
+
+        Returns:
+            tuple: (DeckEntry des gültigen Commanders oder None, Fehlermeldung oder None)
+        """
+        commander_types = rules.get('commander_types')
+        if not commander_types:
+            return None, None
+
+        commander = summary.entries.get(commander_id) if commander_id is not None else None
+        if commander is None:
+            return None, "Kein Commander festgelegt (der Commander muss im Deck enthalten sein)"
+
+        if not commander.can_be_commander and not any(
+            all(commander.type_mask & TYPE_BITS[type_name] for type_name in types) for types in commander_types
+        ):
+            allowed = ' oder '.join(' '.join(types) for types in commander_types)
+            return None, f"{commander.name} kann nicht Commander sein (erlaubt: {allowed})"
+
+        return commander, None
+
+    def identity_problem(self, entry, commander):
+        """
+        Prüft, ob eine Karte in der Farbidentität des Commanders liegt.
+
+        Args:
+            entry (DeckEntry): Die Karte.
+            commander (DeckEntry): Der Commander.
+
+        Returns:
+            str: Die Fehlermeldung oder None.
+        """
+        if entry.identity_mask & ~commander.identity_mask:
+            return f"{entry.name} liegt außerhalb der Farbidentität von {commander.name}"
+        return None
+
+
+class DeckValidation:
+    """
+    Ergebnis der Formatprüfung eines geöffneten Decks.
+
+    Die Ergebnisse der Prüfungen werden pro Karte bzw. Kartenname gehalten.
+    Nach dem Hinzufügen oder Entfernen einer Karte (update_card) werden nur
+    ihr Status, das Kopienlimit ihres Namens, ihre Farbidentität und die
+    Deckgröße neu geprüft. Zusätzlich in FormatChecker.checks ergänzte
+    Prüfungen laufen weiterhin über das ganze Deck.
+
+    Attribute:
+        summary (DeckSummary): Die Zusammenfassung des Decks.
+        format_name (str): Der Name des Formats (Kleinbuchstaben).
+        commander_id (int): Die ID des Commanders oder None.
+    """
+
+    def __init__(self, summary, format_name, commander_id=None, checker=None):
+        """
+        Initialisiert die Prüfung und prüft das ganze Deck.
+
+        Args:
+            summary (DeckSummary): Die Zusammenfassung des Decks.
+            format_name (str): Der Name des Formats.
+            commander_id (int, optional): Die ID des Commanders.
+            checker (FormatChecker, optional): Der Prüfer (Standard: get_format_checker()).
+        """
+        self.checker = checker or get_format_checker()
+        self.summary = summary
+        self.format_name = format_name.lower()
+        self.commander_id = commander_id
+        self.rules = self.checker.rules.get(self.format_name)
+
+        self._size_problems = []
+        # Karten-ID -> Fehlermeldung zum Status der Karte
+        self._status_problems = {}
+        # Kartenname -> Fehlermeldung zum Kopienlimit
+        self._copies_problems = {}
+        # Fehlermeldung zum Commander selbst
+        self._commander_problems = []
+        # Karten-ID -> Fehlermeldung zur Farbidentität
+        self._identity_problems = {}
+
+        self.revalidate()
+
+    def revalidate(self):
+        """Prüft das ganze Deck neu."""
+        self._size_problems = []
+        self._status_problems.clear()
+        self._copies_problems.clear()
+        self._commander_problems = []
+        self._identity_problems.clear()
+
+        if self.rules is None:
+            return
+
+        if self.rules.get('rarities'):
+            self.checker.prefetch_printed_rarities(self.summary.entries.values())
+
+        self._size_problems = self.checker.check_deck_size(
+            self.format_name, self.rules, self.summary, self.commander_id
+        )
+        for card_id in self.summary.entries:
+            self._update_status(card_id)
+        for name in self.summary.counts_by_name:
+            self._update_copies(name)
+        self._update_commander()
+
+    def update_card(self, card_id, name):
+        """
+        Prüft die Regeln neu, die von der Anzahl einer Karte abhängen.
+
+        Args:
+            card_id (int): Die ID der geänderten Karte.
+            name (str): Der Name der Karte (auch wenn sie nicht mehr im Deck ist).
+        """
+        if self.rules is None:
+            return
+
+        entry = self.summary.entries.get(card_id)
+        if entry is not None and self.rules.get('rarities'):
+            self.checker.prefetch_printed_rarities([entry])
+
+        self._size_problems = self.checker.check_deck_size(
+            self.format_name, self.rules, self.summary, self.commander_id
+        )
+        self._update_status(card_id)
+        self._update_copies(name)
+
+        if card_id == self.commander_id:
+            self._update_commander()
+        else:
+            self._update_identity(card_id)
+
+    def set_commander(self, commander_id):
+        """
+        Wechselt den Commander und prüft nur Commander und Farbidentität neu.
+
+        Args:
+            commander_id (int): Die ID des neuen Commanders oder None.
+        """
+        self.commander_id = commander_id
+        if self.rules is not None:
+            self._update_commander()
+
+    def problems(self):
+        """
+        Gibt alle Probleme in der Reihenfolge der Prüfungen zurück.
+
+        Returns:
+            list: Die Fehlermeldungen (leer, wenn das Deck gültig ist).
+        """
+        if self.rules is None:
+            return []
+
+        cached = {
+            self.checker.check_deck_size: self._size_problems,
+            self.checker.check_card_status: list(self._status_problems.values()),
+            self.checker.check_copies: list(self._copies_problems.values()),
+            self.checker.check_commander: self._commander_problems + list(self._identity_problems.values())
+        }
+
+        problems = []
+        for check in self.checker.checks:
+            if check in cached:
+                problems.extend(cached[check])
+            else:
+                problems.extend(check(self.format_name, self.rules, self.summary, self.commander_id))
+        return problems
+
+    def result(self):
+        """
+        Gibt das Ergebnis der Prüfung zurück.
+
+        Returns:
+            bool: True, wenn das Deck gültig ist, sonst False
+            str: Fehlermeldung (die ersten Probleme), wenn das Deck ungültig ist, sonst None
+        """
+        return summarize_problems(self.problems())
+
+    def _update_status(self, card_id):
+        """Prüft den Status einer Karte im Format neu."""
+        entry = self.summary.entries.get(card_id)
+        problem = self.checker.card_status_problem(self.format_name, entry) if entry else None
+        _set_problem(self._status_problems, card_id, problem)
+
+    def _update_copies(self, name):
+        """Prüft das Kopienlimit eines Kartennamens neu."""
+        problem = self.checker.copies_problem(self.format_name, self.rules, self.summary, name)
+        _set_problem(self._copies_problems, name, problem)
+
+    def _update_commander(self):
+        """Prüft den Commander und die Farbidentität aller Karten neu."""
+        self._identity_problems.clear()
+        _, problem = self.checker.commander_problem(self.rules, self.summary, self.commander_id)
+        self._commander_problems = [problem] if problem else []
+
+        for card_id in self.summary.entries:
+            self._update_identity(card_id)
+
+    def _update_identity(self, card_id):
+        """Prüft die Farbidentität einer Karte neu (nur bei gültigem Commander)."""
+        commander = self.summary.entries.get(self.commander_id) if self.commander_id is not None else None
+        entry = self.summary.entries.get(card_id)
+
+        problem = None
+        if entry is not None and commander is not None and not self._commander_problems \
+                and self.rules.get('commander_types'):
+            problem = self.checker.identity_problem(entry, commander)
+        _set_problem(self._identity_problems, card_id, problem)
+
+
+def _set_problem(problems, key, problem):
+    """
+    Setzt oder entfernt das Problem zu einem Schlüssel.
+
+    Args:
+        problems (dict): Die Probleme.
+        key: Der Schlüssel (Karten-ID oder Kartenname).
+        problem (str): Die Fehlermeldung oder None.
+    """
+    if problem:
+        problems[key] = problem
+    else:
+        problems.pop(key, None)
+
+
+# Gemeinsamer Prüfer der Anwendung (wird beim ersten Zugriff erstellt)
+_format_checker = None
+
+
+def get_format_checker():
+    """
+    Gibt den gemeinsamen Formatprüfer zurück.
+
+    Returns:
+        FormatChecker: Der Prüfer.
+    """
+    global _format_checker
+    if _format_checker is None:
+        _format_checker = FormatChecker()
+    return _format_checker
+
+
+def validate_deck(summary, format_name, commander_id=None):
+    """
+    Prüft ein Deck gegen die Regeln eines Formats.
+
+    Args:
+        summary (DeckSummary): Die Zusammenfassung des Decks.
+        format_name (str): Der Name des Formats.
+        commander_id (int, optional): Die ID des Commanders.
+
+    Returns:
+        bool: True, wenn das Deck gültig ist, sonst False
+        str: Fehlermeldung (die ersten Probleme), wenn das Deck ungültig ist, sonst None
+    """
+    return summarize_problems(get_format_checker().check_deck(summary, format_name, commander_id))
+
+
+def summarize_problems(problems):
+    """
+    Fasst die Probleme einer Formatprüfung zu einer Fehlermeldung zusammen.
+
+    Args:
+        problems (list): Die Fehlermeldungen der Prüfungen.
+
+    Returns:
+        bool: True, wenn es keine Probleme gibt, sonst False
+        str: Fehlermeldung (die ersten Probleme) oder None
+    """
+    if not problems:
+        return True, None
+
+    message = "; ".join(problems[:MAX_REPORTED_PROBLEMS])
+    if len(problems) > MAX_REPORTED_PROBLEMS:
+        message += f" (und {len(problems) - MAX_REPORTED_PROBLEMS} weitere)"
+    return False, message
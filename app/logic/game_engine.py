@@ -5,11 +5,17 @@ Dieses Modul implementiert den Hauptspielmotor, der den Spielablauf steuert.
 """
 
 import json
+import random
 import datetime
-from app.logic.rules.rule_engine import RuleEngine
+from app.logic.rules.rule_engine import RuleEngine, OPENING_HAND_SIZE
+from app.logic.phases import Step, NEXT_STEP, PRIORITY_FREE_STEPS, get_path, parse_step
+from app.logic.state_views import CARD_STATE_FIELDS, StateViews
 from app.models.game import Game
 from pony.orm import db_session
 
+# Zonen, zwischen denen move_card Karten bewegen kann
+MOVABLE_ZONES = ('hand', 'library', 'graveyard', 'battlefield', 'exile', 'command')
+
 
 class GameEngine:
     """
@@ -19,18 +25,40 @@ class GameEngine:
     Sie interagiert mit dem Regelmotor, um die Spielregeln anzuwenden.
     """
     
-    def __init__(self, game_id=None):
+    def __init__(self, game_id=None, rule_engine=None):
         """
         Initialisiert den Spielmotor.
         
         Args:
             game_id (int, optional): Die ID eines existierenden Spiels.
                 Wenn None, wird ein neues Spiel erstellt.
+            rule_engine (RuleEngine, optional): Ein gemeinsam genutzter Regelmotor.
+                Wenn None, wird eine neue Instanz erstellt.
         """
-        self.rule_engine = RuleEngine()
+        self.rule_engine = rule_engine or RuleEngine()
         self.game_id = game_id
         self.game_state = None
         
+        # Sichten der Spieler mit verdeckten Informationen
+        self.state_views = StateViews()
+        
+        # Aktionen beim Betreten und Verlassen der Schritte
+        self.step_entry_hooks = {
+            Step.UNTAP: self._handle_untap_phase,
+            Step.DRAW: self._handle_draw_phase,
+            Step.CLEANUP: self._handle_cleanup_phase,
+        }
+        self.step_exit_hooks = {}
+        
+        # Prüfungen, ob in einem Schritt ein Spieler handeln kann (für Auto-Pass)
+        self.step_action_checks = {
+            Step.MAIN1: self._active_player_has_hand,
+            Step.MAIN2: self._active_player_has_hand,
+            Step.COMBAT_ATTACKERS: self._active_player_has_untapped_creatures,
+            Step.COMBAT_BLOCKERS: self._has_attacking_creatures,
+            Step.COMBAT_DAMAGE: self._has_attacking_creatures,
+        }
+        
         # Lade ein existierendes Spiel oder erstelle ein neues
         if game_id:
             self.load_game(game_id)
@@ -148,6 +176,9 @@ class GameEngine:
         self._load_deck_cards(deck1, str(player1.id))
         self._load_deck_cards(deck2, str(player2.id))
         
+        # Teile die Starthände aus
+        self.deal_opening_hands()
+        
         # Speichere den Spielzustand
         game.set_game_state(self.game_state)
         
@@ -182,6 +213,7 @@ class GameEngine:
                 card_instance = {
                     'id': f"{card.id}_{len(library)}",  # Eindeutige ID für diese Karteninstanz
                     'card_id': card.id,
+                    'owner_id': player_id,
                     'name': card.name,
                     'type': card.card_type,
                     'mana_cost': card.mana_cost,
@@ -198,12 +230,144 @@ class GameEngine:
                 library.append(card_instance)
         
         # Mische das Deck
-        import random
         random.shuffle(library)
         
         # Füge das Deck zum Spielzustand hinzu
         self.game_state['players'][player_id]['library'] = library
     
+    @db_session
+    def deal_opening_hands(self):
+        """
+        Teilt jedem Spieler seine Starthand aus (Regel 101.4).
+        
+        Anschließend kann jeder Spieler einen Mulligan nehmen oder seine Hand behalten.
+        
+        Returns:
+            dict: Der aktualisierte Spielzustand.
+        """
+        self.game_state = self.rule_engine.apply_rule('101.4', self.game_state)
+        
+        for player_data in self.game_state['players'].values():
+            player_data['mulligans'] = 0
+            player_data['hand_kept'] = False
+        
+        return self.game_state
+    
+    def take_mulligan(self, player_id):
+        """
+        Nimmt einen Mulligan nach den London-Mulligan-Regeln (Regel 103.5).
+        
+        Der Spieler mischt seine Hand in die Bibliothek und zieht eine neue
+        Starthand. Beim Behalten legt er für jeden Mulligan eine Karte unter
+        seine Bibliothek.
+        
+        Args:
+            player_id (str): Die ID des Spielers.
+        
+        Returns:
+            dict: Der aktualisierte Spielzustand.
+            str: Fehlermeldung bei einem Fehler, sonst None.
+        """
+        error = self._check_mulligan_allowed(player_id)
+        if error:
+            return self.game_state, error
+        
+        player_data = self.game_state['players'][player_id]
+        if player_data['mulligans'] >= OPENING_HAND_SIZE:
+            return self.game_state, "Es können keine weiteren Mulligans genommen werden."
+        
+        library = player_data['library']
+        library.extend(player_data['hand'])
+        player_data['hand'] = []
+        random.shuffle(library)
+        
+        player_data['hand'] = library[:OPENING_HAND_SIZE]
+        del library[:OPENING_HAND_SIZE]
+        player_data['mulligans'] += 1
+        
+        print(f"Spieler {player_id} nimmt seinen {player_data['mulligans']}. Mulligan.")
+        return self.game_state, None
+    
+    def keep_hand(self, player_id, bottom_card_ids=None):
+        """
+        Behält die aktuelle Hand eines Spielers.
+        
+        Args:
+            player_id (str): Die ID des Spielers.
+            bottom_card_ids (list, optional): Instanz-IDs der Karten, die in dieser
+                Reihenfolge unter die Bibliothek gelegt werden. Ihre Anzahl muss der
+                Anzahl der Mulligans entsprechen.
+        
+        Returns:
+            dict: Der aktualisierte Spielzustand.
+            str: Fehlermeldung bei einem Fehler, sonst None.
+        """
+        error = self._check_mulligan_allowed(player_id)
+        if error:
+            return self.game_state, error
+        
+        player_data = self.game_state['players'][player_id]
+        bottom_card_ids = list(bottom_card_ids or [])
+        
+        if len(bottom_card_ids) != player_data['mulligans']:
+            return self.game_state, f"Es müssen genau {player_data['mulligans']} Karte(n) unter die Bibliothek gelegt werden."
+        
+        hand_by_id = {card['id']: card for card in player_data['hand']}
+        if len(set(bottom_card_ids)) != len(bottom_card_ids) or not all(card_id in hand_by_id for card_id in bottom_card_ids):
+            return self.game_state, "Die gewählten Karten sind nicht auf der Hand."
+        
+        bottom = set(bottom_card_ids)
+        player_data['hand'] = [card for card in player_data['hand'] if card['id'] not in bottom]
+        player_data['library'].extend(hand_by_id[card_id] for card_id in bottom_card_ids)
+        player_data['hand_kept'] = True
+        
+        print(f"Spieler {player_id} behält eine Hand mit {len(player_data['hand'])} Karte(n).")
+        return self.game_state, None
+    
+    def get_undecided_player_id(self):
+        """
+        Gibt den nächsten Spieler zurück, der noch über seine Starthand entscheiden muss.
+        
+        Die Spieler entscheiden in Zugreihenfolge, beginnend mit dem aktiven Spieler.
+        
+        Returns:
+            str: Die ID des Spielers oder None, wenn alle Spieler ihre Hand behalten haben.
+        """
+        if self.game_state.get('phase') != Step.SETUP.value:
+            return None
+        
+        player_ids = list(self.game_state['players'].keys())
+        active_player_id = self.game_state.get('active_player_id')
+        if active_player_id in player_ids:
+            start = player_ids.index(active_player_id)
+            player_ids = player_ids[start:] + player_ids[:start]
+        
+        for player_id in player_ids:
+            if not self.game_state['players'][player_id].get('hand_kept', True):
+                return player_id
+        return None
+    
+    def _check_mulligan_allowed(self, player_id):
+        """
+        Prüft, ob ein Spieler noch über seine Starthand entscheiden darf.
+        
+        Args:
+            player_id (str): Die ID des Spielers.
+        
+        Returns:
+            str: Fehlermeldung, wenn keine Entscheidung möglich ist, sonst None.
+        """
+        if player_id not in self.game_state['players']:
+            return f"Spieler mit ID {player_id} nicht im Spiel."
+        
+        if self.game_state.get('phase') != Step.SETUP.value:
+            return "Mulligans sind nur vor Spielbeginn möglich."
+        
+        if self.game_state['players'][player_id].get('hand_kept', True):
+            return "Der Spieler hat seine Hand bereits behalten."
+        
+        return None
+    
     @db_session
     def save_game_state(self):
         """
@@ -287,14 +451,17 @@ class GameEngine:
             print(f"Spieler mit ID {player_id} nicht im Spiel.")
             return self.game_state
         
+        # Verlasse den bisherigen Schritt (z.B. Mana leeren)
+        self._exit_step(parse_step(self.game_state['phase']))
+        
         # Inkrementiere die Zugnummer
         self.game_state['turn_number'] += 1
         
         # Setze den aktiven Spieler
         self.game_state['active_player_id'] = player_id
         
-        # Setze die Phase auf "untap"
-        self.game_state['phase'] = 'untap'
+        # Beginne mit dem Enttappsegment
+        self._enter_step(Step.UNTAP)
         
         print(f"Zug {self.game_state['turn_number']} für Spieler {player_id} gestartet.")
         return self.game_state
@@ -303,37 +470,217 @@ class GameEngine:
         """
         Wechselt die aktuelle Spielphase.
         
+        Übersprungene Schritte innerhalb des Zuges werden dabei durchlaufen,
+        sodass ihre Aktionen (z.B. Ziehen) nicht verloren gehen.
+        
         Args:
             new_phase (str): Die neue Phase.
         
         Returns:
             dict: Der aktualisierte Spielzustand.
+            str: Fehlermeldung bei einem Fehler, sonst None.
         """
-        valid_phases = [
-            'untap', 'upkeep', 'draw', 'main1', 
-            'combat_begin', 'combat_attackers', 'combat_blockers', 'combat_damage', 'combat_end',
-            'main2', 'end', 'cleanup'
-        ]
+        target = parse_step(new_phase)
+        current = parse_step(self.game_state['phase'])
         
-        if new_phase not in valid_phases:
-            print(f"Ungültige Phase: {new_phase}")
-            return self.game_state
+        if target is None:
+            return self.game_state, f"Ungültige Phase: {new_phase}"
+        
+        if target == current:
+            return self.game_state, None
         
-        # Setze die neue Phase
-        old_phase = self.game_state['phase']
-        self.game_state['phase'] = new_phase
+        # Aus der Einrichtung heraus beginnt der erste Zug
+        if current == Step.SETUP and target != Step.ENDED and self.game_state['players']:
+            undecided_player_id = self.get_undecided_player_id()
+            if undecided_player_id:
+                return self.game_state, f"Spieler {undecided_player_id} hat seine Starthand noch nicht behalten."
+            
+            self.start_turn(self.game_state['active_player_id'] or self._get_next_player_id())
+            current = Step.UNTAP
+            if target == current:
+                return self.game_state, None
         
-        print(f"Phase gewechselt von {old_phase} zu {new_phase}")
+        path = get_path(current, target)
+        if path is None:
+            return self.game_state, f"Phasenwechsel von {self.game_state['phase']} zu {new_phase} ist nicht möglich."
         
-        # Führe phasenspezifische Aktionen aus
-        if new_phase == 'untap':
-            self._handle_untap_phase()
-        elif new_phase == 'draw':
-            self._handle_draw_phase()
-        elif new_phase == 'cleanup':
-            self._handle_cleanup_phase()
+        for step in path:
+            self._transition(step)
+            if self.game_state['phase'] == Step.ENDED.value:
+                break
         
-        return self.game_state
+        print(f"Phase gewechselt von {current.value} zu {self.game_state['phase']}")
+        return self.game_state, None
+    
+    def advance_step(self, auto_pass=False):
+        """
+        Geht zum nächsten Schritt über.
+        
+        Nach dem Aufräumen beginnt der Zug des nächsten Spielers.
+        
+        Args:
+            auto_pass (bool, optional): Wenn True, werden Schritte, in denen kein
+                Spieler handeln kann, automatisch durchlaufen.
+        
+        Returns:
+            dict: Der aktualisierte Spielzustand.
+            str: Fehlermeldung bei einem Fehler, sonst None.
+        """
+        current = parse_step(self.game_state['phase'])
+        
+        if not self.game_state['players']:
+            return self.game_state, "Keine Spieler im Spiel."
+        
+        if current not in NEXT_STEP:
+            return self.game_state, f"Aus der Phase {self.game_state['phase']} gibt es keinen nächsten Schritt."
+        
+        undecided_player_id = self.get_undecided_player_id()
+        if undecided_player_id:
+            return self.game_state, f"Spieler {undecided_player_id} hat seine Starthand noch nicht behalten."
+        
+        while True:
+            if current == Step.SETUP:
+                self.start_turn(self.game_state['active_player_id'] or self._get_next_player_id())
+            elif current == Step.CLEANUP:
+                self.start_turn(self._get_next_player_id())
+            else:
+                self._transition(NEXT_STEP[current])
+            
+            current = parse_step(self.game_state['phase'])
+            if not auto_pass or current == Step.ENDED or self._step_has_actions(current):
+                break
+            if current == Step.CLEANUP:
+                # Ein Zug wird nie automatisch beendet
+                break
+        
+        return self.game_state, None
+    
+    def run_turn(self, player_id):
+        """
+        Spielt einen Zug ohne Benutzeroberfläche bis zum Aufräumen durch.
+        
+        Schritte, in denen kein Spieler handeln kann, werden übersprungen;
+        der Zug hält im ersten Schritt mit möglichen Aktionen an.
+        
+        Args:
+            player_id (str): Die ID des aktiven Spielers.
+        
+        Returns:
+            dict: Der aktualisierte Spielzustand.
+            str: Fehlermeldung bei einem Fehler, sonst None.
+        """
+        if player_id not in self.game_state['players']:
+            return self.game_state, f"Spieler mit ID {player_id} nicht im Spiel."
+        
+        self.start_turn(player_id)
+        return self.advance_step(auto_pass=True)
+    
+    def _transition(self, step):
+        """
+        Verlässt den aktuellen Schritt und betritt den angegebenen.
+        
+        Args:
+            step (Step): Der zu betretende Schritt.
+        """
+        self._exit_step(parse_step(self.game_state['phase']))
+        self._enter_step(step)
+    
+    def _enter_step(self, step):
+        """
+        Setzt den Schritt und führt seine Eintrittsaktion aus.
+        
+        Args:
+            step (Step): Der zu betretende Schritt.
+        """
+        self.game_state['phase'] = step.value
+        
+        hook = self.step_entry_hooks.get(step)
+        if hook:
+            hook()
+    
+    def _exit_step(self, step):
+        """
+        Führt die Austrittsaktionen eines Schritts aus.
+        
+        Am Ende jedes Schritts leeren sich die Manapools (Regel 500.4).
+        
+        Args:
+            step (Step): Der zu verlassende Schritt.
+        """
+        hook = self.step_exit_hooks.get(step)
+        if hook:
+            hook()
+        
+        self._empty_mana_pools()
+    
+    def _empty_mana_pools(self):
+        """Leert die Manapools aller Spieler."""
+        for player_data in self.game_state['players'].values():
+            mana_pool = player_data['mana_pool']
+            for mana_type in mana_pool:
+                mana_pool[mana_type] = 0
+    
+    def _get_next_player_id(self):
+        """
+        Ermittelt den Spieler, der als Nächstes am Zug ist.
+        
+        Returns:
+            str: Die ID des nächsten Spielers.
+        """
+        player_ids = list(self.game_state['players'].keys())
+        active_player_id = self.game_state['active_player_id']
+        
+        if active_player_id not in player_ids:
+            return player_ids[0]
+        
+        return player_ids[(player_ids.index(active_player_id) + 1) % len(player_ids)]
+    
+    def _step_has_actions(self, step):
+        """
+        Prüft, ob in einem Schritt mindestens ein Spieler handeln kann.
+        
+        Args:
+            step (Step): Der zu prüfende Schritt.
+        
+        Returns:
+            bool: True, wenn ein Spieler handeln kann, sonst False.
+        """
+        if step in PRIORITY_FREE_STEPS:
+            return False
+        
+        check = self.step_action_checks.get(step)
+        if check and check():
+            return True
+        
+        # In jedem Schritt mit Priorität können Spontanzauber gewirkt werden
+        return self._any_player_has_instant()
+    
+    def _active_player_has_hand(self):
+        """Prüft, ob der aktive Spieler Karten auf der Hand hat."""
+        player_data = self.game_state['players'].get(self.game_state['active_player_id'])
+        return bool(player_data and player_data['hand'])
+    
+    def _active_player_has_untapped_creatures(self):
+        """Prüft, ob der aktive Spieler ungetappte Kreaturen kontrolliert."""
+        active_player_id = self.game_state['active_player_id']
+        return any(
+            card.get('controller_id') == active_player_id
+            and not card.get('tapped', False)
+            and 'Creature' in card.get('type', '')
+            for card in self.game_state['battlefield']
+        )
+    
+    def _has_attacking_creatures(self):
+        """Prüft, ob Kreaturen angreifen."""
+        return any(card.get('attacking', False) for card in self.game_state['battlefield'])
+    
+    def _any_player_has_instant(self):
+        """Prüft, ob ein Spieler Spontanzauber oder Karten mit Aufblitzen auf der Hand hat."""
+        for player_data in self.game_state['players'].values():
+            for card in player_data['hand']:
+                if 'Instant' in card.get('type', '') or 'Flash' in (card.get('rules_text') or ''):
+                    return True
+        return False
     
     def _handle_untap_phase(self):
         """Führt die Aktionen der Enttapp-Phase aus."""
@@ -551,6 +898,18 @@ class GameEngine:
         print(f"Spieler {player_id} hat {count} Karte(n) gezogen: {', '.join(cards_drawn)}")
         return self.game_state, None
     
+    def get_view(self, viewer_id):
+        """
+        Gibt die Sicht eines Spielers auf den Spielzustand zurück.
+        
+        Args:
+            viewer_id (str): Die ID des betrachtenden Spielers.
+        
+        Returns:
+            dict: Die Sicht ohne die für den Spieler verdeckten Informationen.
+        """
+        return self.state_views.get_view(self.game_state, viewer_id)
+    
     def get_card_by_id(self, card_instance_id):
         """
         Findet eine Karte im Spielzustand anhand ihrer Instanz-ID.
@@ -597,6 +956,29 @@ class GameEngine:
         
         return None, None, None
     
+    def set_card_state(self, card_instance_id, **fields):
+        """
+        Setzt Statusfelder einer Karte auf dem Spielfeld (z.B. tapped=True).
+        
+        Args:
+            card_instance_id (str): Die Instanz-ID der Karte.
+            **fields: Die neuen Werte der Statusfelder (siehe CARD_STATE_FIELDS).
+        
+        Returns:
+            dict: Der aktualisierte Spielzustand.
+            str: Fehlermeldung bei einem Fehler, sonst None.
+        """
+        unknown = [name for name in fields if name not in CARD_STATE_FIELDS]
+        if unknown:
+            return self.game_state, f"Unbekannte Statusfelder: {', '.join(unknown)}"
+        
+        card, zone, _ = self.get_card_by_id(card_instance_id)
+        if card is None or zone != 'battlefield':
+            return self.game_state, f"Karte mit ID {card_instance_id} nicht auf dem Spielfeld gefunden."
+        
+        card.update(fields)
+        return self.game_state, None
+    
     def move_card(self, card_instance_id, from_zone, to_zone, player_id=None):
         """
         Bewegt eine Karte von einer Zone in eine andere.
@@ -611,6 +993,9 @@ class GameEngine:
             dict: Der aktualisierte Spielzustand.
             str: Fehlermeldung bei einem Fehler, sonst None.
         """
+        if to_zone not in MOVABLE_ZONES:
+            return self.game_state, f"Unbekannte Zielzone: {to_zone}"
+        
         # Finde die Karte
         card, current_zone, owner_id = self.get_card_by_id(card_instance_id)
         
@@ -620,6 +1005,10 @@ class GameEngine:
         if current_zone != from_zone:
             return self.game_state, f"Karte ist nicht in der angegebenen Zone {from_zone}, sondern in {current_zone}."
         
+        # Ältere Spielstände kennen den Besitzer nur über die Zone der Karte
+        # (wird für verdeckte Karten im Exil benötigt, siehe state_views)
+        card.setdefault('owner_id', owner_id)
+        
         # Bestimme den Spieler für spielerspezifische Zonen
         target_player_id = player_id or owner_id
         
@@ -0,0 +1,437 @@
+"""
+Spiel-Host für die Magic the Gathering Desktop App.
+
+Dieses Modul verwaltet mehrere gleichzeitig geöffnete Spiele (z.B. für einen
+Turnierabend am selben Rechner) mit getrenntem Zustand pro Spiel.
+"""
+
+import os
+import json
+import time
+from collections import OrderedDict, deque
+
+from app.logic.game_engine import GameEngine
+from app.logic.rules.rule_engine import RuleEngine
+from app.logic.save_worker import SaveWorker
+
+
+class GameSession:
+    """
+    Ein geöffnetes Spiel mit eigenem Spielmotor, Undo-Verlauf und Speicherstatus.
+
+    Ist das Spiel ausgelagert, ist `engine` None und der Zustand liegt in
+    der Auslagerungsdatei unter `swap_path`.
+    """
+
+    def __init__(self, engine, max_undo=50):
+        """
+        Initialisiert die Sitzung.
+
+        Args:
+            engine (GameEngine): Der Spielmotor des Spiels.
+            max_undo (int, optional): Maximale Anzahl gespeicherter Undo-Schritte.
+        """
+        self.engine = engine
+        self.game_id = engine.game_id
+        self.undo_stack = deque(maxlen=max_undo)
+        self.committed_state = json.dumps(engine.game_state)
+        self.save_pending = False
+        self.paused = False
+        self.last_used = time.monotonic()
+        self.swap_path = None
+        self.swap_summary = None
+
+    def is_resident(self):
+        """
+        Prüft, ob das Spiel im Speicher gehalten wird.
+
+        Returns:
+            bool: True, wenn das Spiel nicht ausgelagert ist, sonst False.
+        """
+        return self.engine is not None
+
+    def record(self):
+        """
+        Übernimmt den aktuellen Spielzustand als neuen Undo-Punkt.
+
+        Returns:
+            bool: True, wenn sich der Zustand seit dem letzten Punkt geändert hat, sonst False.
+        """
+        state = json.dumps(self.engine.game_state)
+        if state == self.committed_state:
+            return False
+
+        self.undo_stack.append(self.committed_state)
+        self.committed_state = state
+        self.save_pending = True
+        return True
+
+    def undo(self):
+        """
+        Stellt den Spielzustand vor der letzten Änderung wieder her.
+
+        Returns:
+            bool: True, wenn ein Schritt rückgängig gemacht wurde, sonst False.
+        """
+        if not self.undo_stack:
+            return False
+
+        self.committed_state = self.undo_stack.pop()
+        self.engine.game_state = json.loads(self.committed_state)
+        self.save_pending = True
+        return True
+
+
+class GameHost:
+    """
+    Verwaltet mehrere geöffnete Spiele.
+
+    Pausierte Spiele bleiben im Speicher und werden ohne Datenbankzugriff
+    fortgesetzt. Übersteigt die Anzahl der Spiele im Speicher die Grenze,
+    werden die am längsten ungenutzten Spiele in Dateien ausgelagert.
+    Spielstände schreibt ein SaveWorker im Hintergrund in die Datenbank.
+    """
+
+    def __init__(self, max_resident_games=3, swap_dir=None, max_undo=50):
+        """
+        Initialisiert den Host.
+
+        Args:
+            max_resident_games (int, optional): Maximale Anzahl von Spielen im Speicher.
+            swap_dir (str, optional): Verzeichnis für ausgelagerte Spiele.
+                Wenn None, wird das Standardverzeichnis verwendet.
+            max_undo (int, optional): Maximale Anzahl von Undo-Schritten pro Spiel.
+        """
+        if swap_dir is None:
+            base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+            swap_dir = os.path.join(base_dir, 'data', 'suspended_games')
+
+        self.max_resident_games = max(1, max_resident_games)
+        self.swap_dir = swap_dir
+        self.max_undo = max_undo
+
+        # Ein Regelmotor für alle Spiele (das Parsen der Regeln ist teuer)
+        self.rule_engine = RuleEngine()
+
+        # Sitzungen in LRU-Reihenfolge (zuletzt benutzt am Ende)
+        self.sessions = OrderedDict()
+        self.active_game_id = None
+        self.save_queue = deque()
+
+        # Schreibt die Spielstände außerhalb des aufrufenden Threads
+        self.save_worker = SaveWorker()
+
+    def create_game(self, player1_id, player2_id, player1_deck_id, player2_deck_id):
+        """
+        Erstellt ein neues Spiel und macht es zum aktiven Spiel.
+
+        Args:
+            player1_id (int): Die ID des ersten Spielers.
+            player2_id (int): Die ID des zweiten Spielers.
+            player1_deck_id (int): Die ID des Decks des ersten Spielers.
+            player2_deck_id (int): Die ID des Decks des zweiten Spielers.
+
+        Returns:
+            GameEngine: Der Spielmotor des neuen Spiels oder None bei einem Fehler.
+        """
+        engine = GameEngine(rule_engine=self.rule_engine)
+        game_id = engine.create_game(player1_id, player2_id, player1_deck_id, player2_deck_id)
+
+        if not game_id:
+            return None
+
+        self.sessions[game_id] = GameSession(engine, self.max_undo)
+        return self.activate(game_id)
+
+    def open_game(self, game_id):
+        """
+        Öffnet ein gespeichertes Spiel und macht es zum aktiven Spiel.
+
+        Ist das Spiel bereits geöffnet, wird es ohne erneutes Laden fortgesetzt.
+
+        Args:
+            game_id (int): Die ID des Spiels.
+
+        Returns:
+            GameEngine: Der Spielmotor des Spiels oder None bei einem Fehler.
+        """
+        if game_id not in self.sessions:
+            engine = GameEngine(rule_engine=self.rule_engine)
+            if not engine.load_game(game_id):
+                return None
+
+            self.sessions[game_id] = GameSession(engine, self.max_undo)
+
+        return self.activate(game_id)
+
+    def activate(self, game_id):
+        """
+        Macht ein geöffnetes Spiel zum aktiven Spiel und pausiert das bisherige.
+
+        Args:
+            game_id (int): Die ID des Spiels.
+
+        Returns:
+            GameEngine: Der Spielmotor des Spiels oder None, wenn es nicht geöffnet ist.
+        """
+        if game_id not in self.sessions:
+            print(f"Spiel mit ID {game_id} ist nicht geöffnet.")
+            return None
+
+        if self.active_game_id is not None and self.active_game_id != game_id:
+            self.pause(self.active_game_id)
+
+        session = self.resume(game_id)
+        self.active_game_id = game_id
+
+        self._evict_idle_games()
+        return session.engine
+
+    def pause(self, game_id):
+        """
+        Pausiert ein Spiel. Der Zustand bleibt im Speicher.
+
+        Args:
+            game_id (int): Die ID des Spiels.
+        """
+        session = self.sessions.get(game_id)
+        if session:
+            session.paused = True
+
+    def resume(self, game_id):
+        """
+        Setzt ein pausiertes Spiel fort und lädt es bei Bedarf aus der Auslagerung.
+
+        Args:
+            game_id (int): Die ID des Spiels.
+
+        Returns:
+            GameSession: Die fortgesetzte Sitzung oder None, wenn das Spiel nicht geöffnet ist.
+        """
+        session = self.sessions.get(game_id)
+        if not session:
+            return None
+
+        if not session.is_resident():
+            self._swap_in(session)
+
+        session.paused = False
+        session.last_used = time.monotonic()
+        self.sessions.move_to_end(game_id)
+        return session
+
+    def close_game(self, game_id):
+        """
+        Schließt ein Spiel und speichert ausstehende Änderungen.
+
+        Args:
+            game_id (int): Die ID des Spiels.
+        """
+        session = self.sessions.get(game_id)
+        if not session:
+            return
+
+        if session.is_resident():
+            # Auch Änderungen seit dem letzten Undo-Punkt (z.B. das Spielende) speichern
+            session.record()
+            self._save_session(session)
+
+        if session.swap_path and os.path.exists(session.swap_path):
+            os.remove(session.swap_path)
+
+        del self.sessions[game_id]
+
+        if self.active_game_id == game_id:
+            self.active_game_id = None
+
+    def get_active_engine(self):
+        """
+        Gibt den Spielmotor des aktiven Spiels zurück.
+
+        Returns:
+            GameEngine: Der Spielmotor oder None, wenn kein Spiel aktiv ist.
+        """
+        session = self.sessions.get(self.active_game_id)
+        return session.engine if session else None
+
+    def record(self, game_id=None):
+        """
+        Übernimmt den aktuellen Zustand eines Spiels als Undo-Punkt und
+        stellt es in die Speicherwarteschlange.
+
+        Args:
+            game_id (int, optional): Die ID des Spiels. Wenn None, das aktive Spiel.
+        """
+        session = self.sessions.get(game_id if game_id is not None else self.active_game_id)
+        if session and session.is_resident() and session.record():
+            self._enqueue_save(session)
+
+    def undo(self, game_id=None):
+        """
+        Macht die letzte Änderung eines Spiels rückgängig.
+
+        Args:
+            game_id (int, optional): Die ID des Spiels. Wenn None, das aktive Spiel.
+
+        Returns:
+            GameEngine: Der Spielmotor mit dem wiederhergestellten Zustand oder None,
+                wenn nichts rückgängig gemacht werden konnte.
+        """
+        session = self.sessions.get(game_id if game_id is not None else self.active_game_id)
+        if not session or not session.is_resident() or not session.undo():
+            return None
+
+        self._enqueue_save(session)
+        return session.engine
+
+    def flush_saves(self):
+        """
+        Übergibt alle ausstehenden Spielstände dem Speicher-Worker.
+
+        Das Schreiben in die Datenbank erfolgt im Hintergrund (siehe save_worker).
+
+        Returns:
+            int: Die Anzahl der übergebenen Spielstände.
+        """
+        saved = 0
+        while self.save_queue:
+            session = self.sessions.get(self.save_queue.popleft())
+            if session and session.is_resident() and self._save_session(session):
+                saved += 1
+        return saved
+
+    def shutdown(self, timeout=None):
+        """
+        Übergibt alle ausstehenden Spielstände und wartet, bis sie geschrieben sind.
+
+        Args:
+            timeout (float, optional): Maximale Wartezeit in Sekunden (None = unbegrenzt).
+
+        Returns:
+            bool: True, wenn alle Spielstände geschrieben wurden.
+        """
+        self.flush_saves()
+        return self.save_worker.flush(timeout)
+
+    def list_games(self):
+        """
+        Gibt Informationen über alle geöffneten Spiele zurück.
+
+        Returns:
+            list: Liste von Dictionaries mit game_id, Spielernamen, Status und Zugnummer.
+        """
+        games = []
+        for game_id, session in self.sessions.items():
+            if session.is_resident():
+                state = session.engine.game_state
+                player_names = [player['name'] for player in state.get('players', {}).values()]
+                turn_number = state.get('turn_number', 0)
+            else:
+                player_names, turn_number = session.swap_summary
+
+            games.append({
+                'game_id': game_id,
+                'player_names': player_names,
+                'turn_number': turn_number,
+                'active': game_id == self.active_game_id,
+                'paused': session.paused,
+                'resident': session.is_resident()
+            })
+        return games
+
+    def _enqueue_save(self, session):
+        """
+        Stellt ein Spiel in die Speicherwarteschlange (höchstens einmal).
+
+        Args:
+            session (GameSession): Die zu speichernde Sitzung.
+        """
+        if session.game_id not in self.save_queue:
+            self.save_queue.append(session.game_id)
+
+    def _save_session(self, session):
+        """
+        Übergibt den übernommenen Zustand eines Spiels dem Speicher-Worker, wenn Änderungen ausstehen.
+
+        Gespeichert wird der bereits serialisierte Stand des letzten Undo-Punkts,
+        sodass im aufrufenden Thread weder serialisiert noch geschrieben wird.
+
+        Args:
+            session (GameSession): Die zu speichernde Sitzung.
+
+        Returns:
+            bool: True, wenn der Spielstand übergeben wurde, sonst False.
+        """
+        if not session.save_pending:
+            return False
+
+        if self.save_worker.submit(session.game_id, session.committed_state):
+            session.save_pending = False
+            return True
+        return False
+
+    def _evict_idle_games(self):
+        """Lagert die am längsten ungenutzten pausierten Spiele aus, bis die Grenze eingehalten ist."""
+        resident = [session for session in self.sessions.values() if session.is_resident()]
+
+        # Die Sitzungen sind nach letzter Nutzung sortiert (älteste zuerst)
+        for session in resident:
+            if len(resident) <= self.max_resident_games:
+                break
+            if session.game_id == self.active_game_id or not session.paused:
+                continue
+
+            self._swap_out(session)
+            resident.remove(session)
+
+    def _swap_out(self, session):
+        """
+        Lagert ein Spiel in eine Datei aus und gibt den Spielmotor frei.
+
+        Args:
+            session (GameSession): Die auszulagernde Sitzung.
+        """
+        self._save_session(session)
+
+        os.makedirs(self.swap_dir, exist_ok=True)
+        session.swap_path = os.path.join(self.swap_dir, f"game_{session.game_id}.json")
+
+        with open(session.swap_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'game_state': session.engine.game_state,
+                'committed_state': session.committed_state,
+                'undo_stack': list(session.undo_stack)
+            }, f)
+
+        state = session.engine.game_state
+        session.swap_summary = (
+            [player['name'] for player in state.get('players', {}).values()],
+            state.get('turn_number', 0)
+        )
+        session.engine = None
+        session.committed_state = None
+        session.undo_stack.clear()
+        print(f"Spiel {session.game_id} ausgelagert nach {session.swap_path}.")
+
+    def _swap_in(self, session):
+        """
+        Lädt ein ausgelagertes Spiel aus seiner Datei zurück in den Speicher.
+
+        Args:
+            session (GameSession): Die einzulagernde Sitzung.
+        """
+        with open(session.swap_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        engine = GameEngine(rule_engine=self.rule_engine)
+        engine.game_id = session.game_id
+        engine.game_state = data['game_state']
+
+        session.engine = engine
+        session.committed_state = data['committed_state']
+        session.undo_stack.extend(data['undo_stack'])
+        session.swap_summary = None
+
+        os.remove(session.swap_path)
+        session.swap_path = None
+        print(f"Spiel {session.game_id} aus der Auslagerung geladen.")
@@ -0,0 +1,135 @@
+"""
+Zugstruktur für die Magic the Gathering Desktop App.
+
+Dieses Modul definiert die Schritte eines Zuges (Regeln 500-514) als
+Zustandsautomaten mit vorberechneten Übergangstabellen.
+"""
+
+from enum import Enum
+
+
+class Step(str, Enum):
+    """
+    Die Schritte eines Zuges sowie die Sonderzustände vor und nach dem Spiel.
+
+    Die Werte entsprechen den Phasen-Strings im gespeicherten Spielzustand,
+    sodass bestehende Spielstände weiterhin geladen werden können.
+    """
+    SETUP = 'setup'
+    UNTAP = 'untap'
+    UPKEEP = 'upkeep'
+    DRAW = 'draw'
+    MAIN1 = 'main1'
+    COMBAT_BEGIN = 'combat_begin'
+    COMBAT_ATTACKERS = 'combat_attackers'
+    COMBAT_BLOCKERS = 'combat_blockers'
+    COMBAT_DAMAGE = 'combat_damage'
+    COMBAT_END = 'combat_end'
+    MAIN2 = 'main2'
+    END = 'end'
+    CLEANUP = 'cleanup'
+    ENDED = 'ended'
+
+
+# Reihenfolge der Schritte innerhalb eines Zuges
+TURN_ORDER = (
+    Step.UNTAP, Step.UPKEEP, Step.DRAW, Step.MAIN1,
+    Step.COMBAT_BEGIN, Step.COMBAT_ATTACKERS, Step.COMBAT_BLOCKERS,
+    Step.COMBAT_DAMAGE, Step.COMBAT_END,
+    Step.MAIN2, Step.END, Step.CLEANUP
+)
+
+# Position jedes Schritts im Zug (für schnelle Vergleiche ohne list.index)
+STEP_INDEX = {step: index for index, step in enumerate(TURN_ORDER)}
+
+# Nachfolger jedes Schritts; nach dem Aufräumen beginnt ein neuer Zug
+NEXT_STEP = {step: TURN_ORDER[index + 1] for index, step in enumerate(TURN_ORDER[:-1])}
+NEXT_STEP[Step.CLEANUP] = Step.UNTAP
+NEXT_STEP[Step.SETUP] = Step.UNTAP
+
+# Schritte, in denen kein Spieler Priorität erhält (Regeln 502.4 und 514.3)
+PRIORITY_FREE_STEPS = frozenset({Step.UNTAP, Step.CLEANUP})
+
+# Anzeigenamen der Schritte
+STEP_NAMES = {
+    Step.SETUP: 'Einrichtung',
+    Step.UNTAP: 'Enttappen',
+    Step.UPKEEP: 'Versorgung',
+    Step.DRAW: 'Ziehen',
+    Step.MAIN1: 'Hauptphase 1',
+    Step.COMBAT_BEGIN: 'Kampf: Beginn',
+    Step.COMBAT_ATTACKERS: 'Kampf: Angreifer',
+    Step.COMBAT_BLOCKERS: 'Kampf: Blocker',
+    Step.COMBAT_DAMAGE: 'Kampf: Schaden',
+    Step.COMBAT_END: 'Kampf: Ende',
+    Step.MAIN2: 'Hauptphase 2',
+    Step.END: 'Ende',
+    Step.CLEANUP: 'Aufräumen',
+    Step.ENDED: 'Beendet'
+}
+
+# Nachschlagetabelle vom Phasen-String zum Schritt
+_STEPS_BY_VALUE = {step.value: step for step in Step}
+
+
+def parse_step(value):
+    """
+    Wandelt einen Phasen-String in einen Schritt um.
+
+    Args:
+        value (str or Step): Der Phasen-String oder Schritt.
+
+    Returns:
+        Step: Der Schritt oder None, wenn der Wert keinem Schritt entspricht.
+    """
+    if isinstance(value, Step):
+        return value
+    return _STEPS_BY_VALUE.get(value)
+
+
+def get_step_name(value):
+    """
+    Gibt den Anzeigenamen eines Schritts zurück.
+
+    Args:
+        value (str or Step): Der Phasen-String oder Schritt.
+
+    Returns:
+        str: Der Anzeigename oder der Wert selbst, wenn er unbekannt ist.
+    """
+    step = parse_step(value)
+    if step is None:
+        return value
+    return STEP_NAMES[step]
+
+
+def get_path(current, target):
+    """
+    Ermittelt die Schritte, die zwischen zwei Schritten durchlaufen werden.
+
+    Es wird nur innerhalb desselben Zuges vorwärts gegangen; aus der
+    Einrichtung heraus beginnt der Weg beim Enttappen.
+
+    Args:
+        current (Step): Der aktuelle Schritt.
+        target (Step): Der Zielschritt.
+
+    Returns:
+        tuple: Die zu betretenden Schritte einschließlich des Ziels oder None,
+            wenn der Zielschritt nicht vorwärts erreichbar ist.
+    """
+    if target not in STEP_INDEX:
+        return None
+
+    if current == Step.SETUP:
+        start_index = 0
+    elif current in STEP_INDEX:
+        start_index = STEP_INDEX[current] + 1
+    else:
+        return None
+
+    target_index = STEP_INDEX[target]
+    if target_index < start_index:
+        return None
+
+    return TURN_ORDER[start_index:target_index + 1]
@@ -6,6 +6,9 @@ Dieses Modul implementiert den Regelmotor, der die Spielregeln interpretiert und
 
 from app.logic.rules.rule_parser import RuleParser
 
+# Anzahl der Karten auf der Starthand
+OPENING_HAND_SIZE = 7
+
 
 class RuleEngine:
     """
@@ -146,7 +149,8 @@ class RuleEngine:
         elif rule_number == '101.4':
             if 'players' in game_state:
                 for player_id, player_data in game_state['players'].items():
-                    # Implementierung des Kartenziehens würde hier erfolgen
-                    pass
+                    library = player_data['library']
+                    player_data['hand'].extend(library[:OPENING_HAND_SIZE])
+                    del library[:OPENING_HAND_SIZE]
         
         return game_state
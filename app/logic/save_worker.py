@@ -0,0 +1,205 @@
+"""
+Speicher-Worker für die Magic the Gathering Desktop App.
+
+Dieses Modul schreibt Spielstände in einem eigenen Thread in die Datenbank,
+damit Aktionen im GUI-Thread nicht auf die Festplatte warten. Aufträge werden
+pro Spiel zusammengefasst: Trifft ein neuer Spielstand ein, bevor der vorherige
+geschrieben wurde, ersetzt er ihn (der neueste Stand gewinnt). Der Worker
+öffnet für jeden Schreibvorgang eine eigene db_session in seinem Thread.
+
+Beim Beenden der Anwendung werden alle ausstehenden Spielstände noch
+geschrieben (siehe stop).
+"""
+
+import atexit
+import datetime
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from pony.orm import db_session
+
+from app.models.game import Game
+
+# Maximale Anzahl verschiedener Spiele in der Warteschlange (weitere Aufträge warten)
+SAVE_QUEUE_LIMIT = 16
+
+
+@db_session
+def write_game_state(game_id, state_json):
+    """
+    Schreibt einen Spielstand in die Datenbank.
+
+    Args:
+        game_id (int): Die ID des Spiels.
+        state_json (str): Der Spielzustand als JSON-String.
+
+    Returns:
+        bool: True, wenn der Spielstand gespeichert wurde, sonst False.
+    """
+    game = Game.get(id=game_id)
+    if not game:
+        print(f"Spiel mit ID {game_id} nicht gefunden.")
+        return False
+
+    state = json.loads(state_json)
+    state['timestamp'] = datetime.datetime.now().isoformat()
+    game.set_game_state(state)
+    return True
+
+
+class SaveWorker:
+    """
+    Schreibt Spielstände in einem Hintergrund-Thread.
+
+    Attribute:
+        saved (int): Anzahl der geschriebenen Spielstände.
+        coalesced (int): Anzahl der Spielstände, die durch einen neueren ersetzt wurden.
+        failed (int): Anzahl der fehlgeschlagenen Schreibvorgänge.
+        last_latency (float): Zeit vom Einreihen bis zum Schreiben des letzten Spielstands (s).
+        max_latency (float): Längste bisherige Zeit vom Einreihen bis zum Schreiben (s).
+    """
+
+    def __init__(self, max_pending=SAVE_QUEUE_LIMIT, write=write_game_state):
+        """
+        Initialisiert den Worker und startet seinen Thread.
+
+        Args:
+            max_pending (int, optional): Maximale Anzahl verschiedener Spiele in der Warteschlange.
+            write (callable, optional): Schreibt einen Spielstand (Spiel-ID, JSON-String) -> bool.
+        """
+        self.max_pending = max(1, max_pending)
+        self.write = write
+
+        # Spiel-ID -> (JSON-String, Zeitpunkt des ersten Einreihens), älteste zuerst
+        self._pending = OrderedDict()
+        self._writing = False
+        self._stopping = False
+        self._condition = threading.Condition()
+
+        self.saved = 0
+        self.coalesced = 0
+        self.failed = 0
+        self.last_latency = 0.0
+        self.max_latency = 0.0
+        self._total_latency = 0.0
+
+        self._thread = threading.Thread(target=self._run, name='SaveWorker', daemon=True)
+        self._thread.start()
+
+        # Ausstehende Spielstände auch beim Beenden des Interpreters schreiben
+        atexit.register(self.stop)
+
+    def submit(self, game_id, state_json):
+        """
+        Reiht einen Spielstand zum Speichern ein.
+
+        Ein noch nicht geschriebener Spielstand desselben Spiels wird ersetzt.
+        Ist die Warteschlange voll, wartet der Aufruf, bis ein Platz frei wird.
+
+        Args:
+            game_id (int): Die ID des Spiels.
+            state_json (str): Der Spielzustand als JSON-String.
+
+        Returns:
+            bool: True, wenn der Spielstand eingereiht wurde, sonst False (Worker beendet).
+        """
+        with self._condition:
+            if self._stopping:
+                return False
+
+            if game_id in self._pending:
+                # Der neueste Stand gewinnt, die Wartezeit zählt ab dem ersten Auftrag
+                self._pending[game_id] = (state_json, self._pending[game_id][1])
+                self.coalesced += 1
+                return True
+
+            while len(self._pending) >= self.max_pending and not self._stopping:
+                self._condition.wait()
+
+            self._pending[game_id] = (state_json, time.perf_counter())
+            self._condition.notify_all()
+            return True
+
+    def queue_depth(self):
+        """
+        Gibt die Anzahl der noch nicht geschriebenen Spielstände zurück.
+
+        Returns:
+            int: Die Anzahl (einschließlich eines gerade geschriebenen Spielstands).
+        """
+        with self._condition:
+            return len(self._pending) + (1 if self._writing else 0)
+
+    def metrics(self):
+        """
+        Gibt die Kennzahlen des Workers zurück.
+
+        Returns:
+            dict: queue_depth, saved, coalesced, failed sowie last/avg/max_latency_ms.
+        """
+        with self._condition:
+            return {
+                'queue_depth': len(self._pending) + (1 if self._writing else 0),
+                'saved': self.saved,
+                'coalesced': self.coalesced,
+                'failed': self.failed,
+                'last_latency_ms': self.last_latency * 1000,
+                'avg_latency_ms': self._total_latency / self.saved * 1000 if self.saved else 0.0,
+                'max_latency_ms': self.max_latency * 1000
+            }
+
+    def flush(self, timeout=None):
+        """
+        Wartet, bis alle eingereihten Spielstände geschrieben sind.
+
+        Args:
+            timeout (float, optional): Maximale Wartezeit in Sekunden (None = unbegrenzt).
+
+        Returns:
+            bool: True, wenn keine Spielstände mehr ausstehen.
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._pending and not self._writing, timeout)
+
+    def stop(self):
+        """Schreibt alle ausstehenden Spielstände und beendet den Thread."""
+        with self._condition:
+            if self._stopping:
+                return
+            self._stopping = True
+            self._condition.notify_all()
+
+        self._thread.join()
+        atexit.unregister(self.stop)
+
+    def _run(self):
+        """Arbeitet die Warteschlange ab, bis der Worker beendet und die Warteschlange leer ist."""
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending or self._stopping)
+                if not self._pending:
+                    return
+
+                game_id, (state_json, enqueued) = self._pending.popitem(last=False)
+                self._writing = True
+                self._condition.notify_all()
+
+            try:
+                success = self.write(game_id, state_json)
+            except Exception as e:
+                print(f"Fehler beim Speichern von Spiel {game_id}: {e}")
+                success = False
+
+            with self._condition:
+                self._writing = False
+                if success:
+                    latency = time.perf_counter() - enqueued
+                    self.saved += 1
+                    self.last_latency = latency
+                    self.max_latency = max(self.max_latency, latency)
+                    self._total_latency += latency
+                else:
+                    self.failed += 1
+                self._condition.notify_all()
@@ -0,0 +1,281 @@
+"""
+Spielersichten für die Magic the Gathering Desktop App.
+
+Dieses Modul berechnet aus dem vollständigen Spielzustand die Sicht eines
+Spielers, in der verdeckte Informationen (gegnerische Hand, Bibliotheken,
+verdeckte Karten im Exil und auf dem Spielfeld) entfernt sind.
+
+Die Sichten werden inkrementell gepflegt: Für jede Zone wird ein Fingerabdruck
+aus Karten-IDs und Statusfeldern gebildet. Nur Zonen mit geändertem
+Fingerabdruck werden neu projiziert, unveränderte Zonen werden aus dem Cache
+übernommen (auch zwischen den Spielern, wenn die Zone für alle gleich aussieht).
+"""
+
+import itertools
+
+# Statusfelder einer Karte auf dem Spielfeld, die der Spielmotor über
+# set_card_state setzen kann
+CARD_STATE_FIELDS = ('tapped', 'attacking', 'blocking', 'blocking_id')
+
+# Weitere veränderliche Felder einer Karte, die in ihren Fingerabdruck eingehen
+FINGERPRINT_KEYS = CARD_STATE_FIELDS + ('face_down', 'controller_id', 'owner_id')
+
+# Statusfelder, die sich während des Spiels an einer Karte ändern können
+# und auch bei verdeckten Karten sichtbar sind
+PUBLIC_CARD_KEYS = ('tapped', 'attacking', 'blocking', 'controller_id', 'owner_id', 'counters')
+
+# Wer verdeckte Karten einer gemeinsamen Zone sehen darf
+FACE_DOWN_VIEWER_KEY = {
+    'battlefield': 'controller_id',
+    'exile': 'owner_id'
+}
+
+# Gemeinsame Zonen, in denen alle Karten offen liegen
+PUBLIC_ZONES = ('stack', 'command')
+
+# Schlüssel des Spielzustands, die nicht unverändert in die Sicht übernommen werden
+PROJECTED_KEYS = frozenset({'players', 'battlefield', 'exile', 'stack', 'command'})
+
+# Zielgruppe einer Projektion, die für alle Spieler gleich ist
+EVERYONE = None
+
+
+def _copy_card(card):
+    """
+    Erstellt eine unabhängige Kopie einer Karte.
+
+    Args:
+        card (dict): Die Karte.
+
+    Returns:
+        dict: Die Kopie (verschachtelte Listen und Dictionaries werden mitkopiert).
+    """
+    return {
+        key: value.copy() if isinstance(value, (dict, list)) else value
+        for key, value in card.items()
+    }
+
+
+def _card_fingerprint(card):
+    """
+    Bildet den Fingerabdruck einer Karte aus ID und veränderlichen Statusfeldern
+    (siehe FINGERPRINT_KEYS) sowie ihren Zählmarken.
+
+    Die übrigen Felder (Name, Typ, Regeltext ...) gehören zur Karte selbst und
+    ändern sich bei gleicher Instanz-ID nicht.
+
+    Args:
+        card (dict): Die Karte.
+
+    Returns:
+        tuple: Der Fingerabdruck.
+    """
+    counters = card.get('counters')
+    return (card['id'],) + tuple(card.get(key) for key in FINGERPRINT_KEYS) + (
+        tuple(sorted(counters.items())) if counters else None,
+    )
+
+
+class StateViews:
+    """
+    Berechnet und cacht die Sichten der Spieler auf den Spielzustand.
+
+    Die zurückgegebenen Sichten teilen sich unveränderte Zonenlisten mit
+    früheren Sichten und dürfen daher nicht verändert werden.
+    """
+
+    def __init__(self):
+        """Initialisiert die Sichten mit leerem Cache."""
+        # (Zonenpfad, Zielgruppe) -> (Fingerabdruck, projizierte Karten)
+        self._zone_cache = {}
+
+        # Undurchsichtige IDs für verdeckte Karten
+        self._aliases = {}
+        self._alias_targets = {}
+        self._alias_counter = itertools.count(1)
+
+    def get_view(self, game_state, viewer_id):
+        """
+        Gibt die Sicht eines Spielers auf den Spielzustand zurück.
+
+        Fremde Hände enthalten nur verdeckte Platzhalter, Bibliotheken werden
+        nur als Anzahl übertragen.
+
+        Args:
+            game_state (dict): Der vollständige Spielzustand.
+            viewer_id (str): Die ID des betrachtenden Spielers.
+
+        Returns:
+            dict: Die Sicht des Spielers.
+        """
+        viewer_id = str(viewer_id)
+        view = {key: value for key, value in game_state.items() if key not in PROJECTED_KEYS}
+
+        players = {}
+        for player_id, player_data in game_state['players'].items():
+            hand = player_data['hand']
+            players[player_id] = {
+                'name': player_data['name'],
+                'life': player_data['life'],
+                'mana_pool': dict(player_data['mana_pool']),
+                'graveyard': self._project_open(('graveyard', player_id), player_data['graveyard']),
+                'hand': (
+                    self._project_open(('hand', player_id), hand, viewer_id)
+                    if player_id == viewer_id
+                    else self._project_hidden(('hand', player_id), hand, viewer_id)
+                ),
+                'hand_count': len(hand),
+                'library_count': len(player_data['library']),
+                'mulligans': player_data.get('mulligans', 0),
+                'hand_kept': player_data.get('hand_kept', True)
+            }
+        view['players'] = players
+
+        for zone, owner_key in FACE_DOWN_VIEWER_KEY.items():
+            view[zone] = self._project_shared(zone, game_state.get(zone, []), viewer_id, owner_key)
+
+        for zone in PUBLIC_ZONES:
+            view[zone] = self._project_open((zone,), game_state.get(zone, []))
+
+        return view
+
+    def alias(self, card_instance_id):
+        """
+        Gibt eine undurchsichtige ID für eine verdeckte Karte zurück.
+
+        Args:
+            card_instance_id (str): Die Instanz-ID der Karte.
+
+        Returns:
+            str: Die undurchsichtige ID (stabil, solange die Sichten bestehen).
+        """
+        alias = self._aliases.get(card_instance_id)
+        if alias is None:
+            alias = f"hidden_{next(self._alias_counter)}"
+            self._aliases[card_instance_id] = alias
+            self._alias_targets[alias] = card_instance_id
+        return alias
+
+    def resolve_alias(self, card_id):
+        """
+        Löst eine undurchsichtige ID in die Instanz-ID der Karte auf.
+
+        Nur für vertrauenswürdige Aufrufer (z.B. das lokale Spielbrett) gedacht.
+
+        Args:
+            card_id (str): Die undurchsichtige ID oder eine Instanz-ID.
+
+        Returns:
+            str: Die Instanz-ID der Karte.
+        """
+        return self._alias_targets.get(card_id, card_id)
+
+    def invalidate(self):
+        """Verwirft alle zwischengespeicherten Zonen."""
+        self._zone_cache.clear()
+
+    def _hidden_card(self, card):
+        """
+        Erstellt die Darstellung einer verdeckten Karte ohne Identität.
+
+        Args:
+            card (dict): Die Karte.
+
+        Returns:
+            dict: Die verdeckte Karte mit den öffentlichen Statusfeldern.
+        """
+        hidden = {'id': self.alias(card['id']), 'face_down': True}
+        for key in PUBLIC_CARD_KEYS:
+            if key in card:
+                value = card[key]
+                hidden[key] = value.copy() if isinstance(value, (dict, list)) else value
+        return hidden
+
+    def _cached(self, cache_key, fingerprint):
+        """
+        Gibt die zwischengespeicherte Projektion zurück, wenn der Fingerabdruck passt.
+
+        Args:
+            cache_key (tuple): Zonenpfad und Zielgruppe.
+            fingerprint (tuple): Der aktuelle Fingerabdruck der Zone.
+
+        Returns:
+            list: Die projizierten Karten oder None, wenn die Zone sich geändert hat.
+        """
+        entry = self._zone_cache.get(cache_key)
+        if entry and entry[0] == fingerprint:
+            return entry[1]
+        return None
+
+    def _project_open(self, zone_path, cards, audience=EVERYONE):
+        """
+        Projiziert eine Zone, deren Karten für die Zielgruppe offen liegen.
+
+        Args:
+            zone_path (tuple): Der Pfad der Zone (z.B. ('graveyard', '1')).
+            cards (list): Die Karten der Zone.
+            audience (str, optional): Die Zielgruppe (EVERYONE für alle Spieler).
+
+        Returns:
+            list: Die projizierten Karten.
+        """
+        cache_key = (zone_path, audience)
+        fingerprint = tuple(_card_fingerprint(card) for card in cards)
+
+        projected = self._cached(cache_key, fingerprint)
+        if projected is None:
+            projected = [_copy_card(card) for card in cards]
+            self._zone_cache[cache_key] = (fingerprint, projected)
+        return projected
+
+    def _project_hidden(self, zone_path, cards, audience):
+        """
+        Projiziert eine Zone, deren Karten für die Zielgruppe verdeckt sind.
+
+        Args:
+            zone_path (tuple): Der Pfad der Zone (z.B. ('hand', '2')).
+            cards (list): Die Karten der Zone.
+            audience (str): Die ID des betrachtenden Spielers.
+
+        Returns:
+            list: Verdeckte Platzhalter der Karten.
+        """
+        cache_key = (zone_path, audience)
+        fingerprint = tuple(card['id'] for card in cards)
+
+        projected = self._cached(cache_key, fingerprint)
+        if projected is None:
+            projected = [self._hidden_card(card) for card in cards]
+            self._zone_cache[cache_key] = (fingerprint, projected)
+        return projected
+
+    def _project_shared(self, zone, cards, viewer_id, owner_key):
+        """
+        Projiziert eine gemeinsame Zone, die verdeckte Karten enthalten kann.
+
+        Ohne verdeckte Karten ist die Projektion für alle Spieler gleich und
+        wird nur einmal berechnet.
+
+        Args:
+            zone (str): Der Name der Zone.
+            cards (list): Die Karten der Zone.
+            viewer_id (str): Die ID des betrachtenden Spielers.
+            owner_key (str): Das Feld, dessen Spieler verdeckte Karten sehen darf.
+
+        Returns:
+            list: Die projizierten Karten.
+        """
+        fingerprint = tuple(_card_fingerprint(card) for card in cards)
+        has_face_down = any(entry[1] for entry in fingerprint)
+        cache_key = ((zone,), viewer_id if has_face_down else EVERYONE)
+
+        projected = self._cached(cache_key, fingerprint)
+        if projected is None:
+            projected = [
+                _copy_card(card)
+                if not card.get('face_down') or card.get(owner_key) == viewer_id
+                else self._hidden_card(card)
+                for card in cards
+            ]
+            self._zone_cache[cache_key] = (fingerprint, projected)
+        return projected
@@ -5,9 +5,278 @@ Dieses Modul definiert das Datenmodell für Magic the Gathering Karten.
 """
 
 import os
-from pony.orm import Required, Optional, Set, PrimaryKey
+import re
+import unicodedata
+from pony.orm import Required, Optional, Set, PrimaryKey, composite_key
 from app.models.database import db
 
+# Manasymbole in geschweiften Klammern, z.B. {2}, {G}, {W/U}, {2/B}
+MANA_SYMBOL_PATTERN = re.compile(r'\{([^}]*)\}')
+
+# Farben und ihre Bits in Card.color_mask (WUBRG-Reihenfolge)
+COLOR_BITS = {'White': 1, 'Blue': 2, 'Black': 4, 'Red': 8, 'Green': 16}
+
+# Alle Farben zusammen
+ALL_COLORS_MASK = 31
+
+# Kartentypen und Obertypen und ihre Bits in Card.type_mask
+TYPE_BITS = {
+    # Kartentypen
+    'Artifact': 1 << 0,
+    'Battle': 1 << 1,
+    'Creature': 1 << 2,
+    'Enchantment': 1 << 3,
+    'Instant': 1 << 4,
+    'Land': 1 << 5,
+    'Planeswalker': 1 << 6,
+    'Sorcery': 1 << 7,
+    'Kindred': 1 << 8,
+    'Tribal': 1 << 8,  # Früherer Name von Kindred
+    # Obertypen
+    'Basic': 1 << 12,
+    'Legendary': 1 << 13,
+    'Snow': 1 << 14,
+    'World': 1 << 15,
+    'Ongoing': 1 << 16
+}
+
+# Trennzeichen zwischen Typen und Untertypen in der Typzeile
+TYPE_LINE_SEPARATOR = re.compile(r'\s+[—-]\s+')
+
+# Farbkürzel in Manasymbolen und ihre Bits in Card.color_mask
+COLOR_SYMBOL_BITS = {'W': 1, 'U': 2, 'B': 4, 'R': 8, 'G': 16}
+
+# Regeltext, der das Kopienlimit eines Decks aufhebt oder ändert
+COPY_LIMIT_PATTERN = re.compile(r'A deck can have (any number|up to (\w+)) of cards named', re.IGNORECASE)
+
+# Ausgeschriebene Zahlen in COPY_LIMIT_PATTERN
+NUMBER_WORDS = {'two': 2, 'three': 3, 'four': 4, 'five': 5, 'six': 6, 'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10}
+
+# Kopienlimit für Karten, die beliebig oft im Deck sein dürfen
+ANY_NUMBER_OF_COPIES = float('inf')
+
+# Layouts geteilter Karten, die in Decklisten mit beiden Hälften benannt werden ('Fire // Ice')
+SPLIT_LAYOUTS = frozenset({'split', 'aftermath'})
+
+
+def parse_mana_value(mana_cost):
+    """
+    Berechnet den Manabetrag (umgerechnete Manakosten) aus einem Manakosten-String.
+
+    Unterstützt die Schreibweise mit Symbolen ('{2}{G}{G}') und die Kurzform ('2GG').
+    X zählt als 0, Hybridsymbole zählen mit ihrem höchsten Anteil.
+
+    Args:
+        mana_cost (str): Die Manakosten.
+
+    Returns:
+        int: Der Manabetrag.
+    """
+    if not mana_cost:
+        return 0
+
+    symbols = MANA_SYMBOL_PATTERN.findall(mana_cost)
+    if not symbols:
+        # Kurzform: Zahlen am Anfang, danach ein Symbol pro Buchstabe
+        match = re.match(r'(\d*)(.*)', mana_cost.strip())
+        symbols = ([match.group(1)] if match.group(1) else []) + [char for char in match.group(2) if char.isalpha()]
+
+    mana_value = 0
+    for symbol in symbols:
+        parts = symbol.upper().split('/')
+        values = [int(part) if part.isdigit() else (0 if part in ('X', 'Y', 'Z', 'P') else 1) for part in parts]
+        mana_value += max(values) if values else 0
+    return mana_value
+
+
+def parse_color_mask(colors):
+    """
+    Berechnet die Farb-Bitmaske aus der komma-getrennten Farbliste.
+
+    Args:
+        colors (str): Die Farben (z.B. 'Blue,Red').
+
+    Returns:
+        int: Die Bitmaske (siehe COLOR_BITS).
+    """
+    mask = 0
+    for color in (colors or '').split(','):
+        mask |= COLOR_BITS.get(color.strip(), 0)
+    return mask
+
+
+def parse_type_line(type_line):
+    """
+    Zerlegt eine Typzeile in Typen-Bitmaske und Untertypen.
+
+    Mehrseitige Karten ('Creature — Human // Creature — Werewolf') werden
+    seitenweise zerlegt; unbekannte Typwörter werden ignoriert.
+
+    Args:
+        type_line (str): Die Typzeile (z.B. 'Legendary Creature — Elf Druid').
+
+    Returns:
+        tuple: (Bitmaske der Typen und Obertypen, Liste der Untertypen)
+    """
+    type_mask = 0
+    subtypes = []
+
+    for face in (type_line or '').split('//'):
+        parts = TYPE_LINE_SEPARATOR.split(face.strip(), maxsplit=1)
+        for word in parts[0].split():
+            type_mask |= TYPE_BITS.get(word, 0)
+        if len(parts) > 1:
+            for subtype in parts[1].split():
+                if subtype not in subtypes:
+                    subtypes.append(subtype)
+
+    return type_mask, subtypes
+
+
+def parse_color_identity(mana_cost, rules_text, color_mask=0):
+    """
+    Berechnet die Farbidentität einer Karte (für Commander-Formate).
+
+    Zur Farbidentität gehören die Farben der Karte sowie alle farbigen
+    Manasymbole in Manakosten und Regeltext (auch Hybrid- und Phyrexia-Symbole).
+
+    Args:
+        mana_cost (str): Die Manakosten.
+        rules_text (str): Der Regeltext.
+        color_mask (int, optional): Die Farb-Bitmaske der Karte.
+
+    Returns:
+        int: Die Farbidentität als Bitmaske (siehe COLOR_BITS).
+    """
+    identity = color_mask
+    for text in (mana_cost, rules_text):
+        for symbol in MANA_SYMBOL_PATTERN.findall(text or ''):
+            for part in symbol.upper().split('/'):
+                identity |= COLOR_SYMBOL_BITS.get(part, 0)
+    return identity
+
+
+def parse_copy_limit(rules_text):
+    """
+    Liest ein abweichendes Kopienlimit aus dem Regeltext.
+
+    Args:
+        rules_text (str): Der Regeltext (z.B. 'A deck can have any number of cards named ...').
+
+    Returns:
+        Das Kopienlimit (int oder ANY_NUMBER_OF_COPIES) oder None, wenn das
+        Limit des Formats gilt.
+    """
+    match = COPY_LIMIT_PATTERN.search(rules_text or '')
+    if not match:
+        return None
+    if match.group(2) is None:
+        return ANY_NUMBER_OF_COPIES
+
+    count = match.group(2).lower()
+    return int(count) if count.isdigit() else NUMBER_WORDS.get(count)
+
+
+def normalize_card_name(name):
+    """
+    Normalisiert einen Kartennamen für Vergleiche.
+
+    Groß-/Kleinschreibung, Akzente, typografische Apostrophe, mehrfache
+    Leerzeichen und die Schreibweise geteilter Karten ('Fire/Ice',
+    'Fire // Ice') werden vereinheitlicht.
+
+    Args:
+        name (str): Der Kartenname.
+
+    Returns:
+        str: Der normalisierte Name.
+    """
+    name = unicodedata.normalize('NFKD', name or '')
+    name = ''.join(char for char in name if not unicodedata.combining(char))
+    name = name.replace('\u2019', "'").replace('`', "'")
+    name = re.sub(r'\s*/{1,2}\s*', ' // ', name)
+    return ' '.join(name.casefold().split())
+
+
+def card_name_keys(name):
+    """
+    Berechnet die Suchschlüssel eines Kartennamens.
+
+    Args:
+        name (str): Der Kartenname (z.B. 'Delver of Secrets // Insectile Aberration').
+
+    Returns:
+        tuple: (normalisierter Name, normalisierter Name der Vorderseite)
+    """
+    name_key = normalize_card_name(name)
+    return name_key, name_key.split(' // ')[0]
+
+
+def deck_list_name(name, card_type, layout=None):
+    """
+    Gibt den Namen zurück, unter dem Decklisten (MTG Arena, MTGO) eine Karte führen.
+
+    Geteilte Karten ('Fire // Ice') behalten beide Hälften, alle anderen
+    mehrseitigen Karten (transform, modal_dfc, adventure ...) werden mit dem
+    Namen der Vorderseite geführt (siehe is_split_card).
+
+    Args:
+        name (str): Der Kartenname.
+        card_type (str): Die Typzeile.
+        layout (str, optional): Das Layout der Karte (siehe SPLIT_LAYOUTS).
+
+    Returns:
+        str: Der Name für Decklisten.
+    """
+    faces = name.split(' // ')
+    if len(faces) == 1 or is_split_card(card_type, layout):
+        return name
+    return faces[0]
+
+
+def is_split_card(card_type, layout=None):
+    """
+    Prüft, ob eine mehrseitige Karte eine geteilte Karte ist ('Fire // Ice').
+
+    Karten ohne bekanntes Layout (Import vor Einführung der Spalte) gelten als
+    geteilt, wenn jede Hälfte nur aus Spontanzaubern und Hexereien besteht.
+
+    Args:
+        card_type (str): Die Typzeile.
+        layout (str, optional): Das Layout der Karte (siehe SPLIT_LAYOUTS).
+
+    Returns:
+        bool: True für geteilte Karten.
+    """
+    if layout:
+        return layout in SPLIT_LAYOUTS
+
+    spell_bits = TYPE_BITS['Instant'] | TYPE_BITS['Sorcery']
+    face_masks = [parse_type_line(face)[0] for face in (card_type or '').split('//')]
+    return all(mask & spell_bits and not mask & ~spell_bits for mask in face_masks)
+
+
+def derive_card_attributes(card_type, mana_cost, colors, layout=None):
+    """
+    Berechnet die abgeleiteten, indizierten Attribute einer Karte.
+
+    Der Manabetrag geteilter Karten ist die Summe beider Hälften, bei allen
+    anderen mehrseitigen Karten zählen nur die Kosten der Vorderseite.
+
+    Args:
+        card_type (str): Die Typzeile.
+        mana_cost (str): Die Manakosten (bei mehrseitigen Karten 'A // B').
+        colors (str): Die komma-getrennten Farben.
+        layout (str, optional): Das Layout der Karte (siehe SPLIT_LAYOUTS).
+
+    Returns:
+        tuple: (Farb-Bitmaske, Manabetrag, Typen-Bitmaske, Liste der Untertypen)
+    """
+    type_mask, subtypes = parse_type_line(card_type)
+    if mana_cost and '//' in mana_cost and not is_split_card(card_type, layout):
+        mana_cost = mana_cost.split('//')[0]
+    return parse_color_mask(colors), parse_mana_value(mana_cost), type_mask, subtypes
+
 
 class Card(db.Entity):
     """
@@ -17,28 +286,73 @@ class Card(db.Entity):
         id (int): Eindeutige ID der Karte
         name (str): Name der Karte
         card_type (str): Typ der Karte (Creature, Instant, Sorcery, etc.)
-        mana_cost (str): Manakosten der Karte
-        colors (str): Farben der Karte
+        mana_cost (str): Manakosten der Karte (leer für Länder)
+        colors (str): Farben der Karte (leer für farblose Karten)
         rules_text (str): Regeltext der Karte
         power (int, optional): Stärke für Kreaturen
         toughness (int, optional): Widerstandskraft für Kreaturen
         rarity (str): Seltenheit der Karte
         set_code (str): Set-Code der Karte
+        collector_number (str, optional): Sammlernummer innerhalb des Sets
+        layout (str, optional): Layout laut Kartenabzug (z.B. 'split', 'transform', 'modal_dfc')
         image_path (str): Pfad zum Kartenbild
+        color_mask (int): Farben als Bitmaske (abgeleitet aus colors)
+        mana_value (int): Manabetrag (abgeleitet aus mana_cost)
+        type_mask (int): Kartentypen und Obertypen als Bitmaske (abgeleitet aus card_type)
+        subtypes (Set[CardSubtype]): Untertypen (abgeleitet aus card_type)
+        name_key (str): Normalisierter Name (abgeleitet aus name, für Decklisten)
+        face_key (str): Normalisierter Name der Vorderseite (abgeleitet aus name)
         decks (Set[CardInDeck]): Decks, in denen diese Karte enthalten ist
+        commanded_decks (Set[Deck]): Decks, deren Commander diese Karte ist
     """
     id = PrimaryKey(int, auto=True)
-    name = Required(str)
+    name = Required(str, index=True)
     card_type = Required(str)  # Creature, Instant, Sorcery, etc.
-    mana_cost = Required(str)
-    colors = Required(str)  # Komma-getrennte Liste von Farben oder JSON
+    mana_cost = Optional(str)
+    colors = Optional(str)  # Komma-getrennte Liste von Farben oder JSON
     rules_text = Optional(str)
     power = Optional(int)  # Für Kreaturen
     toughness = Optional(int)  # Für Kreaturen
     rarity = Required(str)  # Common, Uncommon, Rare, Mythic Rare
     set_code = Required(str)
+    collector_number = Optional(str, nullable=True)
+    layout = Optional(str)
     image_path = Optional(str)
+    color_mask = Required(int, default=0, index=True)
+    mana_value = Required(int, default=0, index=True)
+    type_mask = Required(int, default=0)
+    subtypes = Set('CardSubtype')
+    name_key = Optional(str, index=True)
+    face_key = Optional(str, index=True)
     decks = Set('CardInDeck')
+    commanded_decks = Set('Deck')
+    composite_key(set_code, collector_number)
+    
+    def __init__(self, *args, **kwargs):
+        """Legt die Karte an und berechnet die abgeleiteten Attribute sofort (nicht erst beim Speichern)."""
+        super().__init__(*args, **kwargs)
+        self.update_derived_attributes()
+    
+    def before_insert(self):
+        """Berechnet die abgeleiteten Attribute vor dem Speichern."""
+        self.update_derived_attributes()
+    
+    def before_update(self):
+        """Berechnet die abgeleiteten Attribute vor dem Speichern."""
+        self.update_derived_attributes()
+    
+    def update_derived_attributes(self):
+        """Setzt Farb- und Typen-Bitmaske, Manabetrag, Namensschlüssel und Untertypen neu."""
+        color_mask, mana_value, type_mask, subtypes = derive_card_attributes(
+            self.card_type, self.mana_cost, self.colors, self.layout
+        )
+        self.color_mask = color_mask
+        self.mana_value = mana_value
+        self.type_mask = type_mask
+        self.name_key, self.face_key = card_name_keys(self.name)
+        
+        if sorted(subtype.name for subtype in self.subtypes) != sorted(subtypes):
+            self.subtypes = [CardSubtype.get(name=name) or CardSubtype(name=name) for name in subtypes]
     
     def get_image_full_path(self):
         """
@@ -59,11 +373,21 @@ class Card(db.Entity):
         Gibt eine Liste der Kartenfarben zurück.
         
         Returns:
-            list: Liste der Kartenfarben
+            list: Liste der Kartenfarben (in WUBRG-Reihenfolge)
+        """
+        return [color for color, bit in COLOR_BITS.items() if self.color_mask & bit]
+    
+    def has_type(self, type_name):
+        """
+        Prüft, ob die Karte einen Kartentyp oder Obertyp hat.
+        
+        Args:
+            type_name (str): Der Typ (siehe TYPE_BITS, z.B. 'Creature' oder 'Basic').
+        
+        Returns:
+            bool: True, wenn die Karte den Typ hat, sonst False
         """
-        if not self.colors:
-            return []
-        return [color.strip() for color in self.colors.split(',')]
+        return bool(self.type_mask & TYPE_BITS[type_name])
     
     def is_creature(self):
         """
@@ -72,7 +396,7 @@ class Card(db.Entity):
         Returns:
             bool: True, wenn die Karte eine Kreatur ist, sonst False
         """
-        return 'Creature' in self.card_type
+        return self.has_type('Creature')
     
     def is_land(self):
         """
@@ -81,7 +405,16 @@ class Card(db.Entity):
         Returns:
             bool: True, wenn die Karte ein Land ist, sonst False
         """
-        return 'Land' in self.card_type
+        return self.has_type('Land')
+    
+    def get_mana_value(self):
+        """
+        Gibt den Manabetrag der Karte zurück.
+        
+        Returns:
+            int: Der Manabetrag (0 für Länder)
+        """
+        return self.mana_value
     
     def is_spell(self):
         """
@@ -90,4 +423,18 @@ class Card(db.Entity):
         Returns:
             bool: True, wenn die Karte ein Zauberspruch ist, sonst False
         """
-        return 'Instant' in self.card_type or 'Sorcery' in self.card_type
+        return bool(self.type_mask & (TYPE_BITS['Instant'] | TYPE_BITS['Sorcery']))
+
+
+class CardSubtype(db.Entity):
+    """
+    Ein Untertyp von Karten (z.B. Elf, Equipment, Aura).
+    
+    Attribute:
+        id (int): Eindeutige ID
+        name (str): Name des Untertyps
+        cards (Set[Card]): Karten mit diesem Untertyp
+    """
+    id = PrimaryKey(int, auto=True)
+    name = Required(str, unique=True)
+    cards = Set(Card)
@@ -0,0 +1,594 @@
+"""
+Kartensuche mit Suchsprache für die Magic the Gathering Desktop App.
+
+Dieses Modul übersetzt Suchanfragen im Stil von Scryfall, z.B.
+
+    t:creature c>=ur cmc<=3 o:"draw a card" pow>=4 r:mythic set:NEO
+
+in einen Syntaxbaum und daraus in eine einzige parametrisierte SQL-Abfrage.
+Die Ergebnisse werden nach Name und ID sortiert und seitenweise per
+Keyset-Pagination geladen (die nächste Seite beginnt hinter dem letzten
+Schlüssel der vorherigen), sodass auch späte Seiten ohne OFFSET auskommen.
+Enthält die Anfrage freie Suchbegriffe, stehen die besten Treffer der
+Volltextsuche (bm25) vorne; die Gewichtung wird dann Teil des Schlüssels.
+
+Syntax:
+    wort, "phrase"      Name, Typ oder Regeltext (Präfixsuche)
+    feld:wert           Vergleich mit einem Feld (siehe FIELD_ALIASES)
+    feld>=wert          Vergleichsoperatoren: : = != < <= > >=
+    -ausdruck           Verneinung
+    a or b              Alternative (ohne Operator werden Ausdrücke mit AND verknüpft)
+    ( ... )             Gruppierung
+"""
+
+import re
+
+from pony.orm import db_session
+
+from app.models import card_search
+from app.models.card import ALL_COLORS_MASK, COLOR_BITS, TYPE_BITS
+from app.models.database import db
+
+# Kurz- und Langnamen der Felder
+FIELD_ALIASES = {
+    'n': 'name', 'name': 'name',
+    't': 'type', 'type': 'type',
+    'o': 'oracle', 'oracle': 'oracle', 'text': 'oracle',
+    'c': 'color', 'color': 'color',
+    'cmc': 'mana_value', 'mv': 'mana_value', 'manavalue': 'mana_value',
+    'pow': 'power', 'power': 'power',
+    'tou': 'toughness', 'toughness': 'toughness',
+    'r': 'rarity', 'rarity': 'rarity',
+    's': 'set', 'set': 'set', 'e': 'set', 'edition': 'set'
+}
+
+# Vergleichsoperatoren und ihre SQL-Entsprechung
+COMPARISON_OPERATORS = {':': '=', '=': '=', '!=': '<>', '<': '<', '<=': '<=', '>': '>', '>=': '>='}
+
+# Farbkürzel und -namen -> Farbname in der Datenbank
+COLOR_CODES = {
+    'w': 'White', 'u': 'Blue', 'b': 'Black', 'r': 'Red', 'g': 'Green',
+    'white': 'White', 'blue': 'Blue', 'black': 'Black', 'red': 'Red', 'green': 'Green'
+}
+
+# Seltenheiten in aufsteigender Reihenfolge und ihre Kürzel
+RARITY_ORDER = ['Common', 'Uncommon', 'Rare', 'Mythic Rare']
+RARITY_CODES = {
+    'c': 'Common', 'common': 'Common',
+    'u': 'Uncommon', 'uncommon': 'Uncommon',
+    'r': 'Rare', 'rare': 'Rare',
+    'm': 'Mythic Rare', 'mythic': 'Mythic Rare'
+}
+
+# Farbvergleiche: Operator -> Prüfung einer Farb-Bitmaske gegen die gesuchten Farben
+COLOR_MATCHERS = {
+    ':': lambda wanted: lambda mask: mask & wanted == wanted,
+    '>=': lambda wanted: lambda mask: mask & wanted == wanted,
+    '>': lambda wanted: lambda mask: mask & wanted == wanted and mask != wanted,
+    '<=': lambda wanted: lambda mask: mask & ~wanted == 0,
+    '<': lambda wanted: lambda mask: mask & ~wanted == 0 and mask != wanted,
+    '=': lambda wanted: lambda mask: mask == wanted,
+    '!=': lambda wanted: lambda mask: mask != wanted
+}
+
+# Spalten der Ergebniszeilen (bei freien Suchbegriffen folgt die bm25-Gewichtung)
+RESULT_COLUMNS = ('id', 'name', 'card_type', 'mana_cost', 'colors')
+
+# Standardgröße einer Ergebnisseite
+DEFAULT_PAGE_SIZE = 200
+
+# Ein Suchbegriff: optional Feld und Operator, dann Wert (ggf. in Anführungszeichen)
+TERM_PATTERN = re.compile(
+    r'(?:(?P<field>[A-Za-z]+)(?P<op>>=|<=|!=|:|=|<|>))?(?P<value>"[^"]*"?|[^\s()"]+)'
+)
+
+
+class QueryError(ValueError):
+    """Wird ausgelöst, wenn eine Suchanfrage ungültig ist."""
+
+
+def tokenize(text):
+    """
+    Zerlegt eine Suchanfrage in Tokens.
+
+    Args:
+        text (str): Die Suchanfrage.
+
+    Returns:
+        list: Tokens der Form ('(',), (')',), ('-',), ('or',) oder
+            ('term', Feld oder None, Operator oder None, Wert, in Anführungszeichen).
+    """
+    tokens = []
+    position = 0
+
+    while position < len(text):
+        char = text[position]
+        if char.isspace():
+            position += 1
+        elif char in '()':
+            tokens.append((char,))
+            position += 1
+        elif char == '-' and position + 1 < len(text) and not text[position + 1].isspace():
+            tokens.append(('-',))
+            position += 1
+        else:
+            match = TERM_PATTERN.match(text, position)
+            if not match:
+                raise QueryError(f"Unerwartetes Zeichen '{char}' an Position {position + 1}")
+            position = match.end()
+
+            field, op, value = match.group('field', 'op', 'value')
+            quoted = value.startswith('"')
+            if quoted:
+                value = value.strip('"')
+
+            if field is None and not quoted and value.lower() == 'or':
+                tokens.append(('or',))
+            elif field is None and not quoted and value.lower() == 'and':
+                continue
+            else:
+                tokens.append(('term', field, op, value, quoted))
+
+    return tokens
+
+
+class _Parser:
+    """Rekursiver Abstiegsparser für die Suchsprache."""
+
+    def __init__(self, tokens):
+        """
+        Initialisiert den Parser.
+
+        Args:
+            tokens (list): Die Tokens aus tokenize.
+        """
+        self.tokens = tokens
+        self.position = 0
+
+    def peek(self):
+        """Gibt das aktuelle Token zurück (None am Ende)."""
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def parse(self):
+        """
+        Parst die vollständige Anfrage.
+
+        Returns:
+            tuple: Der Syntaxbaum (None für eine leere Anfrage).
+        """
+        if not self.tokens:
+            return None
+        node = self.parse_or()
+        if self.peek() is not None:
+            raise QueryError("Schließende Klammer ohne öffnende Klammer")
+        return node
+
+    def parse_or(self):
+        """Parst Alternativen: and_ausdruck (or and_ausdruck)*"""
+        children = [self.parse_and()]
+        while self.peek() == ('or',):
+            self.position += 1
+            children.append(self.parse_and())
+        return children[0] if len(children) == 1 else ('or', children)
+
+    def parse_and(self):
+        """Parst aufeinanderfolgende Ausdrücke, die mit AND verknüpft sind."""
+        children = []
+        while self.peek() not in (None, ('or',), (')',)):
+            children.append(self.parse_unary())
+        if not children:
+            raise QueryError("Suchbegriff erwartet")
+        return children[0] if len(children) == 1 else ('and', children)
+
+    def parse_unary(self):
+        """Parst einen ggf. verneinten Ausdruck."""
+        token = self.peek()
+        if token == ('-',):
+            self.position += 1
+            return ('not', self.parse_unary())
+        if token == ('(',):
+            self.position += 1
+            node = self.parse_or()
+            if self.peek() != (')',):
+                raise QueryError("Fehlende schließende Klammer")
+            self.position += 1
+            return node
+
+        if token is None or token[0] != 'term':
+            raise QueryError("Suchbegriff erwartet")
+
+        self.position += 1
+        _, field, op, value, quoted = token
+        if field is None:
+            return ('term', 'text', ':', value, quoted)
+
+        name = FIELD_ALIASES.get(field.lower())
+        if name is None:
+            raise QueryError(f"Unbekanntes Feld '{field}'")
+        if not value:
+            raise QueryError(f"Wert für '{field}' fehlt")
+        return ('term', name, op, value, quoted)
+
+
+def parse_query(text):
+    """
+    Parst eine Suchanfrage in einen Syntaxbaum.
+
+    Knoten: ('and', [Kinder]), ('or', [Kinder]), ('not', Kind) und
+    ('term', Feld, Operator, Wert, in Anführungszeichen).
+
+    Args:
+        text (str): Die Suchanfrage.
+
+    Returns:
+        tuple: (Syntaxbaum oder None für eine leere Anfrage, Fehlermeldung oder None)
+    """
+    try:
+        return _Parser(tokenize(text)).parse(), None
+    except QueryError as e:
+        return None, str(e)
+
+
+class CardQueryCompiler:
+    """Übersetzt einen Syntaxbaum in eine SQL-Bedingung mit Parametern."""
+
+    def __init__(self):
+        """Initialisiert den Compiler."""
+        self.params = {}
+
+        # FTS5-Phrasen der freien Suchbegriffe (ohne verneinte), nach denen sortiert wird
+        self.rank_phrases = []
+        self._negated = 0
+
+        # Übersetzer der Felder
+        self.field_compilers = {
+            'text': self.compile_text,
+            'name': self.compile_name,
+            'type': self.compile_type,
+            'oracle': self.compile_oracle,
+            'color': self.compile_color,
+            'mana_value': self.compile_mana_value,
+            'power': self.compile_stat,
+            'toughness': self.compile_stat,
+            'rarity': self.compile_rarity,
+            'set': self.compile_set
+        }
+
+    def compile(self, node):
+        """
+        Übersetzt einen Syntaxbaum.
+
+        Args:
+            node (tuple): Der Syntaxbaum (None für eine leere Anfrage).
+
+        Returns:
+            tuple: (SQL-Bedingung, Parameter als Dictionary für Pony)
+
+        Raises:
+            QueryError: Wenn ein Suchbegriff ungültig ist.
+        """
+        self.params = {}
+        self.rank_phrases = []
+        self._negated = 0
+        sql = self.compile_node(node) if node is not None else '1'
+        return sql, self.params
+
+    def compile_node(self, node):
+        """
+        Übersetzt einen Knoten des Syntaxbaums.
+
+        Args:
+            node (tuple): Der Knoten.
+
+        Returns:
+            str: Die SQL-Bedingung.
+        """
+        kind = node[0]
+        if kind == 'and':
+            return '(' + ' AND '.join(self.compile_node(child) for child in node[1]) + ')'
+        if kind == 'or':
+            return '(' + ' OR '.join(self.compile_node(child) for child in node[1]) + ')'
+        if kind == 'not':
+            # NULL-Vergleiche (z.B. Stärke von Nicht-Kreaturen) gelten als nicht erfüllt
+            self._negated += 1
+            try:
+                return f'(NOT IFNULL({self.compile_node(node[1])}, 0))'
+            finally:
+                self._negated -= 1
+
+        _, field, op, value, quoted = node
+        return self.field_compilers[field](field, op, value, quoted)
+
+    def param(self, value):
+        """
+        Legt einen Parameter an.
+
+        Args:
+            value: Der Wert des Parameters.
+
+        Returns:
+            str: Der Platzhalter für die SQL-Abfrage.
+        """
+        name = f"p{len(self.params)}"
+        self.params[name] = value
+        return f"${name}"
+
+    def require_operator(self, field, op, allowed):
+        """
+        Prüft, ob ein Operator für ein Feld erlaubt ist.
+
+        Args:
+            field (str): Das Feld.
+            op (str): Der Operator.
+            allowed (tuple): Die erlaubten Operatoren.
+
+        Raises:
+            QueryError: Wenn der Operator nicht erlaubt ist.
+        """
+        if op not in allowed:
+            raise QueryError(f"Operator '{op}' ist für '{field}' nicht erlaubt")
+
+    def like(self, column, value):
+        """
+        Erzeugt eine Teilstring-Suche (ohne Beachtung der Groß-/Kleinschreibung).
+
+        Args:
+            column (str): Die Spalte.
+            value (str): Der gesuchte Text.
+
+        Returns:
+            str: Die SQL-Bedingung.
+        """
+        # Pony schaltet LIKE auf Groß-/Kleinschreibung um, daher beide Seiten klein
+        escaped = value.lower().replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        return f"LOWER(\"{column}\") LIKE {self.param('%' + escaped + '%')} ESCAPE '\\'"
+
+    def full_text(self, columns, value, quoted, ranked=False):
+        """
+        Sucht einen Begriff über die Volltextsuche in den angegebenen Spalten.
+
+        Ohne FTS5 wird auf eine Teilstring-Suche zurückgegriffen.
+
+        Args:
+            columns (tuple): Die durchsuchten Spalten.
+            value (str): Der Begriff oder die Phrase.
+            quoted (bool): Ob der Begriff als exakte Phrase gesucht wird.
+            ranked (bool, optional): Ob die Ergebnisse nach diesem Begriff sortiert werden.
+
+        Returns:
+            str: Die SQL-Bedingung.
+        """
+        if not card_search.fts_available:
+            return '(' + ' OR '.join(self.like(column, value) for column in columns) + ')'
+
+        if not any(char.isalnum() for char in value):
+            raise QueryError(f"Ungültiger Suchbegriff '{value}'")
+
+        phrase = '"' + value.replace('"', '""') + '"' + ('' if quoted else '*')
+        match = '{' + ' '.join(columns) + '} : ' + phrase
+        if ranked and not self._negated:
+            self.rank_phrases.append(phrase)
+        return (
+            f'"id" IN (SELECT rowid FROM "{card_search.SEARCH_TABLE}" '
+            f'WHERE "{card_search.SEARCH_TABLE}" MATCH {self.param(match)})'
+        )
+
+    def compile_text(self, field, op, value, quoted):
+        """Freier Suchbegriff: Name, Typ oder Regeltext."""
+        return self.full_text(('name', 'card_type', 'rules_text'), value, quoted, ranked=True)
+
+    def compile_name(self, field, op, value, quoted):
+        """n: Name der Karte."""
+        self.require_operator(field, op, (':', '='))
+        if op == '=':
+            return f"\"name\" = {self.param(value)} COLLATE NOCASE"
+        return self.full_text(('name',), value, quoted)
+
+    def compile_type(self, field, op, value, quoted):
+        """t: Kartentyp, Obertyp oder Untertyp (jedes Wort als Präfix)."""
+        self.require_operator(field, op, (':', '='))
+
+        conditions = []
+        for word in value.lower().split():
+            type_bits = 0
+            for type_name, bit in TYPE_BITS.items():
+                if type_name.lower().startswith(word):
+                    type_bits |= bit
+
+            subtype = (
+                '"id" IN (SELECT "card" FROM "Card_CardSubtype" WHERE "cardsubtype" IN '
+                f'(SELECT "id" FROM "CardSubtype" WHERE LOWER("name") LIKE {self.param(word + "%")}))'
+            )
+            if type_bits:
+                conditions.append(f'(("type_mask" & {type_bits}) <> 0 OR {subtype})')
+            else:
+                conditions.append(subtype)
+
+        if not conditions:
+            raise QueryError(f"Wert für '{field}' fehlt")
+        return '(' + ' AND '.join(conditions) + ')'
+
+    def compile_oracle(self, field, op, value, quoted):
+        """o: Regeltext der Karte."""
+        self.require_operator(field, op, (':', '='))
+        return self.full_text(('rules_text',), value, quoted)
+
+    def compile_color(self, field, op, value, quoted):
+        """c: Farben der Karte (Kürzel wie 'ur', 'c' für farblos, 'm' für mehrfarbig)."""
+        value = value.lower()
+
+        if value in ('c', 'colorless'):
+            self.require_operator(field, op, (':', '=', '!='))
+            matches = (lambda mask: mask != 0) if op == '!=' else (lambda mask: mask == 0)
+        elif value in ('m', 'multicolor'):
+            self.require_operator(field, op, (':', '=', '!='))
+            matches = (lambda mask: bin(mask).count('1') < 2) if op == '!=' else (lambda mask: bin(mask).count('1') >= 2)
+        else:
+            if value in COLOR_CODES:
+                codes = [value]
+            elif all(char in 'wubrg' for char in value):
+                codes = list(value)
+            else:
+                raise QueryError(f"Unbekannte Farbe '{value}'")
+
+            wanted = 0
+            for code in codes:
+                wanted |= COLOR_BITS[COLOR_CODES[code]]
+            matches = COLOR_MATCHERS[op](wanted)
+
+        # Es gibt nur 32 Farbkombinationen: Vergleich als IN-Liste über den Index
+        masks = [mask for mask in range(ALL_COLORS_MASK + 1) if matches(mask)]
+        if not masks:
+            return '0'
+        if len(masks) == ALL_COLORS_MASK + 1:
+            return '1'
+        return '"color_mask" IN (' + ', '.join(str(mask) for mask in masks) + ')'
+
+    def number(self, field, value):
+        """
+        Wandelt einen Vergleichswert in eine Zahl um.
+
+        Args:
+            field (str): Das Feld.
+            value (str): Der Wert.
+
+        Returns:
+            int: Die Zahl.
+        """
+        try:
+            return int(value)
+        except ValueError:
+            raise QueryError(f"'{field}' erwartet eine Zahl, nicht '{value}'")
+
+    def compile_mana_value(self, field, op, value, quoted):
+        """cmc/mv: Manabetrag der Karte."""
+        return f"\"mana_value\" {COMPARISON_OPERATORS[op]} {self.param(self.number(field, value))}"
+
+    def compile_stat(self, field, op, value, quoted):
+        """pow/tou: Stärke oder Widerstandskraft (auch gegeneinander, z.B. pow>tou)."""
+        other = FIELD_ALIASES.get(value.lower())
+        if other in ('power', 'toughness'):
+            return f"\"{field}\" {COMPARISON_OPERATORS[op]} \"{other}\""
+        return f"\"{field}\" {COMPARISON_OPERATORS[op]} {self.param(self.number(field, value))}"
+
+    def compile_rarity(self, field, op, value, quoted):
+        """r: Seltenheit (mit Vergleichen entlang RARITY_ORDER)."""
+        rarity = RARITY_CODES.get(value.lower())
+        if rarity is None:
+            raise QueryError(f"Unbekannte Seltenheit '{value}'")
+
+        if op in (':', '='):
+            return f"\"rarity\" = {self.param(rarity)}"
+        if op == '!=':
+            return f"\"rarity\" <> {self.param(rarity)}"
+
+        rank = RARITY_ORDER.index(rarity)
+        selected = [
+            name for index, name in enumerate(RARITY_ORDER)
+            if {'<': index < rank, '<=': index <= rank, '>': index > rank, '>=': index >= rank}[op]
+        ]
+        if not selected:
+            return '0'
+        return '"rarity" IN (' + ', '.join(self.param(name) for name in selected) + ')'
+
+    def compile_set(self, field, op, value, quoted):
+        """s/set/e: Set-Code der Karte."""
+        self.require_operator(field, op, (':', '=', '!='))
+        return f"\"set_code\" {'<>' if op == '!=' else '='} {self.param(value.upper())}"
+
+
+class CardQuery:
+    """
+    Eine übersetzte Suchanfrage, deren Ergebnisse seitenweise geladen werden.
+
+    Attribute:
+        text (str): Die Suchanfrage.
+        error (str): Fehlermeldung, wenn die Anfrage ungültig ist, sonst None.
+    """
+
+    def __init__(self, text):
+        """
+        Parst und übersetzt eine Suchanfrage.
+
+        Args:
+            text (str): Die Suchanfrage.
+        """
+        self.text = text
+        self.where_sql = None
+        self.params = {}
+
+        # FTS5-Suchausdruck für die bm25-Sortierung (None: Sortierung nach Name)
+        self.rank_match = None
+
+        node, self.error = parse_query(text)
+        if self.error is None:
+            compiler = CardQueryCompiler()
+            try:
+                self.where_sql, self.params = compiler.compile(node)
+            except QueryError as e:
+                self.error = str(e)
+            else:
+                if compiler.rank_phrases:
+                    self.rank_match = ' OR '.join(compiler.rank_phrases)
+
+    def fetch_page(self, after=None, limit=DEFAULT_PAGE_SIZE):
+        """
+        Lädt eine Seite der Ergebnisse.
+
+        Args:
+            after (tuple, optional): Schlüssel der letzten Karte der vorherigen
+                Seite (siehe page_key); None für die erste Seite.
+            limit (int, optional): Maximale Anzahl der Karten.
+
+        Returns:
+            tuple: (Liste der Kartenzeilen mit den Spalten aus RESULT_COLUMNS,
+                bei freien Suchbegriffen gefolgt von der bm25-Gewichtung,
+                Fehlermeldung oder None)
+        """
+        if self.error is not None:
+            return [], self.error
+
+        params = dict(self.params)
+        where = self.where_sql
+        columns = ', '.join(f'"{column}"' for column in RESULT_COLUMNS)
+
+        if self.rank_match is None:
+            if after is not None:
+                params['after_name'], params['after_id'] = after
+                where = f'({where}) AND ("name", "id") > ($after_name, $after_id)'
+            sql = f'SELECT {columns} FROM "Card" WHERE {where} ORDER BY "name", "id" LIMIT {int(limit)}'
+        else:
+            # Karten, die nur über andere Bedingungen (z.B. "or t:land") passen, stehen hinten
+            rank = 'IFNULL("ranking"."rank", 0)'
+            params['rank_match'] = self.rank_match
+            if after is not None:
+                params['after_rank'], params['after_name'], params['after_id'] = after
+                where = f'({where}) AND ({rank}, "name", "id") > ($after_rank, $after_name, $after_id)'
+            sql = (
+                f'SELECT {columns}, {rank} FROM "Card" '
+                f'LEFT JOIN ({card_search.rank_subquery("$rank_match")}) AS "ranking" '
+                f'ON "ranking"."card_id" = "Card"."id" '
+                f'WHERE {where} ORDER BY {rank}, "name", "id" LIMIT {int(limit)}'
+            )
+
+        with db_session:
+            return db.select(sql, {}, params), None
+
+    @staticmethod
+    def page_key(rows):
+        """
+        Gibt den Schlüssel für die nächste Seite zurück.
+
+        Args:
+            rows (list): Die Zeilen der aktuellen Seite.
+
+        Returns:
+            tuple: (Name, ID) bzw. (Gewichtung, Name, ID) der letzten Zeile
+                oder None bei leerer Seite.
+        """
+        if not rows:
+            return None
+        last = rows[-1]
+        if len(last) > len(RESULT_COLUMNS):
+            return last[-1], last[1], last[0]
+        return last[1], last[0]
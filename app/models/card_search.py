@@ -0,0 +1,144 @@
+"""
+Volltextsuche über Karten für die Magic the Gathering Desktop App.
+
+Dieses Modul legt eine SQLite-FTS5-Tabelle über Name, Typ und Regeltext der
+Karten an. Die Tabelle speichert keine eigenen Inhalte (external content),
+sondern verweist auf die Tabelle Card und wird über Trigger synchron gehalten,
+auch wenn Karten am ORM vorbei (z.B. durch den Massenimport) geschrieben werden.
+
+Die Suchausdrücke selbst erzeugt die Suchsprache in card_query. Treffer
+freier Suchbegriffe werden mit bm25 gewichtet, wobei Treffer im Namen am
+stärksten zählen (siehe rank_subquery).
+"""
+
+import sqlite3
+
+from pony.orm import db_session
+from pony.orm.dbapiprovider import OperationalError
+
+from app.models.database import db
+
+# Name der FTS5-Tabelle
+SEARCH_TABLE = 'CardSearch'
+
+# Durchsuchte Spalten der Tabelle Card und ihre Gewichtung für bm25
+SEARCH_COLUMNS = (('name', 10.0), ('card_type', 2.0), ('rules_text', 1.0))
+
+# Präfixlängen, für die FTS5 eigene Indizes anlegt (beschleunigt kurze Präfixe)
+PREFIX_INDEXES = '2 3'
+
+# Trigger, die die Suchtabelle mit der Tabelle Card synchron halten
+SEARCH_TRIGGERS = {
+    'card_search_insert': '''
+        CREATE TRIGGER IF NOT EXISTS "card_search_insert" AFTER INSERT ON "Card" BEGIN
+            INSERT INTO "CardSearch" ("rowid", "name", "card_type", "rules_text")
+            VALUES (new."id", new."name", new."card_type", new."rules_text");
+        END''',
+    'card_search_delete': '''
+        CREATE TRIGGER IF NOT EXISTS "card_search_delete" AFTER DELETE ON "Card" BEGIN
+            INSERT INTO "CardSearch" ("CardSearch", "rowid", "name", "card_type", "rules_text")
+            VALUES ('delete', old."id", old."name", old."card_type", old."rules_text");
+        END''',
+    'card_search_update': '''
+        CREATE TRIGGER IF NOT EXISTS "card_search_update"
+        AFTER UPDATE OF "name", "card_type", "rules_text" ON "Card" BEGIN
+            INSERT INTO "CardSearch" ("CardSearch", "rowid", "name", "card_type", "rules_text")
+            VALUES ('delete', old."id", old."name", old."card_type", old."rules_text");
+            INSERT INTO "CardSearch" ("rowid", "name", "card_type", "rules_text")
+            VALUES (new."id", new."name", new."card_type", new."rules_text");
+        END'''
+}
+
+# Ob die SQLite-Version FTS5 unterstützt (wird von create_search_index gesetzt)
+fts_available = False
+
+
+@db_session
+def create_search_index():
+    """
+    Legt die Suchtabelle und ihre Trigger an, falls sie noch nicht existieren.
+
+    Eine neu angelegte Tabelle wird aus den vorhandenen Karten aufgebaut.
+    Ohne FTS5-Unterstützung bleibt die Suche deaktiviert und card_query
+    greift auf Teilstring-Suchen zurück.
+
+    Returns:
+        bool: True, wenn die Volltextsuche verfügbar ist.
+    """
+    global fts_available
+
+    exists = db.select(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name = $SEARCH_TABLE"
+    )
+
+    if not exists:
+        columns = ', '.join(f'"{name}"' for name, _ in SEARCH_COLUMNS)
+        try:
+            db.execute(
+                f'CREATE VIRTUAL TABLE "{SEARCH_TABLE}" USING fts5({columns}, '
+                f'content="Card", content_rowid="id", tokenize="unicode61 remove_diacritics 2", '
+                f'prefix="{PREFIX_INDEXES}")'
+            )
+        except (OperationalError, sqlite3.OperationalError) as e:
+            print(f"Volltextsuche nicht verfügbar: {e}")
+            fts_available = False
+            return False
+
+        db.execute(f'INSERT INTO "{SEARCH_TABLE}" ("{SEARCH_TABLE}") VALUES (\'rebuild\')')
+        print("Suchindex für Karten aufgebaut.")
+
+    for trigger_sql in SEARCH_TRIGGERS.values():
+        db.execute(trigger_sql)
+
+    fts_available = True
+    return True
+
+
+def suspend_search_triggers(connection):
+    """
+    Entfernt die Trigger der Suchtabelle für einen Massenimport.
+
+    Einzelne Aktualisierungen über Trigger sind bei vielen tausend Karten
+    deutlich langsamer als ein Neuaufbau; nach dem Import muss daher
+    rebuild_search_index aufgerufen werden.
+
+    Args:
+        connection (sqlite3.Connection): Die Verbindung des Imports (außerhalb einer Transaktion).
+    """
+    for name in SEARCH_TRIGGERS:
+        connection.execute(f'DROP TRIGGER IF EXISTS "{name}"')
+
+
+def rebuild_search_index(connection):
+    """
+    Baut die Suchtabelle neu auf und legt ihre Trigger wieder an.
+
+    Args:
+        connection (sqlite3.Connection): Die Verbindung des Imports (außerhalb einer Transaktion).
+    """
+    exists = connection.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name = ?", (SEARCH_TABLE,)
+    ).fetchone()
+    if not exists:
+        return
+
+    connection.execute(f'INSERT INTO "{SEARCH_TABLE}" ("{SEARCH_TABLE}") VALUES (\'rebuild\')')
+    for trigger_sql in SEARCH_TRIGGERS.values():
+        connection.execute(trigger_sql)
+
+
+def rank_subquery(match_placeholder):
+    """
+    Erzeugt eine Unterabfrage, die Treffer der Volltextsuche mit bm25 gewichtet.
+
+    Args:
+        match_placeholder (str): Platzhalter des FTS5-Suchausdrucks in der Abfrage.
+
+    Returns:
+        str: SQL mit den Spalten "card_id" und "rank" (kleinere Werte sind bessere Treffer).
+    """
+    weights = ', '.join(str(weight) for _, weight in SEARCH_COLUMNS)
+    return (
+        f'SELECT rowid AS "card_id", bm25("{SEARCH_TABLE}", {weights}) AS "rank" '
+        f'FROM "{SEARCH_TABLE}" WHERE "{SEARCH_TABLE}" MATCH {match_placeholder}'
+    )
@@ -11,18 +11,52 @@ from pony.orm import Database, db_session, commit
 # Erstellt eine Datenbankinstanz
 db = Database()
 
+# Standardprofil der SQLite-Verbindungen (PRAGMA-Name -> Wert)
+DATABASE_PROFILE = {
+    'journal_mode': 'WAL',        # Leser blockieren den Schreiber nicht
+    'synchronous': 'NORMAL',      # Im WAL-Modus sicher, spart fsync pro Commit
+    'mmap_size': 268435456,       # 256 MB der Datei per Memory-Mapping lesen
+    'cache_size': -65536,         # 64 MB Seitencache (negativ = KiB)
+    'temp_store': 'MEMORY'        # Temporäre Sortierungen im Speicher
+}
 
-def init_database(data_dir=None):
+# Aktives Profil, wird beim Öffnen jeder Verbindung angewendet
+_active_profile = dict(DATABASE_PROFILE)
+
+
+@db.on_connect(provider='sqlite')
+def apply_connection_profile(database, connection):
+    """
+    Setzt die PRAGMAs des aktiven Profils auf einer neuen Verbindung.
+    
+    Args:
+        database: Die Datenbankinstanz.
+        connection: Die neue SQLite-Verbindung.
+    """
+    cursor = connection.cursor()
+    for name, value in _active_profile.items():
+        if value is not None:
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def init_database(data_dir=None, profile=None):
     """
     Initialisiert die Datenbankverbindung.
     
     Args:
         data_dir: Das Verzeichnis, in dem die Datenbankdatei gespeichert werden soll.
                  Wenn None, wird das Standardverzeichnis verwendet.
+        profile (dict, optional): PRAGMAs, die das Standardprofil überschreiben.
+                 Ein Wert None lässt die SQLite-Voreinstellung unverändert.
     
     Returns:
         Die initialisierte Datenbankinstanz.
     """
+    _active_profile.clear()
+    _active_profile.update(DATABASE_PROFILE)
+    if profile:
+        _active_profile.update(profile)
+    
     # Wenn kein Datenpfad angegeben ist, verwende das Standardverzeichnis
     if data_dir is None:
         base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
@@ -33,10 +67,13 @@ def init_database(data_dir=None):
     db_path = os.path.join(data_dir, 'magic_tg_app.sqlite')
     db.bind(provider='sqlite', filename=db_path, create_db=True)
     
+    # Bestehende Datenbanken an neue Spalten anpassen
+    added_columns = migrate_schema()
+    
     # Hier werden die Entitäten definiert (aus anderen Moduldateien importiert)
     # Nachdem alle Modelle importiert wurden, werden die Tabellen erstellt
     # Dieser Import muss nach dem db.bind() erfolgen!
-    from app.models.card import Card
+    from app.models.card import Card, CardSubtype
     from app.models.deck import Deck, CardInDeck
     from app.models.player import Player, PlayerStats
     from app.models.game import Game
@@ -44,9 +81,59 @@ def init_database(data_dir=None):
     # Erstellt die Tabellen in der Datenbank
     db.generate_mapping(create_tables=True)
     
+    # Abgeleitete Kartenattribute für bestehende Karten berechnen
+    if {('Card', 'type_mask'), ('Card', 'name_key'), ('Card', 'layout')} & set(added_columns):
+        from app.utils.card_loader import backfill_card_attributes
+        backfill_card_attributes()
+    
+    # Volltextsuche über die Karten (FTS5) anlegen
+    from app.models.card_search import create_search_index
+    create_search_index()
+    
     return db
 
 
+# Spalten, die nachträglich zu bestehenden Tabellen hinzugefügt wurden
+# Format: (Tabelle, Spalte, SQL-Definition, zugehöriger Index oder None)
+ADDED_COLUMNS = [
+    ('Card', 'collector_number', 'TEXT',
+     'CREATE UNIQUE INDEX "unq_card__set_code_collector_number" ON "Card" ("set_code", "collector_number")'),
+    # Abgeleitete Kartenattribute (Indizes legt generate_mapping an)
+    ('Card', 'color_mask', 'INTEGER NOT NULL DEFAULT 0', None),
+    ('Card', 'mana_value', 'INTEGER NOT NULL DEFAULT 0', None),
+    ('Card', 'type_mask', 'INTEGER NOT NULL DEFAULT 0', None),
+    ('Card', 'name_key', "TEXT NOT NULL DEFAULT ''", None),
+    ('Card', 'face_key', "TEXT NOT NULL DEFAULT ''", None),
+    # Layout laut Kartenabzug (leer für Karten aus älteren Importen)
+    ('Card', 'layout', "TEXT NOT NULL DEFAULT ''", None),
+    # Commander eines Decks (Index legt generate_mapping an)
+    ('Deck', 'commander', 'INTEGER REFERENCES "Card" ("id") ON DELETE SET NULL', None),
+]
+
+
+@db_session
+def migrate_schema():
+    """
+    Ergänzt fehlende Spalten (und ihre Indizes) in einer bestehenden Datenbank.
+    
+    Neue Tabellen werden von generate_mapping angelegt; bestehende Tabellen
+    werden dabei jedoch nicht verändert.
+    
+    Returns:
+        list: Die hinzugefügten Spalten als (Tabelle, Spalte).
+    """
+    added = []
+    for table, column, definition, index_definition in ADDED_COLUMNS:
+        columns = [row[1] for row in db.execute(f'PRAGMA table_info("{table}")')]
+        if columns and column not in columns:
+            db.execute(f'ALTER TABLE "{table}" ADD COLUMN "{column}" {definition}')
+            if index_definition:
+                db.execute(index_definition)
+            added.append((table, column))
+            print(f"Spalte {table}.{column} hinzugefügt.")
+    return added
+
+
 def get_database():
     """
     Gibt die Datenbankinstanz zurück.
@@ -4,7 +4,7 @@ Deck-Modell für die Magic the Gathering Desktop App.
 Dieses Modul definiert das Datenmodell für Spielerdecks.
 """
 
-from pony.orm import Required, Optional, Set, PrimaryKey
+from pony.orm import Required, Optional, Set, PrimaryKey, composite_index, select
 from app.models.database import db
 
 
@@ -18,12 +18,15 @@ class Deck(db.Entity):
         player (Player): Spieler, dem das Deck gehört
         format (str): Format des Decks (Standard, Modern, etc.)
         cards (Set[CardInDeck]): Karten im Deck
+        commander (Card, optional): Commander des Decks (Commander, Brawl)
     """
     id = PrimaryKey(int, auto=True)
     name = Required(str)
     player = Required('Player')
     format = Required(str)  # Standard, Modern, Commander, etc.
     cards = Set('CardInDeck')
+    commander = Optional('Card')
+    composite_index(player, name)  # Decks eines Spielers nach Namen
     
     def get_card_count(self):
         """
@@ -32,7 +35,7 @@ class Deck(db.Entity):
         Returns:
             int: Anzahl der Karten im Deck
         """
-        return sum(card_in_deck.quantity for card_in_deck in self.cards)
+        return select(cid.quantity for cid in CardInDeck if cid.deck == self).sum()
     
     def get_unique_card_count(self):
         """
@@ -41,7 +44,18 @@ class Deck(db.Entity):
         Returns:
             int: Anzahl der einzigartigen Karten im Deck
         """
-        return len(self.cards)
+        return self.cards.count()
+    
+    def get_summary(self):
+        """
+        Lädt die aggregierten Kennzahlen des Decks mit einer Abfrage.
+        
+        Returns:
+            DeckSummary: Die Zusammenfassung des Decks
+        """
+        from app.logic.deck_summary import DeckSummary
+        
+        return DeckSummary.load(self.id)
     
     def is_valid_for_format(self):
         """
@@ -51,32 +65,8 @@ class Deck(db.Entity):
             bool: True, wenn das Deck gültig ist, sonst False
             str: Fehlermeldung, wenn das Deck ungültig ist, sonst None
         """
-        # Implementierung der Format-Validierung hier
-        # Beispiel für Standard-Format:
-        if self.format.lower() == 'standard':
-            # Mindestgröße prüfen
-            if self.get_card_count() < 60:
-                return False, "Das Deck muss mindestens 60 Karten enthalten"
-            
-            # Karten-Limits prüfen (max. 4 Karten mit demselben Namen, außer Grundländer)
-            card_counts = {}
-            for card_in_deck in self.cards:
-                card_name = card_in_deck.card.name
-                # Grundländer ignorieren
-                if card_in_deck.card.is_land() and "Basic" in card_in_deck.card.card_type:
-                    continue
-                    
-                if card_name not in card_counts:
-                    card_counts[card_name] = 0
-                card_counts[card_name] += card_in_deck.quantity
-                
-                if card_counts[card_name] > 4:
-                    return False, f"Das Deck enthält mehr als 4 Exemplare von {card_name}"
-            
-            return True, None
-        
-        # Weitere Formate können hier implementiert werden
-        return True, None
+        commander_id = self.commander.id if self.commander else None
+        return self.get_summary().validate_format(self.format, commander_id)
 
 
 class CardInDeck(db.Entity):
@@ -93,3 +83,4 @@ class CardInDeck(db.Entity):
     deck = Required(Deck)
     card = Required('Card')
     quantity = Required(int, default=1)
+    composite_index(deck, card)  # Suche einer Karte in einem Deck
@@ -6,7 +6,7 @@ Dieses Modul definiert das Datenmodell für Spiele.
 
 import json
 import datetime
-from pony.orm import Required, Optional, PrimaryKey
+from pony.orm import Required, Optional, PrimaryKey, composite_index
 from app.models.database import db
 
 
@@ -30,6 +30,7 @@ class Game(db.Entity):
     start_time = Required(datetime.datetime, default=lambda: datetime.datetime.now())
     end_time = Optional(datetime.datetime)
     game_state = Optional(str)  # JSON-String mit dem Spielzustand
+    composite_index(end_time, start_time)  # Offene Spiele nach Startzeit
     
     def set_game_state(self, state_dict):
         """
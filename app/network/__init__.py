@@ -0,0 +1 @@
+"""Netzwerkspiel für die Magic the Gathering Desktop App."""
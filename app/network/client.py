@@ -0,0 +1,142 @@
+"""
+Client für den lokalen Spielserver der Magic the Gathering Desktop App.
+
+Der Client hält die vom Server gelieferte Sicht eines Spielers aktuell und
+sendet Aktionen an den Server.
+"""
+
+import asyncio
+import itertools
+
+from app.network.protocol import (
+    encode_frame, read_frame, apply_delta, ProtocolError,
+    MSG_HELLO, MSG_WELCOME, MSG_SNAPSHOT, MSG_DELTA, MSG_ACTION, MSG_RESULT, MSG_ERROR
+)
+from app.network.server import DEFAULT_PORT
+
+
+class GameClient:
+    """
+    Verbindung eines Spielers zum Spielserver.
+
+    Nach jeder empfangenen Änderung wird `on_state` mit der aktuellen Sicht
+    aufgerufen, z.B. um die Oberfläche zu aktualisieren.
+    """
+
+    def __init__(self, player_id, seat_token, host='127.0.0.1', port=DEFAULT_PORT, on_state=None):
+        """
+        Initialisiert den Client.
+
+        Args:
+            player_id (str): Die ID des Spielers, für den sich der Client anmeldet.
+            seat_token (str): Das Zugangstoken des Platzes (vom Server ausgegeben).
+            host (str, optional): Die Adresse des Servers.
+            port (int, optional): Der Port des Servers.
+            on_state (callable, optional): Wird mit der Sicht aufgerufen, wenn sie sich ändert.
+        """
+        self.player_id = str(player_id)
+        self.seat_token = seat_token
+        self.host = host
+        self.port = port
+        self.on_state = on_state
+
+        self.game_id = None
+        self.view = None
+        self.version = 0
+        self.updated = None
+
+        self._reader = None
+        self._writer = None
+        self._receive_task = None
+        self._seq = itertools.count(1)
+        self._pending_results = {}
+
+    async def connect(self):
+        """
+        Verbindet sich mit dem Server und meldet den Spieler an.
+
+        Raises:
+            ConnectionError: Wenn der Server die Anmeldung ablehnt.
+        """
+        self.updated = asyncio.Event()
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+
+        self._writer.write(encode_frame(MSG_HELLO, {'player_id': self.player_id, 'token': self.seat_token}))
+        await self._writer.drain()
+
+        msg_type, payload = await read_frame(self._reader)
+        if msg_type != MSG_WELCOME:
+            self._writer.close()
+            raise ConnectionError(payload.get('error', "Anmeldung fehlgeschlagen."))
+
+        self.game_id = payload['game_id']
+        self._receive_task = asyncio.ensure_future(self._receive_loop())
+
+    async def close(self):
+        """Trennt die Verbindung zum Server."""
+        if self._receive_task:
+            self._receive_task.cancel()
+        if self._writer:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def send_action(self, action, **args):
+        """
+        Sendet eine Aktion an den Server und wartet auf das Ergebnis.
+
+        Args:
+            action (str): Der Name der Aktion (z.B. 'draw_cards').
+            **args: Die Argumente der Aktion.
+
+        Returns:
+            str: Fehlermeldung bei einem Fehler, sonst None.
+        """
+        seq = next(self._seq)
+        result = asyncio.get_running_loop().create_future()
+        self._pending_results[seq] = result
+
+        self._writer.write(encode_frame(MSG_ACTION, {'seq': seq, 'action': action, 'args': args}))
+        await self._writer.drain()
+
+        return await result
+
+    async def wait_for_update(self):
+        """Wartet, bis die nächste Änderung der Sicht empfangen wurde."""
+        self.updated.clear()
+        await self.updated.wait()
+
+    async def _receive_loop(self):
+        """Empfängt Nachrichten des Servers und wendet sie auf die Sicht an."""
+        try:
+            while True:
+                msg_type, payload = await read_frame(self._reader)
+
+                if msg_type == MSG_SNAPSHOT:
+                    self.view = payload
+                    self._notify()
+                elif msg_type == MSG_DELTA:
+                    apply_delta(self.view, payload['ops'])
+                    self._notify()
+                elif msg_type == MSG_RESULT:
+                    result = self._pending_results.pop(payload['seq'], None)
+                    if result and not result.done():
+                        result.set_result(payload['error'])
+                elif msg_type == MSG_ERROR:
+                    print(f"Fehler vom Server: {payload.get('error')}")
+        except (asyncio.IncompleteReadError, ConnectionError, ProtocolError):
+            print("Verbindung zum Spielserver getrennt.")
+        finally:
+            for result in self._pending_results.values():
+                if not result.done():
+                    result.set_result("Verbindung zum Spielserver getrennt.")
+            self._pending_results.clear()
+
+    def _notify(self):
+        """Meldet eine Änderung der Sicht."""
+        self.version += 1
+        self.updated.set()
+        if self.on_state:
+            self.on_state(self.view)
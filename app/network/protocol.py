@@ -0,0 +1,159 @@
+"""
+Netzwerkprotokoll für die Magic the Gathering Desktop App.
+
+Nachrichten werden als Frames übertragen: ein 6-Byte-Kopf (Länge der Nutzdaten,
+Nachrichtentyp, Flags) gefolgt von kompaktem JSON, das ab einer Mindestgröße
+mit zlib komprimiert wird. Zustandsänderungen werden als Deltas übertragen.
+"""
+
+import json
+import struct
+import zlib
+
+# Kopf: Länge der Nutzdaten (uint32), Nachrichtentyp (uint8), Flags (uint8)
+HEADER = struct.Struct('!IBB')
+
+# Nachrichtentypen
+MSG_HELLO = 1       # Client -> Server: {'player_id': str}
+MSG_WELCOME = 2     # Server -> Client: {'player_id': str, 'game_id': int}
+MSG_SNAPSHOT = 3    # Server -> Client: vollständige Sicht des Spielers
+MSG_DELTA = 4       # Server -> Client: {'ops': [...]} Änderungen seit der letzten Sicht
+MSG_ACTION = 5      # Client -> Server: {'seq': int, 'action': str, 'args': dict}
+MSG_RESULT = 6      # Server -> Client: {'seq': int, 'error': str oder None}
+MSG_ERROR = 7       # Server -> Client: {'error': str}
+
+# Flags
+FLAG_COMPRESSED = 0x01
+
+# Nutzdaten ab dieser Größe werden komprimiert
+COMPRESSION_THRESHOLD = 512
+
+# Obergrenze für einzelne Frames (Schutz vor fehlerhaften Gegenstellen)
+MAX_FRAME_SIZE = 16 * 1024 * 1024
+
+
+class ProtocolError(Exception):
+    """Wird ausgelöst, wenn ein empfangener Frame ungültig ist."""
+
+
+def encode_frame(msg_type, payload):
+    """
+    Kodiert eine Nachricht als Frame.
+
+    Args:
+        msg_type (int): Der Nachrichtentyp.
+        payload: Die JSON-serialisierbaren Nutzdaten.
+
+    Returns:
+        bytes: Der kodierte Frame.
+    """
+    data = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    flags = 0
+
+    if len(data) >= COMPRESSION_THRESHOLD:
+        data = zlib.compress(data)
+        flags |= FLAG_COMPRESSED
+
+    return HEADER.pack(len(data), msg_type, flags) + data
+
+
+def decode_payload(flags, data):
+    """
+    Dekodiert die Nutzdaten eines Frames.
+
+    Args:
+        flags (int): Die Flags aus dem Kopf.
+        data (bytes): Die rohen Nutzdaten.
+
+    Returns:
+        Die dekodierten Nutzdaten.
+    """
+    if flags & FLAG_COMPRESSED:
+        data = zlib.decompress(data)
+    return json.loads(data.decode('utf-8'))
+
+
+async def read_frame(reader):
+    """
+    Liest einen Frame aus einem asyncio-StreamReader.
+
+    Args:
+        reader (asyncio.StreamReader): Der Stream, aus dem gelesen wird.
+
+    Returns:
+        tuple: (Nachrichtentyp, Nutzdaten)
+
+    Raises:
+        asyncio.IncompleteReadError: Wenn die Verbindung geschlossen wurde.
+        ProtocolError: Wenn der Frame zu groß ist.
+    """
+    header = await reader.readexactly(HEADER.size)
+    length, msg_type, flags = HEADER.unpack(header)
+
+    if length > MAX_FRAME_SIZE:
+        raise ProtocolError(f"Frame zu groß: {length} Bytes")
+
+    data = await reader.readexactly(length)
+    return msg_type, decode_payload(flags, data)
+
+
+def diff_views(old, new, path=()):
+    """
+    Berechnet die Änderungen zwischen zwei Sichten.
+
+    Dictionaries werden rekursiv verglichen, alle anderen Werte (auch Listen
+    wie Zonen) werden bei einer Änderung vollständig ersetzt.
+
+    Args:
+        old (dict): Die bisherige Sicht.
+        new (dict): Die neue Sicht.
+        path (tuple, optional): Der Pfad der aktuellen Ebene.
+
+    Returns:
+        list: Operationen der Form [pfad, wert] (setzen) oder [pfad] (löschen).
+    """
+    ops = []
+
+    for key, value in new.items():
+        key_path = path + (key,)
+        if key in old and old[key] is value:
+            # Unveränderte Zonen werden von den Sichten wiederverwendet
+            continue
+        if key not in old:
+            ops.append([list(key_path), value])
+        elif isinstance(value, dict) and isinstance(old[key], dict):
+            ops.extend(diff_views(old[key], value, key_path))
+        elif old[key] != value:
+            ops.append([list(key_path), value])
+
+    for key in old:
+        if key not in new:
+            ops.append([list(path + (key,))])
+
+    return ops
+
+
+def apply_delta(view, ops):
+    """
+    Wendet Änderungen auf eine Sicht an.
+
+    Args:
+        view (dict): Die zu ändernde Sicht.
+        ops (list): Operationen aus diff_views.
+
+    Returns:
+        dict: Die geänderte Sicht.
+    """
+    for op in ops:
+        *parents, key = op[0]
+
+        target = view
+        for part in parents:
+            target = target.setdefault(part, {})
+
+        if len(op) == 1:
+            target.pop(key, None)
+        else:
+            target[key] = op[1]
+
+    return view
@@ -0,0 +1,399 @@
+"""
+Lokaler Spielserver für die Magic the Gathering Desktop App.
+
+Der Server hält einen GameEngine und überträgt jedem Spieler über TCP nur die
+für ihn sichtbare Sicht auf den Spielzustand. Verdeckte Informationen
+(gegnerische Hand, Bibliotheken, verdeckte Karten) verlassen den Server nie.
+"""
+
+import argparse
+import asyncio
+import secrets
+from collections import deque
+
+from app.logic.game_engine import MOVABLE_ZONES
+
+from app.network.protocol import (
+    encode_frame, read_frame, diff_views, ProtocolError,
+    MSG_HELLO, MSG_WELCOME, MSG_SNAPSHOT, MSG_DELTA, MSG_ACTION, MSG_RESULT, MSG_ERROR
+)
+
+DEFAULT_PORT = 8765
+
+# Zonen, aus denen ein Spieler Karten über move_card bewegen darf (die er also
+# sehen kann); die Bibliothek ist nur über draw_cards erreichbar
+MOVE_SOURCE_ZONES = ('hand', 'battlefield', 'graveyard', 'exile', 'stack')
+
+
+class ClientConnection:
+    """
+    Verbindung zu einem Client mit eigener Sendewarteschlange.
+
+    Die Warteschlange ist für Zustandsframes begrenzt: Kommt ein Client nicht
+    hinterher, werden seine ausstehenden Deltas verworfen und durch einen
+    vollständigen Snapshot ersetzt.
+    """
+
+    def __init__(self, player_id, writer, max_pending_frames=64):
+        """
+        Initialisiert die Verbindung.
+
+        Args:
+            player_id (str): Die ID des Spielers an diesem Platz.
+            writer (asyncio.StreamWriter): Der Stream zum Client.
+            max_pending_frames (int, optional): Maximale Anzahl ausstehender Zustandsframes.
+        """
+        self.player_id = player_id
+        self.writer = writer
+        self.max_pending_frames = max_pending_frames
+        self.view = None
+        self.pending = deque()  # Einträge: (ist_zustandsframe, frame)
+        self.pending_state_frames = 0
+        self.frames_dropped = 0
+        self.results = []
+        self._wakeup = asyncio.Event()
+        self._send_task = asyncio.ensure_future(self._send_loop())
+
+    def send(self, frame):
+        """
+        Stellt einen Frame (z.B. ein Ergebnis) in die Warteschlange.
+
+        Args:
+            frame (bytes): Der zu sendende Frame.
+        """
+        self.pending.append((False, frame))
+        self._wakeup.set()
+
+    def send_state(self, frame, snapshot_factory):
+        """
+        Stellt einen Zustandsframe in die Warteschlange.
+
+        Args:
+            frame (bytes): Der Delta-Frame.
+            snapshot_factory (callable): Erzeugt einen Snapshot-Frame für den Fall,
+                dass die Warteschlange voll ist.
+        """
+        if self.pending_state_frames >= self.max_pending_frames:
+            # Gegendruck: ausstehende Deltas verwerfen, Snapshot nachsenden
+            kept = deque(entry for entry in self.pending if not entry[0])
+            self.frames_dropped += self.pending_state_frames
+            self.pending = kept
+            self.pending_state_frames = 0
+            frame = snapshot_factory()
+
+        self.pending.append((True, frame))
+        self.pending_state_frames += 1
+        self._wakeup.set()
+
+    async def _send_loop(self):
+        """Schreibt ausstehende Frames und wartet auf den Abfluss (drain)."""
+        try:
+            while True:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+
+                while self.pending:
+                    is_state, frame = self.pending.popleft()
+                    if is_state:
+                        self.pending_state_frames -= 1
+                    self.writer.write(frame)
+                    await self.writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+
+    async def close(self):
+        """Beendet die Verbindung."""
+        self._send_task.cancel()
+        try:
+            self.writer.close()
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+class GameServer:
+    """
+    Asynchroner TCP-Server, der ein Spiel für zwei Plätze bereitstellt.
+
+    Alle Aktionen einer Ereignisschleifen-Runde werden gesammelt und als ein
+    Delta pro Spieler übertragen.
+
+    Jeder Platz erhält beim Erstellen des Servers ein Zugangstoken (seat_tokens);
+    ein Client wird nur mit dem Token seines Platzes angenommen.
+    """
+
+    def __init__(self, engine, host='127.0.0.1', port=DEFAULT_PORT, on_change=None,
+                 max_pending_frames=64):
+        """
+        Initialisiert den Server.
+
+        Args:
+            engine (GameEngine): Der Spielmotor mit dem laufenden Spiel.
+            host (str, optional): Die Adresse, an die der Server gebunden wird.
+            port (int, optional): Der Port (0 wählt einen freien Port).
+            on_change (callable, optional): Wird nach jeder Änderungsrunde aufgerufen
+                (z.B. zum Speichern).
+            max_pending_frames (int, optional): Maximale Anzahl ausstehender
+                Zustandsframes pro Client.
+        """
+        self.engine = engine
+        self.host = host
+        self.port = port
+        self.on_change = on_change
+        self.max_pending_frames = max_pending_frames
+
+        self.seats = {}
+        self._server = None
+
+        # Zugangstoken pro Platz (Spieler-ID -> Token), werden den Spielern mitgeteilt
+        self.seat_tokens = {
+            player_id: secrets.token_urlsafe(16) for player_id in engine.game_state['players']
+        }
+        self._broadcast_pending = False
+
+        # Erlaubte Aktionen der Clients
+        self.actions = {
+            'draw_cards': self._action_draw_cards,
+            'change_phase': self._action_change_phase,
+            'advance_step': self._action_advance_step,
+            'move_card': self._action_move_card,
+            'set_tapped': self._action_set_tapped,
+            'add_mana': self._action_add_mana,
+        }
+
+    async def start(self):
+        """Startet den Server."""
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        print(f"Spielserver für Spiel {self.engine.game_id} läuft auf {self.host}:{self.port}.")
+
+    async def serve_forever(self):
+        """Startet den Server und bearbeitet Verbindungen, bis er beendet wird."""
+        if not self._server:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def stop(self):
+        """Beendet den Server und alle Verbindungen."""
+        for connection in list(self.seats.values()):
+            await connection.close()
+        self.seats.clear()
+
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def get_view(self, player_id):
+        """
+        Berechnet die Sicht eines Spielers.
+
+        Args:
+            player_id (str): Die ID des Spielers.
+
+        Returns:
+            dict: Die gefilterte Sicht.
+        """
+        return self.engine.get_view(player_id)
+
+    async def _handle_client(self, reader, writer):
+        """
+        Bearbeitet die Verbindung eines Clients.
+
+        Args:
+            reader (asyncio.StreamReader): Der eingehende Stream.
+            writer (asyncio.StreamWriter): Der ausgehende Stream.
+        """
+        connection = None
+        try:
+            msg_type, payload = await read_frame(reader)
+            player_id = str(payload.get('player_id')) if msg_type == MSG_HELLO else None
+            token = payload.get('token') if msg_type == MSG_HELLO else None
+
+            error = None
+            if player_id is None:
+                error = "Erwartet wurde eine Anmeldung."
+            elif player_id not in self.seat_tokens:
+                error = f"Spieler mit ID {player_id} nicht im Spiel."
+            elif not isinstance(token, str) or not secrets.compare_digest(token, self.seat_tokens[player_id]):
+                error = f"Ungültiges Zugangstoken für den Platz von Spieler {player_id}."
+            elif player_id in self.seats:
+                error = f"Der Platz von Spieler {player_id} ist bereits belegt."
+
+            if error:
+                writer.write(encode_frame(MSG_ERROR, {'error': error}))
+                await writer.drain()
+                writer.close()
+                return
+
+            connection = ClientConnection(player_id, writer, self.max_pending_frames)
+            self.seats[player_id] = connection
+
+            connection.send(encode_frame(MSG_WELCOME, {'player_id': player_id, 'game_id': self.engine.game_id}))
+            connection.view = self.get_view(player_id)
+            snapshot = encode_frame(MSG_SNAPSHOT, connection.view)
+            connection.send_state(snapshot, lambda: snapshot)
+            print(f"Spieler {player_id} hat sich verbunden.")
+
+            while True:
+                msg_type, payload = await read_frame(reader)
+                if msg_type == MSG_ACTION:
+                    error = self._apply_action(player_id, payload.get('action'), payload.get('args') or {})
+
+                    # Das Ergebnis folgt den Zustandsänderungen derselben Runde
+                    connection.results.append(encode_frame(MSG_RESULT, {'seq': payload.get('seq'), 'error': error}))
+                    self._schedule_broadcast()
+        except (asyncio.IncompleteReadError, ConnectionError, ProtocolError):
+            pass
+        finally:
+            if connection and self.seats.get(connection.player_id) is connection:
+                del self.seats[connection.player_id]
+                await connection.close()
+                print(f"Spieler {connection.player_id} hat die Verbindung getrennt.")
+
+    def _apply_action(self, player_id, action, args):
+        """
+        Führt eine Aktion eines Spielers auf dem Spielmotor aus.
+
+        Args:
+            player_id (str): Die ID des handelnden Spielers.
+            action (str): Der Name der Aktion.
+            args (dict): Die Argumente der Aktion.
+
+        Returns:
+            str: Fehlermeldung bei einem Fehler, sonst None.
+        """
+        handler = self.actions.get(action)
+        if not handler:
+            return f"Unbekannte Aktion: {action}"
+
+        try:
+            return handler(player_id, args)
+        except (KeyError, TypeError, ValueError) as e:
+            return f"Ungültige Argumente für {action}: {e}"
+        except Exception as e:
+            # Fehler des Spielmotors beenden nicht die Verbindung
+            print(f"Fehler bei Aktion {action} von Spieler {player_id}: {e}")
+            return f"Fehler bei {action}: {e}"
+
+    def _schedule_broadcast(self):
+        """Plant die Übertragung der Änderungen am Ende der aktuellen Runde der Ereignisschleife."""
+        if not self._broadcast_pending:
+            self._broadcast_pending = True
+            asyncio.get_running_loop().call_soon(self._broadcast)
+
+    def _broadcast(self):
+        """Überträgt jedem verbundenen Spieler die Änderungen seiner Sicht."""
+        self._broadcast_pending = False
+        changed = False
+
+        for player_id, connection in self.seats.items():
+            view = self.get_view(player_id)
+            ops = diff_views(connection.view, view)
+            connection.view = view
+
+            if ops:
+                changed = True
+                connection.send_state(
+                    encode_frame(MSG_DELTA, {'ops': ops}),
+                    lambda view=view: encode_frame(MSG_SNAPSHOT, view)
+                )
+
+            for frame in connection.results:
+                connection.send(frame)
+            connection.results.clear()
+
+        if changed and self.on_change:
+            self.on_change()
+
+    # Aktionen
+
+    def _require_active_player(self, player_id):
+        """Gibt eine Fehlermeldung zurück, wenn der Spieler nicht am Zug ist."""
+        if self.engine.game_state['active_player_id'] != player_id:
+            return "Nur der aktive Spieler kann die Phase wechseln."
+        return None
+
+    def _find_own_card(self, player_id, card_instance_id):
+        """
+        Sucht eine Karte, die der Spieler besitzt oder kontrolliert.
+
+        Fremde Karten werden wie nicht vorhandene behandelt, damit keine
+        Informationen über verdeckte Zonen nach außen gelangen.
+        """
+        card, zone, owner_id = self.engine.get_card_by_id(card_instance_id)
+        if not card or (owner_id != player_id and card.get('controller_id') != player_id):
+            return None, None
+        return card, zone
+
+    def _action_draw_cards(self, player_id, args):
+        """Lässt den Spieler Karten ziehen."""
+        _, error = self.engine.draw_cards(player_id, int(args.get('count', 1)))
+        return error
+
+    def _action_change_phase(self, player_id, args):
+        """Wechselt die Phase (nur für den aktiven Spieler)."""
+        error = self._require_active_player(player_id)
+        if error:
+            return error
+        _, error = self.engine.change_phase(args['phase'])
+        return error
+
+    def _action_advance_step(self, player_id, args):
+        """Geht zum nächsten Schritt über (nur für den aktiven Spieler)."""
+        error = self._require_active_player(player_id)
+        if error:
+            return error
+        _, error = self.engine.advance_step(bool(args.get('auto_pass', False)))
+        return error
+
+    def _action_move_card(self, player_id, args):
+        """Bewegt eine eigene Karte in eine andere Zone."""
+        if args['to_zone'] not in MOVABLE_ZONES:
+            return f"Unbekannte Zielzone: {args['to_zone']}"
+        card, zone = self._find_own_card(player_id, args['card_id'])
+        if not card or zone not in MOVE_SOURCE_ZONES:
+            # Karten in verdeckten Zonen werden wie nicht vorhandene behandelt
+            return f"Karte mit ID {args['card_id']} nicht gefunden."
+        _, error = self.engine.move_card(args['card_id'], zone, args['to_zone'], player_id)
+        return error
+
+    def _action_set_tapped(self, player_id, args):
+        """Tappt oder enttappt eine eigene Karte auf dem Spielfeld."""
+        card, zone = self._find_own_card(player_id, args['card_id'])
+        if not card or zone != 'battlefield':
+            return f"Karte mit ID {args['card_id']} nicht auf dem Spielfeld gefunden."
+        _, error = self.engine.set_card_state(args['card_id'], tapped=bool(args['tapped']))
+        return error
+
+    def _action_add_mana(self, player_id, args):
+        """Fügt dem Manapool des Spielers Mana hinzu."""
+        _, error = self.engine.add_mana_to_pool(player_id, args['mana_type'], int(args.get('amount', 1)))
+        return error
+
+
+def main():
+    """Startet einen Spielserver für ein gespeichertes Spiel über die Kommandozeile."""
+    from app.models.database import init_database
+    from app.logic.game_engine import GameEngine
+
+    parser = argparse.ArgumentParser(description="Lokaler Spielserver für Magic the Gathering")
+    parser.add_argument('--game-id', type=int, required=True, help="ID des gespeicherten Spiels")
+    parser.add_argument('--host', default='0.0.0.0', help="Adresse, an die der Server gebunden wird")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="Port des Servers")
+    args = parser.parse_args()
+
+    init_database()
+    engine = GameEngine(args.game_id)
+    server = GameServer(engine, args.host, args.port, on_change=engine.save_game_state)
+    for player_id, token in server.seat_tokens.items():
+        print(f"Zugangstoken für Spieler {player_id}: {token}")
+
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        print("Spielserver beendet.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,552 @@
+"""
+Kartenimport für die Magic the Gathering Desktop App.
+
+Dieses Modul importiert Karten aus einem Offline-Kartenabzug (Scryfall-Bulk-Daten
+oder MTGJSON AllPrintings) in die Datenbank. Die Datei wird stückweise gelesen,
+sodass auch Abzüge mit mehreren hundert Megabyte nicht vollständig in den
+Speicher geladen werden. Die Karten werden in großen Stapeln per Upsert
+(Set-Code und Sammlernummer) geschrieben; ein erneuter Import aktualisiert
+vorhandene Karten, statt sie zu verdoppeln.
+"""
+
+import argparse
+import json
+import sqlite3
+import time
+
+from app.models.card import card_name_keys, derive_card_attributes, parse_type_line
+from app.models.card_search import rebuild_search_index, suspend_search_triggers
+from app.models.database import db
+
+# Größe der gelesenen Blöcke in Zeichen
+CHUNK_SIZE = 1 << 20
+
+# Anzahl der Karten pro Schreibvorgang
+DEFAULT_BATCH_SIZE = 5000
+
+# Kartenlayouts ohne eigene Spielkarte (Token, Art-Series ...)
+SKIPPED_LAYOUTS = frozenset({'token', 'double_faced_token', 'art_series', 'emblem', 'vanguard', 'scheme', 'planar'})
+
+# Farbkürzel beider Formate und ihre Namen in der Datenbank
+COLOR_NAMES = {'W': 'White', 'U': 'Blue', 'B': 'Black', 'R': 'Red', 'G': 'Green'}
+
+# Seltenheiten beider Formate und ihre Namen in der Datenbank
+RARITY_NAMES = {
+    'common': 'Common',
+    'uncommon': 'Uncommon',
+    'rare': 'Rare',
+    'mythic': 'Mythic Rare',
+    'special': 'Special',
+    'bonus': 'Special'
+}
+
+# PRAGMAs für die Verbindung des Massenimports
+BULK_LOAD_PRAGMAS = {
+    'synchronous': 'OFF',
+    'temp_store': 'MEMORY',
+    'cache_size': '-262144'  # 256 MB
+}
+
+UPSERT_SQL = """
+    INSERT INTO "Card" (
+        "name", "card_type", "mana_cost", "colors", "rules_text", "power",
+        "toughness", "rarity", "set_code", "collector_number",
+        "color_mask", "mana_value", "type_mask", "name_key", "face_key", "layout", "image_path"
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, '')
+    ON CONFLICT ("set_code", "collector_number") DO UPDATE SET
+        "name" = excluded."name",
+        "card_type" = excluded."card_type",
+        "mana_cost" = excluded."mana_cost",
+        "colors" = excluded."colors",
+        "rules_text" = excluded."rules_text",
+        "power" = excluded."power",
+        "toughness" = excluded."toughness",
+        "rarity" = excluded."rarity",
+        "color_mask" = excluded."color_mask",
+        "mana_value" = excluded."mana_value",
+        "type_mask" = excluded."type_mask",
+        "name_key" = excluded."name_key",
+        "face_key" = excluded."face_key",
+        "layout" = excluded."layout"
+"""
+
+# ID einer Karte über Set-Code und Sammlernummer
+CARD_ID_SQL = 'SELECT "id" FROM "Card" WHERE "set_code" = ? AND "collector_number" = ?'
+
+
+class JsonStream:
+    """
+    Liest JSON stückweise aus einer Textdatei.
+
+    Einzelne Werte werden mit json.JSONDecoder.raw_decode dekodiert, sobald
+    sie vollständig im Puffer liegen. Damit lassen sich die Elemente eines
+    großen Arrays oder Objekts nacheinander verarbeiten.
+    """
+
+    def __init__(self, file, chunk_size=CHUNK_SIZE):
+        """
+        Initialisiert den Stream.
+
+        Args:
+            file: Die geöffnete Textdatei.
+            chunk_size (int, optional): Größe der gelesenen Blöcke in Zeichen.
+        """
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self):
+        """
+        Liest den nächsten Block in den Puffer.
+
+        Returns:
+            bool: True, wenn Daten gelesen wurden, sonst False (Dateiende).
+        """
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+
+        # Bereits verarbeitete Zeichen verwerfen
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """
+        Gibt das nächste Zeichen nach Leerraum zurück, ohne es zu verbrauchen.
+
+        Returns:
+            str: Das Zeichen oder '' am Dateiende.
+        """
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in ' \t\r\n':
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, chars):
+        """
+        Verbraucht das nächste Zeichen, wenn es eines der erwarteten ist.
+
+        Args:
+            chars (str): Die erlaubten Zeichen.
+
+        Returns:
+            str: Das verbrauchte Zeichen.
+
+        Raises:
+            ValueError: Wenn ein anderes Zeichen folgt.
+        """
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(f"Ungültiges JSON: '{chars}' erwartet, '{char}' gefunden.")
+        self.pos += 1
+        return char
+
+    def read_value(self):
+        """
+        Dekodiert den nächsten vollständigen JSON-Wert.
+
+        Returns:
+            Der dekodierte Wert.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.eof or not self._fill():
+                    raise
+                continue
+
+            # Zahlen am Pufferende könnten abgeschnitten sein
+            if end == len(self.buffer) and not self.eof and self._fill():
+                continue
+
+            self.pos = end
+            return value
+
+    def skip_value(self):
+        """Überspringt den nächsten JSON-Wert."""
+        self.read_value()
+
+    def iter_array(self):
+        """
+        Liefert die Elemente des nächsten Arrays nacheinander.
+
+        Yields:
+            Die dekodierten Elemente.
+        """
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+
+        while True:
+            yield self.read_value()
+            if self.expect(',]') == ']':
+                return
+
+    def iter_object(self):
+        """
+        Liefert die Schlüssel des nächsten Objekts nacheinander.
+
+        Der zugehörige Wert muss vor dem nächsten Schritt mit read_value,
+        skip_value oder iter_array/iter_object gelesen werden.
+
+        Yields:
+            str: Die Schlüssel.
+        """
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+
+        while True:
+            key = self.read_value()
+            self.expect(':')
+            yield key
+            if self.expect(',}') == '}':
+                return
+
+
+def _parse_int(value):
+    """
+    Wandelt Stärke oder Widerstandskraft in eine Zahl um.
+
+    Args:
+        value (str): Der Wert aus dem Kartenabzug (z.B. '3', '*', '1+*').
+
+    Returns:
+        int: Die Zahl oder None, wenn der Wert keine feste Zahl ist.
+    """
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _color_string(colors):
+    """
+    Wandelt Farbkürzel in die in der Datenbank verwendete Farbliste um.
+
+    Args:
+        colors (list): Farbkürzel (z.B. ['W', 'U']).
+
+    Returns:
+        str: Komma-getrennte Farbnamen (leer für farblose Karten).
+    """
+    return ','.join(COLOR_NAMES[color] for color in colors or [] if color in COLOR_NAMES)
+
+
+def _with_derived_attributes(row, layout):
+    """
+    Ergänzt die Spaltenwerte einer Karte um ihre abgeleiteten Attribute und ihr Layout.
+
+    Args:
+        row (tuple): Die Spaltenwerte bis einschließlich der Sammlernummer.
+        layout (str): Das Layout der Karte laut Kartenabzug oder None.
+
+    Returns:
+        tuple: Die Spaltenwerte mit Farb-Bitmaske, Manabetrag, Typen-Bitmaske,
+            Namensschlüsseln und Layout.
+    """
+    color_mask, mana_value, type_mask, _ = derive_card_attributes(row[1], row[2], row[3], layout)
+    return row + (color_mask, mana_value, type_mask) + card_name_keys(row[0]) + (layout or '',)
+
+
+def map_scryfall_card(card):
+    """
+    Bildet eine Karte aus Scryfall-Bulk-Daten auf die Spalten von Card ab.
+
+    Args:
+        card (dict): Die Karte im Scryfall-Format.
+
+    Returns:
+        tuple: Die Spaltenwerte oder None, wenn die Karte übersprungen wird.
+    """
+    if card.get('layout') in SKIPPED_LAYOUTS or not card.get('collector_number'):
+        return None
+
+    # Mehrseitige Karten haben Kosten und Text nur auf den Seiten; die Kosten
+    # aller Seiten bleiben für die Farbidentität erhalten, den Manabetrag
+    # bestimmt derive_card_attributes anhand des Layouts
+    faces = card.get('card_faces') or []
+    front = faces[0] if faces else card
+
+    mana_cost = card.get('mana_cost')
+    if mana_cost is None:
+        mana_cost = ' // '.join(face.get('mana_cost', '') for face in faces if face.get('mana_cost'))
+
+    rules_text = card.get('oracle_text')
+    if rules_text is None:
+        rules_text = '\n//\n'.join(face.get('oracle_text', '') for face in faces)
+
+    colors = card.get('colors')
+    if colors is None:
+        colors = front.get('colors')
+
+    return _with_derived_attributes((
+        card['name'],
+        card.get('type_line') or front.get('type_line', ''),
+        mana_cost,
+        _color_string(colors),
+        rules_text,
+        _parse_int(card.get('power', front.get('power'))),
+        _parse_int(card.get('toughness', front.get('toughness'))),
+        RARITY_NAMES.get(card.get('rarity'), (card.get('rarity') or 'Common').title()),
+        card['set'].upper(),
+        card['collector_number']
+    ), card.get('layout'))
+
+
+def map_mtgjson_card(card, set_code):
+    """
+    Bildet eine Karte aus MTGJSON AllPrintings auf die Spalten von Card ab.
+
+    Args:
+        card (dict): Die Karte im MTGJSON-Format.
+        set_code (str): Der Code des Sets.
+
+    Returns:
+        tuple: Die Spaltenwerte oder None, wenn die Karte übersprungen wird.
+    """
+    # Rückseiten mehrseitiger Karten teilen sich die Sammlernummer mit der Vorderseite
+    if card.get('side') not in (None, 'a') or card.get('layout') in SKIPPED_LAYOUTS or not card.get('number'):
+        return None
+
+    return _with_derived_attributes((
+        card['name'],
+        card.get('type', ''),
+        card.get('manaCost', ''),
+        _color_string(card.get('colors')),
+        card.get('text', ''),
+        _parse_int(card.get('power')),
+        _parse_int(card.get('toughness')),
+        RARITY_NAMES.get(card.get('rarity'), (card.get('rarity') or 'Common').title()),
+        (card.get('setCode') or set_code).upper(),
+        card['number']
+    ), card.get('layout'))
+
+
+def iter_card_rows(file):
+    """
+    Liest die Karten eines Abzugs und liefert ihre Spaltenwerte.
+
+    Das Format wird am ersten Zeichen erkannt: ein Array ist Scryfall-Bulk-Daten,
+    ein Objekt mit dem Schlüssel 'data' ist MTGJSON AllPrintings.
+
+    Args:
+        file: Die geöffnete Textdatei.
+
+    Yields:
+        tuple: Die Spaltenwerte einer Karte.
+    """
+    stream = JsonStream(file)
+    first = stream.peek()
+
+    if first == '[':
+        for card in stream.iter_array():
+            row = map_scryfall_card(card)
+            if row:
+                yield row
+
+    elif first == '{':
+        for key in stream.iter_object():
+            if key != 'data':
+                stream.skip_value()
+                continue
+
+            # Jedes Set wird einzeln dekodiert (einige Megabyte), nicht die ganze Datei
+            for set_code in stream.iter_object():
+                set_data = stream.read_value()
+                for card in set_data.get('cards', []):
+                    row = map_mtgjson_card(card, set_code)
+                    if row:
+                        yield row
+
+    else:
+        raise ValueError("Unbekanntes Dateiformat: JSON-Array oder -Objekt erwartet.")
+
+
+def _set_pragmas(connection, pragmas):
+    """
+    Setzt PRAGMAs auf einer Verbindung.
+
+    Args:
+        connection (sqlite3.Connection): Die SQLite-Verbindung.
+        pragmas (dict): Die zu setzenden PRAGMAs.
+    """
+    for name, value in pragmas.items():
+        connection.execute(f'PRAGMA {name} = {value}')
+
+
+def import_cards(path, batch_size=DEFAULT_BATCH_SIZE, progress=None):
+    """
+    Importiert die Karten eines Abzugs in die Datenbank.
+
+    Vorhandene Karten (gleicher Set-Code und gleiche Sammlernummer) werden
+    aktualisiert, der Bildpfad bleibt dabei erhalten. Der Import nutzt eine
+    eigene Verbindung außerhalb einer db_session, damit die PRAGMAs für den
+    Massenimport außerhalb einer Transaktion gesetzt werden können; jeder
+    Stapel wird in einer eigenen Transaktion geschrieben. Der Suchindex wird
+    während des Imports nicht fortlaufend gepflegt, sondern am Ende neu aufgebaut.
+
+    Args:
+        path (str): Der Pfad zur JSON-Datei.
+        batch_size (int, optional): Anzahl der Karten pro Schreibvorgang.
+        progress (callable, optional): Wird nach jedem Stapel mit der Anzahl
+            der bisher importierten Karten aufgerufen.
+
+    Returns:
+        int: Die Anzahl der importierten Karten.
+    """
+    connection = sqlite3.connect(db.provider.pool.filename, isolation_level=None)
+    _set_pragmas(connection, BULK_LOAD_PRAGMAS)
+
+    # Suchindex einmal am Ende neu aufbauen statt pro Karte über Trigger
+    suspend_search_triggers(connection)
+
+    imported = 0
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            batch = []
+            for row in iter_card_rows(f):
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    imported += _write_batch(connection, batch)
+                    batch = []
+                    if progress:
+                        progress(imported)
+
+            if batch:
+                imported += _write_batch(connection, batch)
+                if progress:
+                    progress(imported)
+    finally:
+        rebuild_search_index(connection)
+        connection.close()
+
+    return imported
+
+
+def _write_batch(connection, batch):
+    """
+    Schreibt einen Stapel von Karten in einer Transaktion.
+
+    Args:
+        connection (sqlite3.Connection): Die Verbindung für den Import.
+        batch (list): Die Spaltenwerte der Karten.
+
+    Returns:
+        int: Die Anzahl der geschriebenen Karten.
+    """
+    connection.execute('BEGIN')
+    try:
+        connection.executemany(UPSERT_SQL, batch)
+        store_subtypes(connection, [
+            (connection.execute(CARD_ID_SQL, (row[8], row[9])).fetchone()[0], parse_type_line(row[1])[1])
+            for row in batch
+        ])
+    except sqlite3.Error:
+        connection.execute('ROLLBACK')
+        raise
+    connection.execute('COMMIT')
+    return len(batch)
+
+
+def store_subtypes(connection, card_subtypes):
+    """
+    Schreibt die Untertypen von Karten (ersetzt die bisherigen Zuordnungen).
+
+    Args:
+        connection (sqlite3.Connection): Die Verbindung (innerhalb einer Transaktion).
+        card_subtypes (list): Paare aus Karten-ID und Liste der Untertypen.
+    """
+    names = {name for _, subtypes in card_subtypes for name in subtypes}
+    connection.executemany('INSERT OR IGNORE INTO "CardSubtype" ("name") VALUES (?)', ((name,) for name in names))
+    subtype_ids = dict(connection.execute('SELECT "name", "id" FROM "CardSubtype"'))
+
+    connection.executemany(
+        'DELETE FROM "Card_CardSubtype" WHERE "card" = ?',
+        ((card_id,) for card_id, _ in card_subtypes)
+    )
+    connection.executemany(
+        'INSERT INTO "Card_CardSubtype" ("card", "cardsubtype") VALUES (?, ?)',
+        ((card_id, subtype_ids[name]) for card_id, subtypes in card_subtypes for name in subtypes)
+    )
+
+
+def backfill_card_attributes(batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Berechnet die abgeleiteten Attribute aller vorhandenen Karten.
+
+    Wird einmalig nach dem Hinzufügen der Spalten zu einer bestehenden
+    Datenbank aufgerufen.
+
+    Args:
+        batch_size (int, optional): Anzahl der Karten pro Transaktion.
+
+    Returns:
+        int: Die Anzahl der aktualisierten Karten.
+    """
+    connection = sqlite3.connect(db.provider.pool.filename, isolation_level=None)
+    updated = 0
+    try:
+        cards = connection.execute('SELECT "id", "name", "card_type", "mana_cost", "colors", "layout" FROM "Card"').fetchall()
+        for start in range(0, len(cards), batch_size):
+            rows = []
+            card_subtypes = []
+            for card_id, name, card_type, mana_cost, colors, layout in cards[start:start + batch_size]:
+                color_mask, mana_value, type_mask, subtypes = derive_card_attributes(
+                    card_type, mana_cost, colors, layout
+                )
+                rows.append((color_mask, mana_value, type_mask) + card_name_keys(name) + (card_id,))
+                card_subtypes.append((card_id, subtypes))
+
+            connection.execute('BEGIN')
+            try:
+                connection.executemany(
+                    'UPDATE "Card" SET "color_mask" = ?, "mana_value" = ?, "type_mask" = ?, '
+                    '"name_key" = ?, "face_key" = ? WHERE "id" = ?', rows
+                )
+                store_subtypes(connection, card_subtypes)
+            except sqlite3.Error:
+                connection.execute('ROLLBACK')
+                raise
+            connection.execute('COMMIT')
+            updated += len(rows)
+    finally:
+        connection.close()
+
+    print(f"Abgeleitete Attribute für {updated} Karten berechnet.")
+    return updated
+
+
+def main():
+    """Importiert einen Kartenabzug über die Kommandozeile."""
+    from app.models.database import init_database
+
+    parser = argparse.ArgumentParser(description="Kartenimport für Magic the Gathering")
+    parser.add_argument('path', help="Pfad zur Scryfall-Bulk-Datei oder zu MTGJSON AllPrintings.json")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="Karten pro Schreibvorgang")
+    args = parser.parse_args()
+
+    init_database()
+
+    start = time.perf_counter()
+    count = import_cards(args.path, args.batch_size, progress=lambda n: print(f"{n} Karten importiert ...", end='\r'))
+    print(f"{count} Karten in {time.perf_counter() - start:.1f} s importiert.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,365 @@
+"""
+Datenbank-Benchmark für die Magic the Gathering Desktop App.
+
+Dieses Modul erzeugt eine Testdatenbank (standardmäßig 50.000 Karten und
+1.000 Decks) mit dem Schema der App und misst die wichtigsten Zugriffspfade
+(Decks eines Spielers, Karte in einem Deck, Katalogseite, offene Spiele,
+Speichern eines Spielstands) in drei Varianten:
+
+- ohne die zusammengesetzten Indizes und mit den SQLite-Voreinstellungen,
+- mit den Indizes der Modelle,
+- mit den Indizes und dem Verbindungsprofil aus DATABASE_PROFILE.
+
+Aufruf: python -m app.utils.db_benchmark [--cards N] [--decks N] [--plans] [--dir PFAD]
+"""
+
+import argparse
+import datetime
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from app.models.card import TYPE_BITS
+from app.models.database import DATABASE_PROFILE, db, init_database
+
+# Indizes, die für die Zugriffspfade in den Modellen deklariert sind
+# Format: Name -> SQL-Definition
+MODEL_INDEXES = {
+    'idx_card__name': 'CREATE INDEX "idx_card__name" ON "Card" ("name")',
+    'idx_deck__player_name': 'CREATE INDEX "idx_deck__player_name" ON "Deck" ("player", "name")',
+    'idx_cardindeck__deck_card': 'CREATE INDEX "idx_cardindeck__deck_card" ON "CardInDeck" ("deck", "card")',
+    'idx_game__end_time_start_time':
+        'CREATE INDEX "idx_game__end_time_start_time" ON "Game" ("end_time", "start_time")'
+}
+
+# Einspaltige Indizes der Fremdschlüssel vor der Einführung der obigen Indizes
+LEGACY_INDEXES = {
+    'idx_deck__player': 'CREATE INDEX "idx_deck__player" ON "Deck" ("player")',
+    'idx_cardindeck__deck': 'CREATE INDEX "idx_cardindeck__deck" ON "CardInDeck" ("deck")'
+}
+
+# SQLite-Voreinstellungen für die Vergleichsmessung
+SQLITE_DEFAULTS = {
+    'journal_mode': 'DELETE',
+    'synchronous': 'FULL',
+    'mmap_size': 0,
+    'cache_size': -2000,
+    'temp_store': 'DEFAULT'
+}
+
+# Zugriffspfade der App (Name -> SQL)
+QUERIES = {
+    'Decks eines Spielers': (
+        'SELECT "id", "name", "format" FROM "Deck" WHERE "player" = ? ORDER BY "name"'
+    ),
+    'Karte in Deck': (
+        'SELECT "id", "quantity" FROM "CardInDeck" WHERE "deck" = ? AND "card" = ? LIMIT 1'
+    ),
+    'Deckinhalt': (
+        'SELECT c."name", cid."quantity" FROM "CardInDeck" cid '
+        'JOIN "Card" c ON c."id" = cid."card" WHERE cid."deck" = ?'
+    ),
+    'Katalogseite': (
+        'SELECT "id", "name", "card_type", "mana_cost" FROM "Card" ORDER BY "name" LIMIT 100 OFFSET ?'
+    ),
+    'Offene Spiele': (
+        'SELECT "id", "player1", "player2", "start_time" FROM "Game" '
+        'WHERE "end_time" IS NULL ORDER BY "start_time" DESC'
+    )
+}
+
+# Wiederholungen je Zugriffspfad
+QUERY_REPEATS = 300
+
+# Anzahl einzeln bestätigter Spielstand-Speicherungen
+SAVE_REPEATS = 200
+
+CARD_TYPES = ['Creature', 'Instant', 'Sorcery', 'Enchantment', 'Artifact', 'Land', 'Planeswalker']
+
+
+def create_benchmark_database(path, cards=50000, decks=1000, players=200, games=5000, seed=1):
+    """
+    Erzeugt eine Testdatenbank mit zufälligen Daten.
+
+    Das Schema wird über init_database aus den Modellen erzeugt, die Daten
+    werden direkt per SQLite geschrieben.
+
+    Args:
+        path (str): Verzeichnis der Datenbankdatei.
+        cards (int, optional): Anzahl der Karten.
+        decks (int, optional): Anzahl der Decks.
+        players (int, optional): Anzahl der Spieler.
+        games (int, optional): Anzahl der Spiele (davon 1 % offen).
+        seed (int, optional): Startwert des Zufallsgenerators.
+
+    Returns:
+        str: Der Pfad der Datenbankdatei.
+    """
+    init_database(path)
+    db_path = os.path.join(path, 'magic_tg_app.sqlite')
+
+    # Verbindung von Pony freigeben, sonst lässt sich der Journalmodus nicht umschalten
+    db.disconnect()
+    rng = random.Random(seed)
+
+    connection = sqlite3.connect(db_path, isolation_level=None)
+    connection.execute('PRAGMA synchronous = OFF')
+    connection.execute('BEGIN')
+
+    connection.executemany(
+        'INSERT INTO "Card" ("name", "card_type", "mana_cost", "colors", "rules_text", "rarity", '
+        '"set_code", "collector_number", "image_path", "color_mask", "mana_value", "type_mask", '
+        '"name_key", "face_key", "layout") '
+        'VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?7, ?8, ?9, 0, ?10, ?11, lower(?1), lower(?1), \'\')',
+        (
+            (f"Karte {rng.randrange(10 ** 9):09d}", card_type, f"{{{mana_value}}}",
+             '', '', 'Common', f"S{i // 300:03d}", str(i % 300), '', mana_value, TYPE_BITS[card_type])
+            for i, card_type, mana_value in (
+                (i, rng.choice(CARD_TYPES), rng.randint(0, 7)) for i in range(cards)
+            )
+        )
+    )
+    connection.executemany(
+        'INSERT INTO "Player" ("name") VALUES (?)',
+        ((f"Spieler {i}",) for i in range(players))
+    )
+    connection.executemany(
+        'INSERT INTO "Deck" ("name", "player", "format") VALUES (?, ?, ?)',
+        ((f"Deck {rng.randrange(10 ** 6):06d}", rng.randint(1, players), 'Standard') for _ in range(decks))
+    )
+
+    deck_rows = []
+    for deck_id in range(1, decks + 1):
+        for card_id in rng.sample(range(1, cards + 1), 25):
+            deck_rows.append((deck_id, card_id, rng.randint(1, 4)))
+    connection.executemany('INSERT INTO "CardInDeck" ("deck", "card", "quantity") VALUES (?, ?, ?)', deck_rows)
+
+    start = datetime.datetime(2024, 1, 1)
+    game_rows = []
+    for i in range(games):
+        started = start + datetime.timedelta(minutes=37 * i)
+        finished = None if rng.random() < 0.01 else started + datetime.timedelta(minutes=30)
+        game_rows.append((rng.randint(1, players), rng.randint(1, players), str(started),
+                          str(finished) if finished else None, '{}'))
+    connection.executemany(
+        'INSERT INTO "Game" ("player1", "player2", "start_time", "end_time", "game_state") VALUES (?, ?, ?, ?, ?)',
+        game_rows
+    )
+
+    connection.execute('COMMIT')
+    connection.execute('ANALYZE')
+    connection.close()
+    return db_path
+
+
+def use_indexes(db_path, model_indexes):
+    """
+    Stellt die Indizes der Modelle oder die früheren einspaltigen Indizes her.
+
+    Args:
+        db_path (str): Pfad der Datenbankdatei.
+        model_indexes (bool): True für die Indizes der Modelle.
+    """
+    wanted, unwanted = (MODEL_INDEXES, LEGACY_INDEXES) if model_indexes else (LEGACY_INDEXES, MODEL_INDEXES)
+
+    connection = sqlite3.connect(db_path, isolation_level=None)
+    existing = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    for name in unwanted:
+        if name in existing:
+            connection.execute(f'DROP INDEX "{name}"')
+    for name, definition in wanted.items():
+        if name not in existing:
+            connection.execute(definition)
+    connection.execute('ANALYZE')
+    connection.close()
+
+
+def open_connection(db_path, profile):
+    """
+    Öffnet eine Verbindung mit den angegebenen PRAGMAs.
+
+    Args:
+        db_path (str): Pfad der Datenbankdatei.
+        profile (dict): Die zu setzenden PRAGMAs.
+
+    Returns:
+        sqlite3.Connection: Die Verbindung.
+    """
+    connection = sqlite3.connect(db_path, isolation_level=None)
+    for name, value in profile.items():
+        connection.execute(f'PRAGMA {name} = {value}')
+    return connection
+
+
+def query_parameters(name, rng, counts):
+    """
+    Erzeugt zufällige Parameter für einen Zugriffspfad.
+
+    Args:
+        name (str): Der Name des Zugriffspfads.
+        rng (random.Random): Der Zufallsgenerator.
+        counts (dict): Anzahl der Zeilen je Tabelle.
+
+    Returns:
+        tuple: Die Parameter der Abfrage.
+    """
+    if name == 'Decks eines Spielers':
+        return (rng.randint(1, counts['Player']),)
+    if name == 'Karte in Deck':
+        return (rng.randint(1, counts['Deck']), rng.randint(1, counts['Card']))
+    if name == 'Deckinhalt':
+        return (rng.randint(1, counts['Deck']),)
+    if name == 'Katalogseite':
+        return (rng.randrange(0, counts['Card'], 100),)
+    return ()
+
+
+def run_queries(connection, repeats=QUERY_REPEATS, seed=2):
+    """
+    Misst die mittlere Dauer der Zugriffspfade.
+
+    Args:
+        connection (sqlite3.Connection): Die Verbindung.
+        repeats (int, optional): Wiederholungen je Zugriffspfad.
+        seed (int, optional): Startwert des Zufallsgenerators.
+
+    Returns:
+        dict: Zugriffspfad -> mittlere Dauer in Mikrosekunden.
+    """
+    counts = {
+        table: connection.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+        for table in ('Card', 'Deck', 'Player')
+    }
+    results = {}
+
+    for name, sql in QUERIES.items():
+        rng = random.Random(seed)
+        params = [query_parameters(name, rng, counts) for _ in range(repeats)]
+        start = time.perf_counter()
+        for args in params:
+            connection.execute(sql, args).fetchall()
+        results[name] = (time.perf_counter() - start) / repeats * 1e6
+
+    return results
+
+
+def run_saves(connection, repeats=SAVE_REPEATS):
+    """
+    Misst das Speichern eines Spielstands mit je einem Commit.
+
+    Args:
+        connection (sqlite3.Connection): Die Verbindung.
+        repeats (int, optional): Anzahl der Speicherungen.
+
+    Returns:
+        float: Mittlere Dauer einer Speicherung in Mikrosekunden.
+    """
+    state = '{"turn_number": 1, "players": {}}' * 50
+
+    def save(game_id):
+        connection.execute('BEGIN')
+        connection.execute('UPDATE "Game" SET "game_state" = ? WHERE "id" = ?', (state, game_id))
+        connection.execute('COMMIT')
+
+    # Aufwärmen (Journal-Datei anlegen, Seiten in den Cache laden)
+    for i in range(SAVE_REPEATS // 4):
+        save(i % 100 + 1)
+
+    start = time.perf_counter()
+    for i in range(repeats):
+        save(i % 100 + 1)
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+def explain(connection):
+    """
+    Gibt die Abfragepläne der Zugriffspfade zurück.
+
+    Args:
+        connection (sqlite3.Connection): Die Verbindung.
+
+    Returns:
+        dict: Zugriffspfad -> Liste der Planzeilen.
+    """
+    plans = {}
+    for name, sql in QUERIES.items():
+        args = (1,) * sql.count('?')
+        plans[name] = [row[3] for row in connection.execute(f'EXPLAIN QUERY PLAN {sql}', args)]
+    return plans
+
+
+def run_benchmark(path, cards=50000, decks=1000, show_plans=False):
+    """
+    Führt den Benchmark in allen drei Varianten aus.
+
+    Args:
+        path (str): Verzeichnis der Testdatenbank.
+        cards (int, optional): Anzahl der Karten.
+        decks (int, optional): Anzahl der Decks.
+        show_plans (bool, optional): Gibt die Abfragepläne aus.
+
+    Returns:
+        dict: Variante -> {Zugriffspfad: mittlere Dauer in Mikrosekunden}
+    """
+    start = time.perf_counter()
+    db_path = create_benchmark_database(path, cards, decks)
+    print(f"Testdatenbank mit {cards} Karten und {decks} Decks in {time.perf_counter() - start:.1f} s erzeugt.")
+
+    variants = [
+        ('Ohne Indizes', False, SQLITE_DEFAULTS),
+        ('Indizes', True, SQLITE_DEFAULTS),
+        ('Indizes + Profil', True, DATABASE_PROFILE)
+    ]
+    results = {}
+
+    for label, model_indexes, profile in variants:
+        use_indexes(db_path, model_indexes)
+        connection = open_connection(db_path, profile)
+
+        if show_plans and profile is SQLITE_DEFAULTS:
+            print(f"\nAbfragepläne ({label}):")
+            for name, plan in explain(connection).items():
+                print(f"  {name}: {' | '.join(plan)}")
+
+        results[label] = run_queries(connection)
+        results[label]['Spielstand speichern'] = run_saves(connection)
+        connection.close()
+
+    return results
+
+
+def print_results(results):
+    """
+    Gibt die Ergebnisse als Tabelle aus.
+
+    Args:
+        results (dict): Ergebnisse aus run_benchmark.
+    """
+    labels = list(results)
+    rows = list(results[labels[0]])
+    name_width = max(len(row) for row in rows)
+
+    print()
+    print(f"{'Zugriffspfad (µs)':<{name_width}}" + ''.join(f"{label:>20}" for label in labels))
+    for row in rows:
+        print(f"{row:<{name_width}}" + ''.join(f"{results[label][row]:>20.1f}" for label in labels))
+
+
+def main():
+    """Führt den Benchmark über die Kommandozeile aus."""
+    parser = argparse.ArgumentParser(description="Datenbank-Benchmark für Magic the Gathering")
+    parser.add_argument('--cards', type=int, default=50000, help="Anzahl der Karten")
+    parser.add_argument('--decks', type=int, default=1000, help="Anzahl der Decks")
+    parser.add_argument('--plans', action='store_true', help="Abfragepläne ausgeben")
+    parser.add_argument('--dir', default=None,
+                        help="Verzeichnis der Testdatenbank (fsync-Kosten hängen vom Datenträger ab)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as path:
+        print_results(run_benchmark(path, args.cards, args.decks, args.plans))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,627 @@
+"""
+Import und Export von Decklisten für die Magic the Gathering Desktop App.
+
+Unterstützte Formate:
+    - MTGO (.dek): XML mit einem <Cards>-Element pro Karte
+    - MTG Arena: Abschnitte "Commander", "Deck", "Sideboard", Zeilen wie
+      '4 Lightning Bolt (M10) 146'
+    - Textlisten: Zeilen wie '4 Lightning Bolt' oder '4x Lightning Bolt',
+      Sideboard nach einer Leerzeile oder mit 'SB:'
+
+Die Kartennamen aller Zeilen (beim Ordnerimport aller Dateien) werden
+gesammelt und blockweise mit einer Abfrage über die indizierten Spalten
+Card.name_key und Card.face_key aufgelöst. Für unbekannte Namen werden
+ähnliche Kartennamen vorgeschlagen.
+"""
+
+import argparse
+import difflib
+import os
+import re
+import time
+import xml.etree.ElementTree as ET
+
+from pony.orm import db_session, commit
+
+from app.models.card import deck_list_name, normalize_card_name
+from app.models.database import db
+
+# Dateiendungen und ihr Format
+FILE_FORMATS = {'.dek': 'dek', '.txt': 'text', '.dec': 'text'}
+
+# Abschnittsüberschriften von Arena- und Textlisten und ihr Abschnitt
+SECTION_HEADERS = {
+    'deck': 'main',
+    'main': 'main',
+    'maindeck': 'main',
+    'mainboard': 'main',
+    'sideboard': 'sideboard',
+    'companion': 'sideboard',
+    'commander': 'commander',
+    'about': 'about'
+}
+
+# Kartenzeile: Anzahl, Name, optional (Set-Code) und Sammlernummer
+CARD_LINE_PATTERN = re.compile(
+    r'^(?P<sideboard>SB:\s*)?(?P<quantity>\d+)\s*[xX]?\s+(?P<name>.+?)'
+    r'(?:\s+\((?P<set_code>[A-Za-z0-9]+)\)(?:\s+(?P<number>\S+))?)?\s*$'
+)
+
+# Höchstzahl der Namen pro Abfrage (jeder Name wird zweimal gebunden; SQLite erlaubt mind. 999 Parameter)
+RESOLVE_CHUNK_SIZE = 400
+
+# Anzahl und Mindestähnlichkeit der Vorschläge für unbekannte Namen
+MAX_SUGGESTIONS = 3
+SUGGESTION_CUTOFF = 0.7
+
+# Abfrage der Karten eines Decks für den Export
+EXPORT_SQL = '''SELECT c."id", c."name", c."set_code", c."collector_number", cid."quantity",
+        c."card_type", c."layout"
+    FROM "CardInDeck" cid JOIN "Card" c ON c."id" = cid."card"
+    WHERE cid."deck" = $deck_id
+    ORDER BY c."name"
+'''
+
+
+def _empty_deck_list(name=None):
+    """
+    Erstellt eine leere Deckliste.
+
+    Args:
+        name (str, optional): Der Name des Decks.
+
+    Returns:
+        dict: Die Deckliste mit den Abschnitten main, sideboard und commander;
+            jede Zeile ist (Anzahl, Name, Set-Code, Sammlernummer).
+    """
+    return {'name': name, 'main': [], 'sideboard': [], 'commander': []}
+
+
+def parse_text_list(text):
+    """
+    Liest eine Arena- oder Textliste.
+
+    Args:
+        text (str): Der Inhalt der Liste.
+
+    Returns:
+        tuple: (Deckliste, Fehlermeldung oder None)
+    """
+    deck_list = _empty_deck_list()
+    section = 'main'
+    headers_used = False
+
+    for line_number, line in enumerate(text.splitlines(), 1):
+        line = line.strip()
+
+        # Leerzeile: in Listen ohne Überschriften beginnt danach das Sideboard
+        if not line:
+            if not headers_used and deck_list['main']:
+                section = 'sideboard'
+            continue
+        if line.startswith('#') or line.startswith('//'):
+            continue
+
+        header = SECTION_HEADERS.get(line.rstrip(':').lower())
+        if header:
+            section = header
+            headers_used = True
+            continue
+
+        if section == 'about':
+            if line.lower().startswith('name '):
+                deck_list['name'] = line[5:].strip()
+            continue
+
+        match = CARD_LINE_PATTERN.match(line)
+        if not match:
+            return None, f"Zeile {line_number} nicht lesbar: {line}"
+
+        target = 'sideboard' if match.group('sideboard') else section
+        deck_list[target].append((
+            int(match.group('quantity')), match.group('name'),
+            match.group('set_code'), match.group('number')
+        ))
+
+    return deck_list, None
+
+
+def parse_dek(text):
+    """
+    Liest eine MTGO-Deckdatei (.dek).
+
+    Args:
+        text (str): Der XML-Inhalt.
+
+    Returns:
+        tuple: (Deckliste, Fehlermeldung oder None)
+    """
+    try:
+        root = ET.fromstring(text)
+    except ET.ParseError as e:
+        return None, f"Ungültige .dek-Datei: {e}"
+
+    deck_list = _empty_deck_list()
+    for element in root.iter('Cards'):
+        name = element.get('Name')
+        if not name:
+            continue
+        try:
+            quantity = int(element.get('Quantity', '1'))
+        except ValueError:
+            return None, f"Ungültige Anzahl für {name}: {element.get('Quantity')}"
+
+        section = 'sideboard' if element.get('Sideboard', 'false').lower() == 'true' else 'main'
+        deck_list[section].append((quantity, name, None, None))
+
+    return deck_list, None
+
+
+# Leser der Formate
+PARSERS = {
+    'dek': parse_dek,
+    'arena': parse_text_list,
+    'text': parse_text_list
+}
+
+
+def parse_deck_text(text, format_name=None):
+    """
+    Liest eine Deckliste; ohne Formatangabe wird das Format am Inhalt erkannt.
+
+    Args:
+        text (str): Der Inhalt der Liste.
+        format_name (str, optional): 'dek', 'arena' oder 'text'.
+
+    Returns:
+        tuple: (Deckliste, Fehlermeldung oder None)
+    """
+    if format_name is None:
+        format_name = 'dek' if text.lstrip().startswith('<') else 'text'
+
+    parser = PARSERS.get(format_name)
+    if parser is None:
+        return None, f"Unbekanntes Format: {format_name}"
+    return parser(text)
+
+
+def read_deck_file(path):
+    """
+    Liest eine Deckdatei.
+
+    Args:
+        path (str): Der Pfad zur Datei.
+
+    Returns:
+        tuple: (Deckliste, Fehlermeldung oder None); der Deckname ist der
+            Name aus der Datei oder der Dateiname.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8-sig') as f:
+            text = f.read()
+    except (OSError, UnicodeDecodeError) as e:
+        return None, f"Datei {path} konnte nicht gelesen werden: {e}"
+
+    extension = os.path.splitext(path)[1].lower()
+    deck_list, error = parse_deck_text(text, FILE_FORMATS.get(extension))
+    if deck_list is not None and not deck_list['name']:
+        deck_list['name'] = os.path.splitext(os.path.basename(path))[0]
+    return deck_list, error
+
+
+@db_session
+def resolve_card_names(names):
+    """
+    Löst Kartennamen blockweise über die normalisierten Namensspalten auf.
+
+    Ein Name passt auf den vollständigen Namen einer Karte oder auf den Namen
+    ihrer Vorderseite ('Delver of Secrets' für die doppelseitige Karte).
+    Vollständige Namen haben Vorrang.
+
+    Args:
+        names (iterable): Die Kartennamen.
+
+    Returns:
+        dict: Normalisierter Name -> Liste von (ID, Set-Code, Sammlernummer),
+            älteste Einträge zuerst; unbekannte Namen fehlen.
+    """
+    keys = sorted({normalize_card_name(name) for name in names} - {''})
+    exact = {}
+    faces = {}
+
+    for start in range(0, len(keys), RESOLVE_CHUNK_SIZE):
+        chunk = keys[start:start + RESOLVE_CHUNK_SIZE]
+        params = {f'k{index}': key for index, key in enumerate(chunk)}
+        placeholders = ', '.join(f'$k{index}' for index in range(len(chunk)))
+        rows = db.select(
+            f'SELECT "id", "name_key", "face_key", "set_code", "collector_number" FROM "Card" '
+            f'WHERE "name_key" IN ({placeholders}) OR "face_key" IN ({placeholders}) ORDER BY "id"',
+            {}, params
+        )
+        for card_id, name_key, face_key, set_code, collector_number in rows:
+            printing = (card_id, set_code, collector_number)
+            exact.setdefault(name_key, []).append(printing)
+            if face_key != name_key:
+                faces.setdefault(face_key, []).append(printing)
+
+    resolved = {}
+    for key in keys:
+        printings = exact.get(key) or faces.get(key)
+        if printings:
+            resolved[key] = printings
+    return resolved
+
+
+def choose_printing(printings, set_code=None, collector_number=None):
+    """
+    Wählt den Druck einer Karte, bevorzugt den angegebenen Set-Code und die Sammlernummer.
+
+    Args:
+        printings (list): Die Drucke als (ID, Set-Code, Sammlernummer).
+        set_code (str, optional): Der gewünschte Set-Code.
+        collector_number (str, optional): Die gewünschte Sammlernummer.
+
+    Returns:
+        int: Die ID der Karte.
+    """
+    if set_code:
+        set_code = set_code.upper()
+        in_set = [printing for printing in printings if printing[1].upper() == set_code]
+        for printing in in_set:
+            if collector_number is None or printing[2] == collector_number:
+                return printing[0]
+        if in_set:
+            return in_set[0][0]
+    return printings[0][0]
+
+
+@db_session
+def suggest_card_names(names, limit=MAX_SUGGESTIONS):
+    """
+    Schlägt für unbekannte Namen ähnliche Kartennamen vor.
+
+    Die Kandidaten werden pro Anfangsbuchstabe einmal über den Index auf
+    Card.name_key geladen.
+
+    Args:
+        names (iterable): Die unbekannten Kartennamen.
+        limit (int, optional): Höchstzahl der Vorschläge pro Name.
+
+    Returns:
+        dict: Name -> Liste vorgeschlagener Kartennamen (beste zuerst).
+    """
+    candidates_by_initial = {}
+    suggestions = {}
+
+    for name in names:
+        key = normalize_card_name(name)
+        if not key:
+            suggestions[name] = []
+            continue
+
+        initial = key[0]
+        candidates = candidates_by_initial.get(initial)
+        if candidates is None:
+            candidates = dict(db.select(
+                'SELECT "name_key", MIN("name") FROM "Card" '
+                'WHERE "name_key" >= $low AND "name_key" < $high GROUP BY "name_key"',
+                {}, {'low': initial, 'high': chr(ord(initial) + 1)}
+            ))
+            candidates_by_initial[initial] = candidates
+
+        matches = difflib.get_close_matches(key, candidates.keys(), n=limit, cutoff=SUGGESTION_CUTOFF)
+        suggestions[name] = [candidates[match] for match in matches]
+
+    return suggestions
+
+
+def _collect_cards(deck_list, resolved):
+    """
+    Ordnet die Zeilen einer Deckliste den Karten-IDs zu.
+
+    Args:
+        deck_list (dict): Die Deckliste.
+        resolved (dict): Ergebnis von resolve_card_names.
+
+    Returns:
+        tuple: (Karten-ID -> Anzahl im Hauptdeck, ID des Commanders oder None,
+            Liste unbekannter Namen)
+    """
+    quantities = {}
+    commander_id = None
+    unknown = []
+
+    for section in ('commander', 'main'):
+        for quantity, name, set_code, collector_number in deck_list[section]:
+            printings = resolved.get(normalize_card_name(name))
+            if not printings:
+                if name not in unknown:
+                    unknown.append(name)
+                continue
+
+            card_id = choose_printing(printings, set_code, collector_number)
+            quantities[card_id] = quantities.get(card_id, 0) + quantity
+            if section == 'commander' and commander_id is None:
+                commander_id = card_id
+
+    return quantities, commander_id, unknown
+
+
+@db_session
+def import_deck_lists(deck_lists, player_id, format_name='Standard'):
+    """
+    Legt Decks aus bereits gelesenen Decklisten an.
+
+    Alle Namen aller Listen werden gemeinsam aufgelöst, alle Decks in einer
+    Transaktion geschrieben. Das Sideboard wird nicht übernommen (Decks haben
+    kein Sideboard); der erste Commander wird als Commander des Decks gesetzt.
+
+    Args:
+        deck_lists (list): Die Decklisten (siehe parse_deck_text).
+        player_id (int): Die ID des Spielers, dem die Decks gehören.
+        format_name (str, optional): Das Format der neuen Decks.
+
+    Returns:
+        tuple: (Liste der Ergebnisse, Fehlermeldung oder None). Jedes Ergebnis
+            enthält deck_id, name, card_count, sideboard_count und unknown
+            (unbekannter Name -> Vorschläge).
+    """
+    from app.models.deck import Deck, CardInDeck
+    from app.models.player import Player
+
+    player = Player.get(id=player_id)
+    if not player:
+        return [], "Spieler nicht gefunden."
+
+    names = {row[1] for deck_list in deck_lists for section in ('main', 'commander') for row in deck_list[section]}
+    resolved = resolve_card_names(names)
+
+    results = []
+    all_unknown = []
+    for deck_list in deck_lists:
+        quantities, commander_id, unknown = _collect_cards(deck_list, resolved)
+
+        deck = Deck(name=deck_list['name'] or "Importiertes Deck", player=player, format=format_name)
+        # Karten über ihre ID zuordnen, ohne sie einzeln zu laden
+        for card_id, quantity in quantities.items():
+            CardInDeck(deck=deck, card=card_id, quantity=quantity)
+        if commander_id is not None:
+            deck.commander = commander_id
+
+        all_unknown.extend(name for name in unknown if name not in all_unknown)
+        results.append({
+            'deck': deck,
+            'name': deck.name,
+            'card_count': sum(quantities.values()),
+            'sideboard_count': sum(row[0] for row in deck_list['sideboard']),
+            'unknown': unknown
+        })
+
+    commit()
+
+    suggestions = suggest_card_names(all_unknown) if all_unknown else {}
+    for result in results:
+        result['deck_id'] = result.pop('deck').id
+        result['unknown'] = {name: suggestions.get(name, []) for name in result['unknown']}
+
+    return results, None
+
+
+def import_deck(path, player_id, format_name='Standard'):
+    """
+    Importiert eine Deckdatei.
+
+    Args:
+        path (str): Der Pfad zur Datei (.dek, .txt).
+        player_id (int): Die ID des Spielers.
+        format_name (str, optional): Das Format des neuen Decks.
+
+    Returns:
+        tuple: (Ergebnis, Fehlermeldung oder None), siehe import_deck_lists.
+    """
+    deck_list, error = read_deck_file(path)
+    if error:
+        return None, error
+
+    results, error = import_deck_lists([deck_list], player_id, format_name)
+    return (results[0] if results else None), error
+
+
+def import_deck_folder(directory, player_id, format_name='Standard'):
+    """
+    Importiert alle Deckdateien eines Ordners.
+
+    Args:
+        directory (str): Der Ordner.
+        player_id (int): Die ID des Spielers.
+        format_name (str, optional): Das Format der neuen Decks.
+
+    Returns:
+        tuple: (Liste der Ergebnisse, Liste der Fehlermeldungen nicht lesbarer Dateien)
+    """
+    deck_lists = []
+    errors = []
+    for file_name in sorted(os.listdir(directory)):
+        if os.path.splitext(file_name)[1].lower() not in FILE_FORMATS:
+            continue
+        deck_list, error = read_deck_file(os.path.join(directory, file_name))
+        if error:
+            errors.append(f"{file_name}: {error}")
+        else:
+            deck_lists.append(deck_list)
+
+    if not deck_lists:
+        return [], errors
+
+    results, error = import_deck_lists(deck_lists, player_id, format_name)
+    if error:
+        errors.append(error)
+    return results, errors
+
+
+def export_text(rows, commander_id):
+    """
+    Erstellt eine Textliste ('4 Lightning Bolt').
+
+    Args:
+        rows (list): Die Karten als (ID, Name, Set-Code, Sammlernummer, Anzahl, Typzeile, Layout).
+        commander_id (int): Die ID des Commanders oder None.
+
+    Returns:
+        str: Die Liste.
+    """
+    return ''.join(f"{quantity} {name}\n" for _, name, _, _, quantity, _, _ in rows)
+
+
+def export_arena(rows, commander_id):
+    """
+    Erstellt eine Arena-Liste mit Set-Code und Sammlernummer.
+
+    Mehrseitige Karten werden mit dem Namen der Vorderseite geführt, geteilte
+    Karten mit beiden Hälften (siehe deck_list_name).
+
+    Args:
+        rows (list): Die Karten als (ID, Name, Set-Code, Sammlernummer, Anzahl, Typzeile, Layout).
+        commander_id (int): Die ID des Commanders oder None.
+
+    Returns:
+        str: Die Liste.
+    """
+    def line(name, set_code, collector_number, quantity):
+        printing = f" ({set_code.upper()}) {collector_number}" if collector_number else f" ({set_code.upper()})"
+        return f"{quantity} {name}{printing}\n"
+
+    commander_lines = []
+    deck_lines = []
+    for card_id, name, set_code, collector_number, quantity, card_type, layout in rows:
+        name = deck_list_name(name, card_type, layout)
+        if card_id == commander_id:
+            commander_lines.append(line(name, set_code, collector_number, 1))
+            quantity -= 1
+        if quantity > 0:
+            deck_lines.append(line(name, set_code, collector_number, quantity))
+
+    text = "Commander\n" + ''.join(commander_lines) + "\n" if commander_lines else ""
+    return text + "Deck\n" + ''.join(deck_lines)
+
+
+def export_dek(rows, commander_id):
+    """
+    Erstellt eine MTGO-Deckdatei.
+
+    Die Datenbank kennt keine MTGO-Katalog-IDs; MTGO ordnet die Karten beim
+    Import über den Namen zu (mehrseitige Karten über den Namen der Vorderseite,
+    siehe deck_list_name).
+
+    Args:
+        rows (list): Die Karten als (ID, Name, Set-Code, Sammlernummer, Anzahl, Typzeile, Layout).
+        commander_id (int): Die ID des Commanders oder None.
+
+    Returns:
+        str: Der XML-Inhalt.
+    """
+    root = ET.Element('Deck')
+    ET.SubElement(root, 'NetDeckID').text = '0'
+    ET.SubElement(root, 'PreconstructedDeckID').text = '0'
+    for _, name, _, _, quantity, card_type, layout in rows:
+        ET.SubElement(
+            root, 'Cards', Quantity=str(quantity), Sideboard='false', Name=deck_list_name(name, card_type, layout)
+        )
+
+    # ET.indent gibt es erst ab Python 3.9
+    if hasattr(ET, 'indent'):
+        ET.indent(root)
+    return '<?xml version="1.0" encoding="utf-8"?>\n' + ET.tostring(root, encoding='unicode') + '\n'
+
+
+# Schreiber der Formate
+EXPORTERS = {
+    'dek': export_dek,
+    'arena': export_arena,
+    'text': export_text
+}
+
+
+@db_session
+def export_deck(deck_id, format_name='text'):
+    """
+    Exportiert ein Deck als Text.
+
+    Args:
+        deck_id (int): Die ID des Decks.
+        format_name (str, optional): 'dek', 'arena' oder 'text'.
+
+    Returns:
+        tuple: (Inhalt, Fehlermeldung oder None)
+    """
+    from app.models.deck import Deck
+
+    exporter = EXPORTERS.get(format_name)
+    if exporter is None:
+        return None, f"Unbekanntes Format: {format_name}"
+
+    deck = Deck.get(id=deck_id)
+    if not deck:
+        return None, "Deck nicht gefunden."
+
+    commander_id = deck.commander.id if deck.commander else None
+    return exporter(db.select(EXPORT_SQL), commander_id), None
+
+
+def export_deck_file(deck_id, path, format_name=None):
+    """
+    Exportiert ein Deck in eine Datei; ohne Formatangabe nach der Dateiendung.
+
+    Args:
+        deck_id (int): Die ID des Decks.
+        path (str): Der Pfad der Datei.
+        format_name (str, optional): 'dek', 'arena' oder 'text'.
+
+    Returns:
+        tuple: (True bei Erfolg, Fehlermeldung oder None)
+    """
+    if format_name is None:
+        format_name = FILE_FORMATS.get(os.path.splitext(path)[1].lower(), 'text')
+
+    content, error = export_deck(deck_id, format_name)
+    if error:
+        return False, error
+
+    try:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+    except OSError as e:
+        return False, f"Datei {path} konnte nicht geschrieben werden: {e}"
+    return True, None
+
+
+def main():
+    """Importiert Deckdateien oder einen Ordner mit Decklisten über die Kommandozeile."""
+    from app.models.database import init_database
+
+    parser = argparse.ArgumentParser(description="Deckimport für Magic the Gathering")
+    parser.add_argument('path', help="Pfad zu einer Deckdatei (.dek, .txt) oder zu einem Ordner")
+    parser.add_argument('--player', type=int, required=True, help="ID des Spielers")
+    parser.add_argument('--format', default='Standard', help="Format der importierten Decks")
+    args = parser.parse_args()
+
+    init_database()
+
+    start = time.perf_counter()
+    if os.path.isdir(args.path):
+        results, errors = import_deck_folder(args.path, args.player, args.format)
+    else:
+        result, error = import_deck(args.path, args.player, args.format)
+        results, errors = ([result] if result else []), ([error] if error else [])
+
+    for error in errors:
+        print(error)
+    for result in results:
+        for name, suggestions in result['unknown'].items():
+            hint = f" (meinten Sie: {', '.join(suggestions)}?)" if suggestions else ""
+            print(f"{result['name']}: unbekannte Karte '{name}'{hint}")
+    print(f"{len(results)} Decks in {time.perf_counter() - start:.1f} s importiert.")
+
+
+if __name__ == "__main__":
+    main()